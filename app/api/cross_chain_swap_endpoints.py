@@ -9,7 +9,7 @@ from typing import Any, Dict
 
 from app.api.dependencies import get_authenticated_user
 from app.api.error_handlers import handle_endpoint_errors
-from app.core.provider_clients import get_cross_chain_routes
+from app.core.provider_clients import get_cross_chain_routes_async
 from app.core.utils import format_response, get_utc_timestamp
 
 
@@ -31,7 +31,7 @@ async def cross_chain_routes(
     user: Dict[str, Any] = Depends(get_authenticated_user),
 ):
     """Return bridge candidates across Socket, LI.FI, ThorChain, Wormhole."""
-    routes = get_cross_chain_routes(
+    routes = await get_cross_chain_routes_async(
         source_chain=request.source_chain,
         destination_chain=request.destination_chain,
         from_token=request.from_token.upper(),
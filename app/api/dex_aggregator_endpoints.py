@@ -9,7 +9,7 @@ from typing import Any, Dict
 
 from app.api.dependencies import get_authenticated_user
 from app.api.error_handlers import handle_endpoint_errors
-from app.core.provider_clients import get_dex_routes
+from app.core.provider_clients import get_dex_routes_async
 from app.core.utils import format_response, get_utc_timestamp
 
 
@@ -30,7 +30,7 @@ async def get_dex_quotes(
     user: Dict[str, Any] = Depends(get_authenticated_user),
 ):
     """Return unified swap quotes across 1inch, Paraswap, MetaMask Swaps."""
-    routes = get_dex_routes(
+    routes = await get_dex_routes_async(
         from_token=request.from_token.upper(),
         to_token=request.to_token.upper(),
         amount_in=request.amount_in,
@@ -171,6 +171,12 @@ async def lifespan(app: FastAPI):
     
     # Start background init without waiting
     asyncio.create_task(init_background_services())
+
+    try:
+        from app.core.price_oracle import get_price_oracle
+        await get_price_oracle().start()
+    except Exception as e:
+        logger.warning(f"Price oracle skipped: {e}")
     
     logger.info("Server ready - services initializing in background")
     
@@ -178,6 +184,16 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         logger.info("Shutting down GuardianX Comprehensive API Server")
+        try:
+            from app.core.price_oracle import get_price_oracle
+            await get_price_oracle().stop()
+        except Exception as e:
+            logger.warning(f"Price oracle shutdown skipped: {e}")
+        try:
+            from app.core.provider_clients import close_async_client
+            await close_async_client()
+        except Exception as e:
+            logger.warning(f"Provider client shutdown skipped: {e}")
 
 
 # Create FastAPI app
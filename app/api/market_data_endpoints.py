@@ -5,7 +5,7 @@ Market data + Pendle integration endpoints.
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 
 from app.api.dependencies import get_authenticated_user
@@ -14,8 +14,9 @@ from app.core.provider_clients import (
     call_pendle_hosted_sdk,
     get_pendle_markets,
     get_pendle_positions,
-    get_token_prices,
+    get_token_prices_async,
 )
+from app.core.price_oracle import get_price_oracle
 from app.core.utils import format_response, get_utc_timestamp
 
 router = APIRouter(prefix="/api/market", tags=["market-data"])
@@ -43,11 +44,47 @@ async def token_prices(
     request: TokenPriceRequest,
     user: Dict[str, Any] = Depends(get_authenticated_user),
 ):
-    """Return Moralis-backed token prices (falls back to mock)."""
-    data = get_token_prices(request.tokens)
+    """Return token prices from the price oracle snapshot (falls back to mock)."""
+    oracle = get_price_oracle()
+    if oracle.running:
+        data = await oracle.get_prices(request.tokens)
+    else:
+        data = await get_token_prices_async(request.tokens)
     return format_response(success=True, data=data, timestamp=get_utc_timestamp())
 
 
+@router.websocket("/prices/ws")
+async def token_prices_websocket(websocket: WebSocket, tokens: Optional[str] = None):
+    """
+    Push token price updates as the oracle refreshes.
+
+    Optional ``tokens`` query parameter (comma separated) filters the stream.
+    Sends a ``price_snapshot`` first, then ``price_update`` messages holding
+    only the prices that changed.
+    """
+    await websocket.accept()
+    oracle = get_price_oracle()
+    symbols = {t.strip().upper() for t in tokens.split(",") if t.strip()} if tokens else None
+    queue = oracle.subscribe()
+
+    try:
+        snapshot = await oracle.get_prices(sorted(symbols) if symbols else None)
+        await websocket.send_json({"type": "price_snapshot", **snapshot, "timestamp": get_utc_timestamp()})
+
+        while True:
+            changed = await queue.get()
+            if symbols:
+                changed = [entry for entry in changed if entry["symbol"] in symbols]
+            if changed:
+                await websocket.send_json(
+                    {"type": "price_update", "tokens": changed, "timestamp": get_utc_timestamp()}
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        oracle.unsubscribe(queue)
+
+
 @router.get("/pendle/markets")
 @handle_endpoint_errors("pendle markets")
 async def pendle_markets(
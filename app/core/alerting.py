@@ -6,9 +6,14 @@ Advanced notification system with webhook, email, and SMS support
 
 import asyncio
 import json
+import random
 import smtplib
 import ssl
 import time
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -53,6 +58,14 @@ class AlertPriority(Enum):
     CRITICAL = "critical"
 
 
+_PRIORITY_RANK = {
+    AlertPriority.LOW: 0,
+    AlertPriority.MEDIUM: 1,
+    AlertPriority.HIGH: 2,
+    AlertPriority.CRITICAL: 3,
+}
+
+
 @dataclass
 class AlertRule:
     rule_id: str
@@ -89,8 +102,111 @@ class AlertDelivery:
     delivery_data: dict[str, Any] = field(default_factory=dict)
 
 
-class EmailNotifier:
-    """Email notification service"""
+class AlertNotifier(ABC):
+    """Base class for channel notifiers
+
+    Subclasses implement ``deliver``, which sends one or more alerts as a
+    single message and raises on failure. ``send_batch``/``send_alert`` wrap
+    a single delivery attempt into ``AlertDelivery`` records; retries and
+    digesting are handled by ``ChannelDispatcher``.
+    """
+
+    channel: AlertChannel
+    disabled_message = "Alert channel disabled"
+
+    def is_enabled(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def deliver(self, alerts: list[Alert]) -> dict[str, Any]:
+        """Send ``alerts`` as one message and return delivery data"""
+        pass
+
+    async def close(self):
+        """Release pooled connections"""
+
+    async def send_alert(self, alert: Alert) -> AlertDelivery:
+        """Send a single alert immediately"""
+        return (await self.send_batch([alert]))[0]
+
+    async def send_batch(self, alerts: list[Alert]) -> list[AlertDelivery]:
+        """Send alerts as one message with a single attempt"""
+        if not self.is_enabled():
+            return self.build_deliveries(alerts, "failed", error_message=self.disabled_message)
+
+        try:
+            delivery_data = await self.deliver(alerts)
+        except Exception as e:
+            logger.error(
+                f"{self.channel.value.title()} alert failed",
+                alert_ids=[alert.alert_id for alert in alerts],
+                error=str(e),
+            )
+            return self.build_deliveries(alerts, "failed", error_message=str(e))
+        return self.build_deliveries(alerts, "sent", delivery_data=delivery_data)
+
+    def build_deliveries(
+        self,
+        alerts: list[Alert],
+        status: str,
+        error_message: str | None = None,
+        delivery_data: dict[str, Any] | None = None,
+    ) -> list[AlertDelivery]:
+        now = time.time()
+        return [
+            AlertDelivery(
+                alert_id=alert.alert_id,
+                channel=self.channel,
+                status=status,
+                timestamp=now,
+                error_message=error_message,
+                delivery_data={**(delivery_data or {}), "digest_size": len(alerts)},
+            )
+            for alert in alerts
+        ]
+
+
+class HTTPNotifier(AlertNotifier):
+    """Notifier that posts JSON over one persistent, pooled aiohttp session"""
+
+    max_connections = 10
+
+    def __init__(self, url: str | None):
+        self.url = url
+        self.timeout = settings.request_timeout
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        async with self._get_session().post(self.url, json=payload) as response:
+            if response.status >= 300:
+                error_text = await response.text()
+                raise RuntimeError(f"HTTP {response.status}: {error_text}")
+            return {"status_code": response.status}
+
+
+class EmailNotifier(AlertNotifier):
+    """Email notification service
+
+    SMTP runs on one dedicated worker thread that keeps its authenticated
+    connection open between messages and reconnects after errors.
+    """
+
+    channel = AlertChannel.EMAIL
+    disabled_message = "Email alerts disabled"
 
     def __init__(self):
         self.smtp_server = settings.email_smtp_server
@@ -99,55 +215,36 @@ class EmailNotifier:
         self.password = settings.email_password
         self.from_email = settings.email_from
         self.to_email = settings.email_to
-
-    async def send_alert(self, alert: Alert) -> AlertDelivery:
-        """Send email alert"""
-        if not settings.email_enabled:
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.EMAIL,
-                status="failed",
-                timestamp=time.time(),
-                error_message="Email alerts disabled",
+        self._smtp: smtplib.SMTP | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-smtp")
+
+    def is_enabled(self) -> bool:
+        return settings.email_enabled
+
+    async def deliver(self, alerts: list[Alert]) -> dict[str, Any]:
+        """Send email alert, or one digest email for several alerts"""
+        message = MIMEMultipart("alternative")
+        if len(alerts) == 1:
+            message["Subject"] = f"🛡️ Wallet Guard Alert: {alerts[0].title}"
+            html_content = self._create_html_email(alerts[0])
+            text_content = self._create_text_email(alerts[0])
+        else:
+            highest = max(alerts, key=lambda alert: _PRIORITY_RANK[alert.priority]).priority
+            message["Subject"] = (
+                f"🛡️ Wallet Guard: {len(alerts)} alerts (highest: {highest.value.upper()})"
             )
+            html_content = "<hr>".join(self._create_html_email(alert) for alert in alerts)
+            text_content = "\n----\n".join(self._create_text_email(alert) for alert in alerts)
+        message["From"] = self.from_email
+        message["To"] = self.to_email
 
-        try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = f"🛡️ Wallet Guard Alert: {alert.title}"
-            message["From"] = self.from_email
-            message["To"] = self.to_email
-
-            # Create HTML content
-            html_content = self._create_html_email(alert)
-            html_part = MIMEText(html_content, "html")
-            message.attach(html_part)
-
-            # Create text content
-            text_content = self._create_text_email(alert)
-            text_part = MIMEText(text_content, "plain")
-            message.attach(text_part)
-
-            # Send email
-            await self._send_email_async(message)
-
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.EMAIL,
-                status="sent",
-                timestamp=time.time(),
-                delivery_data={"to": self.to_email},
-            )
+        # Create HTML and text content
+        message.attach(MIMEText(html_content, "html"))
+        message.attach(MIMEText(text_content, "plain"))
 
-        except Exception as e:
-            logger.error("Failed to send email alert", alert_id=alert.alert_id, error=str(e))
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.EMAIL,
-                status="failed",
-                timestamp=time.time(),
-                error_message=str(e),
-            )
+        # Send email
+        await self._send_email_async(message)
+        return {"to": self.to_email}
 
     def _create_html_email(self, alert: Alert) -> str:
         """Create HTML email content"""
@@ -227,22 +324,45 @@ Details:
         return json.dumps(data, indent=2)
 
     async def _send_email_async(self, message: MIMEMultipart):
-        """Send email asynchronously"""
-        loop = asyncio.get_event_loop()
+        """Send email on the SMTP worker thread"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._send_email_sync, message)
 
-        def send_email():
+    def _send_email_sync(self, message: MIMEMultipart):
+        if self._smtp is None:
             context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.username, self.password)
-                server.send_message(message)
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=settings.request_timeout)
+            server.starttls(context=context)
+            server.login(self.username, self.password)
+            self._smtp = server
 
-        await loop.run_in_executor(None, send_email)
+        try:
+            self._smtp.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Stale pooled connection; reconnect on the next attempt
+            self._close_smtp_sync()
+            raise
+
+    def _close_smtp_sync(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
 
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close_smtp_sync)
+        self._executor.shutdown(wait=False)
 
-class SMSNotifier:
+
+class SMSNotifier(AlertNotifier):
     """SMS notification service using Twilio"""
 
+    channel = AlertChannel.SMS
+    disabled_message = "SMS alerts disabled or not configured"
+
     def __init__(self):
         self.account_sid = settings.twilio_account_sid
         self.auth_token = settings.twilio_auth_token
@@ -252,58 +372,26 @@ class SMSNotifier:
         if self.account_sid and self.auth_token and TWILIO_AVAILABLE:
             self.client = TwilioClient(self.account_sid, self.auth_token)
 
-    async def send_alert(self, alert: Alert) -> AlertDelivery:
-        """Send SMS alert"""
-        if not settings.sms_enabled or not self.client:
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.SMS,
-                status="failed",
-                timestamp=time.time(),
-                error_message="SMS alerts disabled or not configured",
-            )
-
-        try:
-            # Create SMS message
-            message_text = self._create_sms_message(alert)
-
-            # Send SMS
-            loop = asyncio.get_event_loop()
-            message = await loop.run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    body=message_text,
-                    from_=self.phone_number,
-                    to=self.phone_number,  # Would be configured per user
-                ),
-            )
-
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.SMS,
-                status="sent",
-                timestamp=time.time(),
-                delivery_data={"message_sid": message.sid},
-            )
-
-        except TwilioException as e:
-            logger.error("Twilio SMS failed", alert_id=alert.alert_id, error=str(e))
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.SMS,
-                status="failed",
-                timestamp=time.time(),
-                error_message=str(e),
-            )
-        except Exception as e:
-            logger.error("SMS alert failed", alert_id=alert.alert_id, error=str(e))
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.SMS,
-                status="failed",
-                timestamp=time.time(),
-                error_message=str(e),
-            )
+    def is_enabled(self) -> bool:
+        return bool(settings.sms_enabled and self.client)
+
+    async def deliver(self, alerts: list[Alert]) -> dict[str, Any]:
+        """Send SMS alert, or one summary SMS for several alerts"""
+        if len(alerts) == 1:
+            message_text = self._create_sms_message(alerts[0])
+        else:
+            message_text = self._create_sms_digest(alerts)
+
+        loop = asyncio.get_running_loop()
+        message = await loop.run_in_executor(
+            None,
+            lambda: self.client.messages.create(
+                body=message_text,
+                from_=self.phone_number,
+                to=self.phone_number,  # Would be configured per user
+            ),
+        )
+        return {"message_sid": message.sid}
 
     def _create_sms_message(self, alert: Alert) -> str:
         """Create SMS message"""
@@ -327,65 +415,45 @@ Time: {time.strftime('%H:%M:%S', time.gmtime(alert.timestamp))}
 Alert ID: {alert.alert_id[:8]}...
         """
 
+    def _create_sms_digest(self, alerts: list[Alert]) -> str:
+        """Create one SMS summarizing several alerts"""
+        lines = [f"🛡️ Wallet Guard: {len(alerts)} alerts", ""]
+        for alert in alerts[:5]:
+            lines.append(f"[{alert.priority.value.upper()}] {alert.title}")
+        if len(alerts) > 5:
+            lines.append(f"...and {len(alerts) - 5} more")
+        return "\n".join(lines)
 
-class WebhookNotifier:
-    """Webhook notification service"""
 
-    def __init__(self):
-        self.webhook_url = settings.webhook_url
-        self.timeout = settings.request_timeout
+class WebhookNotifier(HTTPNotifier):
+    """Webhook notification service"""
 
-    async def send_alert(self, alert: Alert) -> AlertDelivery:
-        """Send webhook alert"""
-        if not settings.webhook_enabled or not self.webhook_url:
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.WEBHOOK,
-                status="failed",
-                timestamp=time.time(),
-                error_message="Webhook alerts disabled or not configured",
-            )
+    channel = AlertChannel.WEBHOOK
+    disabled_message = "Webhook alerts disabled or not configured"
 
-        try:
-            # Create webhook payload
-            payload = self._create_webhook_payload(alert)
-
-            # Send webhook
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    headers={"Content-Type": "application/json"},
-                ) as response,
-            ):
-                if response.status == 200:
-                    return AlertDelivery(
-                        alert_id=alert.alert_id,
-                        channel=AlertChannel.WEBHOOK,
-                        status="sent",
-                        timestamp=time.time(),
-                        delivery_data={"status_code": response.status},
-                    )
-                error_text = await response.text()
-                return AlertDelivery(
-                    alert_id=alert.alert_id,
-                    channel=AlertChannel.WEBHOOK,
-                    status="failed",
-                    timestamp=time.time(),
-                    error_message=f"HTTP {response.status}: {error_text}",
-                )
-
-        except Exception as e:
-            logger.error("Webhook alert failed", alert_id=alert.alert_id, error=str(e))
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.WEBHOOK,
-                status="failed",
-                timestamp=time.time(),
-                error_message=str(e),
-            )
+    def __init__(self):
+        super().__init__(settings.webhook_url)
+
+    @property
+    def webhook_url(self) -> str | None:
+        return self.url
+
+    def is_enabled(self) -> bool:
+        return bool(settings.webhook_enabled and self.url)
+
+    async def deliver(self, alerts: list[Alert]) -> dict[str, Any]:
+        """Send webhook alert, or one digest payload for several alerts"""
+        if len(alerts) == 1:
+            payload = self._create_webhook_payload(alerts[0])
+        else:
+            payload = {
+                "type": "digest",
+                "count": len(alerts),
+                "alerts": [self._create_webhook_payload(alert) for alert in alerts],
+                "service": "wallet-guard",
+                "version": settings.service_version,
+            }
+        return await self._post(payload)
 
     def _create_webhook_payload(self, alert: Alert) -> dict[str, Any]:
         """Create webhook payload"""
@@ -403,54 +471,26 @@ class WebhookNotifier:
         }
 
 
-class SlackNotifier:
+class SlackNotifier(HTTPNotifier):
     """Slack notification service"""
 
+    channel = AlertChannel.SLACK
+
     def __init__(self, webhook_url: str):
-        self.webhook_url = webhook_url
-        self.timeout = settings.request_timeout
+        super().__init__(webhook_url)
 
-    async def send_alert(self, alert: Alert) -> AlertDelivery:
-        """Send Slack alert"""
-        try:
-            # Create Slack payload
-            payload = self._create_slack_payload(alert)
-
-            # Send to Slack
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                ) as response,
-            ):
-                if response.status == 200:
-                    return AlertDelivery(
-                        alert_id=alert.alert_id,
-                        channel=AlertChannel.SLACK,
-                        status="sent",
-                        timestamp=time.time(),
-                        delivery_data={"status_code": response.status},
-                    )
-                error_text = await response.text()
-                return AlertDelivery(
-                    alert_id=alert.alert_id,
-                    channel=AlertChannel.SLACK,
-                    status="failed",
-                    timestamp=time.time(),
-                    error_message=f"HTTP {response.status}: {error_text}",
-                )
+    @property
+    def webhook_url(self) -> str:
+        return self.url
 
-        except Exception as e:
-            logger.error("Slack alert failed", alert_id=alert.alert_id, error=str(e))
-            return AlertDelivery(
-                alert_id=alert.alert_id,
-                channel=AlertChannel.SLACK,
-                status="failed",
-                timestamp=time.time(),
-                error_message=str(e),
-            )
+    async def deliver(self, alerts: list[Alert]) -> dict[str, Any]:
+        """Send Slack alert; several alerts become attachments of one message"""
+        attachments = [
+            attachment
+            for alert in alerts
+            for attachment in self._create_slack_payload(alert)["attachments"]
+        ]
+        return await self._post({"attachments": attachments})
 
     def _create_slack_payload(self, alert: Alert) -> dict[str, Any]:
         """Create Slack payload"""
@@ -483,19 +523,253 @@ class SlackNotifier:
         }
 
 
+class ChannelDispatcher:
+    """Bounded delivery queue and worker pool for one alert channel
+
+    Alerts are enqueued without waiting for delivery. Workers coalesce alerts
+    that arrive within ``digest_window`` seconds into a single digest message
+    (critical alerts skip the wait), retry failed deliveries with jittered
+    exponential backoff, and report every outcome through ``on_delivery``.
+    """
+
+    def __init__(
+        self,
+        notifier: AlertNotifier,
+        on_delivery: Callable[[AlertDelivery], None] | None = None,
+        queue_size: int = 1000,
+        workers: int = 2,
+        digest_window: float = 2.0,
+        max_digest_size: int = 20,
+        max_retries: int = 3,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        self.notifier = notifier
+        self.channel = notifier.channel
+        self.on_delivery = on_delivery
+        self.queue_size = queue_size
+        self.worker_count = workers
+        self.digest_window = digest_window
+        self.max_digest_size = max_digest_size
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "sent": 0,
+            "failed": 0,
+            "retries": 0,
+            "messages": 0,
+            "digests": 0,
+        }
+
+    def submit(self, alert: Alert) -> bool:
+        """Queue an alert for delivery; returns False if it had to be dropped"""
+        if not self.notifier.is_enabled():
+            self._report(
+                self.notifier.build_deliveries(
+                    [alert], "failed", error_message=self.notifier.disabled_message
+                )
+            )
+            return False
+
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((alert, time.monotonic()))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(
+                "Alert queue full, dropping alert",
+                channel=self.channel.value,
+                alert_id=alert.alert_id,
+            )
+            self._report(
+                self.notifier.build_deliveries([alert], "failed", error_message="Queue full")
+            )
+            return False
+
+        self.stats["enqueued"] += 1
+        return True
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._deliver_batch(batch)
+            except Exception as e:
+                logger.error("Alert delivery worker error", channel=self.channel.value, error=str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> list[tuple[Alert, float]]:
+        """Wait for one alert, then gather more for up to ``digest_window`` seconds"""
+        batch = [await self._queue.get()]
+        window = 0.0 if batch[0][0].priority == AlertPriority.CRITICAL else self.digest_window
+        deadline = time.monotonic() + window
+
+        while len(batch) < self.max_digest_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _deliver_batch(self, batch: list[tuple[Alert, float]]):
+        alerts = [alert for alert, _ in batch]
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(backoff / 2, backoff))
+            try:
+                delivery_data = await self.notifier.deliver(alerts)
+            except Exception as e:
+                error = str(e)
+                logger.warning(
+                    "Alert delivery attempt failed",
+                    channel=self.channel.value,
+                    attempt=attempt + 1,
+                    digest_size=len(alerts),
+                    error=error,
+                )
+                continue
+
+            self.stats["messages"] += 1
+            if len(alerts) > 1:
+                self.stats["digests"] += 1
+            now = time.monotonic()
+            self._latencies.extend(now - enqueued_at for _, enqueued_at in batch)
+            self._report(
+                self.notifier.build_deliveries(alerts, "sent", delivery_data=delivery_data)
+            )
+            return
+
+        logger.error(
+            "Alert delivery failed after retries",
+            channel=self.channel.value,
+            alert_ids=[alert.alert_id for alert in alerts],
+            error=error,
+        )
+        self._report(self.notifier.build_deliveries(alerts, "failed", error_message=error))
+
+    def _report(self, deliveries: list[AlertDelivery]):
+        for delivery in deliveries:
+            self.stats["sent" if delivery.status == "sent" else "failed"] += 1
+            if self.on_delivery is not None:
+                self.on_delivery(delivery)
+
+    def get_metrics(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> float:
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.queue_size,
+            "workers": len([worker for worker in self._workers if not worker.done()]),
+            "delivery_latency_seconds": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] if latencies else 0.0,
+            },
+        }
+
+    async def close(self, drain_timeout: float = 10.0):
+        """Flush queued alerts (bounded by ``drain_timeout``), stop workers and close the notifier"""
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Alert queue not drained before shutdown",
+                    channel=self.channel.value,
+                    pending=self._queue.qsize(),
+                )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.notifier.close()
+
+
+# Condition keys that select each source kind, as (type key, severity key)
+_RULE_SOURCE_CONDITIONS = {
+    "threat": ("threat_types", "threat_severity"),
+    "vulnerability": ("vulnerability_types", "vulnerability_severity"),
+    "mempool": ("event_types", None),
+}
+
+
+def _condition_values(conditions: dict[str, Any], key: str | None) -> tuple[str | None, ...]:
+    """Values a rule condition accepts; (None,) when the rule doesn't constrain it"""
+    if key is None or key not in conditions:
+        return (None,)
+    value = conditions[key]
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
 class AlertManager:
     """Main alert management system"""
 
-    def __init__(self):
+    def __init__(self, history_size: int = 10000):
         self.alert_rules: dict[str, AlertRule] = {}
-        self.alert_history: list[Alert] = []
-        self.delivery_history: list[AlertDelivery] = []
+        self.alert_history: deque[Alert] = deque(maxlen=history_size)
+        self.delivery_history: deque[AlertDelivery] = deque(maxlen=history_size)
+
+        # Running aggregates over everything ever recorded, independent of history size
+        self._alert_count = 0
+        self._delivery_count = 0
+        self._priority_counts: Counter = Counter()
+        self._channel_counts: Counter = Counter()
+        self._status_counts: Counter = Counter()
+
+        # (source kind, type, severity) -> rules; None matches any value, and
+        # rules with no source-specific condition share the (None, None, None) bucket
+        self._rule_index: dict[tuple[str | None, str | None, str | None], list[AlertRule]] = {}
+        self._rule_order: dict[str, int] = {}
+        self._rule_index_dirty = True
 
         # Initialize notifiers
         self.email_notifier = EmailNotifier()
         self.sms_notifier = SMSNotifier()
         self.webhook_notifier = WebhookNotifier()
 
+        # Per-channel delivery queues; SMS is not digested beyond what is already queued
+        self.dispatchers: dict[AlertChannel, ChannelDispatcher] = {
+            AlertChannel.EMAIL: ChannelDispatcher(
+                self.email_notifier, self._record_delivery, workers=1, digest_window=5.0
+            ),
+            AlertChannel.SMS: ChannelDispatcher(
+                self.sms_notifier, self._record_delivery, workers=1, digest_window=0.0
+            ),
+            AlertChannel.WEBHOOK: ChannelDispatcher(
+                self.webhook_notifier, self._record_delivery, workers=4, digest_window=1.0
+            ),
+        }
+
         # Initialize default rules
         self._initialize_default_rules()
 
@@ -563,90 +837,96 @@ class AlertManager:
 
     async def process_threat_detection(self, threat: ThreatDetection):
         """Process threat detection and trigger alerts"""
-        # Check rules for threat detections
-        for rule in self.alert_rules.values():
-            if not rule.enabled:
-                continue
-
-            if self._rule_matches_threat(rule, threat):
-                await self._trigger_alert(rule, threat)
+        for rule in self._candidate_rules("threat", threat.threat_type.value, threat.severity.value):
+            await self._trigger_alert(rule, threat)
 
     async def process_vulnerability_report(self, vulnerability: VulnerabilityReport):
         """Process vulnerability report and trigger alerts"""
-        # Check rules for vulnerability reports
-        for rule in self.alert_rules.values():
-            if not rule.enabled:
-                continue
-
-            if self._rule_matches_vulnerability(rule, vulnerability):
-                await self._trigger_alert(rule, vulnerability)
+        for rule in self._candidate_rules(
+            "vulnerability", vulnerability.vulnerability_type.value, vulnerability.severity.value
+        ):
+            await self._trigger_alert(rule, vulnerability)
 
     async def process_mempool_event(self, event: MempoolEvent):
         """Process mempool event and trigger alerts"""
-        # Check rules for mempool events
+        for rule in self._candidate_rules("mempool", event.event_type.value, None):
+            await self._trigger_alert(rule, event)
+
+    def rebuild_rule_index(self):
+        """Compile rule conditions into the lookup index
+
+        A rule only matches events of the source kinds its conditions name:
+        a rule with ``threat_*`` conditions no longer fires for every mempool
+        event and vulnerability report, as it did when each event was checked
+        against every rule. Rules with no source-specific condition still
+        match events of every kind.
+
+        Called automatically after rule changes made through the manager;
+        call it directly after mutating ``alert_rules`` or rule conditions.
+        """
+        index: dict[tuple[str | None, str | None, str | None], list[AlertRule]] = {}
+        self._rule_order = {rule_id: i for i, rule_id in enumerate(self.alert_rules)}
+
         for rule in self.alert_rules.values():
             if not rule.enabled:
                 continue
-
-            if self._rule_matches_mempool_event(rule, event):
-                await self._trigger_alert(rule, event)
+            sources = [
+                source
+                for source, keys in _RULE_SOURCE_CONDITIONS.items()
+                if any(key in rule.conditions for key in keys if key)
+            ]
+            if not sources:
+                index.setdefault((None, None, None), []).append(rule)
+            for source in sources:
+                type_key, severity_key = _RULE_SOURCE_CONDITIONS[source]
+                for event_type in _condition_values(rule.conditions, type_key):
+                    for severity in _condition_values(rule.conditions, severity_key):
+                        index.setdefault((source, event_type, severity), []).append(rule)
+
+        self._rule_index = index
+        self._rule_index_dirty = False
+
+    def _candidate_rules(
+        self, source: str, event_type: str, severity: str | None
+    ) -> list[AlertRule]:
+        """Enabled rules matching an event that are out of cooldown, in rule order"""
+        if self._rule_index_dirty:
+            self.rebuild_rule_index()
+
+        now = time.time()
+        candidates = []
+        for key in {
+            (source, event_type, severity),
+            (source, event_type, None),
+            (source, None, severity),
+            (source, None, None),
+            (None, None, None),
+        }:
+            for rule in self._rule_index.get(key, ()):
+                if now - rule.last_triggered >= rule.cooldown_seconds:
+                    candidates.append(rule)
+
+        if len(candidates) > 1:
+            candidates.sort(key=lambda rule: self._rule_order[rule.rule_id])
+        return candidates
 
     def _rule_matches_threat(self, rule: AlertRule, threat: ThreatDetection) -> bool:
         """Check if rule matches threat detection"""
-        conditions = rule.conditions
-
-        # Check threat severity
-        if "threat_severity" in conditions:
-            if threat.severity.value != conditions["threat_severity"]:
-                return False
-
-        # Check threat types
-        if "threat_types" in conditions:
-            if threat.threat_type.value not in conditions["threat_types"]:
-                return False
-
-        # Check cooldown
-        if time.time() - rule.last_triggered < rule.cooldown_seconds:
-            return False
-
-        return True
+        return rule in self._candidate_rules(
+            "threat", threat.threat_type.value, threat.severity.value
+        )
 
     def _rule_matches_vulnerability(
         self, rule: AlertRule, vulnerability: VulnerabilityReport
     ) -> bool:
         """Check if rule matches vulnerability report"""
-        conditions = rule.conditions
-
-        # Check vulnerability severity
-        if "vulnerability_severity" in conditions:
-            if vulnerability.severity.value not in conditions["vulnerability_severity"]:
-                return False
-
-        # Check vulnerability types
-        if "vulnerability_types" in conditions:
-            if vulnerability.vulnerability_type.value not in conditions["vulnerability_types"]:
-                return False
-
-        # Check cooldown
-        if time.time() - rule.last_triggered < rule.cooldown_seconds:
-            return False
-
-        return True
+        return rule in self._candidate_rules(
+            "vulnerability", vulnerability.vulnerability_type.value, vulnerability.severity.value
+        )
 
     def _rule_matches_mempool_event(self, rule: AlertRule, event: MempoolEvent) -> bool:
         """Check if rule matches mempool event"""
-        conditions = rule.conditions
-
-        # Check event types
-        if "event_types" in conditions:
-            if event.event_type.value not in conditions["event_types"]:
-                return False
-
-        # Check cooldown
-        if time.time() - rule.last_triggered < rule.cooldown_seconds:
-            return False
-
-        return True
+        return rule in self._candidate_rules("mempool", event.event_type.value, None)
 
     async def _trigger_alert(self, rule: AlertRule, source_data: Any):
         """Trigger alert for matched rule"""
@@ -665,14 +945,27 @@ class AlertManager:
 
         # Add to history
         self.alert_history.append(alert)
+        self._alert_count += 1
+        self._priority_counts[alert.priority.value] += 1
 
         # Update rule last triggered
         rule.last_triggered = time.time()
 
-        # Send alerts through configured channels
+        # Queue alerts for delivery; workers send them off the detection path
         for channel in rule.channels:
-            delivery = await self._send_alert_to_channel(alert, channel)
-            self.delivery_history.append(delivery)
+            dispatcher = self.dispatchers.get(channel)
+            if dispatcher is not None:
+                dispatcher.submit(alert)
+            else:
+                self._record_delivery(
+                    AlertDelivery(
+                        alert_id=alert.alert_id,
+                        channel=channel,
+                        status="failed",
+                        timestamp=time.time(),
+                        error_message=f"Channel {channel.value} not implemented",
+                    )
+                )
 
         # Notify callbacks
         for callback in self.alert_callbacks:
@@ -754,27 +1047,50 @@ class AlertManager:
             error_message=f"Channel {channel.value} not implemented",
         )
 
+    def _record_delivery(self, delivery: AlertDelivery):
+        self.delivery_history.append(delivery)
+        self._delivery_count += 1
+        self._channel_counts[delivery.channel.value] += 1
+        self._status_counts[delivery.status] += 1
+
+    def get_delivery_metrics(self) -> dict[str, Any]:
+        """Queue depth, throughput and delivery latency per channel"""
+        return {
+            channel.value: dispatcher.get_metrics()
+            for channel, dispatcher in self.dispatchers.items()
+        }
+
+    async def close(self, drain_timeout: float = 10.0):
+        """Flush pending alerts and close channel connections"""
+        await asyncio.gather(
+            *[dispatcher.close(drain_timeout) for dispatcher in self.dispatchers.values()]
+        )
+
     def add_alert_rule(self, rule: AlertRule):
         """Add new alert rule"""
         self.alert_rules[rule.rule_id] = rule
+        self._rule_index_dirty = True
         logger.info("Added alert rule", rule_id=rule.rule_id, name=rule.name)
 
     def remove_alert_rule(self, rule_id: str):
         """Remove alert rule"""
         if rule_id in self.alert_rules:
             del self.alert_rules[rule_id]
+            self._rule_index_dirty = True
             logger.info("Removed alert rule", rule_id=rule_id)
 
     def enable_alert_rule(self, rule_id: str):
         """Enable alert rule"""
         if rule_id in self.alert_rules:
             self.alert_rules[rule_id].enabled = True
+            self._rule_index_dirty = True
             logger.info("Enabled alert rule", rule_id=rule_id)
 
     def disable_alert_rule(self, rule_id: str):
         """Disable alert rule"""
         if rule_id in self.alert_rules:
             self.alert_rules[rule_id].enabled = False
+            self._rule_index_dirty = True
             logger.info("Disabled alert rule", rule_id=rule_id)
 
     def add_alert_callback(self, callback: callable):
@@ -788,37 +1104,25 @@ class AlertManager:
 
     def get_alert_stats(self) -> dict[str, Any]:
         """Get alert statistics"""
-        total_alerts = len(self.alert_history)
-        total_deliveries = len(self.delivery_history)
-
-        # Count by priority
-        priority_counts = {}
-        for alert in self.alert_history:
-            priority = alert.priority.value
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
-        # Count by channel
-        channel_counts = {}
-        for delivery in self.delivery_history:
-            channel = delivery.channel.value
-            channel_counts[channel] = channel_counts.get(channel, 0) + 1
-
-        # Count successful vs failed deliveries
-        successful_deliveries = len([d for d in self.delivery_history if d.status == "sent"])
-        failed_deliveries = len([d for d in self.delivery_history if d.status == "failed"])
+        successful_deliveries = self._status_counts["sent"]
+        failed_deliveries = self._status_counts["failed"]
 
         return {
-            "total_alerts": total_alerts,
-            "total_deliveries": total_deliveries,
+            "total_alerts": self._alert_count,
+            "total_deliveries": self._delivery_count,
             "successful_deliveries": successful_deliveries,
             "failed_deliveries": failed_deliveries,
             "delivery_success_rate": (
-                (successful_deliveries / total_deliveries * 100) if total_deliveries > 0 else 0
+                (successful_deliveries / self._delivery_count * 100)
+                if self._delivery_count > 0
+                else 0
             ),
-            "priority_distribution": priority_counts,
-            "channel_distribution": channel_counts,
+            "priority_distribution": dict(self._priority_counts),
+            "channel_distribution": dict(self._channel_counts),
             "active_rules": len([r for r in self.alert_rules.values() if r.enabled]),
             "total_rules": len(self.alert_rules),
+            "retained_alerts": len(self.alert_history),
+            "delivery_pipeline": self.get_delivery_metrics(),
         }
 
 
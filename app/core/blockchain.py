@@ -5,11 +5,14 @@ Real-time blockchain monitoring with multiple RPC providers and failover
 """
 
 import asyncio
+import itertools
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+import aiohttp
 import structlog
 from eth_utils import to_checksum_address
 from web3 import Web3
@@ -29,6 +32,12 @@ from config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+# Maximum calls per JSON-RPC batch request
+RPC_BATCH_SIZE = 100
+
+# Deployed contract code kept per provider (LRU)
+CODE_CACHE_SIZE = 50_000
+
 
 class ConnectionStatus(Enum):
     CONNECTED = "connected"
@@ -62,6 +71,22 @@ class TransactionData:
     gas_used: int | None = None
 
 
+@dataclass
+class AccountState:
+    address: str
+    balance: int
+    nonce: int
+    block: str = "latest"
+
+
+class RPCBatchError(Exception):
+    """Error returned for one call inside a JSON-RPC batch"""
+
+    def __init__(self, message: str, code: int | None = None):
+        super().__init__(message)
+        self.code = code
+
+
 @dataclass
 class MempoolTransaction:
     hash: str
@@ -94,6 +119,14 @@ class BlockchainProvider:
         # Health monitoring will be started when needed
         self._monitoring_task = None
 
+        # Pooled HTTP session for JSON-RPC batches
+        self._session: aiohttp.ClientSession | None = None
+        self._rpc_ids = itertools.count(1)
+
+        # Only non-empty code is cached: an address without code may still be
+        # deployed to later, but deployed code does not change
+        self._code_cache: OrderedDict[str, bytes] = OrderedDict()
+
     def _initialize_web3_instances(self):
         """Initialize Web3 instances for all RPC URLs"""
         for i, rpc_url in enumerate(self.rpc_urls):
@@ -184,6 +217,16 @@ class BlockchainProvider:
                 "Connection check failed", network=self.network, rpc_url=rpc_url, error=str(e)
             )
 
+    def get_healthy_rpc_urls(self) -> list[str]:
+        """RPC URLs currently considered healthy, or all of them if none are"""
+        healthy = [
+            rpc_url
+            for rpc_url in self.rpc_urls
+            if self.connection_status[rpc_url] == ConnectionStatus.CONNECTED
+            and self.error_counts[rpc_url] < 5
+        ]
+        return healthy or list(self.rpc_urls)
+
     def get_best_provider(self) -> tuple[Web3, int]:
         """Get the best available provider based on health and performance"""
         # Find healthy providers
@@ -349,15 +392,20 @@ class BlockchainProvider:
 
     async def get_code(self, address: str) -> bytes:
         """Get contract code"""
+        cached = self._cached_code(address)
+        if cached is not None:
+            return cached
+
         w3, provider_index = self.get_best_provider()
         rpc_url = self.rpc_urls[provider_index]
 
         try:
-            code = w3.eth.get_code(to_checksum_address(address))
+            code = bytes(w3.eth.get_code(to_checksum_address(address)))
 
             # Update request counts
             self.request_counts[rpc_url] += 1
 
+            self._cache_code(address, code)
             return code
 
         except Exception as e:
@@ -370,6 +418,139 @@ class BlockchainProvider:
             )
             raise
 
+    async def rpc_batch(
+        self, calls: list[tuple[str, list[Any]]], rpc_url: str | None = None
+    ) -> list[Any]:
+        """Send JSON-RPC calls as batched HTTP requests to the best provider
+
+        Results are returned in call order; a failed call yields an
+        ``RPCBatchError`` in its slot instead of failing the whole batch.
+        Pass ``rpc_url`` to pin the batch to one provider, e.g. to spread a
+        large workload across every healthy provider.
+        """
+        if not calls:
+            return []
+
+        if rpc_url is None:
+            _, provider_index = self.get_best_provider()
+            rpc_url = self.rpc_urls[provider_index]
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.request_timeout),
+                headers={"User-Agent": f"WalletGuard/{settings.service_version}"},
+            )
+
+        results: list[Any] = []
+        for start in range(0, len(calls), RPC_BATCH_SIZE):
+            chunk = calls[start : start + RPC_BATCH_SIZE]
+            ids = [next(self._rpc_ids) for _ in chunk]
+            payload = [
+                {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+                for request_id, (method, params) in zip(ids, chunk)
+            ]
+            try:
+                async with self._session.post(rpc_url, json=payload) as response:
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+            except Exception as e:
+                self.error_counts[rpc_url] += 1
+                logger.error(
+                    "JSON-RPC batch failed",
+                    network=self.network,
+                    rpc_url=rpc_url,
+                    calls=len(chunk),
+                    error=str(e),
+                )
+                raise
+
+            self.request_counts[rpc_url] += 1
+            self.last_successful_request[rpc_url] = time.time()
+            by_id = {item.get("id"): item for item in (body if isinstance(body, list) else [body])}
+            for request_id in ids:
+                item = by_id.get(request_id)
+                if item is None:
+                    results.append(RPCBatchError("Missing response in batch"))
+                elif item.get("error"):
+                    error = item["error"]
+                    results.append(RPCBatchError(error.get("message", "RPC error"), error.get("code")))
+                else:
+                    results.append(item.get("result"))
+        return results
+
+    async def get_block_number(self) -> int:
+        """Get the latest block number"""
+        (result,) = await self.rpc_batch([("eth_blockNumber", [])])
+        if isinstance(result, Exception):
+            raise result
+        return int(result, 16)
+
+    async def get_account_states(
+        self, addresses: list[str], block: int | str = "latest", rpc_url: str | None = None
+    ) -> dict[str, AccountState]:
+        """Balance and nonce for many addresses in batched round trips"""
+        block_tag = hex(block) if isinstance(block, int) else block
+        calls = []
+        for address in addresses:
+            calls.append(("eth_getBalance", [address, block_tag]))
+            calls.append(("eth_getTransactionCount", [address, block_tag]))
+
+        results = await self.rpc_batch(calls, rpc_url=rpc_url)
+        states = {}
+        for i, address in enumerate(addresses):
+            balance, nonce = results[2 * i], results[2 * i + 1]
+            if isinstance(balance, Exception) or isinstance(nonce, Exception):
+                logger.warning(
+                    "Failed to load account state", network=self.network, address=address
+                )
+                continue
+            states[address] = AccountState(
+                address=address, balance=int(balance, 16), nonce=int(nonce, 16), block=block_tag
+            )
+        return states
+
+    async def get_codes(self, addresses: list[str], rpc_url: str | None = None) -> dict[str, bytes]:
+        """Contract code for many addresses, batching only the cache misses"""
+        codes: dict[str, bytes] = {}
+        missing = []
+        for address in addresses:
+            cached = self._cached_code(address)
+            if cached is None:
+                missing.append(address)
+            else:
+                codes[address] = cached
+
+        results = await self.rpc_batch(
+            [("eth_getCode", [address, "latest"]) for address in missing], rpc_url=rpc_url
+        )
+        for address, result in zip(missing, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to load code", network=self.network, address=address)
+                continue
+            code = bytes.fromhex(result.removeprefix("0x")) if result else b""
+            self._cache_code(address, code)
+            codes[address] = code
+        return codes
+
+    def _cached_code(self, address: str) -> bytes | None:
+        key = address.lower()
+        code = self._code_cache.get(key)
+        if code is not None:
+            self._code_cache.move_to_end(key)
+        return code
+
+    def _cache_code(self, address: str, code: bytes):
+        if not code:
+            return
+        self._code_cache[address.lower()] = code
+        if len(self._code_cache) > CODE_CACHE_SIZE:
+            self._code_cache.popitem(last=False)
+
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     def get_connection_stats(self) -> dict[str, Any]:
         """Get connection statistics"""
         return {
@@ -386,6 +567,7 @@ class BlockchainProvider:
             "request_counts": self.request_counts.copy(),
             "error_counts": self.error_counts.copy(),
             "last_successful_request": self.last_successful_request.copy(),
+            "cached_contract_codes": len(self._code_cache),
         }
 
 
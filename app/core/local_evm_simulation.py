@@ -0,0 +1,696 @@
+"""
+Local EVM Fork Simulation
+In-process EVM (py-evm) that executes transactions against a lazily loaded fork
+of a live chain, so a simulation costs a few state reads instead of a remote API
+call or a spawned node process
+"""
+
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import structlog
+from web3 import Web3
+
+try:
+    import rlp
+    from eth.constants import BLANK_ROOT_HASH, EMPTY_SHA3
+    from eth.db.account import AccountDB
+    from eth.db.atomic import AtomicDB
+    from eth.db.cache import CacheDB
+    from eth.db.journal import JournalDB
+    from eth.db.storage import AccountStorageDB
+    from eth.rlp.accounts import Account
+    from eth.vm.execution_context import ExecutionContext
+    from eth.vm.forks import CancunVM, PragueVM, ShanghaiVM
+    from eth.vm.spoof import SpoofTransaction
+    from eth_hash.auto import keccak
+
+    PY_EVM_AVAILABLE = True
+    EVM_FORKS = {"shanghai": ShanghaiVM, "cancun": CancunVM, "prague": PragueVM}
+except ImportError:
+    AccountDB = AccountStorageDB = AtomicDB = object
+    PY_EVM_AVAILABLE = False
+    EVM_FORKS = {}
+
+logger = structlog.get_logger(__name__)
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+REVERT_SELECTOR = bytes.fromhex("08c379a0")
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class StateSource(ABC):
+    """Where a fork reads account state it has not seen yet"""
+
+    @abstractmethod
+    def get_account(self, address: str) -> tuple[int, int, bytes]:
+        """Return (balance, nonce, code) of a checksummed address"""
+        pass
+
+    @abstractmethod
+    def get_storage(self, address: str, slot: int) -> int:
+        """Value of a storage slot"""
+        pass
+
+    @abstractmethod
+    def get_block(self) -> dict[str, Any]:
+        """Header of the fork block: number, timestamp, gasLimit, miner, ..."""
+        pass
+
+    @abstractmethod
+    def get_chain_id(self) -> int:
+        """Chain id transactions on the fork are checked against"""
+        pass
+
+
+class Web3StateSource(StateSource):
+    """State pinned to one block of an RPC node (remote, or a local node in tests)"""
+
+    def __init__(self, web3: Web3, block_number: int):
+        self.web3 = web3
+        self.block_number = block_number
+
+    def get_account(self, address: str) -> tuple[int, int, bytes]:
+        eth = self.web3.eth
+        return (
+            eth.get_balance(address, self.block_number),
+            eth.get_transaction_count(address, self.block_number),
+            bytes(eth.get_code(address, self.block_number)),
+        )
+
+    def get_storage(self, address: str, slot: int) -> int:
+        return int.from_bytes(self.web3.eth.get_storage_at(address, slot, self.block_number), "big")
+
+    def get_block(self) -> dict[str, Any]:
+        return dict(self.web3.eth.get_block(self.block_number))
+
+    def get_chain_id(self) -> int:
+        return self.web3.eth.chain_id
+
+
+class StaticStateSource(StateSource):
+    """
+    In-memory stand-in for a node.
+
+    ``accounts`` maps address -> {"balance", "nonce", "code", "storage": {slot: value}}.
+    """
+
+    def __init__(
+        self,
+        accounts: dict[str, dict[str, Any]] | None = None,
+        block: dict[str, Any] | None = None,
+        chain_id: int = 1,
+    ):
+        self.accounts = {
+            address.lower(): account for address, account in (accounts or {}).items()
+        }
+        self.block = {
+            "number": 1,
+            "timestamp": int(time.time()),
+            "gasLimit": 30_000_000,
+            "miner": ZERO_ADDRESS,
+            **(block or {}),
+        }
+        self.chain_id = chain_id
+
+    def get_account(self, address: str) -> tuple[int, int, bytes]:
+        account = self.accounts.get(address.lower(), {})
+        code = account.get("code", b"")
+        if isinstance(code, str):
+            code = bytes.fromhex(code.removeprefix("0x"))
+        return int(account.get("balance", 0)), int(account.get("nonce", 0)), code
+
+    def get_storage(self, address: str, slot: int) -> int:
+        return int(self.accounts.get(address.lower(), {}).get("storage", {}).get(slot, 0))
+
+    def get_block(self) -> dict[str, Any]:
+        return self.block
+
+    def get_chain_id(self) -> int:
+        return self.chain_id
+
+
+class ForkSnapshot:
+    """
+    Read-through cache of one fork block's state, shared by every simulation
+    at that block. Entries are immutable chain state, so concurrent readers
+    need no locking; a racing miss at worst fetches the same value twice.
+    Only the ``stats`` counters are updated under a lock.
+    """
+
+    def __init__(self, source: StateSource, block_number: int):
+        self.source = source
+        self.block_number = block_number
+        self.accounts: dict[bytes, tuple[int, int, bytes]] = {}
+        self.storage: dict[tuple[bytes, int], int] = {}
+        self.stats = {"account_fetches": 0, "storage_fetches": 0, "hits": 0}
+        self._stats_lock = threading.Lock()
+        self.header = source.get_block()
+        self.chain_id = source.get_chain_id()
+
+    def account(self, address: bytes) -> tuple[int, int, bytes]:
+        cached = self.accounts.get(address)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("account_fetches")
+        value = self.source.get_account(Web3.to_checksum_address(address))
+        self.accounts[address] = value
+        return value
+
+    def storage_at(self, address: bytes, slot: int) -> int:
+        key = (address, slot)
+        cached = self.storage.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("storage_fetches")
+        value = self.source.get_storage(Web3.to_checksum_address(address), slot)
+        self.storage[key] = value
+        return value
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def get_stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def execution_context(self) -> "ExecutionContext":
+        """Context of the block after the fork block, like a pending-block eth_call"""
+        header = self.header
+        coinbase = header.get("miner") or header.get("coinbase") or ZERO_ADDRESS
+        mix_hash = header.get("mixHash") or header.get("prevRandao") or b"\x00" * 32
+        if isinstance(mix_hash, str):
+            mix_hash = bytes.fromhex(mix_hash.removeprefix("0x"))
+        return ExecutionContext(
+            coinbase=bytes.fromhex(str(coinbase).removeprefix("0x")),
+            timestamp=int(header["timestamp"]) + 12,
+            block_number=int(header["number"]) + 1,
+            difficulty=0,
+            mix_hash=bytes(mix_hash),
+            gas_limit=int(header["gasLimit"]),
+            prev_hashes=(),
+            chain_id=self.chain_id,
+            # Like eth_call: no base fee, so zero-gas-price calls are valid
+            base_fee_per_gas=0,
+            excess_blob_gas=0,
+        )
+
+
+class _ForkDB(AtomicDB):
+    """Backing DB of one simulation; carries the shared snapshot to the account DB"""
+
+    def __init__(self, fork: ForkSnapshot):
+        super().__init__()
+        self.fork = fork
+
+
+class _ForkStorageLookup:
+    """Storage trie lookup that falls back to the fork for slots never written"""
+
+    def __init__(self, lookup: Any, fork: ForkSnapshot, address: bytes):
+        self._lookup = lookup
+        self._fork = fork
+        self._address = address
+
+    def __getitem__(self, key: bytes) -> bytes:
+        try:
+            # The trie answers b"" for keys it does not hold
+            encoded = self._lookup[key]
+            if encoded:
+                return encoded
+        except KeyError:
+            pass
+        value = self._fork.storage_at(self._address, int.from_bytes(key, "big"))
+        if not value:
+            raise KeyError(key)
+        return rlp.encode(value)
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._lookup[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        del self._lookup[key]
+
+    def __contains__(self, key: bytes) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+
+class _ForkStorageDB(AccountStorageDB):
+    """Account storage whose unwritten slots come from the fork"""
+
+    def __init__(self, db: Any, storage_root: bytes, address: bytes, fork: ForkSnapshot):
+        super().__init__(db, storage_root, address)
+        # Same layering as AccountStorageDB, with the fork under the trie cache.
+        # A storage wipe clears the journal, which hides the fork as well.
+        self._storage_cache = CacheDB(_ForkStorageLookup(self._storage_lookup, fork, address))
+        self._locked_changes = JournalDB(self._storage_cache)
+        self._journal_storage = JournalDB(self._locked_changes)
+
+
+class ForkAccountDB(AccountDB):
+    """
+    AccountDB that loads accounts, code and storage from a ``ForkSnapshot`` on
+    first access. Fork data is written below the journals, so reverting a call
+    frame never unloads it. State roots are not meaningful on a fork.
+    """
+
+    def __init__(self, db: Any, state_root: bytes = b""):
+        super().__init__(db, state_root or BLANK_ROOT_HASH)
+        self._fork: ForkSnapshot = db.fork
+        self._loaded: set[bytes] = set()
+        self.touched: set[bytes] = set()
+        # (address, slot) -> value before its first write in the current transaction
+        self.storage_writes: dict[tuple[bytes, int], int] = {}
+
+    def _load(self, address: bytes) -> None:
+        self._loaded.add(address)
+        balance, nonce, code = self._fork.account(address)
+        if not (balance or nonce or code):
+            return
+        code_hash = keccak(code) if code else EMPTY_SHA3
+        if code:
+            self._batchdb[code_hash] = code
+        self._trie_cache[address] = rlp.encode(
+            Account(nonce=nonce, balance=balance, storage_root=BLANK_ROOT_HASH, code_hash=code_hash),
+            sedes=Account,
+        )
+
+    def _get_encoded_account(self, address: bytes, from_journal: bool = True) -> bytes:
+        if address not in self._loaded:
+            self._load(address)
+        self.touched.add(address)
+        return super()._get_encoded_account(address, from_journal)
+
+    def set_storage(self, address: bytes, slot: int, value: int) -> None:
+        key = (address, slot)
+        if key not in self.storage_writes:
+            self.storage_writes[key] = self.get_storage(address, slot)
+        super().set_storage(address, slot, value)
+
+    def _get_address_store(self, address: bytes) -> Any:
+        if address not in self._account_stores:
+            self._account_stores[address] = _ForkStorageDB(
+                self._raw_store_db, self._get_storage_root(address), address, self._fork
+            )
+        return self._account_stores[address]
+
+
+class LocalEVMBackend:
+    """
+    Runs simulations on an in-process EVM forked from ``web3`` (or a stand-in
+    ``StateSource``). Fork snapshots are cached per block and shared, so many
+    simulations against the same block run concurrently and each account or
+    slot is fetched once.
+
+    Simulations run on a thread pool. py-evm is pure Python, so execution
+    itself is serialized by the GIL: the workers overlap the state fetches
+    (RPC round trips release the GIL), not EVM execution. A process pool would
+    have to copy the warmed snapshot into every worker and give up the shared
+    cache, which costs more than it saves for lazily loaded forks.
+    """
+
+    def __init__(
+        self,
+        web3: Web3 | None = None,
+        state_source: StateSource | None = None,
+        evm_fork: str = "prague",
+        max_snapshots: int = 4,
+        max_workers: int | None = None,
+        latest_block_ttl: float = 2.0,
+        gas_limit: int = 30_000_000,
+    ):
+        if not PY_EVM_AVAILABLE:
+            raise RuntimeError("py-evm is required for the local EVM simulator (pip install py-evm)")
+        if web3 is None and state_source is None:
+            raise ValueError("LocalEVMBackend needs a web3 connection or a state source")
+        if evm_fork not in EVM_FORKS:
+            raise ValueError(f"Unsupported EVM fork: {evm_fork}")
+
+        self.web3 = web3
+        self.state_source = state_source
+        self.gas_limit = gas_limit
+        self.max_snapshots = max_snapshots
+        self.latest_block_ttl = latest_block_ttl
+
+        vm_class = EVM_FORKS[evm_fork]
+        self._state_class = type(
+            f"Fork{vm_class.get_state_class().__name__}",
+            (vm_class.get_state_class(),),
+            {"account_db_class": ForkAccountDB},
+        )
+        self._transaction_builder = vm_class.get_transaction_builder()
+
+        self._snapshots: OrderedDict[int, ForkSnapshot] = OrderedDict()
+        self._snapshot_lock = threading.Lock()
+        self._latest_block: tuple[float, int] | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4),
+            thread_name_prefix="local-evm",
+        )
+        self.stats = {"simulations": 0, "reverted": 0, "snapshots_created": 0}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Fork snapshots
+    # ------------------------------------------------------------------
+
+    def _resolve_block(self, block_number: int | None) -> int:
+        if block_number is not None:
+            return block_number
+        if self.state_source is not None:
+            return int(self.state_source.get_block()["number"])
+        now = time.monotonic()
+        if self._latest_block and now - self._latest_block[0] < self.latest_block_ttl:
+            return self._latest_block[1]
+        latest = self.web3.eth.block_number
+        self._latest_block = (now, latest)
+        return latest
+
+    def get_snapshot(self, block_number: int | None = None) -> ForkSnapshot:
+        """Shared fork snapshot for a block (latest by default)"""
+        block_number = self._resolve_block(block_number)
+        with self._snapshot_lock:
+            snapshot = self._snapshots.get(block_number)
+            if snapshot is not None:
+                self._snapshots.move_to_end(block_number)
+                return snapshot
+
+        source = self.state_source or Web3StateSource(self.web3, block_number)
+        snapshot = ForkSnapshot(source, block_number)
+        with self._snapshot_lock:
+            # Another thread may have built it meanwhile; keep the first one
+            snapshot = self._snapshots.setdefault(block_number, snapshot)
+            self._snapshots.move_to_end(block_number)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        self._count("snapshots_created")
+        return snapshot
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def simulate(
+        self, transaction: dict[str, Any], block_number: int | None = None
+    ) -> dict[str, Any]:
+        """Execute ``transaction`` on the fork without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.execute, transaction, block_number)
+
+    async def simulate_bundle(
+        self, transactions: list[dict[str, Any]], block_number: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Execute an ordered bundle on one overlay without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.execute_bundle, transactions, block_number
+        )
+
+    async def simulate_bundles(
+        self, bundles: list[list[dict[str, Any]]], block_number: int | None = None
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Independent bundles (e.g. what-if variants) run on the workers, all
+        pinned to one block so they share a warmed snapshot. Their state
+        fetches overlap; their EVM execution does not (see the class docstring)
+        """
+        if not bundles:
+            return []
+        loop = asyncio.get_running_loop()
+        block = await loop.run_in_executor(self._executor, self._resolve_block, block_number)
+        # The first bundle warms the snapshot, so the rest don't race to fetch the same state
+        first = await self.simulate_bundle(bundles[0], block)
+        rest = await asyncio.gather(*(self.simulate_bundle(bundle, block) for bundle in bundles[1:]))
+        return [first, *rest]
+
+    async def simulate_many(
+        self, transactions: list[dict[str, Any]], block_number: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Independent simulations of each transaction against one shared snapshot"""
+        loop = asyncio.get_running_loop()
+        block = await loop.run_in_executor(self._executor, self._resolve_block, block_number)
+        return list(
+            await asyncio.gather(*(self.simulate(transaction, block) for transaction in transactions))
+        )
+
+    def execute(self, transaction: dict[str, Any], block_number: int | None = None) -> dict[str, Any]:
+        """Synchronously run one transaction on a fresh overlay of the block's snapshot"""
+        snapshot = self.get_snapshot(block_number)
+        state = self._state_class(_ForkDB(snapshot), snapshot.execution_context(), BLANK_ROOT_HASH)
+        account_db: ForkAccountDB = state._account_db
+        return self._apply(state, account_db, snapshot, transaction)
+
+    def execute_bundle(
+        self, transactions: list[dict[str, Any]], block_number: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Run transactions in order on one overlay, each seeing the previous ones' effects"""
+        snapshot = self.get_snapshot(block_number)
+        state = self._state_class(_ForkDB(snapshot), snapshot.execution_context(), BLANK_ROOT_HASH)
+        account_db: ForkAccountDB = state._account_db
+        return [self._apply(state, account_db, snapshot, transaction) for transaction in transactions]
+
+    def _apply(
+        self,
+        state: Any,
+        account_db: "ForkAccountDB",
+        snapshot: ForkSnapshot,
+        transaction: dict[str, Any],
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        result: dict[str, Any] = {
+            "success": False,
+            "gas_used": 0,
+            "gas_price": 0,
+            "logs": [],
+            "balance_changes": {},
+            "token_transfers": [],
+            "approvals": [],
+            "return_data": "0x",
+            "state_diff": {},
+            "error": None,
+            "block_number": snapshot.block_number,
+        }
+        self._count("simulations")
+
+        signed = None
+        if transaction.get("raw"):
+            try:
+                signed = self._transaction_builder.decode(_to_bytes(transaction["raw"]))
+                transaction = self._decode_raw_transaction(signed)
+            except Exception as e:
+                result["error"] = f"Invalid raw transaction: {e}"
+                result["execution_time"] = time.perf_counter() - started
+                return result
+        sender = _to_bytes_address(transaction.get("from") or ZERO_ADDRESS)
+        to = transaction.get("to")
+        gas = min(_to_int(transaction.get("gas")) or self.gas_limit, state.gas_limit)
+        result["gas_price"] = _to_int(transaction.get("gasPrice") or transaction.get("maxFeePerGas"))
+
+        if signed is not None:
+            # A signed transaction only lands as signed, so check it like a node would
+            error = self._validate_signed_transaction(state, snapshot, signed, sender)
+            if error:
+                result["error"] = error
+                result["execution_time"] = time.perf_counter() - started
+                return result
+
+        # Balances and nonces as this transaction found them; accounts first
+        # touched by it start from the fork value
+        accounts_before = {
+            address: (state.get_balance(address), state.get_nonce(address))
+            for address in account_db.touched
+        }
+        account_db.storage_writes = {}
+
+        if signed is not None:
+            # Runs with its signed nonce and gas, and pays its fee from the sender
+            gas = signed.gas
+            executable = signed
+        else:
+            # Gas is free (eth_call semantics); the reported gas price only feeds cost estimates
+            unsigned = self._transaction_builder.create_unsigned_transaction(
+                nonce=state.get_nonce(sender),
+                gas_price=0,
+                gas=gas,
+                to=_to_bytes_address(to) if to else b"",
+                value=_to_int(transaction.get("value")),
+                data=_to_bytes(transaction.get("data") or transaction.get("input")),
+            )
+            executable = SpoofTransaction(unsigned, from_=sender)
+        try:
+            computation = state.apply_transaction(executable)
+        except Exception as e:
+            # Rejected before execution, e.g. value above the sender's balance
+            result["error"] = str(e) or type(e).__name__
+            result["execution_time"] = time.perf_counter() - started
+            return result
+        state.lock_changes()
+
+        gas_used = gas - computation.get_gas_remaining()
+        gas_used -= min(computation.get_gas_refund(), gas_used // 5)
+        gas_used += getattr(computation, "data_floor_gas", 0)
+
+        logs = [
+            {
+                "address": Web3.to_checksum_address(address),
+                "topics": ["0x" + topic.to_bytes(32, "big").hex() for topic in topics],
+                "data": "0x" + data.hex(),
+                "block_number": snapshot.block_number + 1,
+                "log_index": index,
+            }
+            for index, (address, topics, data) in enumerate(computation.get_log_entries())
+        ]
+        state_diff = result["state_diff"]
+        for address in account_db.touched:
+            balance_before, nonce_before = accounts_before.get(address) or snapshot.account(address)[:2]
+            balance, nonce = state.get_balance(address), state.get_nonce(address)
+            checksum = Web3.to_checksum_address(address)
+            if balance != balance_before:
+                result["balance_changes"][checksum] = str(balance - balance_before)
+                state_diff.setdefault(checksum, {})["balance"] = {
+                    "from": str(balance_before),
+                    "to": str(balance),
+                }
+            if nonce != nonce_before:
+                state_diff.setdefault(checksum, {})["nonce"] = {"from": nonce_before, "to": nonce}
+        # Writes undone by a revert end where they started and drop out here
+        for (address, slot), before in account_db.storage_writes.items():
+            after = state.get_storage(address, slot)
+            if after != before:
+                storage = state_diff.setdefault(Web3.to_checksum_address(address), {}).setdefault(
+                    "storage", {}
+                )
+                storage["0x" + slot.to_bytes(32, "big").hex()] = {
+                    "from": "0x" + before.to_bytes(32, "big").hex(),
+                    "to": "0x" + after.to_bytes(32, "big").hex(),
+                }
+
+        if computation.is_error:
+            self._count("reverted")
+            result["error"] = _describe_error(computation)
+        result.update(
+            success=computation.is_success,
+            gas_used=gas_used,
+            logs=logs,
+            token_transfers=[_decode_token_event(log) for log in logs if _is_event(log, TRANSFER_TOPIC)],
+            approvals=[_decode_token_event(log) for log in logs if _is_event(log, APPROVAL_TOPIC)],
+            return_data="0x" + bytes(computation.output).hex(),
+            execution_time=time.perf_counter() - started,
+        )
+        return result
+
+    def _decode_raw_transaction(self, signed: Any) -> dict[str, Any]:
+        """Fields of a signed transaction (as relayed in bundles), sender recovered"""
+        return {
+            "from": Web3.to_checksum_address(signed.sender),
+            "to": Web3.to_checksum_address(signed.to) if signed.to else None,
+            "value": signed.value,
+            "gas": signed.gas,
+            "gasPrice": _max_fee_per_gas(signed),
+            "data": signed.data,
+            "nonce": signed.nonce,
+            "chainId": signed.chain_id,
+        }
+
+    @staticmethod
+    def _validate_signed_transaction(
+        state: Any, snapshot: ForkSnapshot, signed: Any, sender: bytes
+    ) -> str | None:
+        """Why a node would reject ``signed`` on top of ``state``, or None"""
+        # Pre-EIP-155 legacy transactions carry no chain id
+        if signed.chain_id is not None and signed.chain_id != snapshot.chain_id:
+            return f"invalid chain id: signed for {signed.chain_id}, fork is {snapshot.chain_id}"
+        nonce = state.get_nonce(sender)
+        if signed.nonce < nonce:
+            return f"nonce too low: next nonce {nonce}, tx nonce {signed.nonce}"
+        if signed.nonce > nonce:
+            return f"nonce too high: next nonce {nonce}, tx nonce {signed.nonce}"
+        balance = state.get_balance(sender)
+        cost = signed.gas * _max_fee_per_gas(signed) + signed.value
+        if balance < cost:
+            return f"insufficient funds for gas * price + value: balance {balance}, tx cost {cost}"
+        return None
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._snapshot_lock:
+            snapshots = {block: snapshot.get_stats() for block, snapshot in self._snapshots.items()}
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {**stats, "snapshots": snapshots}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._snapshot_lock:
+            self._snapshots.clear()
+
+
+def _to_int(value: Any) -> int:
+    if value is None or value == "":
+        return 0
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value)
+    return int(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if not value:
+        return b""
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x"))
+    return bytes(value)
+
+
+def _max_fee_per_gas(signed: Any) -> int:
+    """Most a signed transaction can pay per gas, for legacy and typed transactions"""
+    max_fee = getattr(signed, "max_fee_per_gas", None)
+    return max_fee if max_fee is not None else signed.gas_price
+
+
+def _to_bytes_address(address: Any) -> bytes:
+    return bytes.fromhex(Web3.to_checksum_address(address)[2:])
+
+
+def _is_event(log: dict[str, Any], topic: str) -> bool:
+    return len(log["topics"]) >= 3 and log["topics"][0] == topic
+
+
+def _decode_token_event(log: dict[str, Any]) -> dict[str, Any]:
+    """ERC-20 Transfer/Approval: value in data; ERC-721 carries the token id as topic 3"""
+    topics = log["topics"]
+    value = topics[3] if len(topics) > 3 else log["data"]
+    return {
+        "contract_address": log["address"],
+        "from": Web3.to_checksum_address("0x" + topics[1][-40:]),
+        "to": Web3.to_checksum_address("0x" + topics[2][-40:]),
+        "value": str(int(value, 16)) if value not in ("0x", "") else "0",
+        "block_number": log["block_number"],
+    }
+
+
+def _describe_error(computation: Any) -> str:
+    output = bytes(computation.output or b"")
+    if output.startswith(REVERT_SELECTOR) and len(output) >= 68:
+        length = int.from_bytes(output[36:68], "big")
+        reason = output[68 : 68 + length].decode("utf-8", errors="replace")
+        return f"execution reverted: {reason}"
+    if type(computation.error).__name__ == "Revert":
+        return "execution reverted"
+    return str(computation.error) or type(computation.error).__name__
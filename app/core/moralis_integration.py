@@ -14,6 +14,8 @@ import httpx
 import structlog
 from config.settings import Settings
 
+from app.core.price_oracle import get_price_oracle
+
 logger = structlog.get_logger(__name__)
 
 
@@ -109,6 +111,18 @@ class MoralisAPI:
             "base": "base",
             "polygon_zkevm": "polygon-zkevm"
         }
+
+        # Native gas token per network, priced from the price oracle
+        self.native_symbols = {
+            "ethereum": "ETH",
+            "polygon": "MATIC",
+            "bsc": "BNB",
+            "arbitrum": "ETH",
+            "optimism": "ETH",
+            "avalanche": "AVAX",
+            "base": "ETH",
+            "polygon_zkevm": "ETH"
+        }
         
         logger.info("Moralis API client initialized", api_key_present=bool(self.api_key))
     
@@ -360,18 +374,26 @@ class MoralisAPI:
             address, network, limit=1
         )
         
-        # Calculate USD balance (simplified)
+        # Calculate USD balance from the price oracle snapshot (no upstream calls)
+        oracle = get_price_oracle()
         usd_balance = 0.0
         try:
             # Add native token value if available
             native_balance_wei = native_data.get("balance", "0")
             # Convert from wei to ETH (18 decimals)
             native_balance_formatted = float(native_balance_wei) / (10**18)
-            # Note: Would need price data for accurate USD conversion
-            usd_balance += native_balance_formatted * 2000  # Rough ETH estimate
+            native_price = oracle.get_price_usd(self.native_symbols.get(network, "ETH"))
+            if native_price:
+                usd_balance += native_balance_formatted * native_price
             
-            # Add token values
+            # Add token values; priced by contract address, since symbols are
+            # not unique and any token can claim a well-known one
+            chain = self._map_network(network)
             for token in token_balances:
+                if token.usd_value is None and token.token_address:
+                    token_price = oracle.get_token_price_usd(chain, token.token_address)
+                    if token_price:
+                        token.usd_value = float(token.balance_formatted or 0) * token_price
                 if token.usd_value:
                     usd_balance += token.usd_value
         except (ValueError, TypeError):
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+In-process token price oracle.
+
+A background task refreshes the tracked symbol universe on a schedule with the
+batch price endpoints in ``provider_clients`` and publishes the result as an
+immutable snapshot. Readers look symbols up in the current snapshot without
+locking or upstream calls; a refresh builds a new dict and swaps the reference.
+Changed prices are pushed to subscriber queues (see the market data WebSocket).
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from app.core.provider_clients import (
+    COINGECKO_TOKEN_IDS,
+    MORALIS_API_KEY,
+    TOKEN_METADATA,
+    _mock_token_price,
+    fetch_token_prices_batch_async,
+)
+
+logger = structlog.get_logger(__name__)
+
+PRICE_REFRESH_INTERVAL_SECONDS = float(os.getenv("PRICE_REFRESH_INTERVAL_SECONDS", "15"))
+PRICE_STALE_AFTER_SECONDS = float(os.getenv("PRICE_STALE_AFTER_SECONDS", "60"))
+PRICE_ORACLE_MAX_SYMBOLS = int(os.getenv("PRICE_ORACLE_MAX_SYMBOLS", "256"))
+
+# Symbols some batch provider can actually price
+PRICEABLE_SYMBOLS = frozenset({*TOKEN_METADATA, *COINGECKO_TOKEN_IDS})
+
+# TOKEN_METADATA chain ids that differ from the Moralis chain names used elsewhere
+_CHAIN_ALIASES = {"arb1": "arbitrum", "matic": "polygon"}
+
+
+def _chain_key(chain: str) -> str:
+    chain = chain.lower()
+    return _CHAIN_ALIASES.get(chain, chain)
+
+
+class PriceOracle:
+    """
+    Scheduled batch price refresher with a lock-free snapshot.
+
+    Snapshot entries are ``asdict(TokenPrice)`` plus ``fetched_at``; they are
+    never mutated after publication, so concurrent readers always see a
+    consistent entry. Requested symbols that a provider can price are added
+    to the universe (up to ``max_symbols``) and priced on demand once; other
+    symbols are ignored rather than tracked with a mock price.
+
+    ``get_price_usd`` and ``get_token_price_usd`` only return real, fresh
+    prices, so callers valuing balances never pick up a mock or stale entry.
+    """
+
+    def __init__(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        refresh_interval: float = PRICE_REFRESH_INTERVAL_SECONDS,
+        stale_after: float = PRICE_STALE_AFTER_SECONDS,
+        subscriber_queue_size: int = 32,
+        max_symbols: int = PRICE_ORACLE_MAX_SYMBOLS,
+    ):
+        self.refresh_interval = refresh_interval
+        self.stale_after = stale_after
+        self.subscriber_queue_size = subscriber_queue_size
+        self.max_symbols = max_symbols
+
+        self._symbols: Set[str] = {
+            s.upper() for s in (symbols or [*TOKEN_METADATA, *COINGECKO_TOKEN_IDS])
+        }
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._symbol_by_token: Dict[Tuple[str, str], str] = {
+            (_chain_key(meta["chain"]), meta["address"].lower()): symbol
+            for symbol, meta in TOKEN_METADATA.items()
+        }
+        self._rate_limit: Dict[str, Any] = {}
+        self._last_refresh: Optional[float] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+        self.stats = {"refreshes": 0, "refresh_failures": 0, "on_demand_fetches": 0, "published": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info("Price oracle started", symbols=len(self._symbols), interval=self.refresh_interval)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.stats["refresh_failures"] += 1
+                logger.error("Price oracle refresh failed", error=str(exc))
+            await asyncio.sleep(self.refresh_interval)
+
+    # ------------------------------------------------------------------
+    # Refreshing
+    # ------------------------------------------------------------------
+
+    def track(self, symbols: Iterable[str]) -> None:
+        """Add priceable symbols to the refreshed universe, up to ``max_symbols``."""
+        for symbol in symbols:
+            symbol = symbol.upper()
+            if symbol in self._symbols or symbol not in PRICEABLE_SYMBOLS:
+                continue
+            if len(self._symbols) >= self.max_symbols:
+                logger.warning("Price oracle symbol cap reached", max_symbols=self.max_symbols)
+                return
+            self._symbols.add(symbol)
+
+    async def refresh(self, symbols: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch ``symbols`` (default: the whole universe) and publish a new
+        snapshot. Returns the entries whose price changed.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            wanted = sorted(symbols if symbols is not None else self._symbols)
+            prices, rate_limit = await fetch_token_prices_batch_async(wanted)
+            fetched_at = time.time()
+
+            snapshot = dict(self._snapshot)
+            changed = []
+            for symbol in wanted:
+                price = prices.get(symbol)
+                if price is None:
+                    if symbol in snapshot:
+                        # Keep the last real price; its age exposes the staleness
+                        continue
+                    price = _mock_token_price(symbol)
+                entry = {**asdict(price), "fetched_at": fetched_at}
+                previous = snapshot.get(symbol)
+                snapshot[symbol] = entry
+                if previous is None or previous["price_usd"] != entry["price_usd"]:
+                    changed.append(entry)
+
+            self._snapshot = snapshot
+            if rate_limit:
+                self._rate_limit = rate_limit
+            self._last_refresh = fetched_at
+            self.stats["refreshes"] += 1
+
+        if changed:
+            self._publish(changed)
+        return changed
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _with_staleness(self, entry: Dict[str, Any], now: float) -> Dict[str, Any]:
+        age = now - entry["fetched_at"]
+        return {**entry, "age_seconds": round(age, 3), "stale": age > self.stale_after}
+
+    def get_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Snapshot entry for one symbol with age and staleness, or None."""
+        entry = self._snapshot.get(symbol.upper())
+        if entry is None:
+            return None
+        return self._with_staleness(entry, time.time())
+
+    def get_price_usd(self, symbol: str) -> Optional[float]:
+        """Real, fresh USD price of a symbol; None for unknown, mock or stale entries."""
+        entry = self._snapshot.get(symbol.upper())
+        if entry is None or entry["status"] == "fallback_mock":
+            return None
+        if time.time() - entry["fetched_at"] > self.stale_after:
+            return None
+        return entry["price_usd"]
+
+    def get_token_price_usd(self, chain: str, token_address: str) -> Optional[float]:
+        """``get_price_usd`` for the token at ``token_address`` on ``chain`` (Moralis chain name)."""
+        symbol = self._symbol_by_token.get((_chain_key(chain), token_address.lower()))
+        return self.get_price_usd(symbol) if symbol else None
+
+    async def get_prices(self, token_symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Prices in the ``get_token_prices`` response shape, served from the
+        snapshot. Priceable symbols not yet tracked are fetched once and
+        tracked from then on; symbols no provider knows are left out.
+        """
+        symbols = [s.upper() for s in (token_symbols or sorted(self._symbols))]
+        self.track(s for s in symbols if s not in self._symbols)
+        symbols = [s for s in symbols if s in self._symbols]
+        missing = [s for s in symbols if s not in self._snapshot]
+        if missing:
+            self.stats["on_demand_fetches"] += 1
+            await self.refresh(missing)
+
+        snapshot, now = self._snapshot, time.time()
+        tokens = [self._with_staleness(snapshot[s], now) for s in symbols if s in snapshot]
+        return {
+            "tokens": tokens,
+            "rate_limit": dict(self._rate_limit) or None,
+            "live": bool(MORALIS_API_KEY),
+            "as_of": self._last_refresh,
+            "stale": any(t["stale"] for t in tokens),
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "tracked_symbols": len(self._symbols),
+            "priced_symbols": len(self._snapshot),
+            "last_refresh": self._last_refresh,
+            "refresh_interval": self.refresh_interval,
+            "subscribers": len(self._subscribers),
+            **self.stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Push updates
+    # ------------------------------------------------------------------
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving lists of changed entries after each refresh."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _publish(self, changed: List[Dict[str, Any]]) -> None:
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Slow consumer: drop its oldest update rather than block refreshes
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(changed)
+        self.stats["published"] += 1
+
+
+_price_oracle: Optional[PriceOracle] = None
+
+
+def get_price_oracle() -> PriceOracle:
+    """Process-wide price oracle instance."""
+    global _price_oracle
+    if _price_oracle is None:
+        _price_oracle = PriceOracle()
+    return _price_oracle
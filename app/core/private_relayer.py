@@ -54,6 +54,8 @@ class RelayBundle:
     submitted_at: Optional[datetime] = None
     confirmed_at: Optional[datetime] = None
     network: str = "ethereum"
+    error: Optional[str] = None
+    simulation: Optional[dict[str, Any]] = None
 
 
 class PrivateRelayer:
@@ -71,6 +73,8 @@ class PrivateRelayer:
             "polygon": "https://rpc.polygon.technology",
             "arbitrum": "https://arb1.arbitrum.io/rpc",
         }
+        # network -> engine with simulate_bundle (local EVM), used to pre-validate bundles
+        self.bundle_simulators: dict[str, Any] = {}
         self.is_running = False
         self._initialize_providers()
 
@@ -160,6 +164,7 @@ class PrivateRelayer:
         transactions: list[dict[str, Any]],
         network: str = "ethereum",
         target_block: Optional[int] = None,
+        simulate: bool = True,
     ) -> RelayBundle:
         """
         Relay multiple transactions as a bundle
@@ -168,6 +173,7 @@ class PrivateRelayer:
             transactions: List of transactions
             network: Blockchain network
             target_block: Target block number (optional)
+            simulate: Simulate the bundle first and do not relay it if a transaction fails
 
         Returns:
             RelayBundle object
@@ -196,6 +202,27 @@ class PrivateRelayer:
 
             self.bundles[bundle_id] = bundle
 
+            simulator = self.bundle_simulators.get(network)
+            if simulate and simulator is not None:
+                simulation = await simulator.simulate_bundle(transactions)
+                bundle.simulation = {
+                    "success": simulation.success,
+                    "block_number": simulation.block_number,
+                    "gas_used": simulation.gas_used,
+                    "failed_index": simulation.failed_index,
+                    "error": simulation.error,
+                    "balance_changes": simulation.balance_changes,
+                }
+                # Only a transaction that actually failed blocks the bundle;
+                # a simulator that could not run does not
+                if simulation.failed_index is not None:
+                    bundle.status = RelayStatus.FAILED
+                    bundle.error = (
+                        f"Transaction {simulation.failed_index} failed in simulation: {simulation.error}"
+                    )
+                    logger.warning("Bundle rejected by simulation", bundle_id=bundle_id, error=bundle.error)
+                    return bundle
+
             # Relay bundle
             if network == "ethereum":
                 result = await self._relay_bundle_flashbots(bundle)
@@ -208,6 +235,7 @@ class PrivateRelayer:
                 logger.info("Bundle relayed", bundle_id=bundle_id, network=network)
             else:
                 bundle.status = RelayStatus.FAILED
+                bundle.error = result.get("error")
                 logger.error("Bundle relay failed", bundle_id=bundle_id, error=result.get("error"))
 
             return bundle
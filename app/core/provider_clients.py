@@ -8,11 +8,13 @@ module. Real API keys are read from the environment (see example.env).
 
 from __future__ import annotations
 
+import asyncio
 import os
 import random
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from decimal import Decimal, ROUND_DOWN
 
 import httpx
@@ -177,57 +179,64 @@ def _extract_rate_limit_headers(headers: Optional[Dict[str, str]]) -> Dict[str,
     return normalized
 
 
+# CoinGecko token ID mapping
+COINGECKO_TOKEN_IDS = {
+    'ETH': 'ethereum',
+    'USDC': 'usd-coin',
+    'USDT': 'tether',
+    'ARB': 'arbitrum',
+    'UNI': 'uniswap',
+    'MATIC': 'matic-network',
+    'BNB': 'binancecoin',
+    'WBTC': 'wrapped-bitcoin',
+}
+COINGECKO_PRICE_ENDPOINT = "https://api.coingecko.com/api/v3/simple/price"
+
+
+def _coingecko_params(token_id: str) -> Dict[str, str]:
+    return {
+        "ids": token_id,
+        "vs_currencies": "usd",
+        "include_24hr_change": "true",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true"
+    }
+
+
+def _parse_coingecko_price(symbol: str, token_id: str, data: Dict[str, Any]) -> TokenPrice | None:
+    if token_id not in data:
+        return None
+    token_data = data[token_id]
+    meta = TOKEN_METADATA.get(symbol, {"address": "unknown", "chain": MORALIS_DEFAULT_CHAIN, "decimals": 18})
+    return TokenPrice(
+        symbol=symbol,
+        address=meta.get("address", "unknown"),
+        chain=meta.get("chain", MORALIS_DEFAULT_CHAIN),
+        price_usd=float(token_data.get("usd", 0)),
+        price_native=float(token_data.get("usd", 0)),
+        percent_change_24h=float(token_data.get("usd_24h_change", 0)),
+        liquidity_usd=float(token_data.get("usd_24h_vol", 0)),
+        last_updated=int(time.time()),
+        status="coingecko",
+    )
+
+
 def _fetch_token_price_from_coingecko(symbol: str) -> TokenPrice | None:
     """Fetch token price from CoinGecko API as fallback (synchronous)"""
     try:
-        # CoinGecko token ID mapping
-        token_id_map = {
-            'ETH': 'ethereum',
-            'USDC': 'usd-coin',
-            'USDT': 'tether',
-            'ARB': 'arbitrum',
-            'UNI': 'uniswap',
-            'MATIC': 'matic-network',
-            'BNB': 'binancecoin',
-            'WBTC': 'wrapped-bitcoin',
-        }
-        
-        token_id = token_id_map.get(symbol.upper())
+        token_id = COINGECKO_TOKEN_IDS.get(symbol.upper())
         if not token_id:
             return None
-        
+
         # Use synchronous httpx client
         with httpx.Client(timeout=5.0) as client:
-            response = client.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={
-                    "ids": token_id,
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true",
-                    "include_market_cap": "true",
-                    "include_24hr_vol": "true"
-                }
-            )
-            
+            response = client.get(COINGECKO_PRICE_ENDPOINT, params=_coingecko_params(token_id))
+
             if response.status_code == 200:
-                data = response.json()
-                if token_id in data:
-                    token_data = data[token_id]
-                    meta = TOKEN_METADATA.get(symbol, {"address": "unknown", "chain": MORALIS_DEFAULT_CHAIN, "decimals": 18})
-                    return TokenPrice(
-                        symbol=symbol,
-                        address=meta.get("address", "unknown"),
-                        chain=meta.get("chain", MORALIS_DEFAULT_CHAIN),
-                        price_usd=float(token_data.get("usd", 0)),
-                        price_native=float(token_data.get("usd", 0)),
-                        percent_change_24h=float(token_data.get("usd_24h_change", 0)),
-                        liquidity_usd=float(token_data.get("usd_24h_vol", 0)),
-                        last_updated=int(time.time()),
-                        status="coingecko",
-                    )
+                return _parse_coingecko_price(symbol, token_id, response.json())
     except Exception as e:
         logger.warning(f"Failed to fetch price from CoinGecko for {symbol}: {e}")
-    
+
     return None
 
 
@@ -380,13 +389,13 @@ def _format_protocols(protocols: List[Any]) -> List[str]:
     return names
 
 
-def _fetch_1inch_route(
+def _1inch_request(
     api_key: str,
     from_token: str,
     to_token: str,
     amount_in: float,
     slippage_percent: float,
-) -> Optional[SwapRoute]:
+) -> Optional[Tuple[str, Dict[str, Any], Dict[str, str]]]:
     src_meta = ERC20_METADATA.get(from_token)
     dst_meta = ERC20_METADATA.get(to_token)
     if not src_meta or not dst_meta:
@@ -406,12 +415,17 @@ def _fetch_1inch_route(
         "slippage": str(slippage_percent),
     }
     url = f"https://api.1inch.dev/swap/v5.2/{CHAIN_ID}/quote"
+    return url, params, headers
 
-    with httpx.Client(timeout=10) as client:
-        response = client.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        quote = response.json()
 
+def _parse_1inch_quote(
+    quote: Dict[str, Any],
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+) -> Optional[SwapRoute]:
+    dst_meta = ERC20_METADATA[to_token]
     to_amount = quote.get("toAmount") or quote.get("dstAmount")
     if not to_amount:
         return None
@@ -441,13 +455,32 @@ def _fetch_1inch_route(
     )
 
 
-def _fetch_paraswap_route(
+def _fetch_1inch_route(
     api_key: str,
     from_token: str,
     to_token: str,
     amount_in: float,
     slippage_percent: float,
 ) -> Optional[SwapRoute]:
+    request = _1inch_request(api_key, from_token, to_token, amount_in, slippage_percent)
+    if request is None:
+        return None
+    url, params, headers = request
+
+    with httpx.Client(timeout=10) as client:
+        response = client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        quote = response.json()
+
+    return _parse_1inch_quote(quote, from_token, to_token, amount_in, slippage_percent)
+
+
+def _paraswap_request(
+    api_key: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> Optional[Tuple[str, Dict[str, Any], Dict[str, str]]]:
     src_meta = ERC20_METADATA.get(from_token)
     dst_meta = ERC20_METADATA.get(to_token)
     if not src_meta or not dst_meta:
@@ -471,12 +504,17 @@ def _fetch_paraswap_route(
     }
 
     url = f"https://apiv5.paraswap.io/prices/"
+    return url, params, headers
 
-    with httpx.Client(timeout=10) as client:
-        response = client.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        quote = response.json()
 
+def _parse_paraswap_quote(
+    quote: Dict[str, Any],
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+) -> Optional[SwapRoute]:
+    dst_meta = ERC20_METADATA[to_token]
     price_route = quote.get("priceRoute") or {}
     if not price_route:
         return None
@@ -512,6 +550,65 @@ def _fetch_paraswap_route(
     )
 
 
+def _fetch_paraswap_route(
+    api_key: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+) -> Optional[SwapRoute]:
+    request = _paraswap_request(api_key, from_token, to_token, amount_in)
+    if request is None:
+        return None
+    url, params, headers = request
+
+    with httpx.Client(timeout=10) as client:
+        response = client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        quote = response.json()
+
+    return _parse_paraswap_quote(quote, from_token, to_token, amount_in, slippage_percent)
+
+
+def _mock_dex_route(
+    aggregator: str,
+    api_key: Optional[str],
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+    base_amount_out: float,
+) -> SwapRoute:
+    adjustment = random.uniform(-0.5, 0.5)
+    amount_out = base_amount_out + adjustment
+    min_received = amount_out * (1 - slippage_percent / 100)
+    gas_estimate = random.uniform(8, 25)
+    mev_supported = aggregator != "Paraswap"
+
+    return SwapRoute(
+        aggregator=aggregator,
+        from_token=from_token,
+        to_token=to_token,
+        amount_in=amount_in,
+        amount_out=amount_out,
+        min_received=min_received,
+        gas_estimate=gas_estimate,
+        slippage_percent=slippage_percent,
+        liquidity_sources=[
+            "Uniswap V3",
+            "Sushi",
+            "Balancer",
+            "Curve",
+        ],
+        mev_protection_supported=mev_supported,
+        route_steps=[
+            {"exchange": "Uniswap V3", "portion": 60},
+            {"exchange": "Curve", "portion": 40},
+        ],
+        status="live" if api_key else "mock",
+    )
+
+
 def get_dex_routes(
     from_token: str,
     to_token: str,
@@ -553,34 +650,9 @@ def get_dex_routes(
             except Exception as exc:
                 logger.warning("Paraswap quote failed, falling back to mock", error=str(exc))
 
-        adjustment = random.uniform(-0.5, 0.5)
-        amount_out = base_amount_out + adjustment
-        min_received = amount_out * (1 - slippage_percent / 100)
-        gas_estimate = random.uniform(8, 25)
-        mev_supported = aggregator != "Paraswap"
-
         routes.append(
-            SwapRoute(
-                aggregator=aggregator,
-                from_token=from_token,
-                to_token=to_token,
-                amount_in=amount_in,
-                amount_out=amount_out,
-                min_received=min_received,
-                gas_estimate=gas_estimate,
-                slippage_percent=slippage_percent,
-                liquidity_sources=[
-                    "Uniswap V3",
-                    "Sushi",
-                    "Balancer",
-                    "Curve",
-                ],
-                mev_protection_supported=mev_supported,
-                route_steps=[
-                    {"exchange": "Uniswap V3", "portion": 60},
-                    {"exchange": "Curve", "portion": 40},
-                ],
-                status="live" if api_key else "mock",
+            _mock_dex_route(
+                aggregator, api_key, from_token, to_token, amount_in, slippage_percent, base_amount_out
             )
         )
 
@@ -735,13 +807,13 @@ def _from_chain_units(value: str, decimals: int) -> float:
     return float(Decimal(value) / (Decimal(10) ** decimals))
 
 
-def _fetch_lifi_route(
+def _lifi_request(
     source_chain: str,
     destination_chain: str,
     from_token: str,
     to_token: str,
     amount_in: float,
-) -> Optional[BridgeRoute]:
+) -> Optional[Tuple[str, Dict[str, Any], Dict[str, str]]]:
     if not LIFI_API_KEY:
         return None
 
@@ -775,11 +847,20 @@ def _fetch_lifi_route(
         "x-li-fi-api-key": LIFI_API_KEY,
     }
 
-    with httpx.Client(timeout=20) as client:
-        response = client.post(f"{LIFI_BASE_URL}/routes", json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+    return f"{LIFI_BASE_URL}/routes", payload, headers
 
+
+def _parse_lifi_routes(
+    data: Dict[str, Any],
+    source_chain: str,
+    destination_chain: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> Optional[BridgeRoute]:
+    from_chain_id = _chain_name_to_id(source_chain)
+    to_chain_id = _chain_name_to_id(destination_chain)
+    to_token_meta = _token_metadata_for_chain(destination_chain, to_token)
     routes = data.get("routes") or []
     if not routes:
         return None
@@ -826,6 +907,62 @@ def _fetch_lifi_route(
     )
 
 
+def _fetch_lifi_route(
+    source_chain: str,
+    destination_chain: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> Optional[BridgeRoute]:
+    request = _lifi_request(source_chain, destination_chain, from_token, to_token, amount_in)
+    if request is None:
+        return None
+    url, payload, headers = request
+
+    with httpx.Client(timeout=20) as client:
+        response = client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+
+    return _parse_lifi_routes(data, source_chain, destination_chain, from_token, to_token, amount_in)
+
+
+def _mock_bridge_route(
+    provider: str,
+    credential: Optional[str],
+    source_chain: str,
+    destination_chain: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> BridgeRoute:
+    bridge_fee = random.uniform(0.05, 0.35)
+    estimated_output = amount_in * (1 - bridge_fee / 100)
+    eta = random.choice([5, 12, 20, 35])
+    multi_hop = (
+        [source_chain, "AVAX", destination_chain]
+        if provider == "Wormhole"
+        else [source_chain, destination_chain]
+    )
+    risk_rating = random.choice(["low", "medium", "elevated"])
+
+    return BridgeRoute(
+        provider=provider,
+        source_chain=source_chain,
+        destination_chain=destination_chain,
+        from_token=from_token,
+        to_token=to_token,
+        amount_in=amount_in,
+        estimated_output=estimated_output,
+        bridge_fee=bridge_fee,
+        gas_on_destination=random.uniform(0.001, 0.02),
+        eta_minutes=eta,
+        risk_rating=risk_rating,
+        multi_hop_path=multi_hop,
+        status="live" if credential else "mock",
+    )
+
+
 def get_cross_chain_routes(
     source_chain: str,
     destination_chain: str,
@@ -852,37 +989,425 @@ def get_cross_chain_routes(
             except Exception as exc:
                 logger.warning("LI.FI route fetch failed; falling back to mock", error=str(exc))
 
-        bridge_fee = random.uniform(0.05, 0.35)
-        estimated_output = amount_in * (1 - bridge_fee / 100)
-        eta = random.choice([5, 12, 20, 35])
-        multi_hop = (
-            [source_chain, "AVAX", destination_chain]
-            if provider == "Wormhole"
-            else [source_chain, destination_chain]
-        )
-        risk_rating = random.choice(["low", "medium", "elevated"])
-
         routes.append(
-            BridgeRoute(
-                provider=provider,
-                source_chain=source_chain,
-                destination_chain=destination_chain,
-                from_token=from_token,
-                to_token=to_token,
-                amount_in=amount_in,
-                estimated_output=estimated_output,
-                bridge_fee=bridge_fee,
-                gas_on_destination=random.uniform(0.001, 0.02),
-                eta_minutes=eta,
-                risk_rating=risk_rating,
-                multi_hop_path=multi_hop,
-                status="live" if credential else "mock",
+            _mock_bridge_route(
+                provider, credential, source_chain, destination_chain, from_token, to_token, amount_in
             )
         )
 
     return [asdict(route) for route in routes]
 
 
+# ---------------------------------------------------------------------------
+# Async quote layer
+# ---------------------------------------------------------------------------
+# Async handlers use these instead of the blocking helpers above: every
+# provider is queried concurrently over one pooled client, each upstream call
+# has a deadline and a hedged second attempt, and live quotes are cached
+# briefly with concurrent misses for the same key coalesced into one upstream
+# call. Mock fallbacks are built per request and never cached.
+
+# Per upstream: (overall deadline, send a hedged duplicate after) in seconds
+PROVIDER_DEADLINES: Dict[str, Tuple[float, float]] = {
+    "1inch": (3.0, 1.0),
+    "Paraswap": (3.0, 1.0),
+    "LI.FI": (8.0, 3.0),
+    "Moralis": (3.0, 1.0),
+    "CoinGecko": (3.0, 1.0),
+    "Moralis batch": (6.0, 2.5),
+    "CoinGecko batch": (6.0, 2.5),
+}
+DEX_QUOTE_TTL_SECONDS = float(os.getenv("DEX_QUOTE_TTL_SECONDS", "5"))
+BRIDGE_QUOTE_TTL_SECONDS = float(os.getenv("BRIDGE_QUOTE_TTL_SECONDS", "15"))
+TOKEN_PRICE_TTL_SECONDS = float(os.getenv("TOKEN_PRICE_TTL_SECONDS", "10"))
+
+_async_client: Optional[httpx.AsyncClient] = None
+_price_rate_limit: Dict[str, Any] = {}
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for all async provider calls."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(20.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Timeouts, connection failures and 5xx answers; anything else will fail again."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+async def _hedged_json(provider: str, method: str, url: str, **kwargs: Any) -> Tuple[Any, httpx.Headers]:
+    """
+    Request ``url`` within the provider's deadline. If the first attempt is
+    slow or fails transiently, a duplicate is sent and the first success
+    wins. Other failures (4xx, bad JSON) are raised without a second request.
+    """
+    deadline, hedge_after = PROVIDER_DEADLINES.get(provider, (5.0, 2.0))
+    client = get_async_client()
+
+    async def attempt() -> Tuple[Any, httpx.Headers]:
+        response = await client.request(method, url, timeout=deadline, **kwargs)
+        response.raise_for_status()
+        return response.json(), response.headers
+
+    loop = asyncio.get_running_loop()
+    expires = loop.time() + deadline
+    tasks = {asyncio.ensure_future(attempt())}
+    hedged = False
+    last_error: Optional[BaseException] = None
+    try:
+        while tasks:
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                break
+            done, tasks = await asyncio.wait(
+                tasks,
+                timeout=remaining if hedged else min(remaining, hedge_after),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+                if not _is_transient(last_error):
+                    raise last_error
+            if not hedged:
+                tasks.add(asyncio.ensure_future(attempt()))
+                hedged = True
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if last_error is not None:
+        raise last_error
+    raise asyncio.TimeoutError(f"{provider} did not answer within {deadline}s")
+
+
+class QuoteCache:
+    """
+    Short-TTL cache with single-flight loading of missing keys. A fetch that
+    returns None (no live quote) is shared with concurrent callers but not
+    cached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    async def get_or_fetch(self, key: Tuple[Any, ...], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._store(key, done))
+        # Shielded so one caller going away does not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _store(self, key: Tuple[Any, ...], task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_dex_quote_cache = QuoteCache(DEX_QUOTE_TTL_SECONDS)
+_bridge_quote_cache = QuoteCache(BRIDGE_QUOTE_TTL_SECONDS)
+_token_price_cache = QuoteCache(TOKEN_PRICE_TTL_SECONDS)
+
+
+def _amount_bucket(amount: float) -> str:
+    """Three significant digits: amounts within ~0.5% share a quote."""
+    return f"{amount:.3g}"
+
+
+def _rescale_route(route: Dict[str, Any], amount_in: float, output_fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Copy a bucketed quote onto the exact requested input amount."""
+    route = dict(route)
+    quoted_in = route.get("amount_in") or 0
+    if quoted_in and quoted_in != amount_in:
+        ratio = amount_in / quoted_in
+        for output_field in output_fields:
+            route[output_field] = route[output_field] * ratio
+        route["amount_in"] = amount_in
+    return route
+
+
+# Aggregators with a live API: (request builder, response parser)
+LIVE_DEX_QUOTES = {
+    "1inch": (
+        lambda key, from_token, to_token, amount_in, slippage: _1inch_request(
+            key, from_token, to_token, amount_in, slippage
+        ),
+        _parse_1inch_quote,
+    ),
+    "Paraswap": (
+        lambda key, from_token, to_token, amount_in, slippage: _paraswap_request(
+            key, from_token, to_token, amount_in
+        ),
+        _parse_paraswap_quote,
+    ),
+}
+
+
+async def _fetch_live_dex_route_async(
+    aggregator: str,
+    api_key: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+) -> Optional[Dict[str, Any]]:
+    build_request, parse = LIVE_DEX_QUOTES[aggregator]
+    request = build_request(api_key, from_token, to_token, amount_in, slippage_percent)
+    if request is None:
+        return None
+    url, params, headers = request
+    try:
+        data, _ = await _hedged_json(aggregator, "GET", url, params=params, headers=headers)
+        route = parse(data, from_token, to_token, amount_in, slippage_percent)
+    except Exception as exc:
+        logger.warning(f"{aggregator} quote failed, falling back to mock", error=str(exc) or type(exc).__name__)
+        return None
+    return asdict(route) if route else None
+
+
+async def get_dex_routes_async(
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+    slippage_percent: float,
+) -> List[Dict[str, Any]]:
+    """Async ``get_dex_routes``: all aggregators queried concurrently, live quotes cached briefly."""
+    from_token, to_token = from_token.upper(), to_token.upper()
+    bucket, slippage = _amount_bucket(amount_in), round(slippage_percent, 2)
+    base_amount_out = amount_in * random.uniform(0.95, 1.05)
+
+    async def quote(aggregator: str, api_key: Optional[str]) -> Dict[str, Any]:
+        if api_key and aggregator in LIVE_DEX_QUOTES:
+            route = await _dex_quote_cache.get_or_fetch(
+                ("dex", aggregator, from_token, to_token, bucket, slippage),
+                lambda: _fetch_live_dex_route_async(
+                    aggregator, api_key, from_token, to_token, amount_in, slippage_percent
+                ),
+            )
+            if route is not None:
+                return _rescale_route(route, amount_in, ("amount_out", "min_received"))
+        return asdict(
+            _mock_dex_route(
+                aggregator, api_key, from_token, to_token, amount_in, slippage_percent, base_amount_out
+            )
+        )
+
+    return list(
+        await asyncio.gather(*(quote(aggregator, api_key) for aggregator, api_key in DEX_AGGREGATORS.items()))
+    )
+
+
+async def _fetch_live_bridge_route_async(
+    source_chain: str,
+    destination_chain: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> Optional[Dict[str, Any]]:
+    request = _lifi_request(source_chain, destination_chain, from_token, to_token, amount_in)
+    if request is None:
+        return None
+    url, payload, headers = request
+    try:
+        data, _ = await _hedged_json("LI.FI", "POST", url, json=payload, headers=headers)
+        route = _parse_lifi_routes(data, source_chain, destination_chain, from_token, to_token, amount_in)
+    except Exception as exc:
+        logger.warning("LI.FI route fetch failed; falling back to mock", error=str(exc) or type(exc).__name__)
+        return None
+    return asdict(route) if route else None
+
+
+async def get_cross_chain_routes_async(
+    source_chain: str,
+    destination_chain: str,
+    from_token: str,
+    to_token: str,
+    amount_in: float,
+) -> List[Dict[str, Any]]:
+    """Async ``get_cross_chain_routes``: providers queried concurrently, live quotes cached briefly."""
+    key = (
+        "bridge",
+        source_chain.strip().upper(),
+        destination_chain.strip().upper(),
+        from_token.upper(),
+        to_token.upper(),
+        _amount_bucket(amount_in),
+    )
+
+    async def quote(provider: str, credential: Optional[str]) -> Dict[str, Any]:
+        if provider == "LI.FI" and credential:
+            route = await _bridge_quote_cache.get_or_fetch(
+                key,
+                lambda: _fetch_live_bridge_route_async(
+                    source_chain, destination_chain, from_token, to_token, amount_in
+                ),
+            )
+            if route is not None:
+                return _rescale_route(route, amount_in, ("estimated_output",))
+        return asdict(
+            _mock_bridge_route(
+                provider, credential, source_chain, destination_chain, from_token, to_token, amount_in
+            )
+        )
+
+    return list(
+        await asyncio.gather(*(quote(provider, credential) for provider, credential in CROSS_CHAIN_PROVIDERS))
+    )
+
+
+async def _fetch_live_token_price_async(symbol: str) -> Optional[TokenPrice]:
+    if MORALIS_API_KEY:
+        meta = TOKEN_METADATA[symbol]
+        try:
+            data, headers = await _hedged_json(
+                "Moralis",
+                "GET",
+                MORALIS_PRICE_ENDPOINT.format(address=meta["address"]),
+                params={"chain": meta.get("chain", MORALIS_DEFAULT_CHAIN)},
+                headers={"X-API-Key": MORALIS_API_KEY},
+            )
+            _price_rate_limit.update(_extract_rate_limit_headers(headers))
+            return _format_moralis_price(symbol, data)
+        except Exception as exc:
+            logger.warning("Moralis price fetch failed; using mock", symbol=symbol, error=str(exc) or type(exc).__name__)
+
+    token_id = COINGECKO_TOKEN_IDS.get(symbol)
+    if token_id:
+        try:
+            data, _ = await _hedged_json(
+                "CoinGecko", "GET", COINGECKO_PRICE_ENDPOINT, params=_coingecko_params(token_id)
+            )
+            return _parse_coingecko_price(symbol, token_id, data)
+        except Exception as exc:
+            logger.warning(f"Failed to fetch price from CoinGecko for {symbol}: {exc}")
+
+    return None
+
+
+async def get_token_prices_async(token_symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Async ``get_token_prices``: every symbol fetched concurrently, live prices cached briefly."""
+    symbols = [sym.upper() for sym in (token_symbols or TOKEN_METADATA.keys())]
+    symbols = [sym for sym in symbols if sym in TOKEN_METADATA]
+
+    async def price(symbol: str) -> TokenPrice:
+        live = await _token_price_cache.get_or_fetch(
+            ("price", symbol), lambda: _fetch_live_token_price_async(symbol)
+        )
+        return live or _mock_token_price(symbol)
+
+    prices = await asyncio.gather(*(price(symbol) for symbol in symbols))
+    return {
+        "tokens": [asdict(price) for price in prices],
+        "rate_limit": dict(_price_rate_limit) or None,
+        "live": bool(MORALIS_API_KEY),
+    }
+
+
+MORALIS_BATCH_PRICE_ENDPOINT = "https://deep-index.moralis.io/api/v2.2/erc20/prices"
+
+
+async def fetch_token_prices_batch_async(symbols: List[str]) -> Tuple[Dict[str, TokenPrice], Dict[str, Any]]:
+    """
+    Price many symbols with batch endpoints: one Moralis call per chain, then
+    one CoinGecko call for whatever is still missing. Symbols no provider
+    priced are absent from the result. Also returns the last rate limit seen.
+    """
+    prices: Dict[str, TokenPrice] = {}
+    rate_limit: Dict[str, Any] = {}
+
+    if MORALIS_API_KEY:
+        by_chain: Dict[str, Dict[str, str]] = {}
+        for symbol in symbols:
+            meta = TOKEN_METADATA.get(symbol)
+            if meta:
+                chain = meta.get("chain", MORALIS_DEFAULT_CHAIN)
+                by_chain.setdefault(chain, {})[meta["address"].lower()] = symbol
+
+        async def moralis_chain(chain: str, addresses: Dict[str, str]) -> None:
+            try:
+                data, headers = await _hedged_json(
+                    "Moralis batch",
+                    "POST",
+                    MORALIS_BATCH_PRICE_ENDPOINT,
+                    params={"chain": chain},
+                    json={"tokens": [{"token_address": address} for address in addresses]},
+                    headers={"X-API-Key": MORALIS_API_KEY},
+                )
+            except Exception as exc:
+                logger.warning("Moralis batch price fetch failed", chain=chain, error=str(exc) or type(exc).__name__)
+                return
+            rate_limit.update(_extract_rate_limit_headers(headers))
+            for item in data if isinstance(data, list) else []:
+                symbol = addresses.get(str(item.get("tokenAddress", "")).lower())
+                if symbol and item.get("usdPrice") is not None:
+                    prices[symbol] = _format_moralis_price(symbol, item)
+
+        await asyncio.gather(*(moralis_chain(chain, addresses) for chain, addresses in by_chain.items()))
+
+    missing = {COINGECKO_TOKEN_IDS[s]: s for s in symbols if s not in prices and s in COINGECKO_TOKEN_IDS}
+    if missing:
+        try:
+            data, _ = await _hedged_json(
+                "CoinGecko batch",
+                "GET",
+                COINGECKO_PRICE_ENDPOINT,
+                params=_coingecko_params(",".join(missing)),
+            )
+            for token_id, symbol in missing.items():
+                price = _parse_coingecko_price(symbol, token_id, data)
+                if price:
+                    prices[symbol] = price
+        except Exception as exc:
+            logger.warning("CoinGecko batch price fetch failed", error=str(exc) or type(exc).__name__)
+
+    return prices, rate_limit
+
+
+def get_quote_cache_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        "dex": dict(_dex_quote_cache.stats),
+        "bridge": dict(_bridge_quote_cache.stats),
+        "prices": dict(_token_price_cache.stats),
+    }
+
+
 # ---------------------------------------------------------------------------
 # NFT metadata helpers
 # ---------------------------------------------------------------------------
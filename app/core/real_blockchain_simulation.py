@@ -16,6 +16,8 @@ import aiohttp
 import structlog
 from web3 import Web3
 
+from app.core.local_evm_simulation import LocalEVMBackend, StateSource
+
 try:
     from web3.middleware import geth_poa_middleware
 except ImportError:
@@ -35,6 +37,7 @@ class SimulationProvider(Enum):
     FOUNDRY = "foundry"
     GANACHE = "ganache"
     HARDHAT = "hardhat"
+    LOCAL_EVM = "local_evm"
 
 
 class SimulationNetwork(Enum):
@@ -61,6 +64,9 @@ class SimulationConfig:
     gas_price: str | None = None
     max_fee_per_gas: str | None = None
     max_priority_fee_per_gas: str | None = None
+    # LOCAL_EVM only: hard fork rules, and a stand-in state source used instead of rpc_url
+    evm_fork: str = "prague"
+    state_source: StateSource | None = None
 
 
 @dataclass
@@ -83,6 +89,22 @@ class SimulationResult:
     trace_data: dict[str, Any] | None
 
 
+@dataclass
+class BundleSimulationResult:
+    """Ordered transaction bundle simulated on one fork state"""
+
+    bundle_id: str
+    success: bool
+    block_number: int | None
+    gas_used: int
+    results: list[SimulationResult]
+    # Net balance change per address across the whole bundle
+    balance_changes: dict[str, str]
+    failed_index: int | None
+    error: str | None
+    execution_time: float
+
+
 @dataclass
 class TenderlyConfig:
     """Tenderly configuration"""
@@ -102,10 +124,19 @@ class RealBlockchainSimulation:
         self.config = config
         self.tenderly_config = tenderly_config
         self.web3 = None
+        self.local_evm: LocalEVMBackend | None = None
         self.simulation_cache: dict[str, SimulationResult] = {}
 
-        # Initialize Web3 connection
-        self._initialize_web3()
+        # Initialize Web3 connection (a local EVM with a stand-in source needs none)
+        if config.provider != SimulationProvider.LOCAL_EVM or config.state_source is None:
+            self._initialize_web3()
+        if config.provider == SimulationProvider.LOCAL_EVM:
+            self.local_evm = LocalEVMBackend(
+                web3=self.web3,
+                state_source=config.state_source,
+                evm_fork=config.evm_fork,
+                gas_limit=config.gas_limit,
+            )
 
     def _initialize_web3(self):
         """Initialize Web3 connection"""
@@ -147,6 +178,8 @@ class RealBlockchainSimulation:
                 result = await self._simulate_with_ganache(transaction, block_number)
             elif self.config.provider == SimulationProvider.HARDHAT:
                 result = await self._simulate_with_hardhat(transaction, block_number)
+            elif self.config.provider == SimulationProvider.LOCAL_EVM:
+                result = await self._simulate_with_local_evm(transaction, block_number)
             else:
                 raise ValueError(f"Unsupported simulation provider: {self.config.provider}")
 
@@ -186,6 +219,138 @@ class RealBlockchainSimulation:
                 trace_data=None,
             )
 
+    async def simulate_bundle(
+        self, transactions: list[dict[str, Any]], block_number: int | None = None
+    ) -> BundleSimulationResult:
+        """
+        Simulate an ordered bundle on a single fork state: each transaction sees
+        the effects of the ones before it. Per-transaction traces and state
+        diffs are in ``results[i].trace_data``.
+        """
+        bundle_id = self._bundle_id(transactions)
+        start_time = time.time()
+
+        try:
+            self._require_local_evm()
+            raw_results = await self.local_evm.simulate_bundle(
+                transactions, block_number or self.config.fork_block_number
+            )
+            result = self._build_bundle_result(bundle_id, transactions, raw_results, start_time)
+
+            logger.info(
+                "Bundle simulation completed",
+                bundle_id=bundle_id,
+                transactions=len(transactions),
+                success=result.success,
+                execution_time=result.execution_time,
+            )
+            return result
+
+        except Exception as e:
+            logger.error("Bundle simulation failed", bundle_id=bundle_id, error=str(e))
+            return self._failed_bundle_result(bundle_id, str(e), start_time)
+
+    async def simulate_sweep(
+        self,
+        transactions: list[dict[str, Any]],
+        variants: list[dict[str, Any]],
+        index: int = -1,
+        block_number: int | None = None,
+    ) -> list[BundleSimulationResult]:
+        """
+        What-if sweep: one bundle per variant, each with the fields in the
+        variant overriding ``transactions[index]`` (e.g. swap calldata at 50
+        slippage settings, or ``value`` at different amounts). Variants run in
+        parallel workers against the same warmed fork block; results keep the
+        variant order.
+        """
+        bundle_id = self._bundle_id(transactions)
+        start_time = time.time()
+        bundles = []
+        for variant in variants:
+            bundle = list(transactions)
+            bundle[index] = {**bundle[index], **variant}
+            bundles.append(bundle)
+
+        try:
+            self._require_local_evm()
+            raw_bundles = await self.local_evm.simulate_bundles(
+                bundles, block_number or self.config.fork_block_number
+            )
+        except Exception as e:
+            logger.error("Sweep simulation failed", bundle_id=bundle_id, error=str(e))
+            return [
+                self._failed_bundle_result(f"{bundle_id}_v{i}", str(e), start_time)
+                for i in range(len(variants))
+            ]
+
+        logger.info(
+            "Sweep simulation completed",
+            bundle_id=bundle_id,
+            variants=len(variants),
+            execution_time=time.time() - start_time,
+        )
+        return [
+            self._build_bundle_result(f"{bundle_id}_v{i}", bundle, raw_results, start_time)
+            for i, (bundle, raw_results) in enumerate(zip(bundles, raw_bundles))
+        ]
+
+    def _require_local_evm(self):
+        if self.local_evm is None:
+            raise ValueError(
+                f"Bundle simulation is not supported by provider: {self.config.provider.value}"
+            )
+
+    def _bundle_id(self, transactions: list[dict[str, Any]]) -> str:
+        digest = hashlib.sha256(
+            json.dumps(transactions, sort_keys=True, default=str).encode()
+        ).hexdigest()[:8]
+        return f"bundle_{int(time.time())}_{digest}"
+
+    def _build_bundle_result(
+        self,
+        bundle_id: str,
+        transactions: list[dict[str, Any]],
+        raw_results: list[dict[str, Any]],
+        start_time: float,
+    ) -> BundleSimulationResult:
+        results = []
+        net_changes: dict[str, int] = {}
+        for i, (transaction, raw_result) in enumerate(zip(transactions, raw_results)):
+            result = self._parse_local_evm_result(raw_result, transaction)
+            result.simulation_id = f"{bundle_id}_{i}"
+            results.append(result)
+            for address, delta in result.balance_changes.items():
+                net_changes[address] = net_changes.get(address, 0) + int(delta)
+
+        failed_index = next((i for i, r in enumerate(results) if not r.success), None)
+        return BundleSimulationResult(
+            bundle_id=bundle_id,
+            success=failed_index is None,
+            block_number=results[0].block_number if results else None,
+            gas_used=sum(r.gas_used for r in results),
+            results=results,
+            balance_changes={a: str(d) for a, d in net_changes.items() if d},
+            failed_index=failed_index,
+            error=results[failed_index].error if failed_index is not None else None,
+            execution_time=time.time() - start_time,
+        )
+
+    def _failed_bundle_result(
+        self, bundle_id: str, error: str, start_time: float
+    ) -> BundleSimulationResult:
+        return BundleSimulationResult(
+            bundle_id=bundle_id,
+            success=False,
+            block_number=None,
+            gas_used=0,
+            results=[],
+            balance_changes={},
+            failed_index=None,
+            error=error,
+            execution_time=time.time() - start_time,
+        )
+
     async def _simulate_with_tenderly(
         self, transaction: dict[str, Any], block_number: int | None
     ) -> SimulationResult:
@@ -348,6 +513,15 @@ class RealBlockchainSimulation:
             logger.error("Hardhat simulation failed", error=str(e))
             raise
 
+    async def _simulate_with_local_evm(
+        self, transaction: dict[str, Any], block_number: int | None
+    ) -> SimulationResult:
+        """Simulate transaction on the in-process EVM fork"""
+        result = await self.local_evm.simulate(
+            transaction, block_number or self.config.fork_block_number
+        )
+        return self._parse_local_evm_result(result, transaction)
+
     def _get_tenderly_network_id(self) -> str:
         """Get Tenderly network ID"""
         network_map = {
@@ -463,6 +637,45 @@ class RealBlockchainSimulation:
             logger.error("Failed to parse Hardhat result", error=str(e))
             raise
 
+    def _parse_local_evm_result(
+        self, result: dict[str, Any], transaction: dict[str, Any]
+    ) -> SimulationResult:
+        """Parse local EVM execution result"""
+        contract_calls = []
+        if transaction.get("to") and transaction.get("data", "0x") not in ("0x", "", None):
+            contract_calls.append(
+                {
+                    "from": transaction.get("from"),
+                    "to": transaction.get("to"),
+                    "value": str(transaction.get("value", 0)),
+                    "input": transaction.get("data"),
+                    "output": result["return_data"],
+                    "call_type": "call",
+                    "depth": [],
+                }
+            )
+
+        return SimulationResult(
+            simulation_id="",
+            success=result["success"],
+            transaction_hash=None,
+            block_number=result["block_number"],
+            gas_used=result["gas_used"],
+            gas_price=str(result["gas_price"]),
+            status="success" if result["success"] else "failed",
+            logs=result["logs"],
+            balance_changes=result["balance_changes"],
+            token_transfers=result["token_transfers"],
+            contract_calls=contract_calls,
+            error=result["error"],
+            execution_time=result["execution_time"],
+            trace_data={
+                "return_data": result["return_data"],
+                "approvals": result["approvals"],
+                "state_diff": result["state_diff"],
+            },
+        )
+
     def _parse_logs(self, logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Parse transaction logs"""
         parsed_logs = []
@@ -552,7 +765,10 @@ class RealBlockchainSimulation:
         """Perform health check on simulation engine"""
         try:
             # Test Web3 connection
-            latest_block = self.web3.eth.block_number
+            if self.web3 is not None:
+                latest_block = self.web3.eth.block_number
+            else:
+                latest_block = self.local_evm.get_snapshot().block_number
 
             health_status = {
                 "simulation_engine_accessible": True,
@@ -568,6 +784,8 @@ class RealBlockchainSimulation:
                 health_status["tenderly_accessible"] = await self._test_tenderly_connection()
             elif self.config.provider == SimulationProvider.FOUNDRY:
                 health_status["foundry_accessible"] = await self._test_foundry_connection()
+            elif self.local_evm is not None:
+                health_status["local_evm"] = self.local_evm.get_stats()
 
             return health_status
 
@@ -616,6 +834,7 @@ class RealBlockchainSimulation:
             "timeout": self.config.timeout,
             "gas_limit": self.config.gas_limit,
             "tenderly_configured": self.tenderly_config is not None,
+            "local_evm": self.local_evm.get_stats() if self.local_evm else None,
         }
 
 
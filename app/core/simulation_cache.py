@@ -0,0 +1,194 @@
+"""
+Simulation Result Cache
+Bounded LRU/TTL cache for simulation verdicts, keyed by transaction and chain
+state so a result is never served once the state it was computed against moved on
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SimulationCacheKey:
+    """Transaction identity plus the chain state it is simulated against"""
+
+    transaction_id: str
+    network: str
+    block_number: int
+    # (address, nonce) pairs whose change invalidates the verdict
+    account_nonces: tuple[tuple[str, int], ...] = ()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    created_at: float
+
+
+class SimulationResultCache:
+    """
+    LRU + TTL cache with single-flight computation.
+
+    Concurrent requests for the same key share one in-flight simulation; a
+    caller going away does not cancel it for the others. ``on_new_block`` drops
+    entries computed against blocks the network has moved past.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[SimulationCacheKey, _Entry] = OrderedDict()
+        self._inflight: dict[SimulationCacheKey, asyncio.Future] = {}
+        self.latest_blocks: dict[str, int] = {}
+        self._block_seen_at: dict[str, float] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expired": 0,
+            "invalidated": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: SimulationCacheKey) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, key: SimulationCacheKey, value: Any):
+        now = time.monotonic()
+        self._entries[key] = _Entry(value=value, expires_at=now + self.ttl_seconds, created_at=now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        key: SimulationCacheKey,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return the cached value or run ``compute`` once for all concurrent callers."""
+        value = self.get(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+
+            def _done(done: asyncio.Future, key: SimulationCacheKey = key):
+                self._inflight.pop(key, None)
+                if done.cancelled() or done.exception() is not None:
+                    return
+                result = done.result()
+                # A block may have landed while simulating; don't store stale state
+                if cacheable(result) and key.block_number >= self.latest_blocks.get(key.network, 0):
+                    self.put(key, result)
+
+            task.add_done_callback(_done)
+
+        return await asyncio.shield(task)
+
+    def on_new_block(self, network: str, block_number: int, keep_blocks: int = 0) -> int:
+        """
+        Per-block invalidation hook: drop entries of ``network`` computed more
+        than ``keep_blocks`` blocks before ``block_number``. Returns the count.
+        """
+        latest = self.latest_blocks.get(network, -1)
+        if block_number < latest:
+            return 0
+        self._block_seen_at[network] = time.monotonic()
+        if block_number == latest:
+            return 0
+        self.latest_blocks[network] = block_number
+
+        cutoff = block_number - keep_blocks
+        stale = [
+            key
+            for key in self._entries
+            if key.network == network and key.block_number < cutoff
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.stats["invalidated"] += len(stale)
+        return len(stale)
+
+    def current_block(self, network: str, max_age_seconds: float) -> int | None:
+        """Latest block reported for ``network`` if it was seen within ``max_age_seconds``"""
+        seen_at = self._block_seen_at.get(network)
+        if seen_at is None or time.monotonic() - seen_at >= max_age_seconds:
+            return None
+        return self.latest_blocks.get(network)
+
+    def invalidate_transaction(self, transaction_id: str) -> int:
+        stale = [key for key in self._entries if key.transaction_id == transaction_id]
+        for key in stale:
+            del self._entries[key]
+        self.stats["invalidated"] += len(stale)
+        return len(stale)
+
+    def latest_for(self, transaction_id: str) -> Any | None:
+        """Most recently used unexpired result for a transaction, at any block"""
+        now = time.monotonic()
+        for key in reversed(self._entries):
+            entry = self._entries[key]
+            if key.transaction_id == transaction_id and entry.expires_at > now:
+                return entry.value
+        return None
+
+    def purge(self, max_age_seconds: float | None = None) -> int:
+        """Drop expired entries and, optionally, entries older than ``max_age_seconds``"""
+        now = time.monotonic()
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if entry.expires_at <= now
+            or (max_age_seconds is not None and now - entry.created_at > max_age_seconds)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.stats["expired"] += len(stale)
+        return len(stale)
+
+    def values(self) -> Iterator[Any]:
+        now = time.monotonic()
+        return (entry.value for entry in self._entries.values() if entry.expires_at > now)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
@@ -0,0 +1,255 @@
+"""
+Wallet state snapshots via Multicall3
+Reads native balance, block context and ERC-20 balances/allowances for a
+token x spender matrix in a single aggregate3 eth_call
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from eth_abi import decode, encode
+from web3 import Web3
+
+logger = structlog.get_logger(__name__)
+
+# Same address on every chain Multicall3 is deployed to
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Function selectors, computed once
+AGGREGATE3_SELECTOR = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+GET_ETH_BALANCE_SELECTOR = Web3.keccak(text="getEthBalance(address)")[:4]
+GET_BLOCK_NUMBER_SELECTOR = Web3.keccak(text="getBlockNumber()")[:4]
+GET_BLOCK_TIMESTAMP_SELECTOR = Web3.keccak(text="getCurrentBlockTimestamp()")[:4]
+BALANCE_OF_SELECTOR = Web3.keccak(text="balanceOf(address)")[:4]
+ALLOWANCE_SELECTOR = Web3.keccak(text="allowance(address,address)")[:4]
+DECIMALS_SELECTOR = Web3.keccak(text="decimals()")[:4]
+SYMBOL_SELECTOR = Web3.keccak(text="symbol()")[:4]
+
+# Common ERC-20 tokens checked when a caller does not pass its own list
+COMMON_TOKENS: dict[str, dict[str, str]] = {
+    "ethereum": {
+        "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        "DAI": "0x6B175474E89094C44Da98b954EedeAC495271d0F",
+        "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+    },
+    "polygon": {
+        "USDC": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        "USDT": "0xc2132D05D31c914a87C6611C10748AEb04B58e8F",
+        "DAI": "0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c6A063",
+        "WMATIC": "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270",
+    },
+    "bsc": {
+        "USDT": "0x55d398326f99059fF775485246999027B3197955",
+        "USDC": "0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d",
+        "BUSD": "0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56",
+        "WBNB": "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c",
+    },
+}
+
+
+class MulticallUnavailableError(Exception):
+    """No Multicall3 contract answers at the configured address"""
+
+
+@dataclass(frozen=True)
+class TokenMetadata:
+    """Immutable ERC-20 metadata, cached per network"""
+
+    symbol: str
+    decimals: int
+
+
+@dataclass
+class TokenState:
+    """Balance and allowances of one token for the snapshot wallet"""
+
+    address: str
+    symbol: str
+    decimals: int
+    balance: int | None
+    allowances: dict[str, int | None] = field(default_factory=dict)
+
+    def to_approval_dict(self, primary_spender: str | None = None) -> dict[str, Any]:
+        scale = 10**self.decimals
+        allowance = self.allowances.get(primary_spender) if primary_spender else None
+        if allowance is None and self.allowances:
+            allowance = max((a for a in self.allowances.values() if a is not None), default=0)
+        return {
+            "allowance": (allowance or 0) / scale,
+            "symbol": self.symbol,
+            "decimals": self.decimals,
+            "balance": (self.balance or 0) / scale,
+            "allowances": dict(self.allowances),
+        }
+
+
+@dataclass
+class WalletStateSnapshot:
+    """Wallet state read at a single block"""
+
+    wallet_address: str
+    network: str
+    block_number: int | None
+    block_timestamp: int | None
+    native_balance: int | None
+    tokens: dict[str, TokenState]
+    round_trips: int
+
+
+def _encode_address(address: str) -> bytes:
+    return bytes.fromhex(address[2:].lower().rjust(64, "0"))
+
+
+def _decode_uint(success: bool, data: bytes) -> int | None:
+    if not success or len(data) < 32:
+        return None
+    return int.from_bytes(data[:32], "big")
+
+
+def _decode_symbol(success: bool, data: bytes) -> str | None:
+    if not success or not data:
+        return None
+    try:
+        return decode(["string"], data)[0]
+    except Exception:
+        # Pre-standard tokens (e.g. MKR) return bytes32
+        return data[:32].rstrip(b"\x00").decode("utf-8", errors="ignore") or None
+
+
+class StateSnapshotter:
+    """
+    Batches wallet state reads into one Multicall3 ``aggregate3`` call.
+
+    Every sub-call allows failure, so a non-standard token only loses its own
+    fields. Token symbol/decimals never change and are fetched once per
+    network. Networks without Multicall3 fall back to concurrent eth_calls.
+    """
+
+    def __init__(self, multicall_address: str = MULTICALL3_ADDRESS):
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+        self.metadata_cache: dict[tuple[str, str], TokenMetadata] = {}
+        self._multicall_unavailable: set[str] = set()
+
+    async def snapshot(
+        self,
+        w3: Web3,
+        network: str,
+        wallet_address: str,
+        tokens: dict[str, str],
+        spenders: list[str] | None = None,
+    ) -> WalletStateSnapshot:
+        """
+        Read native balance, block context and per-token balance/allowances.
+
+        Args:
+            tokens: fallback symbol -> token address
+            spenders: addresses whose allowances are read for every token
+        """
+        wallet = Web3.to_checksum_address(wallet_address)
+        token_addresses = {Web3.to_checksum_address(a): s for s, a in tokens.items()}
+        spender_list = list(dict.fromkeys(Web3.to_checksum_address(s) for s in spenders or []))
+
+        # (target, calldata, decoder key) in request order
+        calls: list[tuple[str, bytes, tuple]] = [
+            (self.multicall_address, GET_ETH_BALANCE_SELECTOR + _encode_address(wallet), ("native",)),
+            (self.multicall_address, GET_BLOCK_NUMBER_SELECTOR, ("block_number",)),
+            (self.multicall_address, GET_BLOCK_TIMESTAMP_SELECTOR, ("block_timestamp",)),
+        ]
+        for token in token_addresses:
+            calls.append((token, BALANCE_OF_SELECTOR + _encode_address(wallet), ("balance", token)))
+            for spender in spender_list:
+                calls.append(
+                    (
+                        token,
+                        ALLOWANCE_SELECTOR + _encode_address(wallet) + _encode_address(spender),
+                        ("allowance", token, spender),
+                    )
+                )
+            if (network, token) not in self.metadata_cache:
+                calls.append((token, DECIMALS_SELECTOR, ("decimals", token)))
+                calls.append((token, SYMBOL_SELECTOR, ("symbol", token)))
+
+        if network in self._multicall_unavailable:
+            results, round_trips = await self._call_individually(w3, calls), len(calls)
+        else:
+            try:
+                results, round_trips = await asyncio.to_thread(self._aggregate3, w3, calls), 1
+            except Exception as e:
+                logger.warning(
+                    "Multicall3 call failed, falling back to individual calls",
+                    network=network,
+                    error=str(e),
+                )
+                if isinstance(e, MulticallUnavailableError):
+                    self._multicall_unavailable.add(network)
+                results, round_trips = await self._call_individually(w3, calls), len(calls)
+
+        values: dict[tuple, Any] = {}
+        for (_, _, key), (success, data) in zip(calls, results):
+            values[key] = _decode_symbol(success, data) if key[0] == "symbol" else _decode_uint(success, data)
+
+        token_states = {}
+        for token, fallback_symbol in token_addresses.items():
+            metadata = self.metadata_cache.get((network, token))
+            if metadata is None:
+                decimals = values.get(("decimals", token))
+                symbol = values.get(("symbol", token))
+                metadata = TokenMetadata(
+                    symbol=symbol or fallback_symbol,
+                    decimals=decimals if decimals is not None else 18,
+                )
+                # Only cache what the token actually reported
+                if decimals is not None and symbol is not None:
+                    self.metadata_cache[(network, token)] = metadata
+
+            token_states[token] = TokenState(
+                address=token,
+                symbol=metadata.symbol,
+                decimals=metadata.decimals,
+                balance=values.get(("balance", token)),
+                allowances={s: values.get(("allowance", token, s)) for s in spender_list},
+            )
+
+        return WalletStateSnapshot(
+            wallet_address=wallet,
+            network=network,
+            block_number=values.get(("block_number",)),
+            block_timestamp=values.get(("block_timestamp",)),
+            native_balance=values.get(("native",)),
+            tokens=token_states,
+            round_trips=round_trips,
+        )
+
+    def _aggregate3(self, w3: Web3, calls: list[tuple[str, bytes, tuple]]) -> list[tuple[bool, bytes]]:
+        payload = AGGREGATE3_SELECTOR + encode(
+            ["(address,bool,bytes)[]"], [[(target, True, data) for target, data, _ in calls]]
+        )
+        raw = w3.eth.call({"to": self.multicall_address, "data": "0x" + payload.hex()})
+        if not raw:
+            raise MulticallUnavailableError(f"empty aggregate3 response from {self.multicall_address}")
+        return [(bool(ok), bytes(data)) for ok, data in decode(["(bool,bytes)[]"], bytes(raw))[0]]
+
+    async def _call_individually(
+        self, w3: Web3, calls: list[tuple[str, bytes, tuple]]
+    ) -> list[tuple[bool, bytes]]:
+        def one(target: str, data: bytes, key: tuple) -> tuple[bool, bytes]:
+            try:
+                if key[0] == "native":
+                    wallet = Web3.to_checksum_address(data[-20:])
+                    return True, w3.eth.get_balance(wallet).to_bytes(32, "big")
+                if key[0] == "block_number":
+                    return True, w3.eth.block_number.to_bytes(32, "big")
+                if key[0] == "block_timestamp":
+                    return True, w3.eth.get_block("latest")["timestamp"].to_bytes(32, "big")
+                return True, bytes(w3.eth.call({"to": target, "data": "0x" + data.hex()}))
+            except Exception:
+                return False, b""
+
+        return list(
+            await asyncio.gather(*(asyncio.to_thread(one, target, data, key) for target, data, key in calls))
+        )
@@ -14,7 +14,7 @@ import structlog
 
 from config.settings import settings
 
-from .blockchain import MempoolTransaction, TransactionData, blockchain_manager
+from .blockchain import AccountState, MempoolTransaction, TransactionData, blockchain_manager
 
 logger = structlog.get_logger(__name__)
 
@@ -558,9 +558,13 @@ class BehavioralAnalyzer:
         self.suspicious_patterns: dict[str, list[dict]] = defaultdict(list)
 
     async def analyze_wallet_behavior(
-        self, wallet_address: str, network: str
+        self, wallet_address: str, network: str, state: AccountState | None = None
     ) -> list[ThreatDetection]:
-        """Analyze wallet behavior for suspicious patterns"""
+        """Analyze wallet behavior for suspicious patterns
+
+        ``state`` is the wallet's already loaded balance and nonce; when given,
+        no account lookups are made.
+        """
         threats = []
 
         # Get recent transactions
@@ -570,11 +574,15 @@ class BehavioralAnalyzer:
 
         try:
             # Analyze transaction patterns
-            rapid_transfer_threats = await self._detect_rapid_transfers(wallet_address, network)
+            rapid_transfer_threats = await self._detect_rapid_transfers(
+                wallet_address, network, state
+            )
             threats.extend(rapid_transfer_threats)
 
             # Analyze balance changes
-            balance_threats = await self._detect_large_balance_changes(wallet_address, network)
+            balance_threats = await self._detect_large_balance_changes(
+                wallet_address, network, state
+            )
             threats.extend(balance_threats)
 
             # Analyze gas usage patterns
@@ -591,7 +599,7 @@ class BehavioralAnalyzer:
         return threats
 
     async def _detect_rapid_transfers(
-        self, wallet_address: str, network: str
+        self, wallet_address: str, network: str, state: AccountState | None = None
     ) -> list[ThreatDetection]:
         """Detect rapid transfer patterns"""
         threats = []
@@ -599,7 +607,10 @@ class BehavioralAnalyzer:
         # This would analyze recent transaction history
         # For now, we'll use a simplified approach
 
-        recent_tx_count = await blockchain_manager.get_transaction_count(wallet_address, network)
+        if state is not None:
+            recent_tx_count = state.nonce
+        else:
+            recent_tx_count = await blockchain_manager.get_transaction_count(wallet_address, network)
 
         if recent_tx_count > settings.rapid_transfer_threshold:
             threat = ThreatDetection(
@@ -618,7 +629,7 @@ class BehavioralAnalyzer:
         return threats
 
     async def _detect_large_balance_changes(
-        self, wallet_address: str, network: str
+        self, wallet_address: str, network: str, state: AccountState | None = None
     ) -> list[ThreatDetection]:
         """Detect large balance changes"""
         threats = []
@@ -626,7 +637,10 @@ class BehavioralAnalyzer:
         # This would compare current balance with historical data
         # For now, we'll use a simplified approach
 
-        current_balance = await blockchain_manager.get_balance(wallet_address, network)
+        if state is not None:
+            current_balance = state.balance
+        else:
+            current_balance = await blockchain_manager.get_balance(wallet_address, network)
         balance_eth = current_balance / 1e18
 
         if balance_eth > settings.large_balance_change_threshold:
@@ -714,13 +728,15 @@ class ThreatDetectionEngine:
 
         return all_threats
 
-    async def analyze_wallet(self, wallet_address: str, network: str) -> list[ThreatDetection]:
-        """Analyze wallet for threats"""
+    async def analyze_wallet(
+        self, wallet_address: str, network: str, state: AccountState | None = None
+    ) -> list[ThreatDetection]:
+        """Analyze wallet for threats, reusing ``state`` when it is already loaded"""
         all_threats = []
 
         # Behavioral analysis
         behavioral_threats = await self.behavioral_analyzer.analyze_wallet_behavior(
-            wallet_address, network
+            wallet_address, network, state
         )
         all_threats.extend(behavioral_threats)
 
@@ -2,20 +2,36 @@
 """
 Transaction Queue System
 Manages pending transactions, retries, and status tracking
+
+Queued transactions are scheduled per (network, account): each account lane
+releases its transactions in nonce order, one at a time, and lanes compete
+for broadcast workers through a per-network binary heap keyed by priority
+and queue age. Enqueue and dequeue are amortized O(log n): heap entries of
+transactions that left the queue are skipped lazily and compacted once they
+outnumber live ones. A full queue rejects new work with ``QueueFullError``
+(or waits for room) instead of dropping it.
 """
 
 import asyncio
+import heapq
+import itertools
 import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
-from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Gas-bump replacements jump ahead of regular work on their network
+REPLACEMENT_PRIORITY_BOOST = 10
+# Heaps are rebuilt without stale entries past 2 x live + this slack
+HEAP_COMPACT_SLACK = 16
+FEE_FIELDS = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+
 
 class TransactionStatus(Enum):
     """Transaction status"""
@@ -26,6 +42,11 @@ class TransactionStatus(Enum):
     CONFIRMED = "confirmed"
     FAILED = "failed"
     CANCELLED = "cancelled"
+    REPLACED = "replaced"
+
+
+class QueueFullError(Exception):
+    """Raised when the queue has no room for another transaction"""
 
 
 @dataclass
@@ -47,18 +68,229 @@ class QueuedTransaction:
     confirmations: int = 0
     required_confirmations: int = 1
     metadata: Dict[str, Any] = field(default_factory=dict)
+    tx_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    queued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def lane(self) -> Tuple[str, int]:
+        return (self.network, self.account_index)
+
+    @property
+    def nonce(self) -> Optional[int]:
+        nonce = self.tx_data.get("nonce")
+        if isinstance(nonce, str):
+            return int(nonce, 0)
+        return nonce
+
+
+@dataclass
+class _AccountLane:
+    """Nonce-ordered transactions of one (network, account)"""
+    key: Tuple[str, int]
+    # (nonce order, enqueue sequence, tx) and (-priority, enqueue sequence, tx);
+    # an entry is live only while ``live`` maps its tx to that sequence
+    heap: List[Tuple[Tuple[int, int], int, QueuedTransaction]] = field(default_factory=list)
+    by_priority: List[Tuple[int, int, QueuedTransaction]] = field(default_factory=list)
+    live: Dict[str, int] = field(default_factory=dict)
+    in_flight: Optional[QueuedTransaction] = None
+    version: int = 0
+    # (-priority, head sequence) of the entry currently on the network heap
+    published: Optional[Tuple[int, int]] = None
+
+    def is_live(self, entry: Tuple[Any, int, QueuedTransaction]) -> bool:
+        return self.live.get(entry[2].tx_id) == entry[1]
+
+    def prune(self):
+        """Drop stale heap tops, and rebuild the heaps once mostly stale"""
+        if len(self.heap) > 2 * len(self.live) + HEAP_COMPACT_SLACK:
+            self.heap = [entry for entry in self.heap if self.is_live(entry)]
+            self.by_priority = [entry for entry in self.by_priority if self.is_live(entry)]
+            heapq.heapify(self.heap)
+            heapq.heapify(self.by_priority)
+        while self.heap and not self.is_live(self.heap[0]):
+            heapq.heappop(self.heap)
+        while self.by_priority and not self.is_live(self.by_priority[0]):
+            heapq.heappop(self.by_priority)
+
+
+def bump_gas_fees(tx_data: Dict[str, Any], bump_percent: float = 12.5) -> Dict[str, Any]:
+    """
+    Copy of ``tx_data`` with every fee field raised by at least ``bump_percent``
+    (nodes require >= 10% to accept a same-nonce replacement)
+    """
+    bump_bps = int(bump_percent * 100)
+    bumped = dict(tx_data)
+    for fee_field in FEE_FIELDS:
+        value = tx_data.get(fee_field)
+        if value is None:
+            continue
+        amount = int(value, 0) if isinstance(value, str) else int(value)
+        amount += max(1, -(-amount * bump_bps // 10000))
+        bumped[fee_field] = hex(amount) if isinstance(value, str) else amount
+    return bumped
 
 
 class TransactionQueue:
     """Transaction queue manager"""
-    
+
     def __init__(self, max_queue_size: int = 100):
-        self.queue: deque = deque(maxlen=max_queue_size)
+        self.max_queue_size = max_queue_size
         self.pending: Dict[str, QueuedTransaction] = {}
         self.completed: Dict[str, QueuedTransaction] = {}
         self.running = False
         self._lock = asyncio.Lock()
-        
+        self._changed = asyncio.Condition(self._lock)
+
+        # Scheduling state
+        self._lanes: Dict[Tuple[str, int], _AccountLane] = {}
+        self._ready: Dict[str, List[Tuple[int, int, int, Tuple[str, int]]]] = {}
+        self._ready_live: Dict[str, int] = {}
+        self._queued: Dict[str, QueuedTransaction] = {}
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+
+        self.metrics = {
+            "enqueued": 0,
+            "dequeued": 0,
+            "rejected": 0,
+            "retried": 0,
+            "replaced": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    @property
+    def queue(self) -> List[QueuedTransaction]:
+        """Queued transactions in scheduling order (snapshot)"""
+        return sorted(self._queued.values(), key=lambda tx: (-tx.priority, tx.queued_at))
+
+    # ------------------------------------------------------------------
+    # Scheduling internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _push_locked(self, queued_tx: QueuedTransaction):
+        queued_tx.status = TransactionStatus.QUEUED
+        queued_tx.queued_at = time.monotonic()
+        lane = self._lanes.get(queued_tx.lane)
+        if lane is None:
+            lane = self._lanes[queued_tx.lane] = _AccountLane(queued_tx.lane)
+
+        nonce = queued_tx.nonce
+        seq = next(self._sequence)
+        # Nonced transactions go out in nonce order, the rest in arrival order
+        order = (0, nonce) if nonce is not None else (1, seq)
+        lane.live[queued_tx.tx_id] = seq
+        heapq.heappush(lane.heap, (order, seq, queued_tx))
+        heapq.heappush(lane.by_priority, (-queued_tx.priority, seq, queued_tx))
+        self._queued[queued_tx.tx_id] = queued_tx
+        self._schedule_locked(lane)
+        self._changed.notify_all()
+
+    def _schedule_locked(self, lane: _AccountLane):
+        """(Re)publish a lane's head on its network heap, if it has one to run"""
+        lane.prune()
+        network = lane.key[0]
+        if lane.in_flight is not None or not lane.live:
+            self._unpublish_locked(lane)
+            if lane.in_flight is None:
+                self._lanes.pop(lane.key, None)
+            return
+
+        # A lane runs at its most urgent transaction's priority so an urgent
+        # tx is not starved behind a low-priority lower nonce
+        published = (lane.by_priority[0][0], lane.heap[0][1])
+        if lane.published == published:
+            return
+        self._unpublish_locked(lane)
+        # Versions come from the global sequence so a recreated lane never
+        # revalidates entries left behind by its predecessor
+        lane.version = next(self._sequence)
+        lane.published = published
+        self._ready_live[network] = self._ready_live.get(network, 0) + 1
+        heapq.heappush(self._ready.setdefault(network, []), (*published, lane.version, lane.key))
+
+    def _unpublish_locked(self, lane: _AccountLane):
+        """Invalidate a lane's network heap entry; compact the heap once mostly stale"""
+        if lane.published is None:
+            return
+        network = lane.key[0]
+        lane.published = None
+        self._ready_live[network] -= 1
+        ready = self._ready.get(network, [])
+        if len(ready) > 2 * self._ready_live[network] + HEAP_COMPACT_SLACK:
+            ready[:] = [entry for entry in ready if self._is_ready_live(entry)]
+            heapq.heapify(ready)
+
+    def _is_ready_live(self, entry: Tuple[int, int, int, Tuple[str, int]]) -> bool:
+        lane = self._lanes.get(entry[3])
+        return lane is not None and lane.published is not None and lane.version == entry[2]
+
+    def _ready_top_locked(self, network: str) -> Optional[Tuple[int, int, int, Tuple[str, int]]]:
+        ready = self._ready.get(network)
+        while ready and not self._is_ready_live(ready[0]):
+            heapq.heappop(ready)
+        return ready[0] if ready else None
+
+    def _pop_ready_locked(self, network: Optional[str]) -> Optional[QueuedTransaction]:
+        if network is None:
+            # Best head across networks
+            tops = [(top[:2], n) for n in list(self._ready) if (top := self._ready_top_locked(n))]
+            if not tops:
+                return None
+            network = min(tops)[1]
+
+        if self._ready_top_locked(network) is None:
+            return None
+        key = heapq.heappop(self._ready[network])[3]
+        lane = self._lanes[key]
+        self._unpublish_locked(lane)
+
+        # A published lane's pruned heap top is live
+        _, _, queued_tx = heapq.heappop(lane.heap)
+        del lane.live[queued_tx.tx_id]
+        lane.in_flight = queued_tx
+        self._queued.pop(queued_tx.tx_id, None)
+        queued_tx.status = TransactionStatus.PENDING
+
+        waited = time.monotonic() - queued_tx.queued_at
+        self.metrics["dequeued"] += 1
+        self.metrics["total_wait_seconds"] += waited
+        self.metrics["max_wait_seconds"] = max(self.metrics["max_wait_seconds"], waited)
+        self._changed.notify_all()  # room for blocked producers
+        return queued_tx
+
+    def _release_lane_locked(self, queued_tx: QueuedTransaction):
+        """Let the next nonce of an account go once this one is handed off"""
+        lane = self._lanes.get(queued_tx.lane)
+        if lane is not None and lane.in_flight is queued_tx:
+            lane.in_flight = None
+            self._schedule_locked(lane)
+            self._changed.notify_all()
+
+    def _discard_queued_locked(self, queued_tx: QueuedTransaction):
+        """Drop a still-queued tx from its lane; heap entries go lazily"""
+        if self._queued.pop(queued_tx.tx_id, None) is not None:
+            lane = self._lanes.get(queued_tx.lane)
+            if lane is not None:
+                lane.live.pop(queued_tx.tx_id, None)
+                self._schedule_locked(lane)
+            self._changed.notify_all()
+
+    def _mark_failed_locked(self, tx_hash: str, error: str, queued_tx: Optional[QueuedTransaction] = None):
+        tx = self.pending.pop(tx_hash, None) or queued_tx
+        if tx is None:
+            return
+        tx.status = TransactionStatus.FAILED
+        tx.error = error
+        self.completed[tx.tx_hash or tx.tx_id] = tx
+        self._release_lane_locked(tx)
+
+        logger.error("Transaction failed", tx_hash=tx_hash, error=error)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     async def add_transaction(
         self,
         tx_data: Dict[str, Any],
@@ -67,10 +299,32 @@ class TransactionQueue:
         account_index: int = 0,
         priority: int = 0,
         max_retries: int = 3,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        wait: bool = False,
+        timeout: Optional[float] = None,
     ) -> QueuedTransaction:
-        """Add transaction to queue"""
+        """
+        Add transaction to queue
+
+        When the queue is full this raises ``QueueFullError``, or with
+        ``wait=True`` blocks until a worker frees room (up to ``timeout``).
+        """
         async with self._lock:
+            if len(self._queued) >= self.max_queue_size:
+                if not wait:
+                    self.metrics["rejected"] += 1
+                    raise QueueFullError(f"Transaction queue full ({self.max_queue_size})")
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(self._queued) < self.max_queue_size),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    self.metrics["rejected"] += 1
+                    raise QueueFullError(
+                        f"Transaction queue full ({self.max_queue_size}) after {timeout}s"
+                    ) from None
+
             queued_tx = QueuedTransaction(
                 tx_data=tx_data,
                 chain_id=chain_id,
@@ -80,45 +334,68 @@ class TransactionQueue:
                 max_retries=max_retries,
                 metadata=metadata or {}
             )
-            
-            # Insert based on priority
-            inserted = False
-            for i, existing in enumerate(self.queue):
-                if priority > existing.priority:
-                    self.queue.insert(i, queued_tx)
-                    inserted = True
-                    break
-            
-            if not inserted:
-                self.queue.append(queued_tx)
-            
+            self._push_locked(queued_tx)
+            self.metrics["enqueued"] += 1
+
             logger.info(
                 "Transaction queued",
-                queue_size=len(self.queue),
+                queue_size=len(self._queued),
                 priority=priority,
                 network=network
             )
-            
+
             return queued_tx
-    
-    async def get_next_transaction(self) -> Optional[QueuedTransaction]:
-        """Get next transaction from queue"""
+
+    async def get_next_transaction(self, network: Optional[str] = None) -> Optional[QueuedTransaction]:
+        """
+        Get next transaction from queue
+
+        Returns the highest-priority (then oldest) transaction whose account
+        has no other transaction in flight, optionally limited to one network.
+        """
         async with self._lock:
-            if not self.queue:
-                return None
-            
-            return self.queue.popleft()
-    
+            return self._pop_ready_locked(network)
+
+    async def wait_next_transaction(
+        self, network: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Optional[QueuedTransaction]:
+        """Like ``get_next_transaction`` but waits for work; None on timeout"""
+        async with self._lock:
+            queued_tx = self._pop_ready_locked(network)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while queued_tx is None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+                queued_tx = self._pop_ready_locked(network)
+            return queued_tx
+
     async def mark_broadcasting(self, tx_hash: str, queued_tx: QueuedTransaction):
         """Mark transaction as broadcasting"""
         async with self._lock:
+            was_queued = queued_tx.status is TransactionStatus.QUEUED
             queued_tx.tx_hash = tx_hash
             queued_tx.status = TransactionStatus.BROADCASTING
+            if was_queued:
+                # Broadcast by the caller without going through a worker
+                self._discard_queued_locked(queued_tx)
             queued_tx.broadcast_at = datetime.utcnow()
             self.pending[tx_hash] = queued_tx
-            
+            self._release_lane_locked(queued_tx)
+
+            replaced_hash = queued_tx.metadata.get("replaces")
+            replaced = self.pending.pop(replaced_hash, None) if replaced_hash else None
+            if replaced is not None:
+                replaced.status = TransactionStatus.REPLACED
+                self.completed[replaced_hash] = replaced
+                self.metrics["replaced"] += 1
+
             logger.info("Transaction broadcasting", tx_hash=tx_hash)
-    
+
     async def mark_confirming(self, tx_hash: str, confirmations: int = 0):
         """Mark transaction as confirming"""
         async with self._lock:
@@ -130,7 +407,7 @@ class TransactionQueue:
                     tx_hash=tx_hash,
                     confirmations=confirmations
                 )
-    
+
     async def mark_confirmed(self, tx_hash: str, confirmations: int):
         """Mark transaction as confirmed"""
         async with self._lock:
@@ -140,93 +417,228 @@ class TransactionQueue:
                 tx.confirmed_at = datetime.utcnow()
                 tx.confirmations = confirmations
                 self.completed[tx_hash] = tx
-                
+
+                # The original landed before its gas-bump replacement went out
+                replacement = self._queued.get(tx.metadata.get("replaced_by", ""))
+                if replacement is not None:
+                    replacement.status = TransactionStatus.CANCELLED
+                    self._discard_queued_locked(replacement)
+
                 logger.info(
                     "Transaction confirmed",
                     tx_hash=tx_hash,
                     confirmations=confirmations
                 )
-    
-    async def mark_failed(self, tx_hash: str, error: str):
+
+    async def mark_failed(self, tx_hash: str, error: str, queued_tx: Optional[QueuedTransaction] = None):
         """Mark transaction as failed"""
         async with self._lock:
-            if tx_hash in self.pending:
-                tx = self.pending.pop(tx_hash)
-                tx.status = TransactionStatus.FAILED
-                tx.error = error
-                self.completed[tx_hash] = tx
-                
-                logger.error("Transaction failed", tx_hash=tx_hash, error=error)
-    
-    async def retry_transaction(self, queued_tx: QueuedTransaction) -> bool:
+            self._mark_failed_locked(tx_hash, error, queued_tx)
+
+    async def retry_transaction(self, queued_tx: QueuedTransaction, error: Optional[str] = None) -> bool:
         """Retry a failed transaction"""
         async with self._lock:
             if queued_tx.retry_count >= queued_tx.max_retries:
-                await self.mark_failed(
+                self._mark_failed_locked(
                     queued_tx.tx_hash or "unknown",
-                    f"Max retries ({queued_tx.max_retries}) exceeded"
+                    f"Max retries ({queued_tx.max_retries}) exceeded" + (f": {error}" if error else ""),
+                    queued_tx,
                 )
                 return False
-            
+
+            if queued_tx.tx_hash:
+                self.pending.pop(queued_tx.tx_hash, None)
             queued_tx.retry_count += 1
-            queued_tx.status = TransactionStatus.QUEUED
-            queued_tx.error = None
-            
-            # Re-queue with same priority
-            inserted = False
-            for i, existing in enumerate(self.queue):
-                if queued_tx.priority > existing.priority:
-                    self.queue.insert(i, queued_tx)
-                    inserted = True
-                    break
-            
-            if not inserted:
-                self.queue.append(queued_tx)
-            
+            queued_tx.error = error
+
+            # Back into its lane ahead of higher nonces, with the same priority
+            lane = self._lanes.get(queued_tx.lane)
+            if lane is not None and lane.in_flight is queued_tx:
+                lane.in_flight = None
+            self._push_locked(queued_tx)
+            self.metrics["retried"] += 1
+
             logger.info(
                 "Transaction retry queued",
                 retry_count=queued_tx.retry_count,
                 max_retries=queued_tx.max_retries
             )
-            
+
             return True
-    
+
+    async def bump_stuck_transactions(
+        self,
+        stuck_after_seconds: float = 180.0,
+        bump_percent: float = 12.5,
+        max_bumps: int = 3,
+    ) -> List[QueuedTransaction]:
+        """
+        Queue same-nonce replacements with raised fees for broadcast
+        transactions that have not confirmed within ``stuck_after_seconds``
+
+        Replacements carry ``metadata["replaces"]`` and run at boosted
+        priority; the original is marked REPLACED once its replacement is
+        broadcast. Workers must re-sign ``tx_data`` before sending.
+        """
+        now = datetime.utcnow()
+        replacements = []
+        async with self._lock:
+            for tx_hash, tx in list(self.pending.items()):
+                if tx.confirmations > 0 or not tx.broadcast_at:
+                    continue
+                if tx.metadata.get("replaced_by") or tx.metadata.get("bump_count", 0) >= max_bumps:
+                    continue
+                if (now - tx.broadcast_at).total_seconds() < stuck_after_seconds:
+                    continue
+                if tx.nonce is None:
+                    continue  # replacement needs the original nonce
+
+                replacement = QueuedTransaction(
+                    tx_data=bump_gas_fees(tx.tx_data, bump_percent),
+                    chain_id=tx.chain_id,
+                    network=tx.network,
+                    account_index=tx.account_index,
+                    priority=tx.priority + REPLACEMENT_PRIORITY_BOOST,
+                    max_retries=tx.max_retries,
+                    required_confirmations=tx.required_confirmations,
+                    metadata={
+                        **tx.metadata,
+                        "replaces": tx_hash,
+                        "bump_count": tx.metadata.get("bump_count", 0) + 1,
+                    },
+                )
+                replacement.metadata.pop("replaced_by", None)
+                tx.metadata["replaced_by"] = replacement.tx_id
+                self._push_locked(replacement)
+                self.metrics["enqueued"] += 1
+                replacements.append(replacement)
+
+                logger.info(
+                    "Stuck transaction queued for gas bump",
+                    tx_hash=tx_hash,
+                    nonce=tx.nonce,
+                    bump_count=replacement.metadata["bump_count"],
+                )
+        return replacements
+
     async def cancel_transaction(self, tx_hash: str) -> bool:
         """Cancel a pending transaction"""
         async with self._lock:
-            # Check queue
-            for tx in self.queue:
-                if tx.tx_hash == tx_hash:
+            # Check queue (by hash or queue id)
+            for tx in list(self._queued.values()):
+                if tx_hash in (tx.tx_hash, tx.tx_id):
                     tx.status = TransactionStatus.CANCELLED
-                    self.queue.remove(tx)
+                    self._discard_queued_locked(tx)
                     logger.info("Transaction cancelled from queue", tx_hash=tx_hash)
                     return True
-            
+
             # Check pending
             if tx_hash in self.pending:
                 self.pending[tx_hash].status = TransactionStatus.CANCELLED
                 del self.pending[tx_hash]
                 logger.info("Transaction cancelled", tx_hash=tx_hash)
                 return True
-            
+
             return False
-    
+
+    # ------------------------------------------------------------------
+    # Broadcast workers
+    # ------------------------------------------------------------------
+
+    async def start_workers(
+        self,
+        broadcast: Callable[[QueuedTransaction], Awaitable[str]],
+        networks: Iterable[str],
+        workers_per_chain: int = 2,
+    ):
+        """
+        Run ``workers_per_chain`` broadcast workers for each network
+
+        ``broadcast`` signs and sends a transaction and returns its hash;
+        exceptions trigger ``retry_transaction``. Accounts stay serialized,
+        so concurrency comes from different accounts on the same chain.
+        """
+        if self.running:
+            return
+        self.running = True
+        for network in networks:
+            for _ in range(workers_per_chain):
+                self._workers.append(asyncio.create_task(self._broadcast_worker(network, broadcast)))
+        logger.info("Transaction broadcast workers started", workers=len(self._workers))
+
+    async def stop_workers(self):
+        """Stop broadcast workers; queued transactions stay queued"""
+        self.running = False
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    async def _broadcast_worker(self, network: str, broadcast: Callable[[QueuedTransaction], Awaitable[str]]):
+        while self.running:
+            queued_tx = await self.wait_next_transaction(network, timeout=1.0)
+            if queued_tx is None:
+                continue
+            queued_tx.status = TransactionStatus.BROADCASTING
+            try:
+                tx_hash = await broadcast(queued_tx)
+            except asyncio.CancelledError:
+                await self.retry_transaction(queued_tx, "worker stopped")
+                raise
+            except Exception as e:
+                logger.warning("Transaction broadcast failed", network=network, error=str(e))
+                await self.retry_transaction(queued_tx, str(e))
+                continue
+            await self.mark_broadcasting(tx_hash, queued_tx)
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def _queue_metrics_locked(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        by_network: Dict[str, Dict[str, Any]] = {}
+        for tx in self._queued.values():
+            stats = by_network.setdefault(tx.network, {"queued": 0, "oldest_age_seconds": 0.0})
+            stats["queued"] += 1
+            stats["oldest_age_seconds"] = max(stats["oldest_age_seconds"], now - tx.queued_at)
+
+        dequeued = self.metrics["dequeued"]
+        return {
+            **self.metrics,
+            "avg_wait_seconds": self.metrics["total_wait_seconds"] / dequeued if dequeued else 0.0,
+            "oldest_queued_age_seconds": max(
+                (s["oldest_age_seconds"] for s in by_network.values()), default=0.0
+            ),
+            "capacity": self.max_queue_size,
+            "accounts_in_flight": sum(1 for lane in self._lanes.values() if lane.in_flight),
+            "workers": len(self._workers),
+            "networks": by_network,
+        }
+
     async def get_queue_status(self) -> Dict[str, Any]:
         """Get queue status"""
         async with self._lock:
+            head = heapq.nsmallest(
+                10, self._queued.values(), key=lambda tx: (-tx.priority, tx.queued_at)
+            )
             return {
-                "queue_size": len(self.queue),
+                "queue_size": len(self._queued),
                 "pending_count": len(self.pending),
                 "completed_count": len(self.completed),
+                "metrics": self._queue_metrics_locked(),
                 "queued": [
                     {
                         "tx_hash": tx.tx_hash,
+                        "tx_id": tx.tx_id,
                         "network": tx.network,
+                        "account_index": tx.account_index,
+                        "nonce": tx.nonce,
                         "priority": tx.priority,
                         "status": tx.status.value,
                         "created_at": tx.created_at.isoformat(),
                     }
-                    for tx in list(self.queue)[:10]  # First 10
+                    for tx in head  # First 10
                 ],
                 "pending": [
                     {
@@ -239,7 +651,7 @@ class TransactionQueue:
                     for tx in list(self.pending.values())[:10]  # First 10
                 ],
             }
-    
+
     async def get_transaction(self, tx_hash: str) -> Optional[QueuedTransaction]:
         """Get transaction by hash"""
         async with self._lock:
@@ -247,21 +659,22 @@ class TransactionQueue:
                 return self.pending[tx_hash]
             if tx_hash in self.completed:
                 return self.completed[tx_hash]
-            return None
-    
+            return self._queued.get(tx_hash)
+
     async def clear_completed(self, older_than_hours: int = 24):
         """Clear old completed transactions"""
         async with self._lock:
             cutoff = datetime.utcnow().timestamp() - (older_than_hours * 3600)
             to_remove = []
-            
+
             for tx_hash, tx in self.completed.items():
-                if tx.confirmed_at and tx.confirmed_at.timestamp() < cutoff:
+                finished_at = tx.confirmed_at or tx.broadcast_at or tx.created_at
+                if finished_at.timestamp() < cutoff:
                     to_remove.append(tx_hash)
-            
+
             for tx_hash in to_remove:
                 del self.completed[tx_hash]
-            
+
             logger.info("Cleared completed transactions", count=len(to_remove))
 
 
@@ -275,4 +688,3 @@ def get_transaction_queue() -> TransactionQueue:
     if _transaction_queue is None:
         _transaction_queue = TransactionQueue()
     return _transaction_queue
-
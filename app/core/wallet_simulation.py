@@ -5,17 +5,21 @@ Production-ready implementation with real blockchain simulation for risk detecti
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
 import structlog
 from web3 import Web3
 
+from .simulation_cache import SimulationCacheKey, SimulationResultCache
+from .state_snapshot import COMMON_TOKENS, MULTICALL3_ADDRESS, StateSnapshotter
+
 try:
     from web3.middleware import geth_poa_middleware
 except ImportError:
@@ -158,7 +162,15 @@ class RealWalletSimulationEngine:
         self.simulation_engines: dict[str, Any] = {}
         self.fork_endpoints: dict[str, str] = {}
         self.risk_patterns: dict[RiskType, list[dict]] = {}
-        self.simulation_cache: dict[str, SimulationResult] = {}
+        cache_config = config.get("simulation_cache", {})
+        self.simulation_cache = SimulationResultCache(
+            max_entries=cache_config.get("max_entries", 1024),
+            ttl_seconds=cache_config.get("ttl_seconds", 30.0),
+        )
+        self.block_number_max_age = cache_config.get("block_number_max_age", 1.0)
+        self.state_snapshotter = StateSnapshotter(
+            config.get("multicall_address", MULTICALL3_ADDRESS)
+        )
 
         # Initialize Web3 connections and real simulation engines
         self._initialize_web3_connections()
@@ -255,6 +267,35 @@ class RealWalletSimulationEngine:
                     sim_config, None
                 )
 
+        # In-process EVM forked from each network's RPC; fastest, so preferred when present
+        local_evm_config = simulation_config.get("local_evm")
+        if local_evm_config:
+            for network_name, network_config in networks.items():
+                sim_config = SimulationConfigCls(
+                    provider=SimulationProviderCls.LOCAL_EVM,
+                    network=(
+                        SimulationNetworkCls.MAINNET
+                        if network_name == "ethereum"
+                        else SimulationNetworkCls.POLYGON
+                    ),
+                    rpc_url=network_config["rpc_url"],
+                    fork_block_number=network_config.get("fork_block_number"),
+                    timeout=simulation_config.get("timeout", 60),
+                    gas_limit=simulation_config.get("gas_limit", 30000000),
+                    evm_fork=local_evm_config.get("evm_fork", "prague")
+                    if isinstance(local_evm_config, dict)
+                    else "prague",
+                )
+
+                try:
+                    self.simulation_engines[f"{network_name}_local_evm"] = RealBlockchainSimulationCls(
+                        sim_config, None
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Local EVM simulation unavailable", network=network_name, error=str(e)
+                    )
+
         logger.info("Real simulation engines initialized", count=len(self.simulation_engines))
 
     def _initialize_risk_patterns(self):
@@ -332,11 +373,115 @@ class RealWalletSimulationEngine:
         """
         transaction_id = f"sim_{hashlib.sha256(json.dumps(transaction, sort_keys=True).encode()).hexdigest()[:16]}"
 
-        # Check cache first
-        if transaction_id in self.simulation_cache:
-            logger.info("Using cached simulation result", transaction_id=transaction_id)
-            return self.simulation_cache[transaction_id]
+        cache_key = await self._simulation_cache_key(
+            transaction_id, transaction, wallet_address, network
+        )
+        if cache_key is None:
+            return await self._run_simulation(
+                transaction_id, transaction, wallet_address, network, simulation_depth
+            )
 
+        # Identical requests at the same block and nonces share one simulation
+        return await self.simulation_cache.get_or_compute(
+            cache_key,
+            lambda: self._run_simulation(
+                transaction_id, transaction, wallet_address, network, simulation_depth
+            ),
+            cacheable=lambda result: result.executed_successfully,
+        )
+
+    async def simulate_bundle(
+        self,
+        transactions: list[dict[str, Any]],
+        wallet_address: str,
+        network: str = "ethereum",
+        block_number: int | None = None,
+    ) -> Any:
+        """
+        Simulate an ordered bundle on one fork state; transactions without a
+        sender are sent from ``wallet_address``. Needs a local EVM engine.
+        """
+        engine = self._bundle_engine(network)
+        bundle = [{"from": wallet_address, **transaction} for transaction in transactions]
+        return await engine.simulate_bundle(bundle, block_number)
+
+    async def simulate_sweep(
+        self,
+        transactions: list[dict[str, Any]],
+        variants: list[dict[str, Any]],
+        wallet_address: str,
+        network: str = "ethereum",
+        index: int = -1,
+        block_number: int | None = None,
+    ) -> list[Any]:
+        """Run one bundle per variant of ``transactions[index]`` in parallel on one fork block"""
+        engine = self._bundle_engine(network)
+        bundle = [{"from": wallet_address, **transaction} for transaction in transactions]
+        return await engine.simulate_sweep(bundle, variants, index, block_number)
+
+    def _bundle_engine(self, network: str) -> Any:
+        engine = self.simulation_engines.get(f"{network}_local_evm")
+        if engine is None:
+            raise ValueError(f"Bundle simulation needs a local EVM engine for network {network}")
+        return engine
+
+    async def _simulation_cache_key(
+        self,
+        transaction_id: str,
+        transaction: dict[str, Any],
+        wallet_address: str,
+        network: str,
+    ) -> SimulationCacheKey | None:
+        """
+        Key a simulation by the block and account nonces it runs against.
+
+        Building the key costs one pending-nonce read per account on every
+        call, hits included: that is the price of never serving a verdict once
+        the sender has sent another transaction, and it is far cheaper than a
+        simulation. The block number is taken from ``on_new_block`` when a
+        block feed (or a recent key) reported it within ``block_number_max_age``.
+        """
+        w3 = self.web3_clients.get(network)
+        if not w3:
+            return None
+
+        accounts = sorted({a.lower() for a in (wallet_address, transaction.get("from")) if a})
+        block_number = self.simulation_cache.current_block(network, self.block_number_max_age)
+        reads = [
+            asyncio.to_thread(w3.eth.get_transaction_count, Web3.to_checksum_address(a), "pending")
+            for a in accounts
+        ]
+        if block_number is None:
+            reads.append(asyncio.to_thread(lambda: w3.eth.block_number))
+        try:
+            results = await asyncio.gather(*reads)
+        except Exception as e:
+            logger.warning("Could not read chain state for simulation cache", error=str(e))
+            return None
+
+        nonces = results[: len(accounts)]
+        if block_number is None:
+            block_number = results[-1]
+            self.on_new_block(network, block_number)
+        return SimulationCacheKey(
+            transaction_id=transaction_id,
+            network=network,
+            block_number=block_number,
+            account_nonces=tuple(zip(accounts, nonces)),
+        )
+
+    def on_new_block(self, network: str, block_number: int) -> int:
+        """Per-block hook: drop cached verdicts computed against older state"""
+        return self.simulation_cache.on_new_block(network, block_number)
+
+    async def _run_simulation(
+        self,
+        transaction_id: str,
+        transaction: dict[str, Any],
+        wallet_address: str,
+        network: str,
+        simulation_depth: int,
+    ) -> SimulationResult:
         start_time = time.time()
 
         try:
@@ -348,7 +493,9 @@ class RealWalletSimulationEngine:
             )
 
             # Initialize simulation state
-            simulation_state = await self._initialize_simulation_state(wallet_address, network)
+            simulation_state = await self._initialize_simulation_state(
+                wallet_address, network, [transaction["to"]] if transaction.get("to") else None
+            )
 
             # Execute simulation
             simulation_metrics = await self._execute_simulation(
@@ -386,9 +533,6 @@ class RealWalletSimulationEngine:
                 simulation_timestamp=datetime.now(timezone.utc),
             )
 
-            # Cache result
-            self.simulation_cache[transaction_id] = result
-
             logger.info(
                 "Transaction simulation completed",
                 transaction_id=transaction_id,
@@ -420,7 +564,7 @@ class RealWalletSimulationEngine:
             )
 
     async def _initialize_simulation_state(
-        self, wallet_address: str, network: str
+        self, wallet_address: str, network: str, spenders: list[str] | None = None
     ) -> dict[str, Any]:
         """Initialize simulation state with current blockchain state"""
         w3 = self.web3_clients.get(network)
@@ -428,24 +572,39 @@ class RealWalletSimulationEngine:
             raise ValueError(f"Network {network} not configured")
 
         try:
-            # Get current state
-            balance = w3.eth.get_balance(wallet_address)
-            nonce = w3.eth.get_transaction_count(wallet_address)
-            code = w3.eth.get_code(wallet_address)
+            # Balances, allowances and block context come from one multicall;
+            # the three calls Multicall3 cannot answer run alongside it
+            snapshot, nonce, code, gas_price = await asyncio.gather(
+                self.state_snapshotter.snapshot(
+                    w3,
+                    network,
+                    wallet_address,
+                    self._tracked_tokens(network),
+                    self._approval_spenders(network, spenders),
+                ),
+                asyncio.to_thread(w3.eth.get_transaction_count, wallet_address),
+                asyncio.to_thread(w3.eth.get_code, wallet_address),
+                asyncio.to_thread(lambda: w3.eth.gas_price),
+            )
 
-            # Get token approvals (simplified - would need contract interaction)
-            token_approvals = await self._get_token_approvals(wallet_address, network)
+            primary_spender = spenders[0] if spenders else None
+            if primary_spender:
+                primary_spender = Web3.to_checksum_address(primary_spender)
 
             simulation_state = {
                 "wallet_address": wallet_address,
                 "network": network,
-                "initial_balance": balance,
+                "initial_balance": snapshot.native_balance or 0,
                 "initial_nonce": nonce,
                 "is_contract": len(code) > 0,
-                "token_approvals": token_approvals,
-                "simulation_block": w3.eth.block_number,
-                "gas_price": w3.eth.gas_price,
-                "block_timestamp": w3.eth.get_block("latest")["timestamp"],
+                "token_approvals": {
+                    address: token.to_approval_dict(primary_spender)
+                    for address, token in snapshot.tokens.items()
+                },
+                "simulation_block": snapshot.block_number,
+                "gas_price": gas_price,
+                "block_timestamp": snapshot.block_timestamp,
+                "state_round_trips": snapshot.round_trips,
             }
 
             return simulation_state
@@ -454,83 +613,37 @@ class RealWalletSimulationEngine:
             logger.error("Failed to initialize simulation state", error=str(e))
             raise
 
-    async def _get_token_approvals(
-        self, wallet_address: str, network: str
-    ) -> dict[str, dict[str, float]]:
-        """Get current token approvals for the wallet"""
-        approvals = {}
+    def _tracked_tokens(self, network: str) -> dict[str, str]:
+        """Tokens whose balances and approvals are read before simulating"""
+        return self.config.get("tracked_tokens", {}).get(network) or COMMON_TOKENS.get(network, {})
 
-        # Common ERC-20 tokens to check
-        common_tokens = {
-            "ethereum": {
-                "USDC": "0xA0b86a33E6417c4d3F4E6B4B8B5A5A5A5A5A5A5A",
-                "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
-                "DAI": "0x6B175474E89094C44Da98b954EedeAC495271d0F",
-                "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
-                "USDC": "0xA0b86a33E6417c4d3F4E6B4B8B5A5A5A5A5A5A5A",
-            },
-            "polygon": {
-                "USDC": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
-                "USDT": "0xc2132D05D31c914a87C6611C10748AEb04B58e8F",
-                "DAI": "0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c6A063",
-                "WMATIC": "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270",
-            },
-            "bsc": {
-                "USDT": "0x55d398326f99059fF775485246999027B3197955",
-                "USDC": "0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d",
-                "BUSD": "0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56",
-                "WBNB": "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c",
-            },
-        }
+    def _approval_spenders(self, network: str, spenders: list[str] | None) -> list[str]:
+        """Transaction target first, then configured spenders (routers, bridges)"""
+        configured = self.config.get("approval_spenders", {}).get(network, [])
+        return [s for s in [*(spenders or []), *configured] if s]
 
-        tokens = common_tokens.get(network, {})
+    async def _get_token_approvals(
+        self, wallet_address: str, network: str, spenders: list[str] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Get current token approvals and balances for the wallet"""
         w3 = self.web3_clients.get(network)
 
         if not w3:
             logger.warning("Web3 client not available for network", network=network)
-            return approvals
-
-        for token_name, token_address in tokens.items():
-            try:
-                # ERC-20 allowance function selector
-                allowance_selector = w3.keccak(text="allowance(address,address)")[:4]
-
-                # Encode parameters: owner (wallet_address), spender (wallet_address)
-                owner_encoded = wallet_address[2:].zfill(64)
-                spender_encoded = wallet_address[2:].zfill(64)
-
-                # Create call data
-                call_data = allowance_selector.hex() + owner_encoded + spender_encoded
-
-                # Make contract call
-                result = w3.eth.call(
-                    {"to": token_address, "data": call_data, "from": wallet_address}
-                )
-
-                # Decode result (uint256)
-                allowance = int(result.hex(), 16)
-
-                # Get token symbol
-                symbol_selector = w3.keccak(text="symbol()")[:4]
-                symbol_result = w3.eth.call(
-                    {"to": token_address, "data": symbol_selector.hex(), "from": wallet_address}
-                )
-
-                # Decode symbol (simplified)
-                symbol = token_name  # Fallback to known symbol
-
-                approvals[token_address] = {
-                    "allowance": allowance / 1e18,  # Convert from wei
-                    "symbol": symbol,
-                    "decimals": 18,  # Most tokens use 18 decimals
-                }
-
-            except Exception as e:
-                logger.warning("Failed to get token approval", token=token_name, error=str(e))
-                # Still add the token with zero allowance
-                approvals[token_address] = {"allowance": 0.0, "symbol": token_name, "decimals": 18}
-
-        return approvals
+            return {}
+
+        snapshot = await self.state_snapshotter.snapshot(
+            w3,
+            network,
+            wallet_address,
+            self._tracked_tokens(network),
+            self._approval_spenders(network, spenders),
+        )
+        primary_spender = Web3.to_checksum_address(spenders[0]) if spenders else None
+        return {
+            address: token.to_approval_dict(primary_spender)
+            for address, token in snapshot.tokens.items()
+        }
 
     async def _execute_simulation(
         self,
@@ -550,15 +663,20 @@ class RealWalletSimulationEngine:
             # Prepare transaction for simulation
             sim_transaction = transaction.copy()
             sim_transaction["from"] = simulation_state["wallet_address"]
-            sim_transaction["gas"] = sim_transaction.get("gas", 21000)
 
-            # Estimate gas
-            try:
-                gas_estimate = w3.eth.estimate_gas(sim_transaction)
-                sim_transaction["gas"] = gas_estimate
-            except Exception as e:
-                logger.warning("Gas estimation failed", error=str(e))
+            if f"{network}_local_evm" in self.simulation_engines:
+                # The local fork reports exact gas used; skip the estimate round trip
                 gas_estimate = sim_transaction.get("gas", 21000)
+            else:
+                sim_transaction["gas"] = sim_transaction.get("gas", 21000)
+
+                # Estimate gas
+                try:
+                    gas_estimate = w3.eth.estimate_gas(sim_transaction)
+                    sim_transaction["gas"] = gas_estimate
+                except Exception as e:
+                    logger.warning("Gas estimation failed", error=str(e))
+                    gas_estimate = sim_transaction.get("gas", 21000)
 
             # Simulate transaction execution using real blockchain simulation
             simulation_result = await self._simulate_with_real_engine(
@@ -597,12 +715,14 @@ class RealWalletSimulationEngine:
     ) -> dict[str, Any]:
         """Simulate transaction using real blockchain simulation engine"""
         try:
-            # Try Tenderly first, then Foundry
+            # Try the local EVM fork first, then Tenderly, then Foundry
             simulation_engine = None
 
-            # Look for Tenderly simulation engine
+            local_evm_key = f"{network}_local_evm"
             tenderly_key = f"{network}_tenderly"
-            if tenderly_key in self.simulation_engines:
+            if local_evm_key in self.simulation_engines:
+                simulation_engine = self.simulation_engines[local_evm_key]
+            elif tenderly_key in self.simulation_engines:
                 simulation_engine = self.simulation_engines[tenderly_key]
                 logger.info("Using Tenderly simulation engine", network=network)
             else:
@@ -617,10 +737,16 @@ class RealWalletSimulationEngine:
                 result = await simulation_engine.simulate_transaction(transaction)
 
                 if result.success:
+                    # Approval events observed by engines that decode them (local EVM)
+                    approval_changes: dict[str, dict[str, int]] = {}
+                    for approval in (result.trace_data or {}).get("approvals", []):
+                        approval_changes.setdefault(approval["contract_address"], {})[
+                            approval["to"]
+                        ] = int(approval["value"])
                     return {
                         "gas_used": result.gas_used,
                         "balance_changes": result.balance_changes,
-                        "token_approval_changes": {},  # Extract from trace
+                        "token_approval_changes": approval_changes,
                         "contract_calls": result.contract_calls,
                         "events_emitted": result.logs,
                         "simulation_data": result.trace_data,
@@ -1095,30 +1221,21 @@ class RealWalletSimulationEngine:
         return recommendations
 
     def get_simulation_result(self, transaction_id: str) -> SimulationResult | None:
-        """Get cached simulation result"""
-        return self.simulation_cache.get(transaction_id)
+        """Get the latest cached simulation result for a transaction"""
+        return self.simulation_cache.latest_for(transaction_id)
 
     def cleanup_cache(self, max_age_hours: int = 24):
-        """Clean up old cached results"""
-        current_time = datetime.now(timezone.utc)
-        cutoff_time = current_time - timedelta(hours=max_age_hours)
-
-        expired_keys = [
-            tx_id
-            for tx_id, result in self.simulation_cache.items()
-            if result.simulation_timestamp < cutoff_time
-        ]
-
-        for key in expired_keys:
-            del self.simulation_cache[key]
+        """Clean up expired and old cached results"""
+        removed = self.simulation_cache.purge(max_age_seconds=max_age_hours * 3600)
 
-        if expired_keys:
-            logger.info("Cleaned up cached simulation results", count=len(expired_keys))
+        if removed:
+            logger.info("Cleaned up cached simulation results", count=removed)
 
     def get_metrics(self) -> dict[str, Any]:
         """Get simulation engine metrics"""
         return {
             "cached_results": len(self.simulation_cache),
+            "simulation_cache": self.simulation_cache.get_stats(),
             "networks_configured": list(self.web3_clients.keys()),
             "risk_patterns_loaded": sum(len(patterns) for patterns in self.risk_patterns.values()),
             "recent_simulations": len(
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Watchlist Scanner
+Block-driven wallet monitoring that matches each new block against a watchlist
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from config.settings import settings
+
+from .blockchain import AccountState, BlockchainProvider
+
+logger = structlog.get_logger(__name__)
+
+# Event topics carry indexed addresses left-padded to 32 bytes
+_TOPIC_ADDRESS_PADDING = b"\x00" * 12
+
+
+def _address_key(address: str | bytes | None) -> bytes | None:
+    """20-byte watchlist key for a hex address, or None if it isn't one"""
+    if address is None:
+        return None
+    if isinstance(address, bytes):
+        return address if len(address) == 20 else None
+    try:
+        raw = bytes.fromhex(address.removeprefix("0x"))
+    except ValueError:
+        return None
+    return raw if len(raw) == 20 else None
+
+
+def _topic_address(topic: str | bytes) -> bytes | None:
+    """Address embedded in an indexed event topic, if the topic looks like one"""
+    try:
+        raw = topic if isinstance(topic, bytes) else bytes.fromhex(topic.removeprefix("0x"))
+    except ValueError:
+        return None
+    if len(raw) == 32 and raw[:12] == _TOPIC_ADDRESS_PADDING:
+        return raw[12:]
+    return None
+
+
+@dataclass
+class WalletActivity:
+    """Activity touching one watched wallet within a scan"""
+
+    address: str
+    network: str
+    block_number: int
+    incoming_txs: list[str] = field(default_factory=list)
+    outgoing_txs: list[str] = field(default_factory=list)
+    log_count: int = 0
+    emitting_contracts: set[str] = field(default_factory=set)
+
+    @property
+    def transaction_hashes(self) -> list[str]:
+        return self.outgoing_txs + self.incoming_txs
+
+
+ActivityHandler = Callable[
+    [str, dict[str, WalletActivity], dict[str, AccountState]], Awaitable[None]
+]
+
+
+class WatchlistScanner:
+    """Scans each new block of one network once for watched wallets
+
+    Transactions are matched on ``from``/``to`` and logs on the emitting
+    address plus any address-shaped indexed topic (ERC-20/721 transfers,
+    approvals and similar). Balances and nonces are then refreshed only for
+    wallets that were touched, in batched JSON-RPC calls, so RPC cost scales
+    with chain activity rather than with the size of the watchlist.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        provider: BlockchainProvider,
+        on_activity: ActivityHandler,
+        poll_interval: float | None = None,
+        max_blocks_per_cycle: int = 20,
+    ):
+        self.network = network
+        self.provider = provider
+        self.on_activity = on_activity
+        self.poll_interval = poll_interval or settings.block_scan_interval
+        self.max_blocks_per_cycle = max_blocks_per_cycle
+
+        # 20-byte address -> watched wallet id as registered by the caller
+        self.watchlist: dict[bytes, str] = {}
+        self.last_block_number: int | None = None
+        self.head_block_number: int | None = None
+        self._task: asyncio.Task | None = None
+        self.stats = {
+            "blocks_scanned": 0,
+            "transactions_scanned": 0,
+            "logs_scanned": 0,
+            "wallets_touched": 0,
+            "rpc_batches": 0,
+            "errors": 0,
+        }
+
+    def watch(self, address: str) -> bool:
+        key = _address_key(address)
+        if key is None:
+            return False
+        self.watchlist[key] = address
+        return True
+
+    def unwatch(self, address: str):
+        key = _address_key(address)
+        if key is not None:
+            self.watchlist.pop(key, None)
+
+    def __contains__(self, address: str) -> bool:
+        return _address_key(address) in self.watchlist
+
+    def __len__(self) -> int:
+        return len(self.watchlist)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Started watchlist scanner", network=self.network)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("Stopped watchlist scanner", network=self.network)
+
+    async def _run(self):
+        while True:
+            cursor = self.last_block_number
+            try:
+                await self.scan_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error("Watchlist scan failed", network=self.network, error=str(e))
+            # Catch up without waiting while a backlog is draining
+            if self.last_block_number == cursor or self.last_block_number >= self.head_block_number:
+                await asyncio.sleep(self.poll_interval)
+
+    async def scan_once(self) -> dict[str, WalletActivity]:
+        """Scan blocks produced since the last scan and report touched wallets
+
+        Each cycle covers at most ``max_blocks_per_cycle`` blocks after the
+        cursor, and the cursor only advances through the blocks that were
+        fetched, so a lagging or flaky node delays blocks instead of skipping
+        them.
+        """
+        head = await self.provider.get_block_number()
+        self.head_block_number = head
+        if self.last_block_number is None or head < self.last_block_number:
+            # First run, or the chain was reorganized below our cursor
+            self.last_block_number = head - 1
+        if head <= self.last_block_number:
+            return {}
+
+        first = self.last_block_number + 1
+        last = min(head, self.last_block_number + self.max_blocks_per_cycle)
+        blocks, logs, self.last_block_number = await self._fetch_blocks(first, last)
+        if not self.watchlist:
+            return {}
+
+        activity = self.match(blocks, logs)
+        if not activity:
+            return activity
+
+        self.stats["wallets_touched"] += len(activity)
+        states = await self.provider.get_account_states(list(activity))
+        self.stats["rpc_batches"] += 1
+        await self.on_activity(self.network, activity, states)
+        return activity
+
+    async def _fetch_blocks(
+        self, first: int, last: int
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int]:
+        """Full blocks plus all their logs in one batched round trip
+
+        Returns the blocks and logs of the contiguous prefix of the range that
+        fetched successfully, and the last block number of that prefix
+        (``first - 1`` when nothing could be fetched).
+        """
+        calls = [("eth_getBlockByNumber", [hex(number), True]) for number in range(first, last + 1)]
+        calls.append(("eth_getLogs", [{"fromBlock": hex(first), "toBlock": hex(last)}]))
+        results = await self.provider.rpc_batch(calls)
+        self.stats["rpc_batches"] += 1
+
+        *blocks, logs = results
+        if isinstance(logs, Exception):
+            # Without logs no block in the range is fully scanned
+            logger.warning("Failed to fetch logs", network=self.network, error=str(logs))
+            return [], [], first - 1
+
+        fetched = []
+        for number, block in zip(range(first, last + 1), blocks):
+            if isinstance(block, Exception) or block is None:
+                logger.warning("Failed to fetch block", network=self.network, block=number)
+                break
+            fetched.append(block)
+
+        scanned_to = first + len(fetched) - 1
+        if scanned_to < last:
+            # Logs past the gap are picked up again with their blocks
+            logs = [log for log in logs or [] if int(log["blockNumber"], 16) <= scanned_to]
+        self.stats["blocks_scanned"] += len(fetched)
+        return fetched, logs or [], scanned_to
+
+    def match(
+        self, blocks: list[dict[str, Any]], logs: list[dict[str, Any]]
+    ) -> dict[str, WalletActivity]:
+        """Match block transactions and logs against the watchlist"""
+        watchlist = self.watchlist
+        activity: dict[str, WalletActivity] = {}
+
+        def touched(key: bytes, block_number: int) -> WalletActivity:
+            wallet = watchlist[key]
+            entry = activity.get(wallet)
+            if entry is None:
+                entry = activity[wallet] = WalletActivity(wallet, self.network, block_number)
+            else:
+                entry.block_number = max(entry.block_number, block_number)
+            return entry
+
+        for block in blocks:
+            block_number = int(block["number"], 16)
+            transactions = block.get("transactions", [])
+            self.stats["transactions_scanned"] += len(transactions)
+            for tx in transactions:
+                sender = _address_key(tx.get("from"))
+                if sender in watchlist:
+                    touched(sender, block_number).outgoing_txs.append(tx["hash"])
+                recipient = _address_key(tx.get("to"))
+                if recipient in watchlist and recipient != sender:
+                    touched(recipient, block_number).incoming_txs.append(tx["hash"])
+
+        self.stats["logs_scanned"] += len(logs)
+        for log in logs:
+            block_number = int(log["blockNumber"], 16)
+            emitter = _address_key(log.get("address"))
+            keys = {emitter} if emitter in watchlist else set()
+            for topic in log.get("topics", [])[1:]:
+                key = _topic_address(topic)
+                if key in watchlist:
+                    keys.add(key)
+            for key in keys:
+                entry = touched(key, block_number)
+                entry.log_count += 1
+                entry.emitting_contracts.add(log["address"].lower())
+
+        return activity
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "network": self.network,
+            "watched_wallets": len(self.watchlist),
+            "last_block_number": self.last_block_number,
+            "running": self._task is not None and not self._task.done(),
+        }
@@ -10,6 +10,7 @@ import hashlib
 import json
 import os
 import secrets
+from collections.abc import AsyncIterator
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -24,6 +25,7 @@ from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 
@@ -31,7 +33,7 @@ from config.settings import settings
 from .core.alerting import alert_manager
 
 # Import our enhanced core modules
-from .core.blockchain import blockchain_manager
+from .core.blockchain import AccountState, blockchain_manager
 from .core.contract_analysis import VulnerabilityReport, contract_analysis_engine
 from .core.mempool_monitor import MempoolEvent, mempool_manager
 from .core.mpc_hsm_integration import MofNConfig, RealMPCHSMIntegration, SignerConfig, SignerType
@@ -41,6 +43,7 @@ from .core.threat_detection import (
     threat_detection_engine,
 )
 from .core.wallet_simulation import RealWalletSimulationEngine
+from .core.watchlist_scanner import WalletActivity, WatchlistScanner
 
 # Configure structured logging
 structlog.configure(
@@ -63,6 +66,23 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Bulk wallet analysis limits
+BULK_ANALYSIS_MAX_ADDRESSES = 10_000
+BULK_ANALYSIS_CHUNK_SIZE = 100
+BULK_ANALYSIS_CONCURRENCY = 8
+
+# Monitored wallets with no on-chain activity for this long are unwatched
+MONITORED_WALLET_IDLE_DAYS = int(os.getenv("MONITORED_WALLET_IDLE_DAYS", "30"))
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for enums and datetimes in streamed records"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
 
 class ThreatLevel(Enum):
     LOW = "low"
@@ -192,6 +212,9 @@ class WalletGuardService:
         self.web3_connections: dict[str, Any] = {}
         self.config: dict[str, Any] = {}
 
+        # One block-driven scanner per network covers every monitored wallet
+        self.watchlist_scanners: dict[str, WatchlistScanner] = {}
+
         # Zero Day Guardian integration
         self.zero_day_guardian_url = os.getenv("ZERO_DAY_GUARDIAN_URL", "http://localhost:8003")
         self.zero_day_api_key = os.getenv("ZERO_DAY_API_KEY", "")
@@ -214,6 +237,15 @@ class WalletGuardService:
                 await self.initialize_core_services()
                 self.core_services_initialized = True
 
+        @self.app.on_event("shutdown")
+        async def shutdown_event():
+            # Flush queued alert deliveries and close pooled notifier connections
+            await alert_manager.close()
+
+            for scanner in self.watchlist_scanners.values():
+                await scanner.stop()
+                await scanner.provider.close()
+
         # Initialize background tasks
         self.background_tasks = set()
 
@@ -281,6 +313,10 @@ class WalletGuardService:
             try:
                 from core.private_relayer import private_relayer
                 self.private_relayer = private_relayer
+                # Bundles are pre-validated on the local EVM fork where one is configured
+                for engine_key, engine in self.wallet_simulation_engine.simulation_engines.items():
+                    if engine_key.endswith("_local_evm"):
+                        private_relayer.bundle_simulators[engine_key.removesuffix("_local_evm")] = engine
                 await private_relayer.start_monitoring()
                 logger.info("Private relayer initialized and monitoring started")
             except Exception as e:
@@ -484,6 +520,8 @@ class WalletGuardService:
                     redis_healthy=redis_healthy,
                 )
 
+                await self.evict_idle_wallets()
+
             except Exception as e:
                 logger.error("Error in health check", error=str(e))
                 await asyncio.sleep(60)
@@ -683,8 +721,8 @@ class WalletGuardService:
                 wallet_info = await self.analyze_wallet_enhanced(wallet_address, network)
                 self.monitored_wallets[wallet_address] = wallet_info
 
-                # Start comprehensive monitoring
-                asyncio.create_task(self.monitor_wallet_activity_enhanced(wallet_address, network))
+                # Add to the network's block-driven watchlist
+                await self.monitor_wallet_activity_enhanced(wallet_address, network)
 
                 # Analyze contract if it's a contract address
                 if wallet_info.wallet_type == WalletType.CONTRACT:
@@ -719,6 +757,13 @@ class WalletGuardService:
                 )
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.delete("/api/v1/wallet-guard/monitor/{wallet_address}")
+        async def stop_monitoring(wallet_address: str):
+            """Stop monitoring a wallet address"""
+            if not await self.stop_monitoring_wallet(wallet_address):
+                raise HTTPException(status_code=404, detail="Wallet not being monitored")
+            return {"message": "Wallet monitoring stopped", "address": wallet_address}
+
         @self.app.get("/api/v1/wallet-guard/status/{wallet_address}")
         async def get_wallet_status(wallet_address: str):
             """Get current status of a monitored wallet"""
@@ -741,6 +786,33 @@ class WalletGuardService:
                 ),
             }
 
+        @self.app.post("/api/v1/wallet-guard/analyze/bulk")
+        async def analyze_wallets_bulk(request: dict):
+            """Analyze many wallets at once, streaming one NDJSON record per wallet"""
+            addresses = request.get("addresses")
+            network = request.get("network", "ethereum")
+
+            if not isinstance(addresses, list) or not addresses:
+                raise HTTPException(status_code=400, detail="addresses must be a non-empty list")
+            if len(addresses) > BULK_ANALYSIS_MAX_ADDRESSES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At most {BULK_ANALYSIS_MAX_ADDRESSES} addresses per request",
+                )
+            if not settings.is_network_supported(network):
+                raise HTTPException(status_code=400, detail=f"Unsupported network: {network}")
+            if not blockchain_manager.get_provider(network):
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Blockchain connection not available for network: {network}",
+                )
+
+            async def ndjson():
+                async for record in self.analyze_wallets_bulk(addresses, network):
+                    yield json.dumps(record, default=_json_default) + "\n"
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
         @self.app.get("/api/v1/wallet-guard/threats")
         async def get_recent_threats(hours: int = 24):
             """Get recent threat detections"""
@@ -1279,6 +1351,7 @@ class WalletGuardService:
                 transactions = request.get("transactions", [])
                 network = request.get("network", "ethereum")
                 target_block = request.get("target_block")
+                simulate = request.get("simulate", True)
 
                 if not transactions:
                     raise HTTPException(status_code=400, detail="Transactions required")
@@ -1288,6 +1361,7 @@ class WalletGuardService:
                     transactions=transactions,
                     network=network,
                     target_block=target_block,
+                    simulate=simulate,
                 )
 
                 return {
@@ -1297,6 +1371,8 @@ class WalletGuardService:
                     "status": bundle.status.value,
                     "target_block": bundle.target_block,
                     "relayed_at": bundle.submitted_at.isoformat() if bundle.submitted_at else None,
+                    "error": bundle.error,
+                    "simulation": bundle.simulation,
                 }
             except Exception as e:
                 logger.error("GuardianX bundle relay error", error=str(e))
@@ -1474,54 +1550,173 @@ class WalletGuardService:
             if not provider:
                 raise RuntimeError(f"Blockchain connection not available for network: {network}")
 
-            # Get wallet data using enhanced blockchain manager
-            balance_wei = await provider.get_balance(address)
-            balance_eth = balance_wei / 1e18
-            tx_count = await provider.get_transaction_count(address)
-            code = await provider.get_code(address)
-
-            # Determine wallet type
-            wallet_type = WalletType.CONTRACT if code != b"" else WalletType.EOA
-
-            # Enhanced risk scoring with threat detection
-            risk_score = await self.calculate_risk_score_enhanced(
-                address, network, balance_eth, tx_count
+            # Balance, nonce and code over batched JSON-RPC; the provider's
+            # per-value getters wrap blocking web3 calls
+            states, codes = await asyncio.gather(
+                provider.get_account_states([address]), provider.get_codes([address])
             )
+            if address not in states or address not in codes:
+                raise RuntimeError("Failed to load account state")
 
-            # Determine threat level
-            if risk_score >= settings.risk_thresholds["CRITICAL"]:
-                threat_level = ThreatLevel.CRITICAL
-            elif risk_score >= settings.risk_thresholds["HIGH"]:
-                threat_level = ThreatLevel.HIGH
-            elif risk_score >= settings.risk_thresholds["MEDIUM"]:
-                threat_level = ThreatLevel.MEDIUM
-            else:
-                threat_level = ThreatLevel.LOW
-
-            # Get wallet tags based on analysis
-            tags = await self.analyze_wallet_tags(address, network, wallet_type, balance_eth)
-
-            return WalletInfo(
-                address=address,
-                wallet_type=wallet_type,
-                balance=float(balance_eth),
-                network=network,
-                first_seen=datetime.utcnow(),
-                last_activity=datetime.utcnow(),
-                transaction_count=tx_count,
-                risk_score=risk_score,
-                threat_level=threat_level,
-                tags=tags,
-            )
+            return await self._build_wallet_info(address, network, states[address], codes[address])
 
         except Exception as e:
             logger.error("Error analyzing wallet", wallet=address, network=network, error=str(e))
             raise RuntimeError(f"Failed to analyze wallet {address}: {e}")
 
+    async def _build_wallet_info(
+        self, address: str, network: str, state: AccountState, code: bytes
+    ) -> WalletInfo:
+        """Score and tag a wallet from already loaded balance, nonce and code"""
+        balance_eth = state.balance / 1e18
+        tx_count = state.nonce
+
+        # Determine wallet type
+        wallet_type = WalletType.CONTRACT if code else WalletType.EOA
+
+        # Enhanced risk scoring with threat detection
+        risk_score = await self.calculate_risk_score_enhanced(
+            address,
+            network,
+            balance_eth,
+            tx_count,
+            suspicious_patterns=self._suspicious_patterns_from_state(state.balance, tx_count),
+            state=state,
+        )
+
+        # Determine threat level
+        if risk_score >= settings.risk_thresholds["CRITICAL"]:
+            threat_level = ThreatLevel.CRITICAL
+        elif risk_score >= settings.risk_thresholds["HIGH"]:
+            threat_level = ThreatLevel.HIGH
+        elif risk_score >= settings.risk_thresholds["MEDIUM"]:
+            threat_level = ThreatLevel.MEDIUM
+        else:
+            threat_level = ThreatLevel.LOW
+
+        # Get wallet tags based on analysis
+        tags = await self.analyze_wallet_tags(
+            address, network, wallet_type, balance_eth, code=code, tx_count=tx_count
+        )
+
+        return WalletInfo(
+            address=address,
+            wallet_type=wallet_type,
+            balance=float(balance_eth),
+            network=network,
+            first_seen=datetime.utcnow(),
+            last_activity=datetime.utcnow(),
+            transaction_count=tx_count,
+            risk_score=risk_score,
+            threat_level=threat_level,
+            tags=tags,
+        )
+
+    async def analyze_wallets_bulk(
+        self,
+        addresses: list[str],
+        network: str,
+        chunk_size: int = BULK_ANALYSIS_CHUNK_SIZE,
+        max_concurrency: int = BULK_ANALYSIS_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Analyze many wallets, yielding one record per address as chunks complete
+
+        Addresses are deduplicated and split into chunks. Each chunk loads
+        balances, nonces and code in batched JSON-RPC calls pinned to one of
+        the network's healthy providers, round-robin, so large requests are
+        spread across providers. Contract code already seen by the provider
+        is served from its code cache. Scoring reuses the loaded state, so no
+        per-address lookups are made beyond the batches. Records are either
+        ``{"address", "wallet_info"}`` or ``{"address", "error"}``.
+        """
+        provider = blockchain_manager.get_provider(network)
+        if not provider:
+            raise RuntimeError(f"Blockchain connection not available for network: {network}")
+
+        valid: list[str] = []
+        seen: set[str] = set()
+        for raw in addresses:
+            address = str(raw).lower()
+            if not address.startswith("0x"):
+                address = "0x" + address
+            if address in seen:
+                continue
+            seen.add(address)
+            if not self.is_valid_ethereum_address(address):
+                yield {"address": raw, "error": "Invalid Ethereum address"}
+                continue
+            valid.append(address)
+
+        rpc_urls = provider.get_healthy_rpc_urls()
+        budget = asyncio.Semaphore(max_concurrency)
+
+        async def analyze_chunk(index: int, chunk: list[str]) -> list[dict[str, Any]]:
+            async with budget:
+                rpc_url = rpc_urls[index % len(rpc_urls)]
+                try:
+                    states, codes = await asyncio.gather(
+                        provider.get_account_states(chunk, rpc_url=rpc_url),
+                        provider.get_codes(chunk, rpc_url=rpc_url),
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Bulk analysis batch failed",
+                        network=network,
+                        rpc_url=rpc_url,
+                        wallets=len(chunk),
+                        error=str(e),
+                    )
+                    return [{"address": address, "error": str(e)} for address in chunk]
+
+                loaded = [address for address in chunk if address in states and address in codes]
+                outcomes = await asyncio.gather(
+                    *[
+                        self._build_wallet_info(address, network, states[address], codes[address])
+                        for address in loaded
+                    ],
+                    return_exceptions=True,
+                )
+
+            by_address = dict(zip(loaded, outcomes))
+            records = []
+            for address in chunk:
+                outcome = by_address.get(address)
+                if outcome is None:
+                    records.append({"address": address, "error": "Failed to load account state"})
+                elif isinstance(outcome, Exception):
+                    records.append({"address": address, "error": str(outcome)})
+                else:
+                    records.append({"address": address, "wallet_info": asdict(outcome)})
+            return records
+
+        tasks = [
+            asyncio.create_task(analyze_chunk(index, valid[start : start + chunk_size]))
+            for index, start in enumerate(range(0, len(valid), chunk_size))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for record in await next_done:
+                    yield record
+        finally:
+            # The client may disconnect mid-stream
+            for task in tasks:
+                task.cancel()
+
     async def calculate_risk_score_enhanced(
-        self, address: str, network: str, balance: float, tx_count: int
+        self,
+        address: str,
+        network: str,
+        balance: float,
+        tx_count: int,
+        suspicious_patterns: list[str] | None = None,
+        state: AccountState | None = None,
     ) -> float:
-        """Enhanced risk scoring with advanced threat detection"""
+        """Enhanced risk scoring with advanced threat detection
+
+        Pass ``suspicious_patterns`` and ``state`` when the wallet's state is
+        already loaded to skip looking it up again; bulk analysis relies on
+        this to make no per-address RPCs.
+        """
         risk_score = 0.0
 
         # Balance-based risk (using configurable thresholds)
@@ -1538,7 +1733,7 @@ class WalletGuardService:
 
         # Advanced threat detection analysis
         try:
-            threats = await threat_detection_engine.analyze_wallet(address, network)
+            threats = await threat_detection_engine.analyze_wallet(address, network, state)
             for threat in threats:
                 if threat.severity == ThreatSeverity.CRITICAL:
                     risk_score += 0.4
@@ -1554,15 +1749,25 @@ class WalletGuardService:
             )
 
         # Check for suspicious patterns
-        suspicious_patterns = await self.detect_suspicious_patterns_enhanced(address, network)
+        if suspicious_patterns is None:
+            suspicious_patterns = await self.detect_suspicious_patterns_enhanced(address, network)
         risk_score += len(suspicious_patterns) * 0.05
 
         return min(risk_score, 1.0)  # Cap at 1.0
 
     async def analyze_wallet_tags(
-        self, address: str, network: str, wallet_type: WalletType, balance: float
+        self,
+        address: str,
+        network: str,
+        wallet_type: WalletType,
+        balance: float,
+        code: bytes | None = None,
+        tx_count: int | None = None,
     ) -> list[str]:
-        """Analyze wallet and return descriptive tags"""
+        """Analyze wallet and return descriptive tags
+
+        ``code`` and ``tx_count`` are looked up when not supplied.
+        """
         tags = []
 
         # Balance-based tags
@@ -1581,9 +1786,11 @@ class WalletGuardService:
 
             # Try to identify contract type
             try:
-                provider = blockchain_manager.get_provider(network)
-                if provider:
-                    code = await provider.get_code(address)
+                if code is None:
+                    provider = blockchain_manager.get_provider(network)
+                    if provider:
+                        code = await provider.get_code(address)
+                if code:
                     if b"transferFrom" in code:
                         tags.append("token_contract")
                     if b"swap" in code or b"exchange" in code:
@@ -1597,9 +1804,11 @@ class WalletGuardService:
 
         # Activity tags
         try:
-            provider = blockchain_manager.get_provider(network)
-            if provider:
-                tx_count = await provider.get_transaction_count(address)
+            if tx_count is None:
+                provider = blockchain_manager.get_provider(network)
+                if provider:
+                    tx_count = await provider.get_transaction_count(address)
+            if tx_count is not None:
                 if tx_count > settings.high_activity_threshold:
                     tags.append("high_activity")
                 elif tx_count > 1000:
@@ -1643,45 +1852,174 @@ class WalletGuardService:
             return suspicious_patterns
 
     async def monitor_wallet_activity_enhanced(self, address: str, network: str):
-        """Enhanced background monitoring with advanced threat detection"""
-        logger.info("Starting enhanced background monitoring", wallet=address, network=network)
-
-        while address in self.monitored_wallets:
-            try:
-                # Enhanced threat detection
-                threats = await threat_detection_engine.analyze_wallet(address, network)
+        """Enhanced background monitoring with advanced threat detection
+
+        Wallets are not polled individually; they join the network's watchlist
+        and are re-analyzed only when a new block touches them.
+        """
+        scanner = self._get_watchlist_scanner(network)
+        if scanner is None:
+            raise RuntimeError(f"Blockchain connection not available for network: {network}")
+        if not scanner.watch(address):
+            raise ValueError(f"Invalid Ethereum address: {address}")
+        scanner.start()
+        logger.info(
+            "Added wallet to block watchlist",
+            wallet=address,
+            network=network,
+            watched_wallets=len(scanner),
+        )
 
-                for threat in threats:
-                    await threat_detection_engine.process_threat(threat)
+    async def stop_monitoring_wallet(self, address: str) -> bool:
+        """Forget a monitored wallet and drop it from its network's watchlist"""
+        wallet_info = self.monitored_wallets.pop(address, None)
+        if wallet_info is None:
+            return False
 
-                    # Auto-apply protection if threat level is high
-                    if threat.severity in [ThreatSeverity.HIGH, ThreatSeverity.CRITICAL]:
-                        await self.execute_protection_action(address, "alert")
+        scanner = self.watchlist_scanners.get(wallet_info.network)
+        if scanner is not None:
+            scanner.unwatch(address)
+            if not len(scanner):
+                await scanner.stop()
+                # Nothing was watched meanwhile; resume at the head when restarted
+                scanner.last_block_number = None
 
-                # Update wallet info periodically
-                if address in self.monitored_wallets:
-                    wallet_info = await self.analyze_wallet_enhanced(address, network)
-                    self.monitored_wallets[address] = wallet_info
-
-                    # Store in Redis for persistence
-                    if self.redis_client:
-                        await self.redis_client.setex(
-                            f"wallet:{address}",
-                            3600,  # 1 hour
-                            json.dumps(asdict(wallet_info), default=str),
-                        )
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(f"wallet:{address}")
+            except Exception as e:
+                logger.error("Failed to delete wallet state", wallet=address, error=str(e))
+
+        logger.info("Stopped monitoring wallet", wallet=address, network=wallet_info.network)
+        return True
+
+    async def evict_idle_wallets(self, now: datetime | None = None) -> int:
+        """Stop monitoring wallets with no activity for ``MONITORED_WALLET_IDLE_DAYS``"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=MONITORED_WALLET_IDLE_DAYS)
+        idle = [
+            address
+            for address, wallet_info in self.monitored_wallets.items()
+            if wallet_info.last_activity < cutoff
+        ]
+        for address in idle:
+            await self.stop_monitoring_wallet(address)
+        if idle:
+            logger.info("Evicted idle monitored wallets", count=len(idle))
+        return len(idle)
+
+    def _get_watchlist_scanner(self, network: str) -> WatchlistScanner | None:
+        scanner = self.watchlist_scanners.get(network)
+        if scanner is None:
+            provider = blockchain_manager.get_provider(network)
+            if provider is None:
+                return None
+            scanner = self.watchlist_scanners[network] = WatchlistScanner(
+                network, provider, self._handle_watchlist_activity
+            )
+        return scanner
 
-                # Wait before next check (configurable interval)
-                await asyncio.sleep(settings.monitoring_interval)
+    async def _handle_watchlist_activity(
+        self,
+        network: str,
+        activity: dict[str, WalletActivity],
+        states: dict[str, AccountState],
+    ):
+        """Update and re-analyze the wallets touched by newly scanned blocks"""
+        touched = [address for address in activity if address in self.monitored_wallets]
+
+        # Enhanced threat detection, only for wallets with on-chain activity,
+        # reusing the balances and nonces the scanner already batch-loaded
+        results = await asyncio.gather(
+            *[
+                threat_detection_engine.analyze_wallet(address, network, state=states.get(address))
+                for address in touched
+            ],
+            return_exceptions=True,
+        )
 
-            except Exception as e:
+        pipeline = self.redis_client.pipeline() if self.redis_client else None
+        for address, threats in zip(touched, results):
+            if isinstance(threats, Exception):
                 logger.error(
                     "Error in enhanced wallet monitoring",
                     wallet=address,
                     network=network,
-                    error=str(e),
+                    error=str(threats),
+                )
+                threats = []
+
+            for threat in threats:
+                await threat_detection_engine.process_threat(threat)
+
+                # Auto-apply protection if threat level is high
+                if threat.severity in [ThreatSeverity.HIGH, ThreatSeverity.CRITICAL]:
+                    await self.execute_protection_action(address, "alert")
+
+            wallet_info = self.monitored_wallets[address]
+            state = states.get(address)
+            if state is not None:
+                for detection in self._detect_activity_threats(wallet_info, state):
+                    self.threat_detections.append(detection)
+                    if detection.threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
+                        await self.execute_protection_action(address, "alert")
+                wallet_info.balance = state.balance / 1e18
+                wallet_info.transaction_count = state.nonce
+            wallet_info.last_activity = datetime.utcnow()
+
+            # Store in Redis for persistence
+            if pipeline is not None:
+                pipeline.setex(
+                    f"wallet:{address}",
+                    3600,  # 1 hour
+                    json.dumps(asdict(wallet_info), default=str),
+                )
+
+        if len(self.threat_detections) > 1000:
+            self.threat_detections = self.threat_detections[-1000:]
+        if pipeline is not None and touched:
+            try:
+                await pipeline.execute()
+            except Exception as e:
+                logger.error("Failed to persist wallet updates", network=network, error=str(e))
+
+    def _detect_activity_threats(
+        self, wallet_info: WalletInfo, state: AccountState
+    ) -> list[ThreatDetection]:
+        """Compare a fresh account state with the last known wallet info"""
+        threats = []
+
+        # Check for balance changes
+        balance_change = abs(state.balance - int(wallet_info.balance * 1e18))
+        if balance_change > 10 * 10**18:  # Large balance change
+            threats.append(
+                ThreatDetection(
+                    wallet_address=wallet_info.address,
+                    threat_type="large_balance_change",
+                    threat_level=ThreatLevel.MEDIUM,
+                    description=f"Large balance change detected: {balance_change / 1e18} ETH",
+                    confidence=0.8,
+                    timestamp=datetime.utcnow(),
+                    metadata={"balance_change": str(balance_change / 1e18)},
+                )
+            )
+
+        # Check for new transactions
+        if state.nonce > wallet_info.transaction_count:
+            new_txs = state.nonce - wallet_info.transaction_count
+            if new_txs > 10:  # Many new transactions
+                threats.append(
+                    ThreatDetection(
+                        wallet_address=wallet_info.address,
+                        threat_type="rapid_transaction_activity",
+                        threat_level=ThreatLevel.HIGH,
+                        description=f"Rapid transaction activity: {new_txs} new transactions",
+                        confidence=0.9,
+                        timestamp=datetime.utcnow(),
+                        metadata={"new_transactions": new_txs},
+                    )
                 )
-                await asyncio.sleep(60)  # Wait longer on error
+
+        return threats
 
     async def detect_suspicious_patterns_enhanced(self, address: str, network: str) -> list[str]:
         """Enhanced suspicious pattern detection"""
@@ -1692,21 +2030,10 @@ class WalletGuardService:
             if not provider:
                 return suspicious_patterns
 
-            # Get recent transaction count
-            tx_count = await provider.get_transaction_count(address)
-
-            # Check for rapid transaction patterns
-            if tx_count > settings.rapid_transfer_threshold:
-                suspicious_patterns.append("rapid_transactions")
-
-            # Check for balance volatility
-            balance = await provider.get_balance(address)
-            if balance == 0 and tx_count > 0:
-                suspicious_patterns.append("empty_high_activity")
-
-            # Check for contract interactions
-            if tx_count > 1000:  # High activity wallet
-                suspicious_patterns.append("high_activity_wallet")
+            states = await provider.get_account_states([address])
+            if address in states:
+                state = states[address]
+                suspicious_patterns = self._suspicious_patterns_from_state(state.balance, state.nonce)
 
         except Exception as e:
             logger.error(
@@ -1715,52 +2042,41 @@ class WalletGuardService:
 
         return suspicious_patterns
 
+    @staticmethod
+    def _suspicious_patterns_from_state(balance_wei: int, tx_count: int) -> list[str]:
+        """Suspicious patterns derivable from a wallet's balance and nonce"""
+        suspicious_patterns = []
+
+        # Check for rapid transaction patterns
+        if tx_count > settings.rapid_transfer_threshold:
+            suspicious_patterns.append("rapid_transactions")
+
+        # Check for balance volatility
+        if balance_wei == 0 and tx_count > 0:
+            suspicious_patterns.append("empty_high_activity")
+
+        # Check for contract interactions
+        if tx_count > 1000:  # High activity wallet
+            suspicious_patterns.append("high_activity_wallet")
+
+        return suspicious_patterns
+
     async def scan_for_threats(self, address: str, network: str) -> list[ThreatDetection]:
         """Scan for threats against a specific wallet"""
-        threats = []
-
         try:
-            w3 = self.web3_connections.get(network)
-            if not w3:
+            provider = blockchain_manager.get_provider(network)
+            if not provider:
                 raise RuntimeError(f"Blockchain connection not available for network: {network}")
 
-            # Check for balance changes
-            current_balance = w3.eth.get_balance(address)
             wallet_info = self.monitored_wallets.get(address)
+            if not wallet_info:
+                return []
 
-            if wallet_info:
-                balance_change = abs(current_balance - w3.to_wei(wallet_info.balance, "ether"))
-                if balance_change > w3.to_wei(10, "ether"):  # Large balance change
-                    threats.append(
-                        ThreatDetection(
-                            wallet_address=address,
-                            threat_type="large_balance_change",
-                            threat_level=ThreatLevel.MEDIUM,
-                            description=f"Large balance change detected: {w3.from_wei(balance_change, 'ether')} ETH",
-                            confidence=0.8,
-                            timestamp=datetime.utcnow(),
-                            metadata={"balance_change": str(w3.from_wei(balance_change, "ether"))},
-                        )
-                    )
-
-            # Check for new transactions
-            current_tx_count = w3.eth.get_transaction_count(address)
-            if wallet_info and current_tx_count > wallet_info.transaction_count:
-                new_txs = current_tx_count - wallet_info.transaction_count
-                if new_txs > 10:  # Many new transactions
-                    threats.append(
-                        ThreatDetection(
-                            wallet_address=address,
-                            threat_type="rapid_transaction_activity",
-                            threat_level=ThreatLevel.HIGH,
-                            description=f"Rapid transaction activity: {new_txs} new transactions",
-                            confidence=0.9,
-                            timestamp=datetime.utcnow(),
-                            metadata={"new_transactions": new_txs},
-                        )
-                    )
-
-            return threats
+            # Balance and nonce in one batched round trip
+            states = await provider.get_account_states([address])
+            if address not in states:
+                raise RuntimeError(f"Failed to load account state for {address}")
+            return self._detect_activity_threats(wallet_info, states[address])
 
         except Exception as e:
             logger.error(f"Error scanning for threats on {address}: {e}")
@@ -1919,6 +2235,10 @@ class WalletGuardService:
         self, transaction: dict[str, Any], wallet_address: str
     ) -> dict[str, Any]:
         """Simulate transaction against a fork"""
+        local_result = await self._simulate_transaction_locally(transaction, wallet_address)
+        if local_result is not None:
+            return local_result
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
@@ -1947,6 +2267,57 @@ class WalletGuardService:
                 "warnings": [f"Simulation error: {e!s}"],
             }
 
+    async def _simulate_transaction_locally(
+        self, transaction: dict[str, Any], wallet_address: str
+    ) -> dict[str, Any] | None:
+        """Simulate on the in-process EVM fork; None when no local engine can answer"""
+        simulation_engine = getattr(self, "wallet_simulation_engine", None)
+        if simulation_engine is None:
+            return None
+        network = transaction.get("network", "ethereum")
+        engine = simulation_engine.simulation_engines.get(f"{network}_local_evm")
+        if engine is None or engine.local_evm is None:
+            return None
+
+        try:
+            result = await engine.local_evm.simulate(
+                {**transaction, "from": transaction.get("from") or wallet_address}
+            )
+        except Exception as e:
+            # Fork state unreachable; the remote simulator still gets a chance
+            logger.warning(f"Local EVM simulation unavailable: {e}")
+            return None
+
+        max_uint256 = 2**256 - 1
+        wallet = wallet_address.lower()
+        unlimited_approvals = [
+            approval
+            for approval in result["approvals"]
+            if approval["from"].lower() == wallet and int(approval["value"]) == max_uint256
+        ]
+
+        warnings = []
+        if result["error"]:
+            warnings.append(f"Simulation reverted: {result['error']}")
+        for approval in unlimited_approvals:
+            warnings.append(
+                f"Unlimited approval of {approval['contract_address']} to {approval['to']}"
+            )
+
+        return {
+            "simulation_success": result["success"],
+            "risk_detected": not result["success"] or bool(unlimited_approvals),
+            # Only the top-level call is observed locally, so reentrancy is not scored here
+            "reentrancy_risk": 0.0,
+            "approval_drain_risk": 1.0 if unlimited_approvals else 0.0,
+            "warnings": warnings,
+            "gas_used": result["gas_used"],
+            "balance_changes": result["balance_changes"],
+            "token_transfers": result["token_transfers"],
+            "block_number": result["block_number"],
+            "simulation_backend": "local_evm",
+        }
+
     async def _assess_transaction_risk(
         self,
         transaction: dict[str, Any],
@@ -17,6 +17,7 @@ from ..core.cryptographic_validation import CryptographicValidator
 from ..core.event_streaming import BlockchainEventStreamer
 from ..core.liveness_monitor import LivenessMonitor
 from ..core.ml_anomaly_detection import MLAnomalyDetector
+from ..core.performance_optimization import TieredCache
 from ..core.proof_of_reserves import ProofOfReservesMonitor
 from ..core.security_orchestrator import SecurityOrchestrator
 from ..utils.network_utils import get_supported_networks
@@ -39,19 +40,25 @@ blockchain_integration = None
 event_streamer = None
 crypto_validator = None
 ml_detector = None
+response_cache = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global bridge_analyzer, security_orchestrator, attestation_monitor, proof_of_reserves, attack_detection, liveness_monitor, blockchain_integration, event_streamer, crypto_validator, ml_detector
+    global bridge_analyzer, security_orchestrator, attestation_monitor, proof_of_reserves, attack_detection, liveness_monitor, blockchain_integration, event_streamer, crypto_validator, ml_detector, response_cache
 
     # Startup
     logger.info("Starting Cross-Chain Bridge Security Service...")
 
     try:
+        # Shared tiered cache for RPC lookups and route handlers
+        response_cache = TieredCache(
+            max_entries=50000, max_memory_mb=256, default_ttl=60, stale_ttl=30
+        )
+
         # Initialize blockchain integration first
-        blockchain_integration = BlockchainIntegration()
+        blockchain_integration = BlockchainIntegration(cache=response_cache)
         await blockchain_integration.initialize()
 
         # Initialize cryptographic validator
@@ -64,7 +71,7 @@ async def lifespan(app: FastAPI):
         event_streamer = BlockchainEventStreamer(blockchain_integration)
 
         # Initialize bridge analyzer
-        bridge_analyzer = BridgeAnalyzer()
+        bridge_analyzer = BridgeAnalyzer(blockchain_integration)
 
         # Initialize supported networks
         networks = get_supported_networks()
@@ -106,6 +113,7 @@ async def lifespan(app: FastAPI):
         app.state.event_streamer = event_streamer
         app.state.crypto_validator = crypto_validator
         app.state.ml_detector = ml_detector
+        app.state.response_cache = response_cache
 
         # Start real-time monitoring
         await attestation_monitor.start_monitoring()
@@ -136,9 +144,15 @@ async def lifespan(app: FastAPI):
     if security_orchestrator:
         await security_orchestrator.stop_security_monitoring()
 
+    if liveness_monitor:
+        await liveness_monitor.close()
+
     if blockchain_integration:
         await blockchain_integration.close()
 
+    if response_cache:
+        await response_cache.close()
+
     logger.info("Cross-Chain Bridge Security Service shutdown complete")
 
 
@@ -1,13 +1,17 @@
 """Bridge analysis API routes."""
 
+import json
 import logging
 from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
 
 from ...core.bridge_analyzer import BridgeAnalyzer
+from ...core.bridge_scan import BridgeScanTarget
+from ...core.performance_optimization import TieredCache
 from ...core.security_monitor import AttackPlaybookAnalyzer, SignatureForgeryDetector
 from ...models.bridge import BridgeAnalysis, BridgeSecurityScore
 from ...utils.network_utils import validate_network
@@ -16,6 +20,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Analyses are expensive and bridge state changes slowly
+ANALYSIS_CACHE_TTL = 300
+
 
 # Request/Response models
 class BridgeAnalysisRequest(BaseModel):
@@ -101,6 +108,34 @@ class BridgeSimulationRequest(BaseModel):
         return v.lower()
 
 
+class PortfolioBridge(BaseModel):
+    """A bridge entry in a portfolio scan request."""
+
+    bridge_address: str = Field(..., description="Bridge contract address")
+    network: str = Field(..., description="Network where bridge is deployed")
+    target_network: str | None = Field(None, description="Target blockchain network")
+
+    @validator("bridge_address")
+    def validate_bridge_address(cls, v):
+        if not v.startswith("0x") or len(v) != 42:
+            raise ValueError("Invalid bridge address format")
+        return v.lower()
+
+    @validator("network")
+    def validate_network(cls, v):
+        if not validate_network(v):
+            raise ValueError(f"Unsupported network: {v}")
+        return v
+
+
+class PortfolioScanRequest(BaseModel):
+    """Request model for a multi-bridge portfolio scan."""
+
+    bridges: list[PortfolioBridge] = Field(..., min_length=1, description="Bridges to scan")
+    analysis_depth: str = Field(default="comprehensive", description="Analysis depth")
+    max_concurrency: int = Field(default=32, ge=1, le=256, description="Concurrent analyses")
+
+
 def get_bridge_analyzer(request: Request):
     """Get bridge analyzer from app state."""
     analyzer = getattr(request.app.state, "bridge_analyzer", None)
@@ -109,9 +144,25 @@ def get_bridge_analyzer(request: Request):
     return analyzer
 
 
+def get_response_cache(request: Request) -> TieredCache | None:
+    """Get the shared response cache from app state, if configured."""
+    return getattr(request.app.state, "response_cache", None)
+
+
+async def _cached(cache: TieredCache | None, namespace: str, params: BaseModel, loader):
+    """Serve ``loader`` through the response cache, coalescing identical requests."""
+    if cache is None:
+        return await loader()
+    return await cache.get_or_load(
+        cache.make_key(namespace, params), loader, ttl=ANALYSIS_CACHE_TTL
+    )
+
+
 @router.post("/analyze", response_model=BridgeAnalysis)
 async def analyze_bridge(
-    request: BridgeAnalysisRequest, analyzer: BridgeAnalyzer = Depends(get_bridge_analyzer)
+    request: BridgeAnalysisRequest,
+    analyzer: BridgeAnalyzer = Depends(get_bridge_analyzer),
+    cache: TieredCache | None = Depends(get_response_cache),
 ):
     """
     Analyze a cross-chain bridge for security vulnerabilities and risks.
@@ -123,11 +174,16 @@ async def analyze_bridge(
     try:
         logger.info(f"Starting bridge analysis for {request.bridge_address}")
 
-        analysis = await analyzer.analyze_bridge(
-            bridge_address=request.bridge_address,
-            source_network=request.source_network,
-            target_network=request.target_network,
-            analysis_depth=request.analysis_depth,
+        analysis = await _cached(
+            cache,
+            "bridge_analysis",
+            request,
+            lambda: analyzer.analyze_bridge(
+                bridge_address=request.bridge_address,
+                source_network=request.source_network,
+                target_network=request.target_network,
+                analysis_depth=request.analysis_depth,
+            ),
         )
 
         logger.info(f"Bridge analysis completed. Security score: {analysis.security_score}")
@@ -143,7 +199,9 @@ async def analyze_bridge(
 
 @router.post("/security-score", response_model=BridgeSecurityScore)
 async def get_bridge_security_score(
-    request: BridgeSecurityScoreRequest, analyzer: BridgeAnalyzer = Depends(get_bridge_analyzer)
+    request: BridgeSecurityScoreRequest,
+    analyzer: BridgeAnalyzer = Depends(get_bridge_analyzer),
+    cache: TieredCache | None = Depends(get_response_cache),
 ):
     """
     Get detailed security score for a bridge.
@@ -154,10 +212,15 @@ async def get_bridge_security_score(
     try:
         logger.info(f"Calculating security score for {request.bridge_address}")
 
-        security_score = await analyzer.get_bridge_security_score(
-            bridge_address=request.bridge_address,
-            network=request.network,
-            scoring_criteria=request.scoring_criteria,
+        security_score = await _cached(
+            cache,
+            "bridge_security_score",
+            request,
+            lambda: analyzer.get_bridge_security_score(
+                bridge_address=request.bridge_address,
+                network=request.network,
+                scoring_criteria=request.scoring_criteria,
+            ),
         )
 
         logger.info(f"Security score calculated: {security_score.overall_score}")
@@ -757,3 +820,48 @@ async def comprehensive_security_scan(
     except Exception as e:
         logger.error(f"Error performing comprehensive security scan: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/portfolio-scan")
+async def portfolio_scan(
+    request: PortfolioScanRequest, analyzer: BridgeAnalyzer = Depends(get_bridge_analyzer)
+):
+    """
+    Scan a portfolio of bridges across networks.
+
+    Bridges are analyzed concurrently and on-chain reads shared between them
+    are fetched once. Results stream back as NDJSON, one line per bridge as
+    soon as it completes, followed by a summary line.
+    """
+    logger.info(f"Starting portfolio scan of {len(request.bridges)} bridges")
+
+    targets = [
+        BridgeScanTarget(
+            bridge_address=bridge.bridge_address,
+            network=bridge.network,
+            target_network=bridge.target_network,
+            analysis_depth=request.analysis_depth,
+        )
+        for bridge in request.bridges
+    ]
+
+    async def stream():
+        completed = failed = 0
+        async for result in analyzer.scan_portfolio(
+            targets, max_concurrency=request.max_concurrency
+        ):
+            completed += 1
+            failed += 0 if result.succeeded else 1
+            yield json.dumps({"type": "result", **result.to_dict()}, default=str) + "\n"
+
+        yield json.dumps(
+            {
+                "type": "summary",
+                "bridges": len(targets),
+                "completed": completed,
+                "failed": failed,
+                "scan_timestamp": datetime.now().isoformat(),
+            }
+        ) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -60,6 +60,9 @@ class GuardianRegistrationRequest(BaseModel):
         default_factory=list, description="Technical expertise areas"
     )
     stake_amount: float = Field(default=0.0, ge=0.0, description="Stake amount")
+    bridges: list[str] = Field(
+        default_factory=list, description="Bridge addresses this guardian attests for"
+    )
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
     @validator("address")
@@ -244,6 +247,7 @@ async def register_guardian(
             "institutional_type": request.institutional_type,
             "technical_expertise": request.technical_expertise,
             "stake_amount": request.stake_amount,
+            "bridges": request.bridges,
             "metadata": request.metadata,
         }
 
@@ -4,6 +4,7 @@ Real Blockchain Integration Layer - Production-grade blockchain connectivity
 """
 
 import asyncio
+import functools
 import logging
 import time
 from collections import defaultdict, deque
@@ -29,10 +30,23 @@ import ssl
 import certifi
 from eth_account import Account
 from eth_utils import to_checksum_address
-from web3.exceptions import BlockNotFound, TransactionNotFound
+
+from .performance_optimization import TieredCache
+from .rpc_pool import RPCClientPool
 
 logger = logging.getLogger(__name__)
 
+# Blocks and receipts past finality are immutable; contract code rarely changes
+IMMUTABLE_CACHE_TTL = 3600
+CODE_CACHE_TTL = 600
+
+
+def _hex_to_int(value: str | int | None) -> int | None:
+    """Decode a JSON-RPC quantity"""
+    if value is None or isinstance(value, int):
+        return value
+    return int(value, 16)
+
 
 class NetworkType(str, Enum):
     """Network types for different blockchain networks"""
@@ -73,6 +87,7 @@ class NetworkConfig:
     max_retries: int = 3
     timeout: int = 30
     rate_limit: int = 1000  # requests per minute
+    finality_blocks: int = 64  # depth after which blocks are treated as immutable
 
 
 @dataclass
@@ -134,7 +149,7 @@ class ContractEvent:
 class BlockchainIntegration:
     """Production-grade blockchain integration with real connectivity"""
 
-    def __init__(self):
+    def __init__(self, cache: TieredCache | None = None):
         self.networks: dict[str, NetworkConfig] = {}
         self.web3_instances: dict[str, Web3] = {}
         self.ws_connections: dict[str, Any] = {}
@@ -142,10 +157,16 @@ class BlockchainIntegration:
         self.rate_limiter: dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         self.connection_pool: aiohttp.ClientSession | None = None
         self.ssl_context: ssl.SSLContext | None = None
+        self.rpc_pools: dict[str, RPCClientPool] = {}
+        self.head_block_numbers: dict[str, int] = {}
 
         # Initialize SSL context
         self.ssl_context = ssl.create_default_context(cafile=certifi.where())
 
+        # RPC result cache; cache hits skip both the RPC and the rate limiter
+        self._owns_cache = cache is None
+        self.cache = cache or TieredCache(max_entries=50000, max_memory_mb=128, default_ttl=60)
+
         # Load network configurations
         self._load_network_configurations()
 
@@ -193,6 +214,7 @@ class BlockchainIntegration:
                 is_poa=True,
                 supports_eip1559=True,
                 supports_ws=True,
+                finality_blocks=256,
             ),
             "bsc": NetworkConfig(
                 name="Binance Smart Chain",
@@ -212,6 +234,7 @@ class BlockchainIntegration:
                 is_poa=True,
                 supports_eip1559=False,
                 supports_ws=True,
+                finality_blocks=15,
             ),
             "avalanche": NetworkConfig(
                 name="Avalanche C-Chain",
@@ -229,6 +252,7 @@ class BlockchainIntegration:
                 gas_limit=8000000,
                 supports_eip1559=True,
                 supports_ws=True,
+                finality_blocks=1,
             ),
             "arbitrum": NetworkConfig(
                 name="Arbitrum One",
@@ -281,6 +305,7 @@ class BlockchainIntegration:
                 is_poa=True,
                 supports_eip1559=False,
                 supports_ws=True,
+                finality_blocks=1,
             ),
             "base": NetworkConfig(
                 name="Base Mainnet",
@@ -321,8 +346,16 @@ class BlockchainIntegration:
             headers={"User-Agent": "CrossChainBridgeSecurity/1.0"},
         )
 
-        # Initialize Web3 instances for each network
+        # Initialize RPC pools and Web3 instances for each network
         for network_name, config in self.networks.items():
+            self.rpc_pools[network_name] = RPCClientPool(
+                network_name,
+                config.rpc_urls,
+                session=self.connection_pool,
+                max_retries=config.max_retries,
+                request_timeout=config.timeout,
+                rate_limiter=functools.partial(self._rate_limit, network_name),
+            )
             await self._initialize_network(network_name, config)
 
         logger.info(f"Initialized {len(self.networks)} blockchain networks")
@@ -356,34 +389,43 @@ class BlockchainIntegration:
         except Exception as e:
             logger.error(f"Error initializing {network_name}: {e}")
 
+    def _get_rpc_pool(self, network: str) -> RPCClientPool:
+        """Get the RPC pool for a network"""
+        pool = self.rpc_pools.get(network)
+        if pool is None:
+            raise ValueError(f"Network {network} not initialized")
+        return pool
+
+    def _is_final(self, network: str, block_number: int | None) -> bool:
+        """Whether a block is deep enough below the known head to never reorg"""
+        head = self.head_block_numbers.get(network)
+        if head is None or block_number is None:
+            return False
+        return head - block_number >= self.networks[network].finality_blocks
+
+    def _finality_ttl(self, network: str, block_number: int | None) -> float:
+        if self._is_final(network, block_number):
+            return IMMUTABLE_CACHE_TTL
+        return self.networks[network].block_time
+
     async def get_latest_block(self, network: str) -> BlockData | None:
         """Get the latest block from blockchain"""
-        if network not in self.web3_instances:
-            raise ValueError(f"Network {network} not initialized")
+        pool = self._get_rpc_pool(network)
 
-        w3 = self.web3_instances[network]
+        async def load() -> BlockData:
+            block = self._block_from_rpc(
+                await pool.request("eth_getBlockByNumber", ["latest", False])
+            )
+            self.head_block_numbers[network] = max(
+                block.number, self.head_block_numbers.get(network, 0)
+            )
+            return block
 
         try:
-            # Rate limiting
-            await self._rate_limit(network)
-
-            # Get latest block
-            block = w3.eth.get_block("latest")
-
-            return BlockData(
-                number=block.number,
-                hash=block.hash.hex(),
-                parent_hash=block.parentHash.hex(),
-                timestamp=datetime.fromtimestamp(block.timestamp),
-                gas_limit=block.gasLimit,
-                gas_used=block.gasUsed,
-                base_fee_per_gas=getattr(block, "baseFeePerGas", None),
-                transactions=[tx.hex() for tx in block.transactions],
-                miner=block.miner,
-                difficulty=block.difficulty,
-                total_difficulty=block.totalDifficulty,
-                size=block.size,
-                extra_data=block.extraData.hex(),
+            return await self.cache.get_or_load(
+                self.cache.make_key("latest_block", network),
+                load,
+                ttl=self.networks[network].block_time,
             )
 
         except Exception as e:
@@ -392,79 +434,96 @@ class BlockchainIntegration:
 
     async def get_block_by_number(self, network: str, block_number: int) -> BlockData | None:
         """Get block by number from blockchain"""
-        if network not in self.web3_instances:
-            raise ValueError(f"Network {network} not initialized")
+        pool = self._get_rpc_pool(network)
 
-        w3 = self.web3_instances[network]
+        async def load() -> BlockData | None:
+            block = await pool.request("eth_getBlockByNumber", [hex(block_number), False])
+            if block is None:
+                logger.warning(f"Block {block_number} not found on {network}")
+                return None
+            return self._block_from_rpc(block)
 
         try:
-            await self._rate_limit(network)
-
-            block = w3.eth.get_block(block_number)
-
-            return BlockData(
-                number=block.number,
-                hash=block.hash.hex(),
-                parent_hash=block.parentHash.hex(),
-                timestamp=datetime.fromtimestamp(block.timestamp),
-                gas_limit=block.gasLimit,
-                gas_used=block.gasUsed,
-                base_fee_per_gas=getattr(block, "baseFeePerGas", None),
-                transactions=[tx.hex() for tx in block.transactions],
-                miner=block.miner,
-                difficulty=block.difficulty,
-                total_difficulty=block.totalDifficulty,
-                size=block.size,
-                extra_data=block.extraData.hex(),
+            # Missing blocks are negatively cached for one block interval
+            return await self.cache.get_or_load(
+                self.cache.make_key("block", network, block_number),
+                load,
+                ttl=lambda block: self._finality_ttl(network, block.number),
+                negative_ttl=self.networks[network].block_time,
             )
 
-        except BlockNotFound:
-            logger.warning(f"Block {block_number} not found on {network}")
-            return None
         except Exception as e:
             logger.error(f"Error getting block {block_number} for {network}: {e}")
             return None
 
+    def _block_from_rpc(self, block: dict[str, Any]) -> BlockData:
+        """Convert a JSON-RPC block object into BlockData"""
+        return BlockData(
+            number=_hex_to_int(block["number"]),
+            hash=block["hash"],
+            parent_hash=block["parentHash"],
+            timestamp=datetime.fromtimestamp(_hex_to_int(block["timestamp"])),
+            gas_limit=_hex_to_int(block["gasLimit"]),
+            gas_used=_hex_to_int(block["gasUsed"]),
+            base_fee_per_gas=_hex_to_int(block.get("baseFeePerGas")),
+            transactions=[
+                tx if isinstance(tx, str) else tx["hash"] for tx in block.get("transactions", [])
+            ],
+            miner=block.get("miner", ""),
+            difficulty=_hex_to_int(block.get("difficulty")) or 0,
+            total_difficulty=_hex_to_int(block.get("totalDifficulty")) or 0,
+            size=_hex_to_int(block.get("size")) or 0,
+            extra_data=block.get("extraData", "0x"),
+        )
+
     async def get_transaction(self, network: str, tx_hash: str) -> TransactionData | None:
         """Get transaction by hash from blockchain"""
-        if network not in self.web3_instances:
-            raise ValueError(f"Network {network} not initialized")
-
-        w3 = self.web3_instances[network]
-
-        try:
-            await self._rate_limit(network)
+        pool = self._get_rpc_pool(network)
 
-            tx = w3.eth.get_transaction(tx_hash)
-            receipt = w3.eth.get_transaction_receipt(tx_hash)
+        async def load() -> TransactionData | None:
+            # Both calls go out in the same JSON-RPC batch
+            tx, receipt = await asyncio.gather(
+                pool.request("eth_getTransactionByHash", [tx_hash]),
+                pool.request("eth_getTransactionReceipt", [tx_hash]),
+            )
+            if tx is None or receipt is None:
+                logger.warning(f"Transaction {tx_hash} not found on {network}")
+                return None
 
+            block_number = _hex_to_int(tx["blockNumber"])
             return TransactionData(
-                hash=tx.hash.hex(),
-                block_number=tx.blockNumber,
-                block_hash=tx.blockHash.hex(),
-                transaction_index=tx.transactionIndex,
+                hash=tx["hash"],
+                block_number=block_number,
+                block_hash=tx["blockHash"],
+                transaction_index=_hex_to_int(tx["transactionIndex"]),
                 from_address=tx["from"],
-                to_address=tx.to,
-                value=tx.value,
-                gas=tx.gas,
-                gas_price=tx.gasPrice,
-                max_fee_per_gas=getattr(tx, "maxFeePerGas", None),
-                max_priority_fee_per_gas=getattr(tx, "maxPriorityFeePerGas", None),
-                nonce=tx.nonce,
-                input_data=tx.input.hex(),
-                timestamp=datetime.fromtimestamp(receipt.blockNumber),  # Approximate
-                status=receipt.status,
+                to_address=tx.get("to"),
+                value=_hex_to_int(tx["value"]),
+                gas=_hex_to_int(tx["gas"]),
+                gas_price=_hex_to_int(tx.get("gasPrice")),
+                max_fee_per_gas=_hex_to_int(tx.get("maxFeePerGas")),
+                max_priority_fee_per_gas=_hex_to_int(tx.get("maxPriorityFeePerGas")),
+                nonce=_hex_to_int(tx["nonce"]),
+                input_data=tx.get("input", "0x"),
+                timestamp=datetime.fromtimestamp(block_number),  # Approximate
+                status=_hex_to_int(receipt.get("status")),
                 receipt={
-                    "gas_used": receipt.gasUsed,
-                    "effective_gas_price": receipt.effectiveGasPrice,
-                    "contract_address": receipt.contractAddress,
-                    "logs": [log.hex() for log in receipt.logs],
+                    "gas_used": _hex_to_int(receipt["gasUsed"]),
+                    "effective_gas_price": _hex_to_int(receipt.get("effectiveGasPrice")),
+                    "contract_address": receipt.get("contractAddress"),
+                    "logs": receipt.get("logs", []),
                 },
             )
 
-        except TransactionNotFound:
-            logger.warning(f"Transaction {tx_hash} not found on {network}")
-            return None
+        try:
+            # Unknown/pending transactions are only negatively cached for one block
+            return await self.cache.get_or_load(
+                self.cache.make_key("transaction", network, tx_hash.lower()),
+                load,
+                ttl=lambda tx: self._finality_ttl(network, tx.block_number),
+                negative_ttl=self.networks[network].block_time,
+            )
+
         except Exception as e:
             logger.error(f"Error getting transaction {tx_hash} for {network}: {e}")
             return None
@@ -537,23 +596,27 @@ class BlockchainIntegration:
 
     async def get_balance(self, network: str, address: str, token_address: str = None) -> int:
         """Get balance from blockchain"""
-        if network not in self.web3_instances:
-            raise ValueError(f"Network {network} not initialized")
-
-        w3 = self.web3_instances[network]
-
-        try:
-            await self._rate_limit(network)
+        pool = self._get_rpc_pool(network)
 
+        async def load() -> int:
             if token_address:
                 # ERC-20 token balance
                 # In production, this would use the ERC-20 ABI
-                balance = 0  # Placeholder for ERC-20 balance
-            else:
-                # Native token balance
-                balance = w3.eth.get_balance(to_checksum_address(address))
+                return 0  # Placeholder for ERC-20 balance
+
+            # Native token balance
+            return _hex_to_int(
+                await pool.request("eth_getBalance", [to_checksum_address(address), "latest"])
+            )
 
-            return balance
+        try:
+            return await self.cache.get_or_load(
+                self.cache.make_key(
+                    "balance", network, address.lower(), (token_address or "").lower()
+                ),
+                load,
+                ttl=self.networks[network].block_time,
+            )
 
         except Exception as e:
             logger.error(f"Error getting balance for {address} on {network}: {e}")
@@ -561,21 +624,34 @@ class BlockchainIntegration:
 
     async def get_code(self, network: str, address: str) -> str:
         """Get contract code from blockchain"""
-        if network not in self.web3_instances:
-            raise ValueError(f"Network {network} not initialized")
+        pool = self._get_rpc_pool(network)
 
-        w3 = self.web3_instances[network]
+        async def load() -> str:
+            return await pool.request("eth_getCode", [to_checksum_address(address), "latest"])
 
         try:
-            await self._rate_limit(network)
-
-            code = w3.eth.get_code(to_checksum_address(address))
-            return code.hex()
+            return await self.cache.get_or_load(
+                self.cache.make_key("code", network, address.lower()),
+                load,
+                ttl=CODE_CACHE_TTL,
+            )
 
         except Exception as e:
             logger.error(f"Error getting code for {address} on {network}: {e}")
             return "0x"
 
+    async def get_balances(self, network: str, addresses: list[str]) -> dict[str, int]:
+        """Get native balances for many addresses in as few RPC round trips as possible"""
+        balances = await asyncio.gather(
+            *[self.get_balance(network, address) for address in addresses]
+        )
+        return dict(zip(addresses, balances))
+
+    async def get_codes(self, network: str, addresses: list[str]) -> dict[str, str]:
+        """Get contract code for many addresses in as few RPC round trips as possible"""
+        codes = await asyncio.gather(*[self.get_code(network, address) for address in addresses])
+        return dict(zip(addresses, codes))
+
     async def call_contract(
         self,
         network: str,
@@ -689,7 +765,17 @@ class BlockchainIntegration:
         if network not in self.web3_instances:
             return {"status": "disconnected", "error": "Network not initialized"}
 
-        w3 = self.web3_instances[network]
+        # Status polls from every route share one refresh per block interval
+        block_time = self.networks[network].block_time
+        return await self.cache.get_or_load(
+            self.cache.make_key("network_status", network),
+            lambda: self._build_network_status(network),
+            ttl=block_time,
+            stale_ttl=block_time * 2,
+        )
+
+    async def _build_network_status(self, network: str) -> dict[str, Any]:
+        """Query the chain for network status"""
         config = self.networks[network]
 
         try:
@@ -738,9 +824,15 @@ class BlockchainIntegration:
         """Close all connections"""
         logger.info("Closing blockchain connections...")
 
+        for rpc_pool in self.rpc_pools.values():
+            await rpc_pool.close()
+
         if self.connection_pool:
             await self.connection_pool.close()
 
+        if self._owns_cache:
+            await self.cache.close()
+
         # Close WebSocket connections
         for ws_connection in self.ws_connections.values():
             if ws_connection:
@@ -748,6 +840,10 @@ class BlockchainIntegration:
 
         logger.info("Blockchain connections closed")
 
+    def get_rpc_pool_stats(self) -> dict[str, Any]:
+        """Get batching and endpoint health statistics for each network"""
+        return {network: pool.get_stats() for network, pool in self.rpc_pools.items()}
+
     def get_supported_networks(self) -> list[str]:
         """Get list of supported networks"""
         return list(self.networks.keys())
@@ -4,11 +4,16 @@ Bridge Analyzer - Core analysis engine for cross-chain bridges
 """
 
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from .bridge_scan import BridgeScanResult, BridgeScanScheduler, BridgeScanTarget, ScanSnapshot
 from .security_monitor import SecurityMonitor
-from ..models.bridge import SecurityLevel, BridgeAnalysis
+from ..models.bridge import SecurityLevel, BridgeAnalysis, BridgeSecurityScore
+
+if TYPE_CHECKING:
+    from .blockchain_integration import BlockchainIntegration
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +21,12 @@ logger = logging.getLogger(__name__)
 class BridgeAnalyzer:
     """Core bridge analysis engine"""
 
-    def __init__(self):
+    def __init__(self, blockchain_integration: "BlockchainIntegration | None" = None):
         self.networks: dict[str, Any] = {}
         self.bridge_configs: dict[str, Any] = {}
         self.analysis_cache: dict[str, Any] = {}
         self.security_monitor = SecurityMonitor()
+        self.blockchain_integration = blockchain_integration
         self.initialized = False
 
         logger.info("BridgeAnalyzer initialized")
@@ -47,6 +53,7 @@ class BridgeAnalyzer:
         target_network: str | None = None,
         network: str | None = None,
         analysis_depth: str = "comprehensive",
+        snapshot: ScanSnapshot | None = None,
     ) -> BridgeAnalysis:
         """Analyze a specific bridge
         
@@ -56,6 +63,7 @@ class BridgeAnalyzer:
             target_network: Target blockchain network (optional)
             network: Network where bridge is deployed (optional, for backward compatibility)
             analysis_depth: Analysis depth - basic, comprehensive, or deep
+            snapshot: Shared on-chain reads for a portfolio scan (optional)
             
         Returns:
             BridgeAnalysis object with analysis results
@@ -87,6 +95,10 @@ class BridgeAnalyzer:
             ],
         )
 
+        onchain_state = await self._get_bridge_state(bridge_address, bridge_network, snapshot)
+        if onchain_state:
+            analysis.source_network_analysis = {"onchain_state": onchain_state}
+
         # Cache the result
         cache_key = f"{bridge_network}:{bridge_address}"
         self.analysis_cache[cache_key] = analysis
@@ -106,8 +118,6 @@ class BridgeAnalyzer:
         Returns:
             BridgeSecurityScore object with detailed scoring
         """
-        from ..models.bridge import BridgeSecurityScore
-        
         logger.info(f"Calculating security score for {bridge_address} on {network}")
         
         # Default scoring criteria
@@ -217,7 +227,7 @@ class BridgeAnalyzer:
         return self.initialized
 
     async def detect_attestation_anomalies(
-        self, bridge_address: str, network: str
+        self, bridge_address: str, network: str, snapshot: ScanSnapshot | None = None
     ) -> dict[str, Any]:
         """Detect attestation anomalies in bridge operations"""
         logger.info(f"Detecting attestation anomalies for {bridge_address} on {network}")
@@ -229,6 +239,7 @@ class BridgeAnalyzer:
             "attestation_anomalies": [],
             "severity_score": 0,
             "risk_level": "low",
+            "onchain_state": await self._get_bridge_state(bridge_address, network, snapshot),
         }
 
         # Mock anomaly detection logic
@@ -283,7 +294,9 @@ class BridgeAnalyzer:
 
         return anomalies
 
-    async def analyze_quorum_skews(self, bridge_address: str, network: str) -> dict[str, Any]:
+    async def analyze_quorum_skews(
+        self, bridge_address: str, network: str, snapshot: ScanSnapshot | None = None
+    ) -> dict[str, Any]:
         """Analyze quorum skews and liveness gaps in bridge validators"""
         logger.info(f"Analyzing quorum skews for {bridge_address} on {network}")
 
@@ -307,6 +320,7 @@ class BridgeAnalyzer:
             },
             "alerts": [],
             "recommendations": [],
+            "onchain_state": await self._get_bridge_state(bridge_address, network, snapshot),
         }
 
         # Mock liveness gaps
@@ -356,7 +370,7 @@ class BridgeAnalyzer:
         return analysis
 
     async def proof_of_reserves_monitoring(
-        self, bridge_address: str, network: str
+        self, bridge_address: str, network: str, snapshot: ScanSnapshot | None = None
     ) -> dict[str, Any]:
         """Monitor proof-of-reserves for bridge contracts"""
         logger.info(f"Monitoring proof-of-reserves for {bridge_address} on {network}")
@@ -387,6 +401,7 @@ class BridgeAnalyzer:
             },
             "alerts": [],
             "risk_assessment": "low",
+            "onchain_state": await self._get_bridge_state(bridge_address, network, snapshot),
         }
 
         # Check collateralization
@@ -416,6 +431,37 @@ class BridgeAnalyzer:
 
         return monitoring
 
+    def scan_portfolio(
+        self,
+        targets: list[BridgeScanTarget],
+        max_concurrency: int = 32,
+        bridge_timeout: float | None = 120.0,
+    ) -> AsyncIterator[BridgeScanResult]:
+        """Scan many bridges concurrently, yielding results as each bridge completes.
+
+        All analyses in the scan share one ScanSnapshot, so on-chain state that
+        several bridges or analyses need is read once per scan.
+        """
+        scheduler = BridgeScanScheduler(
+            self, max_concurrency=max_concurrency, bridge_timeout=bridge_timeout
+        )
+        return scheduler.scan(targets)
+
+    async def _get_bridge_state(
+        self, bridge_address: str, network: str, snapshot: ScanSnapshot | None
+    ) -> dict[str, Any] | None:
+        """Fetch on-chain bridge state through the scan snapshot, if a client is available."""
+        if snapshot is None:
+            if self.blockchain_integration is None:
+                return None
+            snapshot = ScanSnapshot(self.blockchain_integration)
+
+        try:
+            return await snapshot.get_bridge_state(network, bridge_address)
+        except Exception as e:
+            logger.warning(f"Could not read on-chain state for {bridge_address} on {network}: {e}")
+            return None
+
     def _calculate_security_score(self, analysis: BridgeAnalysis) -> float:
         """Calculate security score from bridge analysis.
         
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Bridge Scan Pipeline - Concurrent multi-bridge portfolio scanning with shared on-chain snapshots
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .blockchain_integration import BlockchainIntegration
+    from .bridge_analyzer import BridgeAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BridgeScanTarget:
+    """A bridge to include in a portfolio scan"""
+
+    bridge_address: str
+    network: str
+    target_network: str | None = None
+    analysis_depth: str = "comprehensive"
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.network, self.bridge_address.lower())
+
+
+@dataclass
+class BridgeScanResult:
+    """All analyses for one bridge in a portfolio scan"""
+
+    target: BridgeScanTarget
+    analysis: Any | None = None
+    attestation_anomalies: dict[str, Any] | None = None
+    quorum_analysis: dict[str, Any] | None = None
+    reserves_monitoring: dict[str, Any] | None = None
+    errors: dict[str, str] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+    completed_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict[str, Any]:
+        analysis = self.analysis
+        if analysis is not None and hasattr(analysis, "model_dump"):
+            analysis = analysis.model_dump(mode="json")
+        return {
+            "bridge_address": self.target.bridge_address,
+            "network": self.target.network,
+            "target_network": self.target.target_network,
+            "analysis": analysis,
+            "attestation_anomalies": self.attestation_anomalies,
+            "quorum_analysis": self.quorum_analysis,
+            "reserves_monitoring": self.reserves_monitoring,
+            "errors": self.errors,
+            "duration_seconds": self.duration_seconds,
+            "completed_at": self.completed_at.isoformat(),
+        }
+
+
+class ScanSnapshot:
+    """Per-scan memo of on-chain reads
+
+    Every distinct read (code, balance, head block) is fetched once per scan
+    no matter how many bridges or analyses ask for it, and concurrent
+    requests for the same read share a single fetch. The head block number
+    is read once per scan and reused by every analysis; code and balance
+    reads are taken at ``latest``, not pinned to that block.
+    """
+
+    def __init__(self, blockchain_integration: "BlockchainIntegration | None" = None):
+        self.blockchain = blockchain_integration
+        self.created_at = datetime.utcnow()
+        self._reads: dict[tuple, asyncio.Future] = {}
+        self.stats = {"reads": 0, "deduplicated": 0, "errors": 0}
+
+    async def read(self, key: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the memoized result of ``loader`` for ``key``"""
+        future = self._reads.get(key)
+        if future is not None:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._reads[key] = future
+        self.stats["reads"] += 1
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            # Wake waiters rather than leave them on a future nobody resolves
+            self._reads.pop(key, None)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self.stats["errors"] += 1
+            # Failed reads are not memoized so a later analysis can retry
+            self._reads.pop(key, None)
+            future.set_exception(e)
+            future.exception()
+            raise
+        future.set_result(result)
+        return result
+
+    async def get_head_block_number(self, network: str) -> int | None:
+        async def load():
+            block = await self.blockchain.get_latest_block(network)
+            return block.number if block else None
+
+        return await self.read(("head", network), load)
+
+    async def get_code(self, network: str, address: str) -> str:
+        return await self.read(
+            ("code", network, address.lower()),
+            lambda: self.blockchain.get_code(network, address),
+        )
+
+    async def get_balance(self, network: str, address: str) -> int:
+        return await self.read(
+            ("balance", network, address.lower()),
+            lambda: self.blockchain.get_balance(network, address),
+        )
+
+    async def get_bridge_state(self, network: str, address: str) -> dict[str, Any] | None:
+        """Shared on-chain state for a bridge contract, or None without a blockchain client"""
+        if self.blockchain is None:
+            return None
+
+        async def load():
+            block_number, code, balance = await asyncio.gather(
+                self.get_head_block_number(network),
+                self.get_code(network, address),
+                self.get_balance(network, address),
+            )
+            code_size = (len(code) - 2) // 2 if code and code.startswith("0x") else 0
+            return {
+                "network": network,
+                "block_number": block_number,
+                "has_code": code_size > 0,
+                "code_size": code_size,
+                "native_balance": balance,
+            }
+
+        return await self.read(("bridge_state", network, address.lower()), load)
+
+
+class BridgeScanScheduler:
+    """Runs bridge analyses for a portfolio concurrently under a global budget
+
+    Each bridge's analyses run concurrently with each other and with other
+    bridges, but no more than ``max_concurrency`` analyses are in flight at
+    once across the whole scan. ``bridge_timeout`` bounds each analysis from
+    the moment it holds a budget slot, so time spent queued behind other
+    bridges never counts against it. Results are yielded as each bridge
+    completes.
+    """
+
+    ANALYSES = (
+        "analysis",
+        "attestation_anomalies",
+        "quorum_analysis",
+        "reserves_monitoring",
+    )
+
+    def __init__(
+        self,
+        analyzer: "BridgeAnalyzer",
+        max_concurrency: int = 32,
+        bridge_timeout: float | None = 120.0,
+    ):
+        self.analyzer = analyzer
+        self.max_concurrency = max_concurrency
+        self.bridge_timeout = bridge_timeout
+        self.last_scan_stats: dict[str, Any] = {}
+
+    async def scan(
+        self, targets: list[BridgeScanTarget], snapshot: ScanSnapshot | None = None
+    ) -> AsyncIterator[BridgeScanResult]:
+        """Scan a portfolio, yielding each bridge's result as soon as it is ready"""
+        snapshot = snapshot or ScanSnapshot(self.analyzer.blockchain_integration)
+        budget = asyncio.Semaphore(self.max_concurrency)
+        unique_targets = list({target.key: target for target in targets}.values())
+
+        started = time.monotonic()
+        stats = {"bridges": len(unique_targets), "completed": 0, "failed": 0}
+        self.last_scan_stats = stats
+        logger.info(
+            f"Starting portfolio scan of {len(unique_targets)} bridges "
+            f"(concurrency={self.max_concurrency})"
+        )
+
+        tasks = [
+            asyncio.create_task(self._scan_bridge(target, snapshot, budget))
+            for target in unique_targets
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                stats["completed"] += 1
+                if not result.succeeded:
+                    stats["failed"] += 1
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            stats["duration_seconds"] = time.monotonic() - started
+            stats["snapshot"] = dict(snapshot.stats)
+            logger.info(
+                f"Portfolio scan finished: {stats['completed']}/{stats['bridges']} bridges "
+                f"in {stats['duration_seconds']:.1f}s"
+            )
+
+    async def scan_all(self, targets: list[BridgeScanTarget]) -> list[BridgeScanResult]:
+        """Scan a portfolio and collect every result"""
+        return [result async for result in self.scan(targets)]
+
+    async def _scan_bridge(
+        self, target: BridgeScanTarget, snapshot: ScanSnapshot, budget: asyncio.Semaphore
+    ) -> BridgeScanResult:
+        started = time.monotonic()
+        result = BridgeScanResult(target=target)
+        analyzer = self.analyzer
+        calls = {
+            "analysis": lambda: analyzer.analyze_bridge(
+                bridge_address=target.bridge_address,
+                source_network=target.network,
+                target_network=target.target_network,
+                analysis_depth=target.analysis_depth,
+                snapshot=snapshot,
+            ),
+            "attestation_anomalies": lambda: analyzer.detect_attestation_anomalies(
+                target.bridge_address, target.network, snapshot=snapshot
+            ),
+            "quorum_analysis": lambda: analyzer.analyze_quorum_skews(
+                target.bridge_address, target.network, snapshot=snapshot
+            ),
+            "reserves_monitoring": lambda: analyzer.proof_of_reserves_monitoring(
+                target.bridge_address, target.network, snapshot=snapshot
+            ),
+        }
+
+        async def run(name: str):
+            async with budget:
+                # The clock starts once the analysis holds a slot
+                try:
+                    return await asyncio.wait_for(calls[name](), timeout=self.bridge_timeout)
+                except asyncio.TimeoutError:
+                    raise asyncio.TimeoutError(f"{name} exceeded {self.bridge_timeout}s") from None
+
+        outcomes = await asyncio.gather(
+            *[run(name) for name in self.ANALYSES], return_exceptions=True
+        )
+
+        for name, outcome in zip(self.ANALYSES, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"{name} failed for {target.bridge_address} on {target.network}: {outcome}")
+                result.errors[name] = str(outcome)
+            else:
+                setattr(result, name, outcome)
+
+        result.duration_seconds = time.monotonic() - started
+        result.completed_at = datetime.utcnow()
+        return result
@@ -5,15 +5,14 @@ Liveness Monitor - Network health monitoring and liveness gap detection
 
 import asyncio
 import logging
-import statistics
 import time
-from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
 import aiohttp
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +89,107 @@ class ValidatorLiveness:
     issues: list[LivenessIssue]
 
 
+class HealthHistoryBuffer:
+    """Fixed-size ring buffers of numeric health samples for one network
+
+    Each field is a preallocated numpy array written in place, so appending
+    is O(1) and trend/gap analysis runs vectorized over the stored window.
+    Latency and block lag are NaN for failed probes.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.timestamp = np.zeros(capacity, dtype=np.float64)
+        self.response_time = np.full(capacity, np.nan)
+        self.block_height = np.zeros(capacity, dtype=np.int64)
+        self.block_lag = np.full(capacity, np.nan)
+        self.health_score = np.zeros(capacity, dtype=np.float64)
+        self.error = np.zeros(capacity, dtype=bool)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        timestamp: float,
+        response_time: float,
+        block_height: int,
+        block_lag: float,
+        health_score: float,
+        error: bool,
+    ):
+        i = self._next
+        self.timestamp[i] = timestamp
+        self.response_time[i] = response_time
+        self.block_height[i] = block_height
+        self.block_lag[i] = block_lag
+        self.health_score[i] = health_score
+        self.error[i] = error
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def window(self, field: str, last: int | None = None) -> np.ndarray:
+        """Samples of one field in chronological order, optionally only the most recent ``last``"""
+        array = getattr(self, field)
+        n = self._size if last is None else min(last, self._size)
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            return array[start : start + n]
+        return np.concatenate((array[start:], array[: start + n - self.capacity]))
+
+    def summary(self, last: int | None = None) -> dict[str, Any]:
+        """Latency and block-lag percentiles, error rate and mean health over a window"""
+        errors = self.window("error", last)
+        if not errors.size:
+            return {"samples": 0}
+
+        latency = self.window("response_time", last)[~errors]
+        lag = self.window("block_lag", last)[~errors]
+        lag = lag[~np.isnan(lag)]
+        summary: dict[str, Any] = {
+            "samples": int(errors.size),
+            "error_rate": float(errors.mean()),
+            "health_score_avg": float(self.window("health_score", last).mean()),
+        }
+        if latency.size:
+            p50, p95, p99 = np.percentile(latency, [50, 95, 99]).tolist()
+            summary["response_time"] = {
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "max": float(latency.max()),
+            }
+        if lag.size:
+            p50, p95 = np.percentile(lag, [50, 95]).tolist()
+            summary["block_lag"] = {"p50": p50, "p95": p95, "max": float(lag.max())}
+        return summary
+
+    def trailing_outage(self, block_lag_max: float) -> dict[str, Any] | None:
+        """The run of failed or stalled samples ending at the latest sample, if any"""
+        if not self._size:
+            return None
+
+        errors = self.window("error")
+        lag = self.window("block_lag")
+        with np.errstate(invalid="ignore"):
+            unhealthy = errors | (lag > block_lag_max)
+        if not unhealthy[-1]:
+            return None
+
+        healthy = np.flatnonzero(~unhealthy)
+        start = int(healthy[-1]) + 1 if healthy.size else 0
+        timestamps = self.window("timestamp")
+        return {
+            "start_time": float(timestamps[start]),
+            "last_time": float(timestamps[-1]),
+            "samples": int(unhealthy.size - start),
+            "error_samples": int(errors[start:].sum()),
+            "max_block_lag": float(np.nanmax(lag[start:])) if (~errors[start:]).any() else None,
+        }
+
+
 class LivenessMonitor:
     """Comprehensive liveness monitoring and gap detection system"""
 
@@ -97,9 +197,11 @@ class LivenessMonitor:
         self.network_health: dict[str, NetworkHealth] = {}
         self.validator_liveness: dict[str, ValidatorLiveness] = {}
         self.liveness_gaps: list[LivenessGap] = []
-        self.health_history: dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.health_history: dict[str, HealthHistoryBuffer] = {}
         self.rpc_endpoints: dict[str, list[str]] = {}
         self.monitoring_config: dict[str, Any] = {}
+        self._open_network_gaps: dict[str, LivenessGap] = {}
+        self._session: aiohttp.ClientSession | None = None
 
         # Configuration
         self.health_thresholds = {
@@ -117,6 +219,14 @@ class LivenessMonitor:
             "gap_detection": 60,  # 1 minute
         }
 
+        self.probe_settings = {
+            "timeout": 5.0,  # seconds, per endpoint probe
+            "max_concurrent": 64,  # probes in flight across all networks
+            "history_size": 1000,  # samples kept per network
+            "trend_window": 120,  # samples used for trend percentiles
+        }
+        self._probe_semaphore = asyncio.Semaphore(self.probe_settings["max_concurrent"])
+
         logger.info("LivenessMonitor initialized")
 
     async def initialize_networks(self, networks: list[dict[str, Any]]):
@@ -125,6 +235,9 @@ class LivenessMonitor:
             network_name = network_config["name"]
             self.rpc_endpoints[network_name] = network_config.get("rpc_endpoints", [])
             self.monitoring_config[network_name] = network_config.get("monitoring", {})
+            self.health_history[network_name] = HealthHistoryBuffer(
+                self.probe_settings["history_size"]
+            )
 
             # Initialize network health
             self.network_health[network_name] = NetworkHealth(
@@ -164,8 +277,7 @@ class LivenessMonitor:
         """Monitor network health continuously"""
         while True:
             try:
-                for network in self.network_health.keys():
-                    await self._check_network_health(network)
+                await self._check_all_networks()
                 await asyncio.sleep(self.monitoring_intervals["network_check"])
             except Exception as e:
                 logger.error(f"Network monitoring error: {e}")
@@ -202,9 +314,16 @@ class LivenessMonitor:
                 logger.error(f"Health analysis error: {e}")
                 await asyncio.sleep(10)
 
+    async def _check_all_networks(self):
+        """Probe every network's endpoints concurrently"""
+        await asyncio.gather(
+            *[self._check_network_health(network) for network in list(self.network_health)]
+        )
+
     async def _check_network_health(self, network: str):
         """Check health of a specific network"""
         logger.debug(f"Checking health for network: {network}")
+        started = time.monotonic()
 
         try:
             # Get RPC endpoints for network
@@ -213,27 +332,26 @@ class LivenessMonitor:
                 logger.warning(f"No RPC endpoints configured for network: {network}")
                 return
 
-            # Test each endpoint
-            best_endpoint = None
-            best_response_time = float("inf")
-            network_data = None
-
-            for endpoint in endpoints:
-                try:
-                    response_time, data = await self._test_rpc_endpoint(endpoint)
-                    if response_time < best_response_time:
-                        best_response_time = response_time
-                        best_endpoint = endpoint
-                        network_data = data
-                except Exception as e:
-                    logger.debug(f"RPC endpoint {endpoint} failed: {e}")
-                    continue
-
-            if network_data is None:
+            # Probe all endpoints at once and keep the fastest answer
+            results = await asyncio.gather(
+                *[self._probe_endpoint(endpoint) for endpoint in endpoints],
+                return_exceptions=True,
+            )
+            probes = []
+            for endpoint, result in zip(endpoints, results):
+                if isinstance(result, Exception):
+                    logger.debug(f"RPC endpoint {endpoint} failed: {result!r}")
+                else:
+                    probes.append(result)
+
+            if not probes:
                 # All endpoints failed
+                self._record_health_sample(network, np.nan, 0, np.nan, 0.0, error=True)
                 await self._update_network_status(network, NetworkStatus.DOWN, [], 0.0)
                 return
 
+            best_response_time, network_data = min(probes, key=lambda probe: probe[0])
+
             # Analyze network data
             issues = await self._analyze_network_issues(network, network_data, best_response_time)
             health_score = await self._calculate_network_health_score(
@@ -242,69 +360,108 @@ class LivenessMonitor:
 
             # Update network health
             await self._update_network_status(network, NetworkStatus.HEALTHY, issues, health_score)
+            health = self.network_health[network]
+            health.response_time = best_response_time
+            health.block_height = network_data.get("block_height", 0)
+            health.block_time = network_data.get("block_time", 0)
+            health.metrics["endpoints_available"] = len(probes)
+            health.metrics["endpoints_total"] = len(endpoints)
+            health.metrics["best_endpoint"] = network_data.get("endpoint")
 
             # Store health data
-            health_data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "response_time": best_response_time,
-                "block_height": network_data.get("block_height", 0),
-                "block_time": network_data.get("block_time", 0),
-                "health_score": health_score,
-                "issues": [issue.value for issue in issues],
-            }
-            self.health_history[network].append(health_data)
+            block_time = network_data.get("block_time", 0)
+            self._record_health_sample(
+                network,
+                best_response_time,
+                network_data.get("block_height", 0),
+                time.time() - block_time if block_time else np.nan,
+                health_score,
+                error=False,
+            )
 
         except Exception as e:
             logger.error(f"Error checking network health for {network}: {e}")
+            # Keep the failed check in the history so gap detection sees it
+            self._record_health_sample(
+                network, time.monotonic() - started, 0, np.nan, 0.0, error=True
+            )
             await self._update_network_status(
                 network, NetworkStatus.UNKNOWN, [LivenessIssue.RPC_UNAVAILABLE], 0.0
             )
 
-    async def _test_rpc_endpoint(self, endpoint: str) -> tuple[float, dict[str, Any]]:
-        """Test an RPC endpoint and return response time and data"""
-        start_time = time.time()
-
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            # Test basic connectivity
-            response = await session.post(
-                endpoint,
-                json={"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1},
+    def _record_health_sample(
+        self,
+        network: str,
+        response_time: float,
+        block_height: int,
+        block_lag: float,
+        health_score: float,
+        error: bool,
+    ):
+        history = self.health_history.get(network)
+        if history is None:
+            history = self.health_history[network] = HealthHistoryBuffer(
+                self.probe_settings["history_size"]
+            )
+        history.append(time.time(), response_time, block_height, block_lag, health_score, error)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session used by every endpoint probe"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.probe_settings["max_concurrent"], ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.probe_settings["timeout"]),
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared probe session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _probe_endpoint(self, endpoint: str) -> tuple[float, dict[str, Any]]:
+        """Probe one endpoint under the global concurrency budget and a hard timeout"""
+        async with self._probe_semaphore:
+            return await asyncio.wait_for(
+                self._test_rpc_endpoint(endpoint), timeout=self.probe_settings["timeout"]
             )
 
+    async def _test_rpc_endpoint(self, endpoint: str) -> tuple[float, dict[str, Any]]:
+        """Test an RPC endpoint and return response time and data"""
+        session = await self._get_session()
+        start_time = time.monotonic()
+
+        # The latest block carries both the height and its timestamp, so one round trip suffices
+        async with session.post(
+            endpoint,
+            json={
+                "jsonrpc": "2.0",
+                "method": "eth_getBlockByNumber",
+                "params": ["latest", False],
+                "id": 1,
+            },
+        ) as response:
             if response.status != 200:
                 raise Exception(f"HTTP {response.status}")
+            data = await response.json(content_type=None)
 
-            data = await response.json()
-            if "error" in data:
-                raise Exception(f"RPC error: {data['error']}")
-
-            response_time = time.time() - start_time
-
-            # Get additional network data
-            block_height = int(data["result"], 16)
+        response_time = time.monotonic() - start_time
 
-            # Get block time
-            block_response = await session.post(
-                endpoint,
-                json={
-                    "jsonrpc": "2.0",
-                    "method": "eth_getBlockByNumber",
-                    "params": [hex(block_height), False],
-                    "id": 2,
-                },
-            )
+        if "error" in data:
+            raise Exception(f"RPC error: {data['error']}")
+        block = data.get("result")
+        if not block:
+            raise Exception("RPC returned no block")
 
-            block_data = await block_response.json()
-            block_timestamp = (
-                int(block_data["result"]["timestamp"], 16) if "result" in block_data else 0
-            )
-
-            return response_time, {
-                "block_height": block_height,
-                "block_time": block_timestamp,
-                "response_time": response_time,
-                "endpoint": endpoint,
-            }
+        return response_time, {
+            "block_height": int(block["number"], 16),
+            "block_time": int(block["timestamp"], 16),
+            "response_time": response_time,
+            "endpoint": endpoint,
+        }
 
     async def _analyze_network_issues(
         self, network: str, network_data: dict[str, Any], response_time: float
@@ -458,12 +615,9 @@ class LivenessMonitor:
 
     async def _analyze_liveness_gaps(self):
         """Analyze for liveness gaps across all monitored components"""
-        current_time = datetime.utcnow()
-
         # Check network gaps
-        for network, health in self.network_health.items():
-            if health.status in [NetworkStatus.DOWN, NetworkStatus.UNHEALTHY]:
-                await self._detect_network_gap(network, health)
+        for network in self.network_health:
+            await self._detect_network_gap(network)
 
         # Check validator gaps
         for validator_address, validator in self.validator_liveness.items():
@@ -473,50 +627,66 @@ class LivenessMonitor:
             ):
                 await self._detect_validator_gap(validator_address, validator)
 
-    async def _detect_network_gap(self, network: str, health: NetworkHealth):
-        """Detect liveness gap for a network"""
-        # Check if gap already exists
-        existing_gap = None
-        for gap in self.liveness_gaps:
-            if (
-                gap.network == network
-                and gap.issue_type in [LivenessIssue.RPC_UNAVAILABLE, LivenessIssue.BLOCK_STALL]
-                and gap.end_time is None
-            ):
-                existing_gap = gap
-                break
+    async def _detect_network_gap(self, network: str):
+        """Open, extend or close the liveness gap for a network from its health history"""
+        history = self.health_history.get(network)
+        if history is None:
+            return
+
+        current_time = datetime.utcnow()
+        existing_gap = self._open_network_gaps.get(network)
+        outage = history.trailing_outage(self.health_thresholds["block_time_max"])
+
+        if outage is None:
+            if existing_gap:
+                # Network recovered
+                existing_gap.end_time = current_time
+                existing_gap.duration = (current_time - existing_gap.start_time).total_seconds()
+                del self._open_network_gaps[network]
+            return
+
+        health = self.network_health[network]
+        metrics = {
+            "health_score": health.health_score,
+            "response_time": health.response_time,
+            "issues": [issue.value for issue in health.issues],
+            "failed_samples": outage["error_samples"],
+            "unhealthy_samples": outage["samples"],
+            "max_block_lag": outage["max_block_lag"],
+        }
 
         if existing_gap:
             # Update existing gap
             existing_gap.duration = (current_time - existing_gap.start_time).total_seconds()
-        else:
-            # Create new gap
-            gap = LivenessGap(
-                gap_id=f"network_{network}_{current_time.strftime('%Y%m%d_%H%M%S')}",
-                network=network,
-                issue_type=(
-                    LivenessIssue.RPC_UNAVAILABLE
-                    if health.status == NetworkStatus.DOWN
-                    else LivenessIssue.BLOCK_STALL
-                ),
-                start_time=current_time,
-                end_time=None,
-                duration=0.0,
-                severity="high" if health.status == NetworkStatus.DOWN else "medium",
-                description=f"Network {network} is {health.status.value}",
-                affected_components=["rpc", "blockchain", "bridge"],
-                resolution_actions=[
-                    "Check RPC endpoints",
-                    "Verify network connectivity",
-                    "Contact network operators",
-                ],
-                metrics={
-                    "health_score": health.health_score,
-                    "response_time": health.response_time,
-                    "issues": [issue.value for issue in health.issues],
-                },
-            )
-            self.liveness_gaps.append(gap)
+            existing_gap.metrics = metrics
+            return
+
+        # Create new gap
+        is_down = outage["error_samples"] > 0
+        start_time = datetime.utcfromtimestamp(outage["start_time"])
+        gap = LivenessGap(
+            gap_id=f"network_{network}_{start_time.strftime('%Y%m%d_%H%M%S')}",
+            network=network,
+            issue_type=LivenessIssue.RPC_UNAVAILABLE if is_down else LivenessIssue.BLOCK_STALL,
+            start_time=start_time,
+            end_time=None,
+            duration=(current_time - start_time).total_seconds(),
+            severity="high" if is_down else "medium",
+            description=(
+                f"Network {network} RPC unavailable"
+                if is_down
+                else f"Network {network} block production stalled"
+            ),
+            affected_components=["rpc", "blockchain", "bridge"],
+            resolution_actions=[
+                "Check RPC endpoints",
+                "Verify network connectivity",
+                "Contact network operators",
+            ],
+            metrics=metrics,
+        )
+        self._open_network_gaps[network] = gap
+        self.liveness_gaps.append(gap)
 
     async def _detect_validator_gap(self, validator_address: str, validator: ValidatorLiveness):
         """Detect liveness gap for a validator"""
@@ -563,13 +733,15 @@ class LivenessMonitor:
             self.liveness_gaps.append(gap)
 
     async def _update_health_scores(self):
-        """Update health scores based on recent data"""
-        for network in self.network_health.keys():
-            if network in self.health_history:
-                recent_data = list(self.health_history[network])[-10:]  # Last 10 data points
-                if recent_data:
-                    avg_health_score = statistics.mean([d["health_score"] for d in recent_data])
-                    self.network_health[network].health_score = avg_health_score
+        """Update health scores and trend percentiles based on recent data"""
+        for network, health in self.network_health.items():
+            history = self.health_history.get(network)
+            if not history:
+                continue
+
+            recent_scores = history.window("health_score", 10)  # Last 10 data points
+            health.health_score = float(recent_scores.mean())
+            health.metrics["trends"] = history.summary(self.probe_settings["trend_window"])
 
     async def register_validator(
         self, validator_address: str, network: str, metadata: dict[str, Any] = None
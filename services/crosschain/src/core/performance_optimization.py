@@ -5,25 +5,33 @@ Performance Optimization - Enterprise-grade performance optimization and caching
 
 import asyncio
 import cProfile
+import dataclasses
 import functools
 import gc
 import hashlib
+import inspect
 import io
 import logging
 import multiprocessing
 import pickle
 import pstats
+import struct
+import sys
 import time
 import tracemalloc
-from collections import defaultdict, deque
-from collections.abc import Callable
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Awaitable, Callable
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from enum import Enum
 from typing import Any
 
-import aioredis
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - legacy client
+    import aioredis
 import msgpack
 import numpy as np
 import orjson
@@ -78,19 +86,644 @@ class CacheEntry:
     access_count: int = 0
     last_accessed: datetime = None
     size_bytes: int = 0
+    stale_until: datetime | None = None
+    negative: bool = False
+    serialized: bool = False
+
+    def is_fresh(self, now: datetime) -> bool:
+        return self.expires_at is None or self.expires_at > now
+
+    def is_servable(self, now: datetime) -> bool:
+        """Fresh, or still inside its stale-while-revalidate window"""
+        if self.is_fresh(now):
+            return True
+        return self.stale_until is not None and self.stale_until > now
+
+
+_EPOCH = datetime(1970, 1, 1)
+_REDIS_HEADER = struct.Struct(">ddB")
+_FORMAT_JSON = b"j"
+_FORMAT_MSGPACK = b"m"
+_FORMAT_PICKLE = b"p"
+
+
+def serialize_value(data: Any) -> bytes:
+    """Serialize a value with a one-byte format tag so it round-trips exactly
+
+    orjson is only used for plain JSON types; dataclasses, datetimes and numpy
+    values fall through to msgpack/pickle so cached objects keep their type.
+    """
+    try:
+        return _FORMAT_JSON + orjson.dumps(
+            data,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    except (TypeError, ValueError):
+        pass
+    try:
+        return _FORMAT_MSGPACK + msgpack.packb(data)
+    except (TypeError, ValueError):
+        return _FORMAT_PICKLE + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize_value(data: bytes) -> Any:
+    """Deserialize a value produced by ``serialize_value``"""
+    tag, payload = data[:1], data[1:]
+    if tag == _FORMAT_JSON:
+        return orjson.loads(payload)
+    if tag == _FORMAT_MSGPACK:
+        return msgpack.unpackb(payload, raw=False)
+    if tag == _FORMAT_PICKLE:
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown cache payload format: {tag!r}")
+
+
+class UncacheableArgumentError(TypeError):
+    """A call argument has no value semantics to build a cache key from"""
+
+
+def _canonicalize(obj: Any) -> Any:
+    """Convert a value into a JSON-encodable form that is stable across runs
+
+    Objects without value semantics must define ``__cache_key__``; anything
+    else raises ``UncacheableArgumentError`` rather than keying on identity,
+    which would never hit across instances and collide once ids are reused.
+    """
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    if isinstance(obj, float):
+        return {"__float__": repr(obj)}
+    if isinstance(obj, Enum):
+        return _canonicalize(obj.value)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return {"__bytes__": bytes(obj).hex()}
+    if isinstance(obj, (datetime, date)):
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {"__decimal__": str(obj)}
+    if isinstance(obj, dict):
+        items = [[_canonicalize(k), _canonicalize(v)] for k, v in obj.items()]
+        items.sort(key=lambda item: orjson.dumps(item[0]))
+        return {"__map__": items}
+    if isinstance(obj, (list, tuple)):
+        return [_canonicalize(item) for item in obj]
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": sorted((_canonicalize(item) for item in obj), key=orjson.dumps)}
+
+    type_name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+    cache_key_hook = getattr(obj, "__cache_key__", None)
+    if callable(cache_key_hook):
+        return {"__type__": type_name, "key": _canonicalize(cache_key_hook())}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        fields = {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+        return {"__type__": type_name, "fields": _canonicalize(fields)}
+    model_dump = getattr(obj, "model_dump", None)
+    if callable(model_dump):
+        return {"__type__": type_name, "fields": _canonicalize(model_dump())}
+
+    raise UncacheableArgumentError(f"Cannot build a cache key from {type_name}")
+
+
+def canonical_cache_key(namespace: str, args: tuple = (), kwargs: dict | None = None) -> str:
+    """Build a stable cache key from a namespace and call arguments
+
+    Raises:
+        UncacheableArgumentError: an argument cannot be canonicalized
+    """
+    payload = orjson.dumps([_canonicalize(args), _canonicalize(kwargs or {})])
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _estimate_size(obj: Any, _seen: set | None = None) -> int:
+    """Approximate deep size of an in-memory value in bytes"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            _estimate_size(k, seen) + _estimate_size(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(_estimate_size(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        return size + _estimate_size(vars(obj), seen)
+    return size
+
+
+class MemoryCacheTier:
+    """In-process cache tier with O(1) LRU/LFU eviction and byte accounting
+
+    ``size_bytes`` tracks exactly what the tier holds: the serialized payload
+    for serialized entries, or a deep size estimate for raw objects.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 500 * 1024 * 1024,
+        policy: CacheStrategy = CacheStrategy.LRU,
+    ):
+        # TTL and write policies only affect expiry/writes; eviction order is LRU for them
+        self.policy = CacheStrategy.LFU if policy == CacheStrategy.LFU else CacheStrategy.LRU
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._freq_buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_freq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> list[str]:
+        return list(self._entries.keys())
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return an entry without updating its recency/frequency"""
+        return self._entries.get(key)
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._touch(key, entry)
+        return entry
+
+    def put(self, entry: CacheEntry) -> int:
+        """Insert an entry and return the number of entries evicted to make room"""
+        self.pop(entry.key)
+        if entry.size_bytes > self.max_bytes:
+            logger.debug(f"Cache entry {entry.key} exceeds memory tier capacity, not cached")
+            return 0
+
+        # Make room first so a new LFU entry is not its own eviction victim
+        evicted = 0
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or self.size_bytes + entry.size_bytes > self.max_bytes
+        ):
+            self._evict_one()
+            evicted += 1
+
+        entry.access_count = max(1, entry.access_count)
+        self._entries[entry.key] = entry
+        self.size_bytes += entry.size_bytes
+        if self.policy == CacheStrategy.LFU:
+            self._freq_buckets.setdefault(entry.access_count, OrderedDict())[entry.key] = None
+            if not self._min_freq or entry.access_count < self._min_freq:
+                self._min_freq = entry.access_count
+        return evicted
+
+    def pop(self, key: str) -> CacheEntry | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.size_bytes -= entry.size_bytes
+        if self.policy == CacheStrategy.LFU:
+            bucket = self._freq_buckets.get(entry.access_count)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._freq_buckets[entry.access_count]
+        return entry
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        """Drop entries that are past both their TTL and stale window"""
+        now = now or datetime.utcnow()
+        expired = [key for key, entry in self._entries.items() if not entry.is_servable(now)]
+        for key in expired:
+            self.pop(key)
+        return len(expired)
+
+    def clear(self, pattern: str | None = None) -> int:
+        if pattern is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._freq_buckets.clear()
+            self._min_freq = 0
+            self.size_bytes = 0
+            return removed
+
+        keys = [key for key in self._entries if pattern in key]
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def _touch(self, key: str, entry: CacheEntry):
+        entry.last_accessed = datetime.utcnow()
+        if self.policy == CacheStrategy.LRU:
+            entry.access_count += 1
+            self._entries.move_to_end(key)
+            return
+
+        freq = entry.access_count
+        bucket = self._freq_buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._freq_buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        entry.access_count = freq + 1
+        self._freq_buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _evict_one(self):
+        if self.policy == CacheStrategy.LRU:
+            key = next(iter(self._entries))
+        else:
+            if self._min_freq not in self._freq_buckets:
+                self._min_freq = min(self._freq_buckets)
+            key = next(iter(self._freq_buckets[self._min_freq]))
+        self.pop(key)
+        self.evictions += 1
+
+
+class TieredCache:
+    """Memory + Redis cache with single-flight loading
+
+    Concurrent misses on a key share one loader call. Entries past their TTL
+    are served for up to ``stale_ttl`` seconds while a single background
+    refresh runs, and ``None`` results are remembered for ``negative_ttl``
+    seconds so lookups of missing data do not keep hitting the backend.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_memory_mb: float = 500,
+        policy: CacheStrategy = CacheStrategy.LRU,
+        redis_client: Any | None = None,
+        default_ttl: float = 300,
+        stale_ttl: float = 0,
+        negative_ttl: float = 0,
+        key_prefix: str = "",
+    ):
+        self.memory = MemoryCacheTier(
+            max_entries=max_entries,
+            max_bytes=int(max_memory_mb * 1024 * 1024),
+            policy=policy,
+        )
+        self.redis_client = redis_client
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.key_prefix = key_prefix
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "negative_hits": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "evictions": 0,
+            "size_bytes": 0,
+        }
+
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    @property
+    def redis_enabled(self) -> bool:
+        return self.redis_client is not None
+
+    def make_key(self, namespace: str, *args, **kwargs) -> str:
+        """Build a namespaced, canonical key for the given arguments"""
+        return f"{self.key_prefix}{canonical_cache_key(namespace, args, kwargs)}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get a value from memory, then Redis; stale entries count as hits"""
+        entry, _ = await self._lookup(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+
+        self.stats["hits"] += 1
+        if entry.negative:
+            self.stats["negative_hits"] += 1
+            return default
+        return self._entry_value(entry)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        serialize: bool = True,
+    ):
+        """Store a value; unserialized values stay in the memory tier only"""
+        entry = self._build_entry(key, value, ttl, stale_ttl, serialize)
+        self._store_local(entry)
+        if entry.serialized:
+            await self._redis_set(entry, entry.value)
+
+    async def set_negative(self, key: str, ttl: float | None = None):
+        """Remember that ``key`` has no value for ``ttl`` seconds"""
+        ttl = self.negative_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        entry = self._build_entry(key, None, ttl, 0, serialize=False, negative=True)
+        self._store_local(entry)
+        await self._redis_set(entry, b"")
+
+    async def delete(self, key: str):
+        self.memory.pop(key)
+        self.stats["size_bytes"] = self.memory.size_bytes
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(key)
+            except Exception as e:
+                logger.warning(f"Redis cache delete error: {e}")
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any | Awaitable[Any]],
+        ttl: float | Callable[[Any], float] | None = None,
+        stale_ttl: float | None = None,
+        negative_ttl: float | None = None,
+        serialize: bool = True,
+    ) -> Any:
+        """Return the cached value for ``key``, loading it at most once on a miss
+
+        ``ttl`` may be a callable that picks the TTL from the loaded value.
+        """
+        entry, fresh = await self._lookup(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            if not fresh:
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, loader, ttl, stale_ttl, negative_ttl, serialize)
+            if entry.negative:
+                self.stats["negative_hits"] += 1
+                return None
+            return self._entry_value(entry)
+
+        self.stats["misses"] += 1
+        return await self._load(key, loader, ttl, stale_ttl, negative_ttl, serialize)
+
+    def lookup_local(self, key: str) -> tuple[bool, Any]:
+        """Synchronous memory-tier lookup for sync callers; returns (found, value)"""
+        entry = self.memory.get(key)
+        if entry is not None and entry.is_servable(datetime.utcnow()):
+            self.stats["hits"] += 1
+            if entry.negative:
+                self.stats["negative_hits"] += 1
+                return True, None
+            return True, self._entry_value(entry)
+
+        self.stats["misses"] += 1
+        return False, None
+
+    def set_local(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        serialize: bool = True,
+    ):
+        """Synchronous memory-tier store for sync callers"""
+        self._store_local(self._build_entry(key, value, ttl, stale_ttl, serialize))
+
+    async def clear(self, pattern: str | None = None):
+        """Clear entries whose key contains ``pattern`` (all entries if omitted)"""
+        self.memory.clear(pattern)
+        self.stats["size_bytes"] = self.memory.size_bytes
+
+        if self.redis_client:
+            try:
+                if pattern:
+                    keys = [key async for key in self.redis_client.scan_iter(match=f"*{pattern}*")]
+                    if keys:
+                        await self.redis_client.delete(*keys)
+                else:
+                    await self.redis_client.flushdb()
+            except Exception as e:
+                logger.warning(f"Redis cache clear error: {e}")
+
+    def purge_expired(self) -> int:
+        removed = self.memory.purge_expired()
+        self.stats["evictions"] += removed
+        self.stats["size_bytes"] = self.memory.size_bytes
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        total_requests = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / total_requests if total_requests > 0 else 0,
+            "size_mb": self.stats["size_bytes"] / (1024 * 1024),
+            "entries": len(self.memory),
+            "inflight": len(self._inflight),
+            "policy": self.memory.policy.value,
+            "redis_enabled": self.redis_enabled,
+        }
+
+    async def close(self):
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self.redis_client:
+            await self.redis_client.close()
+        self.memory.clear()
+        self.stats["size_bytes"] = 0
+
+    async def _lookup(self, key: str) -> tuple[CacheEntry | None, bool]:
+        """Find a servable entry; returns (entry, is_fresh)"""
+        now = datetime.utcnow()
+        entry = self.memory.get(key)
+        if entry is not None:
+            if entry.is_servable(now):
+                return entry, entry.is_fresh(now)
+            self.memory.pop(key)
+            self.stats["evictions"] += 1
+            self.stats["size_bytes"] = self.memory.size_bytes
+
+        entry = await self._redis_get(key)
+        if entry is not None and entry.is_servable(now):
+            self._store_local(entry)
+            return entry, entry.is_fresh(now)
+        return None, False
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Any | Awaitable[Any]],
+        ttl: float | Callable[[Any], float] | None,
+        stale_ttl: float | None,
+        negative_ttl: float | None,
+        serialize: bool,
+    ) -> Any:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = loader()
+            if inspect.isawaitable(value):
+                value = await value
+            await self._store_loaded(key, value, ttl, stale_ttl, negative_ttl, serialize)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a miss without concurrent waiters does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _store_loaded(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | Callable[[Any], float] | None,
+        stale_ttl: float | None,
+        negative_ttl: float | None,
+        serialize: bool,
+    ):
+        try:
+            if value is None:
+                await self.set_negative(key, negative_ttl)
+            else:
+                if callable(ttl):
+                    ttl = ttl(value)
+                await self.set(key, value, ttl, stale_ttl, serialize)
+        except Exception as e:
+            logger.warning(f"Failed to cache value for {key}: {e}")
+
+    def _schedule_refresh(self, key: str, loader: Callable, *options):
+        if key in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+        task = asyncio.create_task(self._refresh(key, loader, *options))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: str, loader: Callable, *options):
+        try:
+            await self._load(key, loader, *options)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {key}: {e}")
+
+    def _build_entry(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None,
+        stale_ttl: float | None,
+        serialize: bool,
+        negative: bool = False,
+    ) -> CacheEntry:
+        now = datetime.utcnow()
+        ttl = self.default_ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        expires_at = now + timedelta(seconds=ttl) if ttl > 0 else None
+        stale_until = (
+            expires_at + timedelta(seconds=stale_ttl) if expires_at and stale_ttl > 0 else None
+        )
+
+        if negative:
+            stored, size_bytes = None, sys.getsizeof(key)
+        elif serialize:
+            stored = serialize_value(value)
+            size_bytes = len(stored) + sys.getsizeof(key)
+        else:
+            stored, size_bytes = value, _estimate_size(value) + sys.getsizeof(key)
+
+        return CacheEntry(
+            key=key,
+            value=stored,
+            created_at=now,
+            expires_at=expires_at,
+            access_count=1,
+            last_accessed=now,
+            size_bytes=size_bytes,
+            stale_until=stale_until,
+            negative=negative,
+            serialized=serialize and not negative,
+        )
+
+    def _store_local(self, entry: CacheEntry):
+        self.stats["evictions"] += self.memory.put(entry)
+        self.stats["size_bytes"] = self.memory.size_bytes
+
+    @staticmethod
+    def _entry_value(entry: CacheEntry) -> Any:
+        return deserialize_value(entry.value) if entry.serialized else entry.value
+
+    async def _redis_get(self, key: str) -> CacheEntry | None:
+        if not self.redis_client:
+            return None
+        try:
+            cached_data = await self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis cache get error: {e}")
+            return None
+        if not cached_data or len(cached_data) < _REDIS_HEADER.size:
+            return None
+
+        expires_ts, stale_ts, negative = _REDIS_HEADER.unpack_from(cached_data)
+        payload = bytes(cached_data[_REDIS_HEADER.size :])
+        now = datetime.utcnow()
+        return CacheEntry(
+            key=key,
+            value=None if negative else payload,
+            created_at=now,
+            expires_at=_EPOCH + timedelta(seconds=expires_ts) if expires_ts else None,
+            access_count=1,
+            last_accessed=now,
+            size_bytes=len(payload) + sys.getsizeof(key),
+            stale_until=_EPOCH + timedelta(seconds=stale_ts) if stale_ts else None,
+            negative=bool(negative),
+            serialized=not negative,
+        )
+
+    async def _redis_set(self, entry: CacheEntry, payload: bytes):
+        if not self.redis_client:
+            return
+
+        expires_ts = (entry.expires_at - _EPOCH).total_seconds() if entry.expires_at else 0.0
+        stale_ts = (entry.stale_until - _EPOCH).total_seconds() if entry.stale_until else 0.0
+        data = _REDIS_HEADER.pack(expires_ts, stale_ts, int(entry.negative)) + payload
+        retain_until = entry.stale_until or entry.expires_at
+        try:
+            if retain_until:
+                ttl_ms = max(1, int((retain_until - datetime.utcnow()).total_seconds() * 1000))
+                await self.redis_client.set(entry.key, data, px=ttl_ms)
+            else:
+                await self.redis_client.set(entry.key, data)
+        except Exception as e:
+            logger.warning(f"Redis cache set error: {e}")
 
 
 class PerformanceOptimizer:
     """Enterprise-grade performance optimization system"""
 
-    def __init__(self):
+    def __init__(self, cache_policy: CacheStrategy = CacheStrategy.LRU):
         self.metrics: deque = deque(maxlen=100000)
-        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "size_bytes": 0}
 
-        # Memory cache
-        self.memory_cache: dict[str, CacheEntry] = {}
-        self.cache_max_size = 1000
-        self.cache_max_memory_mb = 500
+        # Two-tier cache (memory + Redis); cache_stats is shared with it
+        self.tiered_cache = TieredCache(max_entries=1000, max_memory_mb=500, policy=cache_policy)
+        self.cache_stats = self.tiered_cache.stats
 
         # Redis cache
         self.redis_client: aioredis.Redis | None = None
@@ -141,10 +774,12 @@ class PerformanceOptimizer:
             self.redis_client = aioredis.from_url(redis_url)
             await self.redis_client.ping()
             self.redis_enabled = True
+            self.tiered_cache.redis_client = self.redis_client
             logger.info("Redis cache initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize Redis cache: {e}")
             self.redis_enabled = False
+            self.tiered_cache.redis_client = None
 
     def cache(
         self,
@@ -152,134 +787,111 @@ class PerformanceOptimizer:
         strategy: CacheStrategy = CacheStrategy.TTL,
         key_prefix: str = "",
         serialize: bool = True,
+        stale_ttl: int = 0,
+        negative_ttl: int = 0,
     ):
-        """Decorator for caching function results"""
+        """Decorator for caching function results
+
+        Concurrent misses for the same arguments share one call. With
+        ``stale_ttl`` an expired result keeps being served while it is
+        refreshed in the background; with ``negative_ttl`` ``None`` results
+        are cached too. Sync functions use the memory tier only. Calls with
+        arguments that cannot be keyed (see ``canonical_cache_key``) run
+        uncached.
+        """
 
         def decorator(func: Callable) -> Callable:
+            namespace = f"{func.__module__}.{func.__qualname__}"
+
             @functools.wraps(func)
             async def async_wrapper(*args, **kwargs):
-                # Generate cache key
-                cache_key = self._generate_cache_key(func.__name__, args, kwargs, key_prefix)
+                cache_key = self._generate_cache_key(namespace, args, kwargs, key_prefix)
+                if cache_key is None:
+                    return await func(*args, **kwargs)
 
-                # Try to get from cache
-                cached_result = await self.get_from_cache(cache_key)
-                if cached_result is not None:
-                    self.cache_stats["hits"] += 1
-                    return cached_result
-
-                # Cache miss - execute function
-                self.cache_stats["misses"] += 1
-                start_time = time.time()
-
-                try:
-                    if asyncio.iscoroutinefunction(func):
+                async def load():
+                    start_time = time.time()
+                    try:
                         result = await func(*args, **kwargs)
-                    else:
-                        result = func(*args, **kwargs)
-
-                    # Store in cache
-                    await self.set_cache(cache_key, result, ttl, strategy, serialize)
+                    except Exception as e:
+                        self.error_count += 1
+                        await self._record_metric(
+                            PerformanceMetric.ERROR_RATE,
+                            1.0,
+                            {"function": func.__name__, "error": str(e)},
+                        )
+                        raise
 
-                    # Record performance metric
-                    execution_time = time.time() - start_time
                     await self._record_metric(
                         PerformanceMetric.RESPONSE_TIME,
-                        execution_time,
+                        time.time() - start_time,
                         {"function": func.__name__, "cache_hit": False},
                     )
-
                     return result
 
-                except Exception as e:
-                    self.error_count += 1
-                    await self._record_metric(
-                        PerformanceMetric.ERROR_RATE,
-                        1.0,
-                        {"function": func.__name__, "error": str(e)},
-                    )
-                    raise
+                return await self.tiered_cache.get_or_load(
+                    cache_key,
+                    load,
+                    ttl=ttl,
+                    stale_ttl=stale_ttl,
+                    negative_ttl=negative_ttl,
+                    serialize=serialize,
+                )
 
             @functools.wraps(func)
             def sync_wrapper(*args, **kwargs):
-                # Generate cache key
-                cache_key = self._generate_cache_key(func.__name__, args, kwargs, key_prefix)
+                cache_key = self._generate_cache_key(namespace, args, kwargs, key_prefix)
+                if cache_key is None:
+                    return func(*args, **kwargs)
 
-                # Try to get from cache
-                cached_result = asyncio.run(self.get_from_cache(cache_key))
-                if cached_result is not None:
-                    self.cache_stats["hits"] += 1
+                found, cached_result = self.tiered_cache.lookup_local(cache_key)
+                if found:
                     return cached_result
 
-                # Cache miss - execute function
-                self.cache_stats["misses"] += 1
                 start_time = time.time()
-
                 try:
                     result = func(*args, **kwargs)
-
-                    # Store in cache
-                    asyncio.run(self.set_cache(cache_key, result, ttl, strategy, serialize))
-
-                    # Record performance metric
-                    execution_time = time.time() - start_time
-                    asyncio.run(
-                        self._record_metric(
-                            PerformanceMetric.RESPONSE_TIME,
-                            execution_time,
-                            {"function": func.__name__, "cache_hit": False},
-                        )
-                    )
-
-                    return result
-
                 except Exception as e:
                     self.error_count += 1
-                    asyncio.run(
-                        self._record_metric(
-                            PerformanceMetric.ERROR_RATE,
-                            1.0,
-                            {"function": func.__name__, "error": str(e)},
-                        )
+                    self._record_metric_sync(
+                        PerformanceMetric.ERROR_RATE,
+                        1.0,
+                        {"function": func.__name__, "error": str(e)},
                     )
                     raise
 
+                if result is not None:
+                    self.tiered_cache.set_local(cache_key, result, ttl, stale_ttl, serialize)
+                elif negative_ttl > 0:
+                    self.tiered_cache.set_local(cache_key, None, negative_ttl, 0, serialize=False)
+
+                self._record_metric_sync(
+                    PerformanceMetric.RESPONSE_TIME,
+                    time.time() - start_time,
+                    {"function": func.__name__, "cache_hit": False},
+                )
+                return result
+
             return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
 
         return decorator
 
     def _generate_cache_key(
         self, func_name: str, args: tuple, kwargs: dict, key_prefix: str
-    ) -> str:
-        """Generate cache key from function name and arguments"""
-        # Create hash of arguments
-        args_str = str(args) + str(sorted(kwargs.items()))
-        args_hash = hashlib.md5(args_str.encode()).hexdigest()[:8]
+    ) -> str | None:
+        """Generate a stable cache key from function name and arguments
 
-        return f"{key_prefix}{func_name}:{args_hash}"
+        Returns None when the arguments cannot be keyed.
+        """
+        try:
+            return f"{key_prefix}{canonical_cache_key(func_name, args, kwargs)}"
+        except UncacheableArgumentError as e:
+            logger.debug(f"Not caching {func_name}: {e}")
+            return None
 
     async def get_from_cache(self, key: str) -> Any | None:
         """Get value from cache"""
-        # Try memory cache first
-        if key in self.memory_cache:
-            entry = self.memory_cache[key]
-            if entry.expires_at is None or entry.expires_at > datetime.utcnow():
-                entry.access_count += 1
-                entry.last_accessed = datetime.utcnow()
-                return entry.value
-            # Expired
-            del self.memory_cache[key]
-            self.cache_stats["evictions"] += 1
-
-        # Try Redis cache
-        if self.redis_enabled and self.redis_client:
-            try:
-                cached_data = await self.redis_client.get(key)
-                if cached_data:
-                    return self._deserialize(cached_data)
-            except Exception as e:
-                logger.warning(f"Redis cache get error: {e}")
-
-        return None
+        return await self.tiered_cache.get(key)
 
     async def set_cache(
         self,
@@ -288,123 +900,37 @@ class PerformanceOptimizer:
         ttl: int = 300,
         strategy: CacheStrategy = CacheStrategy.TTL,
         serialize: bool = True,
+        stale_ttl: int = 0,
     ):
-        """Set value in cache"""
-        now = datetime.utcnow()
-        expires_at = now + timedelta(seconds=ttl) if ttl > 0 else None
+        """Set value in cache
 
-        # Create cache entry
-        serialized_value = self._serialize(value) if serialize else value
-        entry = CacheEntry(
-            key=key,
-            value=value,
-            created_at=now,
-            expires_at=expires_at,
-            access_count=1,
-            last_accessed=now,
-            size_bytes=len(serialized_value) if isinstance(serialized_value, (bytes, str)) else 0,
-        )
-
-        # Store in memory cache
-        self.memory_cache[key] = entry
-        self.cache_stats["size_bytes"] += entry.size_bytes
-
-        # Store in Redis cache
-        if self.redis_enabled and self.redis_client:
-            try:
-                if ttl > 0:
-                    await self.redis_client.setex(key, ttl, serialized_value)
-                else:
-                    await self.redis_client.set(key, serialized_value)
-            except Exception as e:
-                logger.warning(f"Redis cache set error: {e}")
-
-        # Check cache size limits
-        await self._enforce_cache_limits()
+        Eviction order is fixed by the memory tier policy; ``strategy`` is
+        accepted for API compatibility.
+        """
+        await self.tiered_cache.set(key, value, ttl, stale_ttl, serialize)
 
     def _serialize(self, data: Any) -> bytes:
         """Serialize data for caching"""
-        try:
-            # Try orjson first (fastest)
-            return orjson.dumps(data)
-        except (TypeError, ValueError):
-            try:
-                # Try msgpack
-                return msgpack.packb(data)
-            except (TypeError, ValueError):
-                # Fall back to pickle
-                return pickle.dumps(data)
+        return serialize_value(data)
 
     def _deserialize(self, data: bytes) -> Any:
         """Deserialize cached data"""
-        try:
-            # Try orjson first
-            return orjson.loads(data)
-        except (TypeError, ValueError):
-            try:
-                # Try msgpack
-                return msgpack.unpackb(data, raw=False)
-            except (TypeError, ValueError):
-                # Fall back to pickle
-                return pickle.loads(data)
-
-    async def _enforce_cache_limits(self):
-        """Enforce cache size and memory limits"""
-        # Check memory cache size
-        if len(self.memory_cache) > self.cache_max_size:
-            await self._evict_cache_entries()
-
-        # Check memory usage
-        memory_usage_mb = self.cache_stats["size_bytes"] / (1024 * 1024)
-        if memory_usage_mb > self.cache_max_memory_mb:
-            await self._evict_cache_entries()
-
-    async def _evict_cache_entries(self):
-        """Evict cache entries based on strategy"""
-        if not self.memory_cache:
-            return
-
-        # Sort by last accessed time (LRU)
-        sorted_entries = sorted(
-            self.memory_cache.items(), key=lambda x: x[1].last_accessed or x[1].created_at
-        )
-
-        # Remove oldest 10% of entries
-        evict_count = max(1, len(sorted_entries) // 10)
-        for key, entry in sorted_entries[:evict_count]:
-            del self.memory_cache[key]
-            self.cache_stats["evictions"] += 1
-            self.cache_stats["size_bytes"] -= entry.size_bytes
+        return deserialize_value(data)
 
     async def clear_cache(self, pattern: str = None):
         """Clear cache entries"""
-        if pattern:
-            # Clear entries matching pattern
-            keys_to_remove = [key for key in self.memory_cache.keys() if pattern in key]
-            for key in keys_to_remove:
-                del self.memory_cache[key]
-                self.cache_stats["evictions"] += 1
-        else:
-            # Clear all entries
-            self.memory_cache.clear()
-            self.cache_stats["evictions"] += len(self.memory_cache)
-
-        # Clear Redis cache
-        if self.redis_enabled and self.redis_client:
-            try:
-                if pattern:
-                    keys = await self.redis_client.keys(pattern)
-                    if keys:
-                        await self.redis_client.delete(*keys)
-                else:
-                    await self.redis_client.flushdb()
-            except Exception as e:
-                logger.warning(f"Redis cache clear error: {e}")
+        await self.tiered_cache.clear(pattern)
 
     async def _record_metric(
         self, metric: PerformanceMetric, value: float, tags: dict[str, str] = None
     ):
         """Record performance metric"""
+        self._record_metric_sync(metric, value, tags)
+
+    def _record_metric_sync(
+        self, metric: PerformanceMetric, value: float, tags: dict[str, str] = None
+    ):
+        """Record performance metric from synchronous code"""
         data = PerformanceData(
             metric=metric, value=value, timestamp=datetime.utcnow(), tags=tags or {}, metadata={}
         )
@@ -478,19 +1004,10 @@ class PerformanceOptimizer:
         """Clean up expired cache entries"""
         while True:
             try:
-                now = datetime.utcnow()
-                expired_keys = []
+                removed = self.tiered_cache.purge_expired()
 
-                for key, entry in self.memory_cache.items():
-                    if entry.expires_at and entry.expires_at < now:
-                        expired_keys.append(key)
-
-                for key in expired_keys:
-                    del self.memory_cache[key]
-                    self.cache_stats["evictions"] += 1
-
-                if expired_keys:
-                    logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+                if removed:
+                    logger.debug(f"Cleaned up {removed} expired cache entries")
 
                 await asyncio.sleep(300)  # Clean up every 5 minutes
 
@@ -629,12 +1146,8 @@ class PerformanceOptimizer:
         self.io_thread_pool.shutdown(wait=True)
         self.process_pool.shutdown(wait=True)
 
-        # Close Redis connection
-        if self.redis_client:
-            await self.redis_client.close()
-
-        # Clear caches
-        self.memory_cache.clear()
+        # Close Redis connection and clear caches
+        await self.tiered_cache.close()
 
         # Stop memory tracing
         tracemalloc.stop()
@@ -643,16 +1156,4 @@ class PerformanceOptimizer:
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics"""
-        total_requests = self.cache_stats["hits"] + self.cache_stats["misses"]
-        hit_ratio = self.cache_stats["hits"] / total_requests if total_requests > 0 else 0
-
-        return {
-            "hits": self.cache_stats["hits"],
-            "misses": self.cache_stats["misses"],
-            "hit_ratio": hit_ratio,
-            "evictions": self.cache_stats["evictions"],
-            "size_bytes": self.cache_stats["size_bytes"],
-            "size_mb": self.cache_stats["size_bytes"] / (1024 * 1024),
-            "entries": len(self.memory_cache),
-            "redis_enabled": self.redis_enabled,
-        }
+        return self.tiered_cache.get_stats()
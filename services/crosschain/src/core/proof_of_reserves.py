@@ -3,16 +3,22 @@
 Proof of Reserves Monitor - Guardian quorum diversity scoring and reserve verification
 """
 
+import bisect
+import dataclasses
 import logging
+import math
 import statistics
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Aggregate key covering every guardian, used when a bridge has no dedicated quorum
+GLOBAL_QUORUM = "*"
+
 
 class GuardianStatus(str, Enum):
     """Guardian status types"""
@@ -62,6 +68,7 @@ class Guardian:
     response_time_avg: float
     diversity_scores: dict[DiversityMetric, float]
     metadata: dict[str, Any]
+    bridges: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -100,6 +107,211 @@ class QuorumDiversityScore:
     recommendations: list[str]
 
 
+@dataclass(frozen=True)
+class _GuardianContribution:
+    """Guardian attributes as last folded into the quorum aggregates"""
+
+    active: bool
+    region: str
+    institution: str
+    expertise: tuple[str, ...]
+    reputation: float
+    stake: float
+    accuracy: float
+    response_time: float
+    quorums: tuple[str, ...]
+
+    @classmethod
+    def from_guardian(cls, guardian: "Guardian") -> "_GuardianContribution":
+        return cls(
+            active=guardian.status == GuardianStatus.ACTIVE,
+            region=guardian.geographic_region,
+            institution=guardian.institutional_type,
+            expertise=tuple(guardian.technical_expertise),
+            reputation=guardian.reputation_score,
+            stake=guardian.stake_amount,
+            accuracy=guardian.accuracy_rate,
+            response_time=guardian.response_time_avg,
+            quorums=(GLOBAL_QUORUM, *dict.fromkeys(guardian.bridges)),
+        )
+
+
+def _count_adjust(counter: Counter, key: str, delta: int) -> float:
+    """Adjust a histogram bucket and return the change in sum(c * log c)"""
+    old = counter[key]
+    new = old + delta
+    if new > 0:
+        counter[key] = new
+    else:
+        del counter[key]
+    return (new * math.log(new) if new > 0 else 0.0) - (old * math.log(old) if old > 0 else 0.0)
+
+
+class QuorumDiversityAggregate:
+    """Running diversity statistics for the active guardians of one quorum
+
+    Category histograms, entropy terms, sums of squares and a sorted stake
+    list are updated as guardians join, change or leave, so every diversity
+    score is read in O(1).
+    """
+
+    def __init__(self):
+        self.total_guardians = 0
+        self.count = 0
+        self.regions: Counter = Counter()
+        self.institutions: Counter = Counter()
+        self.expertise: Counter = Counter()
+        self.expertise_total = 0
+        self.reputation_sum = 0.0
+        self.reputation_sq_sum = 0.0
+        self.stake_sum = 0.0
+        self.stake_sq_sum = 0.0
+        self.accuracy_sum = 0.0
+        self.response_time_sum = 0.0
+
+        self._region_clogc = 0.0
+        self._institution_clogc = 0.0
+        self._reputations: list[float] = []
+        self._stakes: list[float] = []
+        # sum of (rank + 1) * stake over the sorted stakes, for the Gini coefficient
+        self._stake_rank_sum = 0.0
+
+    def add(self, contribution: _GuardianContribution):
+        self._apply(contribution, 1)
+
+    def remove(self, contribution: _GuardianContribution):
+        self._apply(contribution, -1)
+
+    def update_performance(
+        self, old: _GuardianContribution, new: _GuardianContribution
+    ):
+        """Fold an accuracy/response-time change in without touching other statistics"""
+        if old.active:
+            self.accuracy_sum += new.accuracy - old.accuracy
+            self.response_time_sum += new.response_time - old.response_time
+
+    def _apply(self, c: _GuardianContribution, sign: int):
+        self.total_guardians += sign
+        if not c.active:
+            return
+
+        self.count += sign
+        self._region_clogc += _count_adjust(self.regions, c.region, sign)
+        self._institution_clogc += _count_adjust(self.institutions, c.institution, sign)
+        for skill in c.expertise:
+            _count_adjust(self.expertise, skill, sign)
+        self.expertise_total += sign * len(c.expertise)
+
+        self.reputation_sum += sign * c.reputation
+        self.reputation_sq_sum += sign * c.reputation**2
+        self.stake_sum += sign * c.stake
+        self.stake_sq_sum += sign * c.stake**2
+        self.accuracy_sum += sign * c.accuracy
+        self.response_time_sum += sign * c.response_time
+
+        if sign > 0:
+            bisect.insort(self._reputations, c.reputation)
+            self._insert_stake(c.stake)
+        else:
+            del self._reputations[bisect.bisect_left(self._reputations, c.reputation)]
+            self._remove_stake(c.stake)
+
+    def _suffix_sum(self, index: int, total: float) -> float:
+        """Sum of sorted stakes from ``index`` on, summing whichever side is shorter"""
+        if index > len(self._stakes) // 2:
+            return sum(self._stakes[index:])
+        return total - sum(self._stakes[:index])
+
+    def _insert_stake(self, stake: float):
+        index = bisect.bisect_right(self._stakes, stake)
+        # Every stake ranked after the new one moves up a rank
+        suffix = self._suffix_sum(index, self.stake_sum - stake)
+        self._stake_rank_sum += suffix + (index + 1) * stake
+        self._stakes.insert(index, stake)
+
+    def _remove_stake(self, stake: float):
+        index = bisect.bisect_left(self._stakes, stake)
+        del self._stakes[index]
+        self._stake_rank_sum -= (index + 1) * stake + self._suffix_sum(index, self.stake_sum)
+
+    @staticmethod
+    def _sample_variance(total: float, sq_total: float, n: int) -> float:
+        if n <= 1:
+            return 0.0
+        return max((sq_total - total * total / n) / (n - 1), 0.0)
+
+    @staticmethod
+    def _normalized_entropy(clogc: float, n: int) -> float:
+        if n <= 1:
+            return 0.0
+        return max(math.log(n) - clogc / n, 0.0) / math.log(n)
+
+    @property
+    def geographic_diversity(self) -> float:
+        return 0.0 if self.count <= 1 else min(len(self.regions) / self.count, 1.0)
+
+    @property
+    def institutional_diversity(self) -> float:
+        return 0.0 if self.count <= 1 else min(len(self.institutions) / self.count, 1.0)
+
+    @property
+    def technical_diversity(self) -> float:
+        if not self.expertise_total:
+            return 0.0
+        return min(len(self.expertise) / self.expertise_total, 1.0)
+
+    @property
+    def reputational_diversity(self) -> float:
+        """Coefficient of variation of reputation, capped at 1"""
+        if self.count <= 1 or self.reputation_sum == 0:
+            return 0.0
+        mean = self.reputation_sum / self.count
+        std = math.sqrt(
+            self._sample_variance(self.reputation_sum, self.reputation_sq_sum, self.count)
+        )
+        return min(std / mean, 1.0)
+
+    @property
+    def economic_diversity(self) -> float:
+        """1 - Gini coefficient of stake"""
+        if self.count <= 1 or not self._stakes or self._stakes[-1] == 0 or self.stake_sum == 0:
+            return 0.0
+        n = self.count
+        gini = (2 * self._stake_rank_sum - (n + 1) * self.stake_sum) / (n * self.stake_sum)
+        return 1.0 - gini
+
+    def scores(self) -> dict[DiversityMetric, float]:
+        return {
+            DiversityMetric.GEOGRAPHIC: self.geographic_diversity,
+            DiversityMetric.INSTITUTIONAL: self.institutional_diversity,
+            DiversityMetric.TECHNICAL: self.technical_diversity,
+            DiversityMetric.REPUTATIONAL: self.reputational_diversity,
+            DiversityMetric.ECONOMIC: self.economic_diversity,
+        }
+
+    def breakdown(self) -> dict[str, Any]:
+        n = self.count
+        return {
+            "geographic_regions": len(self.regions),
+            "institutional_types": len(self.institutions),
+            "technical_expertise": len(self.expertise),
+            "geographic_entropy": self._normalized_entropy(self._region_clogc, n),
+            "institutional_entropy": self._normalized_entropy(self._institution_clogc, n),
+            "reputation_range": {
+                "min": self._reputations[0] if n else 0.0,
+                "max": self._reputations[-1] if n else 0.0,
+                "std": math.sqrt(
+                    self._sample_variance(self.reputation_sum, self.reputation_sq_sum, n)
+                ),
+            },
+            "stake_distribution": {
+                "min": self._stakes[0] if n else 0.0,
+                "max": self._stakes[-1] if n else 0.0,
+                "std": math.sqrt(self._sample_variance(self.stake_sum, self.stake_sq_sum, n)),
+            },
+        }
+
+
 class ProofOfReservesMonitor:
     """Proof of reserves monitoring and guardian quorum diversity analysis"""
 
@@ -110,6 +322,13 @@ class ProofOfReservesMonitor:
         self.attestation_history: dict[str, list[dict[str, Any]]] = defaultdict(list)
         self.consensus_requirements: dict[str, int] = {}
 
+        # Incrementally maintained diversity statistics, keyed by bridge address
+        # plus GLOBAL_QUORUM for all guardians
+        self.quorum_aggregates: dict[str, QuorumDiversityAggregate] = {
+            GLOBAL_QUORUM: QuorumDiversityAggregate()
+        }
+        self._contributions: dict[str, _GuardianContribution] = {}
+
         # Configuration
         self.diversity_weights = {
             DiversityMetric.GEOGRAPHIC: 0.25,
@@ -145,85 +364,110 @@ class ProofOfReservesMonitor:
             response_time_avg=0.0,
             diversity_scores={},
             metadata=guardian_data.get("metadata", {}),
+            bridges=[bridge.lower() for bridge in guardian_data.get("bridges", [])],
         )
 
+        # Re-registration replaces the previous contribution
+        self._unindex_guardian(guardian.address)
+
         # Calculate initial diversity scores
         await self._calculate_guardian_diversity_scores(guardian)
 
         self.guardians[guardian.address] = guardian
+        self._index_guardian(guardian)
         logger.info(f"Registered guardian: {guardian.name} ({guardian.address})")
 
         return guardian
 
+    async def update_guardian(self, guardian_address: str, updates: dict[str, Any]) -> Guardian | None:
+        """Update a guardian's profile and refresh the quorum aggregates it belongs to"""
+        guardian = self.guardians.get(guardian_address)
+        if guardian is None:
+            logger.warning(f"Guardian {guardian_address} not found")
+            return None
+
+        if "status" in updates:
+            guardian.status = GuardianStatus(updates["status"])
+        if "bridges" in updates:
+            guardian.bridges = [bridge.lower() for bridge in updates["bridges"]]
+        for attribute in (
+            "reputation_score",
+            "stake_amount",
+            "geographic_region",
+            "institutional_type",
+            "technical_expertise",
+        ):
+            if attribute in updates:
+                setattr(guardian, attribute, updates[attribute])
+
+        self._index_guardian(guardian)
+        return guardian
+
+    async def set_guardian_status(
+        self, guardian_address: str, status: GuardianStatus
+    ) -> Guardian | None:
+        """Change a guardian's status, e.g. to take it out of the active quorum"""
+        return await self.update_guardian(guardian_address, {"status": status})
+
+    def _index_guardian(self, guardian: Guardian):
+        """Replace a guardian's contribution to every quorum aggregate it belongs to"""
+        self._unindex_guardian(guardian.address)
+        contribution = _GuardianContribution.from_guardian(guardian)
+        for quorum in contribution.quorums:
+            aggregate = self.quorum_aggregates.get(quorum)
+            if aggregate is None:
+                aggregate = self.quorum_aggregates[quorum] = QuorumDiversityAggregate()
+            aggregate.add(contribution)
+        self._contributions[guardian.address] = contribution
+
+    def _unindex_guardian(self, guardian_address: str):
+        contribution = self._contributions.pop(guardian_address, None)
+        if contribution is None:
+            return
+        for quorum in contribution.quorums:
+            aggregate = self.quorum_aggregates[quorum]
+            aggregate.remove(contribution)
+            if aggregate.total_guardians == 0 and quorum != GLOBAL_QUORUM:
+                del self.quorum_aggregates[quorum]
+
+    def _weighted_diversity(self, scores: dict[DiversityMetric, float]) -> float:
+        return sum(scores[metric] * weight for metric, weight in self.diversity_weights.items())
+
     async def _calculate_guardian_diversity_scores(self, guardian: Guardian):
-        """Calculate diversity scores for a guardian"""
-        # Geographic diversity (based on region distribution)
-        regions = [
-            g.geographic_region for g in self.guardians.values() if g.address != guardian.address
-        ]
-        if regions:
-            region_count = len(set(regions))
-            total_guardians = len(regions)
-            guardian.diversity_scores[DiversityMetric.GEOGRAPHIC] = min(
-                region_count / max(total_guardians, 1), 1.0
-            )
-        else:
-            guardian.diversity_scores[DiversityMetric.GEOGRAPHIC] = 1.0
+        """Calculate diversity scores for a guardian against the current active quorum"""
+        others = self.quorum_aggregates[GLOBAL_QUORUM]
+        n = others.count
+        if not n:
+            guardian.diversity_scores = dict.fromkeys(DiversityMetric, 1.0)
+            return
 
-        # Institutional diversity
-        institutional_types = [
-            g.institutional_type for g in self.guardians.values() if g.address != guardian.address
-        ]
-        if institutional_types:
-            type_count = len(set(institutional_types))
-            total_guardians = len(institutional_types)
-            guardian.diversity_scores[DiversityMetric.INSTITUTIONAL] = min(
-                type_count / max(total_guardians, 1), 1.0
-            )
-        else:
-            guardian.diversity_scores[DiversityMetric.INSTITUTIONAL] = 1.0
+        # Geographic and institutional diversity (based on category distribution)
+        guardian.diversity_scores[DiversityMetric.GEOGRAPHIC] = min(len(others.regions) / n, 1.0)
+        guardian.diversity_scores[DiversityMetric.INSTITUTIONAL] = min(
+            len(others.institutions) / n, 1.0
+        )
 
         # Technical diversity (based on expertise overlap)
-        all_expertise = []
-        for g in self.guardians.values():
-            if g.address != guardian.address:
-                all_expertise.extend(g.technical_expertise)
-
-        if all_expertise:
-            unique_expertise = len(set(all_expertise))
-            total_expertise = len(all_expertise)
-            guardian.diversity_scores[DiversityMetric.TECHNICAL] = min(
-                unique_expertise / max(total_expertise, 1), 1.0
-            )
-        else:
-            guardian.diversity_scores[DiversityMetric.TECHNICAL] = 1.0
+        guardian.diversity_scores[DiversityMetric.TECHNICAL] = (
+            min(len(others.expertise) / others.expertise_total, 1.0)
+            if others.expertise_total
+            else 1.0
+        )
 
         # Reputational diversity (based on reputation score distribution)
-        reputation_scores = [
-            g.reputation_score for g in self.guardians.values() if g.address != guardian.address
-        ]
-        if reputation_scores:
-            score_variance = (
-                statistics.variance(reputation_scores) if len(reputation_scores) > 1 else 0
-            )
-            guardian.diversity_scores[DiversityMetric.REPUTATIONAL] = min(
-                score_variance * 4, 1.0
-            )  # Scale variance
-        else:
-            guardian.diversity_scores[DiversityMetric.REPUTATIONAL] = 1.0
+        reputation_variance = others._sample_variance(
+            others.reputation_sum, others.reputation_sq_sum, n
+        )
+        guardian.diversity_scores[DiversityMetric.REPUTATIONAL] = min(
+            reputation_variance * 4, 1.0
+        )  # Scale variance
 
         # Economic diversity (based on stake distribution)
-        stake_amounts = [
-            g.stake_amount for g in self.guardians.values() if g.address != guardian.address
-        ]
-        if stake_amounts:
-            stake_variance = statistics.variance(stake_amounts) if len(stake_amounts) > 1 else 0
-            max_stake = max(stake_amounts) if stake_amounts else 1
-            guardian.diversity_scores[DiversityMetric.ECONOMIC] = min(
-                stake_variance / (max_stake**2), 1.0
-            )
-        else:
-            guardian.diversity_scores[DiversityMetric.ECONOMIC] = 1.0
+        stake_variance = others._sample_variance(others.stake_sum, others.stake_sq_sum, n)
+        max_stake = others._stakes[-1]
+        guardian.diversity_scores[DiversityMetric.ECONOMIC] = (
+            min(stake_variance / (max_stake**2), 1.0) if max_stake else 0.0
+        )
 
     async def update_guardian_activity(
         self, guardian_address: str, attestation_data: dict[str, Any]
@@ -261,6 +505,16 @@ class ProofOfReservesMonitor:
                 alpha * response_time + (1 - alpha) * guardian.response_time_avg
             )
 
+        contribution = self._contributions[guardian_address]
+        updated = dataclasses.replace(
+            contribution,
+            accuracy=guardian.accuracy_rate,
+            response_time=guardian.response_time_avg,
+        )
+        for quorum in contribution.quorums:
+            self.quorum_aggregates[quorum].update_performance(contribution, updated)
+        self._contributions[guardian_address] = updated
+
         # Store attestation history
         self.attestation_history[guardian_address].append(
             {
@@ -377,12 +631,19 @@ class ProofOfReservesMonitor:
         self.reserve_proofs.append(reserve_proof)
         return reserve_proof
 
+    def get_quorum_aggregate(self, bridge_address: str | None = None) -> QuorumDiversityAggregate:
+        """Aggregate for a bridge's guardians, falling back to all guardians"""
+        if bridge_address is not None:
+            aggregate = self.quorum_aggregates.get(bridge_address.lower())
+            if aggregate is not None:
+                return aggregate
+        return self.quorum_aggregates[GLOBAL_QUORUM]
+
     async def calculate_quorum_diversity(self, bridge_address: str) -> QuorumDiversityScore:
         """Calculate quorum diversity score for a bridge"""
-        # Get active guardians
-        active_guardians = [g for g in self.guardians.values() if g.status == GuardianStatus.ACTIVE]
+        aggregate = self.get_quorum_aggregate(bridge_address)
 
-        if not active_guardians:
+        if not aggregate.count:
             return QuorumDiversityScore(
                 bridge_address=bridge_address,
                 timestamp=datetime.utcnow(),
@@ -393,159 +654,39 @@ class ProofOfReservesMonitor:
                 reputational_diversity=0.0,
                 economic_diversity=0.0,
                 active_guardians=0,
-                total_guardians=len(self.guardians),
+                total_guardians=aggregate.total_guardians,
                 diversity_breakdown={},
                 recommendations=["No active guardians found"],
             )
 
-        # Calculate individual diversity metrics
-        geographic_diversity = self._calculate_geographic_diversity(active_guardians)
-        institutional_diversity = self._calculate_institutional_diversity(active_guardians)
-        technical_diversity = self._calculate_technical_diversity(active_guardians)
-        reputational_diversity = self._calculate_reputational_diversity(active_guardians)
-        economic_diversity = self._calculate_economic_diversity(active_guardians)
-
-        # Calculate weighted overall score
-        overall_score = (
-            geographic_diversity * self.diversity_weights[DiversityMetric.GEOGRAPHIC]
-            + institutional_diversity * self.diversity_weights[DiversityMetric.INSTITUTIONAL]
-            + technical_diversity * self.diversity_weights[DiversityMetric.TECHNICAL]
-            + reputational_diversity * self.diversity_weights[DiversityMetric.REPUTATIONAL]
-            + economic_diversity * self.diversity_weights[DiversityMetric.ECONOMIC]
-        )
-
-        # Generate recommendations
+        scores = aggregate.scores()
         recommendations = self._generate_diversity_recommendations(
-            geographic_diversity,
-            institutional_diversity,
-            technical_diversity,
-            reputational_diversity,
-            economic_diversity,
-            active_guardians,
+            scores[DiversityMetric.GEOGRAPHIC],
+            scores[DiversityMetric.INSTITUTIONAL],
+            scores[DiversityMetric.TECHNICAL],
+            scores[DiversityMetric.REPUTATIONAL],
+            scores[DiversityMetric.ECONOMIC],
+            aggregate.count,
         )
 
         diversity_score = QuorumDiversityScore(
             bridge_address=bridge_address,
             timestamp=datetime.utcnow(),
-            overall_diversity_score=overall_score,
-            geographic_diversity=geographic_diversity,
-            institutional_diversity=institutional_diversity,
-            technical_diversity=technical_diversity,
-            reputational_diversity=reputational_diversity,
-            economic_diversity=economic_diversity,
-            active_guardians=len(active_guardians),
-            total_guardians=len(self.guardians),
-            diversity_breakdown={
-                "geographic_regions": len(set(g.geographic_region for g in active_guardians)),
-                "institutional_types": len(set(g.institutional_type for g in active_guardians)),
-                "technical_expertise": len(
-                    set(expertise for g in active_guardians for expertise in g.technical_expertise)
-                ),
-                "reputation_range": {
-                    "min": min(g.reputation_score for g in active_guardians),
-                    "max": max(g.reputation_score for g in active_guardians),
-                    "std": (
-                        statistics.stdev([g.reputation_score for g in active_guardians])
-                        if len(active_guardians) > 1
-                        else 0
-                    ),
-                },
-                "stake_distribution": {
-                    "min": min(g.stake_amount for g in active_guardians),
-                    "max": max(g.stake_amount for g in active_guardians),
-                    "std": (
-                        statistics.stdev([g.stake_amount for g in active_guardians])
-                        if len(active_guardians) > 1
-                        else 0
-                    ),
-                },
-            },
+            overall_diversity_score=self._weighted_diversity(scores),
+            geographic_diversity=scores[DiversityMetric.GEOGRAPHIC],
+            institutional_diversity=scores[DiversityMetric.INSTITUTIONAL],
+            technical_diversity=scores[DiversityMetric.TECHNICAL],
+            reputational_diversity=scores[DiversityMetric.REPUTATIONAL],
+            economic_diversity=scores[DiversityMetric.ECONOMIC],
+            active_guardians=aggregate.count,
+            total_guardians=aggregate.total_guardians,
+            diversity_breakdown=aggregate.breakdown(),
             recommendations=recommendations,
         )
 
         self.diversity_scores.append(diversity_score)
         return diversity_score
 
-    def _calculate_geographic_diversity(self, guardians: list[Guardian]) -> float:
-        """Calculate geographic diversity score"""
-        regions = [g.geographic_region for g in guardians]
-        unique_regions = len(set(regions))
-        total_guardians = len(guardians)
-
-        if total_guardians <= 1:
-            return 0.0
-
-        # Normalize by expected diversity (more guardians should have more regions)
-        expected_diversity = min(unique_regions / total_guardians, 1.0)
-        return expected_diversity
-
-    def _calculate_institutional_diversity(self, guardians: list[Guardian]) -> float:
-        """Calculate institutional diversity score"""
-        institutional_types = [g.institutional_type for g in guardians]
-        unique_types = len(set(institutional_types))
-        total_guardians = len(guardians)
-
-        if total_guardians <= 1:
-            return 0.0
-
-        return min(unique_types / total_guardians, 1.0)
-
-    def _calculate_technical_diversity(self, guardians: list[Guardian]) -> float:
-        """Calculate technical diversity score"""
-        all_expertise = []
-        for g in guardians:
-            all_expertise.extend(g.technical_expertise)
-
-        if not all_expertise:
-            return 0.0
-
-        unique_expertise = len(set(all_expertise))
-        total_expertise = len(all_expertise)
-
-        return min(unique_expertise / total_expertise, 1.0)
-
-    def _calculate_reputational_diversity(self, guardians: list[Guardian]) -> float:
-        """Calculate reputational diversity score"""
-        reputation_scores = [g.reputation_score for g in guardians]
-
-        if len(reputation_scores) <= 1:
-            return 0.0
-
-        # Calculate coefficient of variation
-        mean_reputation = statistics.mean(reputation_scores)
-        if mean_reputation == 0:
-            return 0.0
-
-        std_reputation = statistics.stdev(reputation_scores)
-        cv = std_reputation / mean_reputation
-
-        # Normalize to 0-1 range (higher variation = higher diversity)
-        return min(cv, 1.0)
-
-    def _calculate_economic_diversity(self, guardians: list[Guardian]) -> float:
-        """Calculate economic diversity score"""
-        stake_amounts = [g.stake_amount for g in guardians]
-
-        if len(stake_amounts) <= 1 or max(stake_amounts) == 0:
-            return 0.0
-
-        # Calculate Gini coefficient (simplified)
-        sorted_stakes = sorted(stake_amounts)
-        n = len(sorted_stakes)
-        total = sum(sorted_stakes)
-
-        if total == 0:
-            return 0.0
-
-        gini = 0.0
-        for i, stake in enumerate(sorted_stakes):
-            gini += (2 * (i + 1) - n - 1) * stake
-
-        gini = gini / (n * total)
-
-        # Convert to diversity score (1 - gini)
-        return 1.0 - gini
-
     def _generate_diversity_recommendations(
         self,
         geo_diversity: float,
@@ -553,7 +694,7 @@ class ProofOfReservesMonitor:
         tech_diversity: float,
         rep_diversity: float,
         econ_diversity: float,
-        guardians: list[Guardian],
+        active_guardians: int,
     ) -> list[str]:
         """Generate recommendations for improving diversity"""
         recommendations = []
@@ -583,7 +724,7 @@ class ProofOfReservesMonitor:
                 "Increase economic diversity by including guardians with varied stake amounts"
             )
 
-        if len(guardians) < 5:
+        if active_guardians < 5:
             recommendations.append(
                 "Consider increasing the number of active guardians for better decentralization"
             )
@@ -662,11 +803,24 @@ class ProofOfReservesMonitor:
             )
         ]
 
+    def _quorum_status(self, overall_diversity: float, active_guardians: int) -> str:
+        if overall_diversity >= 0.8 and active_guardians >= 5:
+            return "excellent"
+        if overall_diversity >= 0.6 and active_guardians >= 3:
+            return "good"
+        if overall_diversity >= 0.4:
+            return "fair"
+        return "poor"
+
     async def get_quorum_health_summary(self) -> dict[str, Any]:
-        """Get overall quorum health summary"""
-        active_guardians = [g for g in self.guardians.values() if g.status == GuardianStatus.ACTIVE]
+        """Get overall quorum health summary
 
-        if not active_guardians:
+        Reads only the maintained aggregates, so the cost is proportional to
+        the number of bridges rather than the number of guardians.
+        """
+        overall = self.quorum_aggregates[GLOBAL_QUORUM]
+
+        if not overall.count:
             return {
                 "status": "critical",
                 "message": "No active guardians",
@@ -675,56 +829,33 @@ class ProofOfReservesMonitor:
                 "diversity_score": 0.0,
             }
 
-        # Calculate average diversity scores
-        avg_geo_diversity = statistics.mean(
-            [g.diversity_scores.get(DiversityMetric.GEOGRAPHIC, 0) for g in active_guardians]
-        )
-        avg_inst_diversity = statistics.mean(
-            [g.diversity_scores.get(DiversityMetric.INSTITUTIONAL, 0) for g in active_guardians]
-        )
-        avg_tech_diversity = statistics.mean(
-            [g.diversity_scores.get(DiversityMetric.TECHNICAL, 0) for g in active_guardians]
-        )
-        avg_rep_diversity = statistics.mean(
-            [g.diversity_scores.get(DiversityMetric.REPUTATIONAL, 0) for g in active_guardians]
-        )
-        avg_econ_diversity = statistics.mean(
-            [g.diversity_scores.get(DiversityMetric.ECONOMIC, 0) for g in active_guardians]
-        )
-
-        overall_diversity = (
-            avg_geo_diversity * self.diversity_weights[DiversityMetric.GEOGRAPHIC]
-            + avg_inst_diversity * self.diversity_weights[DiversityMetric.INSTITUTIONAL]
-            + avg_tech_diversity * self.diversity_weights[DiversityMetric.TECHNICAL]
-            + avg_rep_diversity * self.diversity_weights[DiversityMetric.REPUTATIONAL]
-            + avg_econ_diversity * self.diversity_weights[DiversityMetric.ECONOMIC]
-        )
-
-        # Determine status
-        if overall_diversity >= 0.8 and len(active_guardians) >= 5:
-            status = "excellent"
-        elif overall_diversity >= 0.6 and len(active_guardians) >= 3:
-            status = "good"
-        elif overall_diversity >= 0.4:
-            status = "fair"
-        else:
-            status = "poor"
+        scores = overall.scores()
+        overall_diversity = self._weighted_diversity(scores)
+
+        bridges = {}
+        for bridge_address, aggregate in self.quorum_aggregates.items():
+            if bridge_address == GLOBAL_QUORUM:
+                continue
+            bridge_diversity = self._weighted_diversity(aggregate.scores())
+            bridges[bridge_address] = {
+                "status": (
+                    self._quorum_status(bridge_diversity, aggregate.count)
+                    if aggregate.count
+                    else "critical"
+                ),
+                "active_guardians": aggregate.count,
+                "total_guardians": aggregate.total_guardians,
+                "overall_diversity_score": bridge_diversity,
+            }
 
         return {
-            "status": status,
-            "active_guardians": len(active_guardians),
+            "status": self._quorum_status(overall_diversity, overall.count),
+            "active_guardians": overall.count,
             "total_guardians": len(self.guardians),
             "overall_diversity_score": overall_diversity,
-            "diversity_breakdown": {
-                "geographic": avg_geo_diversity,
-                "institutional": avg_inst_diversity,
-                "technical": avg_tech_diversity,
-                "reputational": avg_rep_diversity,
-                "economic": avg_econ_diversity,
-            },
-            "average_reputation": statistics.mean([g.reputation_score for g in active_guardians]),
-            "average_accuracy": statistics.mean([g.accuracy_rate for g in active_guardians]),
-            "average_response_time": statistics.mean(
-                [g.response_time_avg for g in active_guardians]
-            ),
+            "diversity_breakdown": {metric.value: score for metric, score in scores.items()},
+            "average_reputation": overall.reputation_sum / overall.count,
+            "average_accuracy": overall.accuracy_sum / overall.count,
+            "average_response_time": overall.response_time_sum / overall.count,
+            "bridges": bridges,
         }
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+RPC Client Pool - Multi-endpoint JSON-RPC client with batching and request coalescing
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class RPCError(Exception):
+    """JSON-RPC error returned by a node or raised when no endpoint can serve a request"""
+
+    def __init__(self, message: str, code: int | None = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+@dataclass
+class RPCEndpoint:
+    """Health state for a single RPC endpoint"""
+
+    url: str
+    latency_ewma: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def health_score(self) -> float:
+        """Higher is better: smoothed success rate divided by smoothed latency"""
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return success_rate / (1.0 + self.latency_ewma)
+
+    def record_success(self, latency: float, alpha: float = 0.2):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.latency_ewma = (
+            latency if self.successes == 1 else alpha * latency + (1 - alpha) * self.latency_ewma
+        )
+
+    def record_failure(self, error: str, base_cooldown: float, max_cooldown: float):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        cooldown = min(max_cooldown, base_cooldown * 2 ** (self.consecutive_failures - 1))
+        self.cooldown_until = time.monotonic() + cooldown
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "health_score": self.health_score,
+            "latency_ms": self.latency_ewma * 1000,
+            "successes": self.successes,
+            "failures": self.failures,
+            "available": self.available,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class _PendingCall:
+    method: str
+    params: list[Any]
+    future: asyncio.Future
+    dedup_key: bytes | None = field(default=None)
+
+
+class RPCClientPool:
+    """JSON-RPC client over several endpoints of one network
+
+    Calls made within ``batch_window`` seconds of each other are sent as a
+    single JSON-RPC batch to the healthiest endpoint, and identical calls that
+    are already in flight share one result. Failed batches are retried on the
+    next endpoint while the failing one cools down.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        urls: list[str],
+        session: aiohttp.ClientSession | None = None,
+        batch_window: float = 0.005,
+        max_batch_size: int = 100,
+        max_retries: int = 3,
+        request_timeout: float = 10.0,
+        base_cooldown: float = 1.0,
+        max_cooldown: float = 60.0,
+        rate_limiter: Callable[[], Awaitable[None]] | None = None,
+    ):
+        if not urls:
+            raise ValueError(f"No RPC endpoints configured for {network}")
+
+        self.network = network
+        self.endpoints = [RPCEndpoint(url=url) for url in urls]
+        self.session = session
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.rate_limiter = rate_limiter
+
+        self._ids = itertools.count(1)
+        self._pending: list[_PendingCall] = []
+        self._inflight: dict[bytes, asyncio.Future] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        self._owns_session = session is None
+
+        self.stats = {
+            "calls": 0,
+            "deduplicated": 0,
+            "batches": 0,
+            "http_requests": 0,
+            "retries": 0,
+            "errors": 0,
+        }
+
+    async def request(self, method: str, params: list[Any] | None = None, dedup: bool = True) -> Any:
+        """Queue a JSON-RPC call and return its result
+
+        Set ``dedup=False`` for calls with side effects such as
+        ``eth_sendRawTransaction``.
+        """
+        params = params or []
+        self.stats["calls"] += 1
+
+        dedup_key = orjson.dumps([method, params]) if dedup else None
+        if dedup_key is not None:
+            existing = self._inflight.get(dedup_key)
+            if existing is not None:
+                self.stats["deduplicated"] += 1
+                return await asyncio.shield(existing)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if dedup_key is not None:
+            self._inflight[dedup_key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(dedup_key, None))
+
+        self._pending.append(_PendingCall(method, params, future, dedup_key))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await asyncio.shield(future)
+
+    async def batch(self, calls: list[tuple[str, list[Any]]]) -> list[Any]:
+        """Issue many calls at once; failed calls come back as RPCError instances"""
+        return await asyncio.gather(
+            *[self.request(method, params) for method, params in calls], return_exceptions=True
+        )
+
+    def select_endpoint(self, exclude: set[str] | None = None) -> RPCEndpoint:
+        """Pick the healthiest available endpoint, or the one recovering soonest"""
+        candidates = [e for e in self.endpoints if not exclude or e.url not in exclude]
+        if not candidates:
+            candidates = self.endpoints
+
+        available = [e for e in candidates if e.available]
+        if available:
+            return max(available, key=lambda e: e.health_score)
+        return min(candidates, key=lambda e: e.cooldown_until)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "network": self.network,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+            "endpoints": [endpoint.to_dict() for endpoint in self.endpoints],
+        }
+
+    async def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for call in self._pending:
+            if not call.future.done():
+                call.future.cancel()
+        self._pending.clear()
+
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            calls = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._send_batch(calls))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(self, calls: list[_PendingCall]):
+        self.stats["batches"] += 1
+        ids = {}
+        payload = []
+        for call in calls:
+            request_id = next(self._ids)
+            ids[request_id] = call
+            payload.append(
+                {"jsonrpc": "2.0", "id": request_id, "method": call.method, "params": call.params}
+            )
+        body = orjson.dumps(payload)
+
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries):
+            endpoint = self.select_endpoint(exclude=tried)
+            tried.add(endpoint.url)
+            if attempt:
+                self.stats["retries"] += 1
+
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter()
+                started = time.monotonic()
+                self.stats["http_requests"] += 1
+                responses = await self._post(endpoint.url, body)
+                if not isinstance(responses, list):
+                    # A single object answering a batch (e.g. a rate limit error) rejects it whole
+                    raise self._batch_rejection(responses)
+                endpoint.record_success(time.monotonic() - started)
+            except asyncio.CancelledError:
+                for call in calls:
+                    if not call.future.done():
+                        call.future.cancel()
+                raise
+            except Exception as e:
+                last_error = e
+                endpoint.record_failure(str(e), self.base_cooldown, self.max_cooldown)
+                logger.warning(f"RPC batch to {endpoint.url} ({self.network}) failed: {e}")
+                continue
+
+            self._resolve(ids, responses)
+            return
+
+        self.stats["errors"] += 1
+        error = RPCError(f"All RPC endpoints failed for {self.network}: {last_error}")
+        for call in calls:
+            if not call.future.done():
+                call.future.set_exception(error)
+                # Waiters are shielded; avoid "exception never retrieved" if all gave up
+                call.future.exception()
+
+    @staticmethod
+    def _batch_rejection(response: Any) -> RPCError:
+        error = response.get("error") if isinstance(response, dict) else None
+        if isinstance(error, dict):
+            return RPCError(
+                f"Batch rejected: {error.get('message', 'RPC error')}",
+                error.get("code"),
+                error.get("data"),
+            )
+        return RPCError(f"Batch rejected: unexpected response {str(response)[:200]}")
+
+    def _resolve(self, ids: dict[int, _PendingCall], responses: list[dict[str, Any]]):
+        for response in responses:
+            call = ids.pop(response.get("id"), None)
+            if call is None or call.future.done():
+                continue
+            if response.get("error"):
+                error = response["error"]
+                call.future.set_exception(
+                    RPCError(error.get("message", "RPC error"), error.get("code"), error.get("data"))
+                )
+                call.future.exception()
+            else:
+                call.future.set_result(response.get("result"))
+
+        for call in ids.values():
+            if not call.future.done():
+                call.future.set_exception(RPCError(f"No response for {call.method}"))
+                call.future.exception()
+
+    async def _post(self, url: str, body: bytes) -> Any:
+        """Send one HTTP request carrying a JSON-RPC batch"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+
+        async with self.session.post(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        ) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
@@ -0,0 +1,158 @@
+"""Tests for the parallel multi-bridge scan pipeline."""
+
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from src.core.bridge_analyzer import BridgeAnalyzer
+from src.core.bridge_scan import BridgeScanScheduler, BridgeScanTarget, ScanSnapshot
+
+
+class CountingBlockchain:
+    """Blockchain integration stand-in that counts reads."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    async def get_latest_block(self, network):
+        self.calls[("head", network)] += 1
+        await asyncio.sleep(0)
+        return SimpleNamespace(number=1000)
+
+    async def get_code(self, network, address):
+        self.calls[("code", network, address)] += 1
+        await asyncio.sleep(0)
+        return "0x6080"
+
+    async def get_balance(self, network, address):
+        self.calls[("balance", network, address)] += 1
+        await asyncio.sleep(0)
+        return 42
+
+
+BRIDGES = [
+    BridgeScanTarget(f"0x{i:040x}", network)
+    for i in range(5)
+    for network in ("ethereum", "polygon")
+]
+
+
+class TestBridgeScan:
+    """Test cases for BridgeScanScheduler and ScanSnapshot."""
+
+    @pytest.fixture
+    def blockchain(self):
+        return CountingBlockchain()
+
+    @pytest.fixture
+    def analyzer(self, blockchain):
+        return BridgeAnalyzer(blockchain_integration=blockchain)
+
+    @pytest.mark.asyncio
+    async def test_scan_reads_each_onchain_value_once(self, analyzer, blockchain):
+        results = [result async for result in analyzer.scan_portfolio(BRIDGES)]
+
+        assert len(results) == len(BRIDGES)
+        assert all(result.succeeded for result in results)
+        assert set(blockchain.calls.values()) == {1}
+        assert blockchain.calls[("head", "ethereum")] == 1
+
+        state = results[0].reserves_monitoring["onchain_state"]
+        assert state["has_code"] is True
+        assert state["code_size"] == 2
+        assert state["native_balance"] == 42
+
+    @pytest.mark.asyncio
+    async def test_duplicate_targets_are_scanned_once(self, analyzer):
+        scheduler = BridgeScanScheduler(analyzer)
+        results = await scheduler.scan_all(BRIDGES + BRIDGES[:3])
+
+        assert len(results) == len(BRIDGES)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_budget_is_respected(self, analyzer):
+        in_flight = peak = 0
+
+        async def slow_analysis(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        analyzer.detect_attestation_anomalies = slow_analysis
+        analyzer.analyze_quorum_skews = slow_analysis
+        analyzer.proof_of_reserves_monitoring = slow_analysis
+
+        scheduler = BridgeScanScheduler(analyzer, max_concurrency=3)
+        await scheduler.scan_all(BRIDGES)
+
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_is_reported_per_bridge(self, analyzer):
+        async def broken(*args, **kwargs):
+            raise RuntimeError("rpc unavailable")
+
+        analyzer.analyze_quorum_skews = broken
+        results = await BridgeScanScheduler(analyzer).scan_all(BRIDGES[:2])
+
+        assert all(result.errors == {"quorum_analysis": "rpc unavailable"} for result in results)
+        assert all(result.analysis is not None for result in results)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_without_blockchain_returns_no_state(self):
+        snapshot = ScanSnapshot()
+        assert await snapshot.get_bridge_state("ethereum", "0x" + "0" * 40) is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_starts_after_budget_is_acquired(self, analyzer):
+        async def analysis(*args, **kwargs):
+            await asyncio.sleep(0.02)
+            return {}
+
+        analyzer.analyze_bridge = analysis
+        analyzer.detect_attestation_anomalies = analysis
+        analyzer.analyze_quorum_skews = analysis
+        analyzer.proof_of_reserves_monitoring = analysis
+
+        targets = [BridgeScanTarget(f"0x{i:040x}", "ethereum") for i in range(30)]
+        # The whole scan takes ~0.6s, well past each bridge's 0.2s budget
+        scheduler = BridgeScanScheduler(analyzer, max_concurrency=4, bridge_timeout=0.2)
+        results = await scheduler.scan_all(targets)
+
+        assert [result.errors for result in results if result.errors] == []
+
+    @pytest.mark.asyncio
+    async def test_slow_analysis_times_out_individually(self, analyzer):
+        async def hung(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        analyzer.analyze_quorum_skews = hung
+        scheduler = BridgeScanScheduler(analyzer, bridge_timeout=0.05)
+        [result] = await scheduler.scan_all(BRIDGES[:1])
+
+        assert result.errors == {"quorum_analysis": "quorum_analysis exceeded 0.05s"}
+        assert result.analysis is not None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_read_does_not_strand_waiters(self, blockchain):
+        snapshot = ScanSnapshot(blockchain)
+        started = asyncio.Event()
+
+        async def stalled():
+            started.set()
+            await asyncio.sleep(10)
+
+        loader = asyncio.create_task(snapshot.read(("head", "ethereum"), stalled))
+        await started.wait()
+        waiter = asyncio.create_task(snapshot.read(("head", "ethereum"), stalled))
+        await asyncio.sleep(0)
+        loader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+        # The key is released, so the next read fetches again
+        assert await asyncio.wait_for(snapshot.get_head_block_number("ethereum"), timeout=1) == 1000
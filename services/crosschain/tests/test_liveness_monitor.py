@@ -0,0 +1,124 @@
+"""Tests for concurrent probing and ring-buffer health history."""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from src.core.liveness_monitor import HealthHistoryBuffer, LivenessIssue, LivenessMonitor
+
+
+class TestHealthHistoryBuffer:
+    """Test cases for the fixed-size health ring buffer."""
+
+    def test_window_wraps_in_chronological_order(self):
+        history = HealthHistoryBuffer(capacity=4)
+        for i in range(6):
+            history.append(float(i), 0.1 * i, i, 1.0, 1.0, error=False)
+
+        assert len(history) == 4
+        assert history.window("block_height").tolist() == [2, 3, 4, 5]
+        assert history.window("block_height", last=2).tolist() == [4, 5]
+
+    def test_summary_ignores_failed_samples(self):
+        history = HealthHistoryBuffer()
+        for latency in (0.1, 0.2, 0.3):
+            history.append(time.time(), latency, 1, 2.0, 1.0, error=False)
+        history.append(time.time(), np.nan, 0, np.nan, 0.0, error=True)
+
+        summary = history.summary()
+        assert summary["error_rate"] == 0.25
+        assert summary["response_time"]["p50"] == pytest.approx(0.2)
+        assert summary["block_lag"]["max"] == 2.0
+
+    def test_trailing_outage_spans_only_latest_run(self):
+        history = HealthHistoryBuffer()
+        history.append(1.0, np.nan, 0, np.nan, 0.0, error=True)
+        history.append(2.0, 0.1, 10, 5.0, 1.0, error=False)
+        history.append(3.0, 0.1, 10, 90.0, 0.6, error=False)
+        history.append(4.0, np.nan, 0, np.nan, 0.0, error=True)
+
+        outage = history.trailing_outage(block_lag_max=30.0)
+        assert outage["start_time"] == 3.0
+        assert outage["samples"] == 2
+        assert outage["error_samples"] == 1
+
+        history.append(5.0, 0.1, 11, 3.0, 1.0, error=False)
+        assert history.trailing_outage(block_lag_max=30.0) is None
+
+
+class TestLivenessMonitorProbing:
+    """Test cases for concurrent endpoint probing and gap tracking."""
+
+    @pytest_asyncio.fixture
+    async def monitor(self):
+        monitor = LivenessMonitor()
+        await monitor.initialize_networks(
+            [
+                {"name": "ethereum", "rpc_endpoints": ["slow", "fast", "broken"]},
+                {"name": "polygon", "rpc_endpoints": ["fast"]},
+            ]
+        )
+        return monitor
+
+    @staticmethod
+    def _fake_endpoint(delays):
+        async def probe(endpoint):
+            if endpoint == "broken":
+                raise ConnectionError("refused")
+            await asyncio.sleep(delays[endpoint])
+            return delays[endpoint], {
+                "block_height": 100,
+                "block_time": int(time.time()),
+                "endpoint": endpoint,
+            }
+
+        return probe
+
+    @pytest.mark.asyncio
+    async def test_probes_run_concurrently_with_timeout(self, monitor):
+        monitor.probe_settings["timeout"] = 0.2
+        monitor._test_rpc_endpoint = self._fake_endpoint({"slow": 5.0, "fast": 0.01})
+
+        started = time.monotonic()
+        await monitor._check_all_networks()
+
+        assert time.monotonic() - started < 1.0
+        health = monitor.network_health["ethereum"]
+        assert health.metrics["best_endpoint"] == "fast"
+        assert health.metrics["endpoints_available"] == 1
+        assert len(monitor.health_history["polygon"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_network_gap_opens_and_closes_from_history(self, monitor):
+        monitor.rpc_endpoints["polygon"] = ["broken"]
+        monitor._test_rpc_endpoint = self._fake_endpoint({"fast": 0.0})
+
+        await monitor._check_network_health("polygon")
+        await monitor._analyze_liveness_gaps()
+        gap = monitor.liveness_gaps[-1]
+        assert gap.issue_type == LivenessIssue.RPC_UNAVAILABLE
+        assert gap.end_time is None
+
+        monitor.rpc_endpoints["polygon"] = ["fast"]
+        await monitor._check_network_health("polygon")
+        await monitor._analyze_liveness_gaps()
+        assert gap.end_time is not None
+        assert len(monitor.liveness_gaps) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_check_is_recorded_in_history(self, monitor):
+        monitor._test_rpc_endpoint = self._fake_endpoint({"fast": 0.0})
+
+        async def broken_analysis(network, network_data, response_time):
+            raise ValueError("malformed block data")
+
+        monitor._analyze_network_issues = broken_analysis
+        await monitor._check_network_health("polygon")
+
+        history = monitor.health_history["polygon"]
+        assert len(history) == 1
+        assert history.window("error").tolist() == [True]
+        assert history.window("response_time")[0] >= 0.0
+        assert history.summary()["error_rate"] == 1.0
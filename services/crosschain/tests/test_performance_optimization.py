@@ -0,0 +1,175 @@
+"""Tests for the tiered cache in performance optimization."""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+from src.core.performance_optimization import (
+    CacheEntry,
+    CacheStrategy,
+    MemoryCacheTier,
+    TieredCache,
+    UncacheableArgumentError,
+    canonical_cache_key,
+    deserialize_value,
+    serialize_value,
+)
+
+
+@dataclass
+class SampleBlock:
+    """Typed value used to check serialization round-trips."""
+
+    number: int
+    timestamp: datetime
+
+
+class KeyedClient:
+    """Service object that opts into caching with an explicit key."""
+
+    def __init__(self, network: str):
+        self.network = network
+
+    def __cache_key__(self):
+        return self.network
+
+
+def _entry(key: str, size_bytes: int = 10) -> CacheEntry:
+    return CacheEntry(
+        key=key, value=key, created_at=datetime.utcnow(), expires_at=None, size_bytes=size_bytes
+    )
+
+
+class TestCacheKeys:
+    """Test cases for canonical cache keys."""
+
+    def test_dict_order_does_not_change_key(self):
+        """Equal dicts produce the same key regardless of insertion order."""
+        first = canonical_cache_key("fn", ({"b": 1, "a": [1, 2]},), {"x": {3, 1, 2}})
+        second = canonical_cache_key("fn", ({"a": [1, 2], "b": 1},), {"x": {2, 3, 1}})
+        assert first == second
+
+    def test_distinct_values_produce_distinct_keys(self):
+        """Type and value differences are reflected in the key."""
+        assert canonical_cache_key("fn", (1,)) != canonical_cache_key("fn", ("1",))
+        assert canonical_cache_key("fn", (1.0,)) != canonical_cache_key("fn", (1,))
+        assert canonical_cache_key("a", (1,)) != canonical_cache_key("b", (1,))
+
+    def test_objects_without_value_semantics_are_rejected(self):
+        """Plain objects raise instead of being keyed on identity."""
+        with pytest.raises(UncacheableArgumentError):
+            canonical_cache_key("fn", (object(),))
+
+    def test_cache_key_hook_keys_by_value(self):
+        """Distinct instances with the same ``__cache_key__`` share a key."""
+        first = canonical_cache_key("fn", (KeyedClient("ethereum"), 1))
+        assert first == canonical_cache_key("fn", (KeyedClient("ethereum"), 1))
+        assert first != canonical_cache_key("fn", (KeyedClient("polygon"), 1))
+
+    def test_dataclass_values_round_trip(self):
+        """Typed values keep their type through serialization."""
+        block = SampleBlock(number=5, timestamp=datetime(2024, 1, 1))
+        assert deserialize_value(serialize_value(block)) == block
+        assert deserialize_value(serialize_value({"a": 1})) == {"a": 1}
+
+
+class TestMemoryCacheTier:
+    """Test cases for memory tier eviction and accounting."""
+
+    def test_lru_evicts_least_recently_used(self):
+        tier = MemoryCacheTier(max_entries=2, policy=CacheStrategy.LRU)
+        tier.put(_entry("a"))
+        tier.put(_entry("b"))
+        tier.get("a")
+        tier.put(_entry("c"))
+
+        assert tier.keys() == ["a", "c"]
+        assert tier.evictions == 1
+
+    def test_lfu_evicts_least_frequently_used(self):
+        tier = MemoryCacheTier(max_entries=2, policy=CacheStrategy.LFU)
+        tier.put(_entry("a"))
+        tier.put(_entry("b"))
+        tier.get("b")
+        tier.get("b")
+        tier.get("a")
+        tier.put(_entry("c"))
+
+        assert sorted(tier.keys()) == ["b", "c"]
+
+    def test_byte_budget_is_enforced(self):
+        tier = MemoryCacheTier(max_entries=100, max_bytes=25)
+        for key in "abc":
+            tier.put(_entry(key, size_bytes=10))
+
+        assert tier.size_bytes == 20
+        assert tier.keys() == ["b", "c"]
+
+
+class TestTieredCache:
+    """Test cases for TieredCache loading semantics."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TieredCache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return SampleBlock(number=1, timestamp=datetime(2024, 1, 1))
+
+        results = await asyncio.gather(*[cache.get_or_load("k", loader) for _ in range(20)])
+
+        assert calls == 1
+        assert all(result == results[0] for result in results)
+        assert cache.stats["coalesced"] == 19
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        cache = TieredCache(default_ttl=0.01, stale_ttl=10)
+        values = iter([1, 2])
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("k", loader) == 1
+        await asyncio.sleep(0.02)
+
+        assert await cache.get_or_load("k", loader) == 1
+        await asyncio.sleep(0)
+        assert await cache.get_or_load("k", loader) == 2
+        assert cache.stats["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_none_results_are_negatively_cached(self):
+        cache = TieredCache(negative_ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await cache.get_or_load("missing", loader) is None
+        assert await cache.get_or_load("missing", loader) is None
+        assert calls == 1
+        assert cache.stats["negative_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_are_not_cached(self):
+        cache = TieredCache()
+        attempts = 0
+
+        async def loader():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("rpc down")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", loader)
+        assert await cache.get_or_load("k", loader) == "ok"
@@ -0,0 +1,107 @@
+"""Tests for incremental quorum diversity aggregates."""
+
+import random
+import statistics
+
+import pytest
+from src.core.proof_of_reserves import GuardianStatus, ProofOfReservesMonitor
+
+BRIDGE = "0x" + "b" * 40
+REGIONS = ["north_america", "europe", "asia_pacific", "latin_america"]
+INSTITUTIONS = ["exchange", "custodian", "validator", "individual"]
+SKILLS = ["cryptography", "smart_contracts", "networking", "consensus", "auditing"]
+
+
+def _expected_scores(guardians):
+    """Recompute diversity from scratch for comparison."""
+    n = len(guardians)
+    expertise = [skill for g in guardians for skill in g.technical_expertise]
+    reputations = [g.reputation_score for g in guardians]
+    stakes = sorted(g.stake_amount for g in guardians)
+    gini = sum((2 * (i + 1) - n - 1) * s for i, s in enumerate(stakes)) / (n * sum(stakes))
+    return {
+        "geographic": len({g.geographic_region for g in guardians}) / n,
+        "institutional": len({g.institutional_type for g in guardians}) / n,
+        "technical": len(set(expertise)) / len(expertise),
+        "reputational": min(statistics.stdev(reputations) / statistics.mean(reputations), 1.0),
+        "economic": 1.0 - gini,
+    }
+
+
+class TestQuorumDiversityAggregate:
+    """Test cases for incrementally maintained quorum diversity."""
+
+    @pytest.fixture
+    def monitor(self):
+        return ProofOfReservesMonitor()
+
+    async def _register(self, monitor, count, seed=7):
+        rng = random.Random(seed)
+        for i in range(count):
+            await monitor.register_guardian(
+                {
+                    "address": f"0x{i:040x}",
+                    "name": f"Guardian {i}",
+                    "geographic_region": rng.choice(REGIONS),
+                    "institutional_type": rng.choice(INSTITUTIONS),
+                    "technical_expertise": rng.sample(SKILLS, rng.randint(1, 3)),
+                    "reputation_score": rng.uniform(0.3, 1.0),
+                    "stake_amount": rng.uniform(1_000, 100_000),
+                    "bridges": [BRIDGE] if i % 2 == 0 else [],
+                }
+            )
+
+    @pytest.mark.asyncio
+    async def test_scores_match_full_recomputation_after_changes(self, monitor):
+        await self._register(monitor, 40)
+        for i in range(0, 40, 5):
+            await monitor.set_guardian_status(f"0x{i:040x}", GuardianStatus.INACTIVE)
+        await monitor.update_guardian(
+            f"0x{1:040x}", {"stake_amount": 250_000.0, "geographic_region": "africa"}
+        )
+
+        score = await monitor.calculate_quorum_diversity("0x" + "f" * 40)
+        active = [g for g in monitor.guardians.values() if g.status == GuardianStatus.ACTIVE]
+        expected = _expected_scores(active)
+
+        assert score.active_guardians == len(active)
+        assert score.total_guardians == 40
+        for metric, value in expected.items():
+            assert getattr(score, f"{metric}_diversity") == pytest.approx(value)
+
+    @pytest.mark.asyncio
+    async def test_bridge_quorum_only_counts_its_guardians(self, monitor):
+        await self._register(monitor, 10)
+
+        score = await monitor.calculate_quorum_diversity(BRIDGE.upper().replace("0X", "0x"))
+        members = [g for g in monitor.guardians.values() if BRIDGE in g.bridges]
+
+        assert score.active_guardians == len(members) == 5
+        assert score.economic_diversity == pytest.approx(_expected_scores(members)["economic"])
+
+    @pytest.mark.asyncio
+    async def test_health_summary_tracks_activity(self, monitor):
+        await self._register(monitor, 6)
+        await monitor.update_guardian_activity(
+            f"0x{0:040x}", {"is_correct": False, "response_time": 2.0}
+        )
+
+        summary = await monitor.get_quorum_health_summary()
+        guardians = list(monitor.guardians.values())
+
+        assert summary["active_guardians"] == 6
+        assert summary["average_accuracy"] == pytest.approx(
+            statistics.mean(g.accuracy_rate for g in guardians)
+        )
+        assert summary["average_response_time"] == pytest.approx(2.0 / 6)
+        assert summary["bridges"][BRIDGE]["active_guardians"] == 3
+
+    @pytest.mark.asyncio
+    async def test_deactivating_everyone_reports_critical(self, monitor):
+        await self._register(monitor, 3)
+        for address in list(monitor.guardians):
+            await monitor.set_guardian_status(address, GuardianStatus.SUSPENDED)
+
+        summary = await monitor.get_quorum_health_summary()
+        assert summary["status"] == "critical"
+        assert monitor.get_quorum_aggregate().count == 0
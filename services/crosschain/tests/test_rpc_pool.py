@@ -0,0 +1,127 @@
+"""Tests for the multi-endpoint JSON-RPC client pool."""
+
+import asyncio
+
+import orjson
+import pytest
+from src.core.rpc_pool import RPCClientPool, RPCError
+
+
+class FakeTransport:
+    """Records HTTP round trips and answers JSON-RPC batches."""
+
+    def __init__(self, failing_urls=()):
+        self.failing_urls = set(failing_urls)
+        self.requests = []
+
+    async def __call__(self, url, body):
+        self.requests.append((url, orjson.loads(body)))
+        if url in self.failing_urls:
+            raise ConnectionError("endpoint down")
+
+        responses = []
+        for call in orjson.loads(body):
+            if call["method"] == "eth_fail":
+                responses.append({"id": call["id"], "error": {"code": -32000, "message": "boom"}})
+            else:
+                responses.append({"id": call["id"], "result": [call["method"], call["params"]]})
+        return responses
+
+
+class TestRPCClientPool:
+    """Test cases for RPCClientPool batching and failover."""
+
+    @pytest.fixture
+    def transport(self):
+        return FakeTransport()
+
+    @pytest.fixture
+    def pool(self, transport):
+        pool = RPCClientPool("ethereum", ["https://a.example", "https://b.example"])
+        pool._post = transport
+        return pool
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_round_trip(self, pool, transport):
+        addresses = [f"0x{i:040x}" for i in range(250)]
+        results = await asyncio.gather(
+            *[pool.request("eth_getBalance", [address, "latest"]) for address in addresses]
+        )
+
+        assert results[7] == ["eth_getBalance", [addresses[7], "latest"]]
+        assert len(transport.requests) == 3  # max_batch_size=100
+        assert pool.stats["batches"] == 3
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_calls_are_deduplicated(self, pool, transport):
+        results = await asyncio.gather(
+            *[pool.request("eth_getCode", ["0xabc", "latest"]) for _ in range(10)]
+        )
+
+        assert all(result == results[0] for result in results)
+        assert len(transport.requests[0][1]) == 1
+        assert pool.stats["deduplicated"] == 9
+
+    @pytest.mark.asyncio
+    async def test_per_call_errors_do_not_fail_the_batch(self, pool):
+        results = await pool.batch([("eth_blockNumber", []), ("eth_fail", [])])
+
+        assert results[0] == ["eth_blockNumber", []]
+        assert isinstance(results[1], RPCError)
+        assert results[1].code == -32000
+
+    @pytest.mark.asyncio
+    async def test_failed_endpoint_is_retried_elsewhere_and_penalized(self):
+        transport = FakeTransport(failing_urls={"https://a.example"})
+        pool = RPCClientPool("ethereum", ["https://a.example", "https://b.example"])
+        pool._post = transport
+
+        assert await pool.request("eth_chainId") == ["eth_chainId", []]
+        assert pool.stats["retries"] == 1
+
+        await pool.request("eth_blockNumber")
+        assert transport.requests[-1][0] == "https://b.example"
+        assert not pool.endpoints[0].available
+
+    @pytest.mark.asyncio
+    async def test_all_endpoints_failing_raises(self):
+        pool = RPCClientPool("ethereum", ["https://a.example"], max_retries=2)
+        pool._post = FakeTransport(failing_urls={"https://a.example"})
+
+        with pytest.raises(RPCError):
+            await pool.request("eth_chainId")
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_with_single_error_fails_over(self):
+        transport = FakeTransport()
+
+        async def post(url, body):
+            if url == "https://a.example":
+                transport.requests.append((url, orjson.loads(body)))
+                return {"jsonrpc": "2.0", "id": None, "error": {"code": -32005, "message": "rate limited"}}
+            return await transport(url, body)
+
+        pool = RPCClientPool("ethereum", ["https://a.example", "https://b.example"])
+        pool._post = post
+
+        results = await pool.batch([("eth_chainId", []), ("eth_blockNumber", [])])
+
+        assert results == [["eth_chainId", []], ["eth_blockNumber", []]]
+        assert [url for url, _ in transport.requests] == ["https://a.example", "https://b.example"]
+        assert pool.endpoints[0].failures == 1
+        assert pool.endpoints[0].successes == 0
+        assert pool.endpoints[0].last_error == "Batch rejected: rate limited"
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_everywhere_fails_each_call(self):
+        async def post(url, body):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}}
+
+        pool = RPCClientPool("ethereum", ["https://a.example"], max_retries=2)
+        pool._post = post
+
+        results = await pool.batch([("eth_chainId", []), ("eth_blockNumber", [])])
+
+        assert all(isinstance(result, RPCError) for result in results)
+        assert "batch too large" in str(results[0])
+        assert pool.endpoints[0].failures == 2
@@ -28,6 +28,8 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
+from app.core.block_mev_analyzer import BlockMEVBackfill, BlockMEVStats
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -71,6 +73,11 @@ protection_stats = {
     "saved_value_usd": 0
 }
 
+# Measured from confirmed blocks by the backfill endpoint
+measured_mev_stats = BlockMEVStats()
+block_backfill_jobs = {}
+MAX_BACKFILL_BLOCKS = 10_000
+
 # ============================================================================
 # MEV BOT DATABASE
 # ============================================================================
@@ -115,6 +122,13 @@ class SandwichDetectionRequest(BaseModel):
     chain_id: int = Field(..., description="Blockchain chain ID")
     analysis_window: Optional[int] = Field(5, description="Blocks to analyze before/after")
 
+class BlockBackfillRequest(BaseModel):
+    """Request to reconstruct MEV from a range of confirmed blocks"""
+    start_block: int = Field(..., ge=0, description="First block to analyze")
+    end_block: int = Field(..., ge=0, description="Last block to analyze (inclusive)")
+    chain_id: int = Field(1, description="Blockchain chain ID")
+    workers: Optional[int] = Field(None, ge=1, le=64, description="Analysis worker processes")
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -163,6 +177,7 @@ async def root():
             "sandwich": "/api/detect/sandwich",
             "frontrunning": "/api/detect/frontrunning",
             "bots": "/api/mev-bots",
+            "block_backfill": "/api/analyze/blocks/backfill",
             "stats": "/api/stats"
         },
         "docs": "/docs"
@@ -653,6 +668,54 @@ async def protect_liquidation(position_id: str, protocol: str, chain_id: int):
         "alert_threshold": "1.15 health factor"
     }
 
+# ============================================================================
+# CONFIRMED BLOCK ANALYSIS
+# ============================================================================
+
+async def _run_block_backfill(job_id: str, rpc_url: str, request: BlockBackfillRequest):
+    job = block_backfill_jobs[job_id]
+    try:
+        backfill = BlockMEVBackfill(rpc_url, workers=request.workers)
+        stats = await backfill.run(request.start_block, request.end_block, on_result=measured_mev_stats.add)
+        job["status"] = "completed"
+        job["result"] = stats.to_dict()
+    except Exception as e:
+        logger.error(f"Block backfill {job_id} failed: {e}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    job["completed_at"] = datetime.utcnow().isoformat()
+
+@app.post("/api/analyze/blocks/backfill")
+async def backfill_block_mev(request: BlockBackfillRequest, background_tasks: BackgroundTasks):
+    """Reconstruct sandwiches, front-runs and back-runs from historical blocks"""
+    if request.end_block < request.start_block:
+        raise HTTPException(status_code=400, detail="end_block must not precede start_block")
+    if request.end_block - request.start_block + 1 > MAX_BACKFILL_BLOCKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BACKFILL_BLOCKS} blocks per backfill")
+
+    rpc_url = os.getenv(f"RPC_URL_{request.chain_id}")
+    if not rpc_url:
+        raise HTTPException(status_code=503, detail=f"No RPC endpoint configured for chain {request.chain_id}")
+
+    job_id = f"backfill_{uuid.uuid4().hex[:12]}"
+    block_backfill_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "running",
+        "chain_id": request.chain_id,
+        "start_block": request.start_block,
+        "end_block": request.end_block,
+        "started_at": datetime.utcnow().isoformat(),
+    }
+    background_tasks.add_task(_run_block_backfill, job_id, rpc_url, request)
+    return block_backfill_jobs[job_id]
+
+@app.get("/api/analyze/blocks/backfill/{job_id}")
+async def get_block_backfill(job_id: str):
+    """Get the status and results of a block backfill"""
+    if job_id not in block_backfill_jobs:
+        raise HTTPException(status_code=404, detail="Backfill job not found")
+    return block_backfill_jobs[job_id]
+
 # ============================================================================
 # STATISTICS
 # ============================================================================
@@ -665,6 +728,7 @@ async def get_protection_statistics():
         "version": "2.0.0",
         "uptime": "99.94%",
         "protection_stats": protection_stats,
+        "measured": measured_mev_stats.to_dict(),
         "mev_landscape": {
             "total_mev_extracted_24h": "$12.4M",
             "sandwich_attacks_24h": 2847,
@@ -11,7 +11,7 @@ import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import aiohttp
 import numpy as np
@@ -21,9 +21,25 @@ from sklearn.preprocessing import StandardScaler
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 
+from .block_mev_analyzer import BLOCK_DEDUP_WINDOW, BlockMEVEvent, BlockMEVStats, analyze_block
+
 logger = structlog.get_logger(__name__)
 
 
+# Wrapped native tokens, used to express measured MEV profit in native units
+WRAPPED_NATIVE_TOKENS = {
+    "ethereum": "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2",
+    "bsc": "0xbb4cdb9cbd36b01bd1cbaebf2de08d9173bc095c",
+    "polygon": "0x0d500b1d8e8ef31e21c99d1db9a6444d3adf1270",
+    "arbitrum": "0x82af49447d8a07e3bd95bd0d56f35241523fbab1",
+    "optimism": "0x4200000000000000000000000000000000000006",
+    "base": "0x4200000000000000000000000000000000000006",
+}
+
+# token0() / token1() selectors shared by Uniswap V2 pairs and V3 pools
+POOL_TOKEN_SELECTORS = ("0x0dfe1681", "0xd21220a7")
+
+
 class MEVType(Enum):
     FRONT_RUNNING = "front_running"
     SANDWICH_ATTACK = "sandwich_attack"
@@ -102,6 +118,11 @@ class RealMEVProtectionService:
         self.monitoring_tasks: List[asyncio.Task] = []
         self.is_running = False
 
+        # Measured MEV from confirmed blocks
+        self.block_mev_stats = BlockMEVStats(dedup_window=BLOCK_DEDUP_WINDOW)
+        self._last_analyzed_block: Dict[str, int] = {}
+        self._pool_tokens: Dict[str, Tuple[str, str]] = {}
+
         # Initialize Web3 connections
         self._initialize_web3_connections()
 
@@ -198,6 +219,10 @@ class RealMEVProtectionService:
                 for tx in block.transactions:
                     await self._analyze_transaction(tx, network)
 
+                if self._last_analyzed_block.get(network) != latest_block:
+                    await self._analyze_confirmed_block(w3, network, block)
+                    self._last_analyzed_block[network] = latest_block
+
                 # Wait before next block
                 await asyncio.sleep(12)  # ~12 seconds per block on Ethereum
 
@@ -205,6 +230,72 @@ class RealMEVProtectionService:
                 logger.error("Network monitoring error", network=network, error=str(e))
                 await asyncio.sleep(30)
 
+    async def _analyze_confirmed_block(self, w3: Web3, network: str, block: Dict[str, Any]):
+        """Reconstruct sandwiches, front-runs and back-runs from a mined block"""
+        try:
+            response = w3.provider.make_request("eth_getBlockReceipts", [hex(block["number"])])
+            receipts = response.get("result")
+            if not receipts:
+                logger.debug("Block receipts unavailable", network=network, block=block["number"])
+                return
+
+            analysis = analyze_block(block, receipts)
+            self.block_mev_stats.add(analysis)
+
+            for event in analysis.events:
+                await self._handle_mev_threat(self._threat_from_block_event(w3, network, event))
+
+        except Exception as e:
+            logger.error("Confirmed block analysis error", network=network, error=str(e))
+
+    def _pool_token(self, w3: Web3, pool: str, index: int) -> Optional[str]:
+        """Resolve and cache a pool's token0/token1 address"""
+        if pool not in self._pool_tokens:
+            try:
+                self._pool_tokens[pool] = tuple(
+                    "0x" + w3.eth.call({"to": Web3.to_checksum_address(pool), "data": selector}).hex()[-40:]
+                    for selector in POOL_TOKEN_SELECTORS
+                )
+            except Exception as e:
+                logger.debug("Pool token lookup failed", pool=pool, error=str(e))
+                return None
+        return self._pool_tokens[pool][index]
+
+    def _threat_from_block_event(self, w3: Web3, network: str, event: BlockMEVEvent) -> MEVThreat:
+        """Turn a measured block event into a threat record"""
+        mev_type, severity, suggestions = {
+            "sandwich": (
+                MEVType.SANDWICH_ATTACK,
+                MEVSeverity.HIGH,
+                ["Use private mempool", "Tighten slippage tolerance"],
+            ),
+            "front_run": (
+                MEVType.FRONT_RUNNING,
+                MEVSeverity.MEDIUM,
+                ["Use private mempool", "Use commit-reveal or batch auctions"],
+            ),
+        }.get(event.mev_type, (MEVType.BACK_RUNNING, MEVSeverity.LOW, ["Consider MEV-Share style backrun rebates"]))
+
+        # Profit is only converted when it is denominated in the wrapped native token
+        potential_profit = 0.0
+        wrapped_native = WRAPPED_NATIVE_TOKENS.get(network)
+        if event.attacker_profit is not None and wrapped_native:
+            if self._pool_token(w3, event.pool, event.profit_token_index) == wrapped_native:
+                potential_profit = event.attacker_profit / 10**18
+
+        return MEVThreat(
+            threat_id=f"{event.mev_type}_{event.attacker_txs[0]}",
+            mev_type=mev_type,
+            severity=severity,
+            confidence=event.confidence,
+            description=f"Confirmed {event.mev_type.replace('_', ' ')} in block {event.block_number}",
+            affected_transactions=event.victim_txs,
+            potential_profit=potential_profit,
+            detection_time=datetime.now(timezone.utc),
+            mitigation_suggestions=suggestions,
+            evidence=event.to_dict(),
+        )
+
     async def _monitor_mempool(self):
         """Monitor mempool for MEV threats"""
         logger.info("Starting mempool monitoring")
@@ -229,7 +320,7 @@ class RealMEVProtectionService:
             pending_txs = w3.eth.get_block("pending", full_transactions=True)
 
             for tx in pending_txs.transactions:
-                if tx.hash.hex() not in self.mempool_transactions:
+                if self._is_new_transaction(tx.hash.hex()):
                     mempool_tx = MempoolTransaction(
                         hash=tx.hash.hex(),
                         from_address=tx["from"],
@@ -242,14 +333,20 @@ class RealMEVProtectionService:
                         timestamp=datetime.now(timezone.utc),
                     )
 
-                    self.mempool_transactions[tx.hash.hex()] = mempool_tx
-
-                    # Analyze for MEV threats
-                    await self._analyze_mempool_transaction(mempool_tx, network)
+                    await self._submit_mempool_transaction(mempool_tx, network)
 
         except Exception as e:
             logger.debug("Mempool polling error", network=network, error=str(e))
 
+    def _is_new_transaction(self, tx_hash: str) -> bool:
+        """Whether a pending transaction has not been seen yet"""
+        return tx_hash not in self.mempool_transactions
+
+    async def _submit_mempool_transaction(self, tx: MempoolTransaction, network: str):
+        """Record a new pending transaction and analyze it for MEV threats"""
+        self.mempool_transactions[tx.hash] = tx
+        await self._analyze_mempool_transaction(tx, network)
+
     async def _analyze_transaction(self, tx: Dict[str, Any], network: str):
         """Analyze a transaction for MEV threats"""
         try:
@@ -679,6 +776,7 @@ class RealMEVProtectionService:
                 "mempool_size": len(self.mempool_transactions),
                 "threats_detected": len(self.detected_threats),
                 "ml_model_loaded": self.ml_model is not None,
+                "measured_mev": self.block_mev_stats.to_dict(),
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
         except Exception as e:
@@ -696,4 +794,5 @@ class RealMEVProtectionService:
             "mempool_transactions": len(self.mempool_transactions),
             "detected_threats": len(self.detected_threats),
             "ml_model_available": self.ml_model is not None,
+            "measured_mev": self.block_mev_stats.to_dict(),
         }
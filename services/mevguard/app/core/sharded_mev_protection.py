@@ -0,0 +1,318 @@
+"""
+Sharded MEV Protection Service
+Partitions pending and confirmed transactions by (network, target contract)
+across worker processes so detection scales with cores.
+
+The coordinator keeps the RPC connections, polling loops and confirmed-block
+analysis of ``RealMEVProtectionService``; each worker process owns the mempool
+state and detectors of one shard. Transactions touching the same contract on
+the same network always land in the same shard, so detectors that correlate
+related transactions see all of them.
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from .real_mev_protection import (
+    MempoolTransaction,
+    MEVProtectionConfig,
+    MEVThreat,
+    RealMEVProtectionService,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Work items sent to a shard: (kind, network, payload)
+MEMPOOL_ITEM = "mempool"
+BLOCK_ITEM = "block"
+
+
+def shard_for(network: str, to_address: Optional[str], num_shards: int) -> int:
+    """Stable shard index for a (network, target contract) pair"""
+    key = f"{network}:{(to_address or '').lower()}".encode()
+    return zlib.crc32(key) % num_shards
+
+
+class ShardDetector(RealMEVProtectionService):
+    """Detectors and mempool state of one shard, running inside a worker process"""
+
+    def __init__(self, config: MEVProtectionConfig, shard_id: int):
+        # Workers never talk to RPC endpoints; the coordinator feeds them
+        super().__init__(replace(config, rpc_urls={}))
+        self.shard_id = shard_id
+        self.processed = 0
+        self.new_threats: List[MEVThreat] = []
+        self.mempool_transactions = OrderedDict()
+
+    async def _submit_mempool_transaction(self, tx: MempoolTransaction, network: str):
+        await super()._submit_mempool_transaction(tx, network)
+        while len(self.mempool_transactions) > self.config.max_mempool_size:
+            self.mempool_transactions.popitem(last=False)
+
+    async def _handle_mev_threat(self, threat: MEVThreat):
+        is_new = threat.threat_id not in self.detected_threats
+        await super()._handle_mev_threat(threat)
+        if is_new:
+            self.new_threats.append(threat)
+
+    async def process(self, items: List[Tuple[str, str, Any]]):
+        for kind, network, payload in items:
+            if kind == MEMPOOL_ITEM:
+                if self._is_new_transaction(payload.hash):
+                    await self._submit_mempool_transaction(payload, network)
+            else:
+                await self._analyze_transaction(payload, network)
+            self.processed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "shard_id": self.shard_id,
+            "pid": os.getpid(),
+            "processed": self.processed,
+            "mempool_transactions": len(self.mempool_transactions),
+            "detected_threats": len(self.detected_threats),
+            "ml_model_available": self.ml_model is not None,
+            "reported_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+async def _shard_worker_main(
+    shard_id: int,
+    config: MEVProtectionConfig,
+    inbox: mp.Queue,
+    outbox: mp.Queue,
+    report_interval: float,
+):
+    detector = ShardDetector(config, shard_id)
+    detector.is_running = True
+    loop = asyncio.get_running_loop()
+    last_report = 0.0
+
+    while True:
+        try:
+            items = await loop.run_in_executor(None, partial(inbox.get, timeout=report_interval))
+        except queue.Empty:
+            items = []
+        if items is None:
+            break
+
+        await detector.process(items)
+        if detector.new_threats:
+            outbox.put(("threats", shard_id, detector.new_threats))
+            detector.new_threats = []
+
+        now = time.monotonic()
+        if now - last_report >= report_interval:
+            await detector._cleanup_old_threats()
+            outbox.put(("metrics", shard_id, detector.snapshot()))
+            last_report = now
+
+    outbox.put(("metrics", shard_id, detector.snapshot()))
+
+
+def run_shard_worker(
+    shard_id: int,
+    config: MEVProtectionConfig,
+    inbox: mp.Queue,
+    outbox: mp.Queue,
+    report_interval: float = 5.0,
+):
+    """Worker process entry point"""
+    asyncio.run(_shard_worker_main(shard_id, config, inbox, outbox, report_interval))
+
+
+class ShardedMEVProtectionService(RealMEVProtectionService):
+    """
+    Coordinator that routes transactions to shard worker processes and
+    aggregates their threats and metrics behind the same interface as
+    ``RealMEVProtectionService``
+    """
+
+    def __init__(
+        self,
+        config: MEVProtectionConfig,
+        num_shards: Optional[int] = None,
+        report_interval: float = 5.0,
+    ):
+        # Detection happens in the shards, so the coordinator needs no model
+        super().__init__(replace(config, enable_ml_detection=False))
+        self.shard_config = config
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self.report_interval = report_interval
+        self.shard_metrics: Dict[int, Dict[str, Any]] = {}
+        self.routed_transactions = 0
+
+        self._context = mp.get_context("spawn")
+        self._processes: List[mp.Process] = []
+        self._inboxes: List[mp.Queue] = []
+        self._outbox: Optional[mp.Queue] = None
+        self._pending: List[List[Tuple[str, str, Any]]] = [[] for _ in range(self.num_shards)]
+        self._seen_transactions: "OrderedDict[str, None]" = OrderedDict()
+
+    def start_shards(self):
+        """Spawn the shard worker processes"""
+        if self._processes:
+            return
+
+        self._outbox = self._context.Queue()
+        for shard_id in range(self.num_shards):
+            inbox = self._context.Queue()
+            process = self._context.Process(
+                target=run_shard_worker,
+                args=(shard_id, self.shard_config, inbox, self._outbox, self.report_interval),
+                name=f"mev-shard-{shard_id}",
+                daemon=True,
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+        logger.info("MEV shard workers started", shards=self.num_shards)
+
+    async def stop_shards(self, timeout: float = 30.0):
+        """Flush pending work, stop the workers and collect their final results"""
+        if not self._processes:
+            return
+
+        self.flush()
+        for inbox in self._inboxes:
+            inbox.put(None)
+
+        # Keep reading while workers exit: a worker cannot finish while its
+        # final results are still buffered in a full pipe
+        deadline = time.monotonic() + timeout
+        while any(p.is_alive() for p in self._processes) and time.monotonic() < deadline:
+            self.drain_results()
+            await asyncio.sleep(0.05)
+        self.drain_results()
+
+        for process in self._processes:
+            if process.is_alive():
+                logger.warning("MEV shard worker did not stop, terminating", pid=process.pid)
+                process.terminate()
+
+        self._processes.clear()
+        self._inboxes.clear()
+        logger.info("MEV shard workers stopped")
+
+    async def start_monitoring(self):
+        self.start_shards()
+        await super().start_monitoring()
+        if self.is_running:
+            self.monitoring_tasks.append(asyncio.create_task(self._collect_shard_results()))
+
+    async def stop_monitoring(self):
+        await super().stop_monitoring()
+        await self.stop_shards()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, kind: str, network: str, to_address: Optional[str], payload: Any):
+        """Queue a work item for the shard owning (network, to_address)"""
+        self._pending[shard_for(network, to_address, self.num_shards)].append((kind, network, payload))
+        self.routed_transactions += 1
+
+    def flush(self):
+        """Send queued work to the shards, one message per shard"""
+        for shard_id, items in enumerate(self._pending):
+            if items:
+                self._inboxes[shard_id].put(items)
+                self._pending[shard_id] = []
+
+    def _is_new_transaction(self, tx_hash: str) -> bool:
+        if tx_hash in self._seen_transactions:
+            return False
+        self._seen_transactions[tx_hash] = None
+        while len(self._seen_transactions) > self.config.max_mempool_size:
+            self._seen_transactions.popitem(last=False)
+        return True
+
+    async def _submit_mempool_transaction(self, tx: MempoolTransaction, network: str):
+        self.route(MEMPOOL_ITEM, network, tx.to_address, tx)
+
+    async def _analyze_transaction(self, tx: Dict[str, Any], network: str):
+        self.route(BLOCK_ITEM, network, tx.get("to"), dict(tx))
+
+    async def _poll_mempool(self, w3, network: str):
+        await super()._poll_mempool(w3, network)
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    def drain_results(self) -> int:
+        """Merge every threat and metrics report currently waiting from the shards"""
+        drained = 0
+        while self._outbox is not None:
+            try:
+                message = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            self._ingest(message)
+            drained += 1
+        return drained
+
+    def _ingest(self, message: Tuple[str, int, Any]):
+        kind, shard_id, payload = message
+        if kind == "threats":
+            for threat in payload:
+                threat.evidence.setdefault("shard_id", shard_id)
+                self.detected_threats[threat.threat_id] = threat
+        else:
+            self.shard_metrics[shard_id] = payload
+
+    async def _collect_shard_results(self):
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            try:
+                # Block transactions arrive between mempool polls
+                self.flush()
+                message = await loop.run_in_executor(None, partial(self._outbox.get, timeout=1.0))
+                self._ingest(message)
+                self.drain_results()
+            except queue.Empty:
+                continue
+            except Exception as e:
+                logger.error("Shard result collection error", error=str(e))
+                await asyncio.sleep(1)
+
+    async def health_check(self) -> Dict[str, Any]:
+        health = await super().health_check()
+        alive = sum(process.is_alive() for process in self._processes)
+        health.update(
+            {
+                "mempool_size": sum(m["mempool_transactions"] for m in self.shard_metrics.values()),
+                "ml_model_loaded": any(m["ml_model_available"] for m in self.shard_metrics.values()),
+                "shards": self.num_shards,
+                "shards_alive": alive,
+            }
+        )
+        if health.get("status") == "healthy" and alive < self.num_shards:
+            health["status"] = "degraded"
+        return health
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        metrics.update(
+            {
+                "mempool_transactions": sum(m["mempool_transactions"] for m in self.shard_metrics.values()),
+                "ml_model_available": any(m["ml_model_available"] for m in self.shard_metrics.values()),
+                "routed_transactions": self.routed_transactions,
+                "shards": [self.shard_metrics.get(i, {"shard_id": i}) for i in range(self.num_shards)],
+            }
+        )
+        return metrics
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+🧪 Block-level MEV Analyzer Tests
+=================================
+Sandwich, front-run and back-run reconstruction from synthetic blocks whose
+swap logs follow the Uniswap V2/V3 event layouts.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.block_mev_analyzer import (
+    Q96,
+    UNISWAP_V2_SWAP_TOPIC,
+    UNISWAP_V2_SYNC_TOPIC,
+    UNISWAP_V3_SWAP_TOPIC,
+    BlockMEVBackfill,
+    BlockMEVStats,
+    analyze_block,
+    decode_block_swaps,
+    v2_amount_out,
+)
+
+POOL = "0x" + "aa" * 20
+ROUTER = "0x" + "77" * 20
+BOT = "0x" + "b0" * 20
+SEARCHER = "0x" + "5e" * 20
+
+
+def word(value):
+    return f"{value % (1 << 256):064x}"
+
+
+def topic(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+class V2Pool:
+    """Constant-product pair that emits Sync + Swap logs like UniswapV2Pair"""
+
+    def __init__(self, reserve0, reserve1):
+        self.reserve0, self.reserve1 = reserve0, reserve1
+
+    def swap(self, zero_for_one, amount_in, recipient):
+        if zero_for_one:
+            out = v2_amount_out(amount_in, self.reserve0, self.reserve1)
+            self.reserve0, self.reserve1 = self.reserve0 + amount_in, self.reserve1 - out
+            amounts = (amount_in, 0, 0, out)
+        else:
+            out = v2_amount_out(amount_in, self.reserve1, self.reserve0)
+            self.reserve0, self.reserve1 = self.reserve0 - out, self.reserve1 + amount_in
+            amounts = (0, amount_in, out, 0)
+        logs = [
+            {"address": POOL, "topics": [UNISWAP_V2_SYNC_TOPIC], "data": "0x" + word(self.reserve0) + word(self.reserve1)},
+            {
+                "address": POOL,
+                "topics": [UNISWAP_V2_SWAP_TOPIC, topic(ROUTER), topic(recipient)],
+                "data": "0x" + "".join(word(a) for a in amounts),
+            },
+        ]
+        return out, logs
+
+
+def make_block(txs):
+    """txs: list of (from, to, gas_price, logs)"""
+    block = {"number": "0x10", "transactions": []}
+    receipts = []
+    log_index = 0
+    for i, (sender, to, gas_price, logs) in enumerate(txs):
+        tx_hash = "0x" + f"{i + 1:064x}"
+        block["transactions"].append({"hash": tx_hash, "from": sender, "to": to, "gasPrice": hex(gas_price)})
+        for log in logs:
+            log["logIndex"] = hex(log_index)
+            log_index += 1
+        receipts.append(
+            {
+                "transactionHash": tx_hash,
+                "transactionIndex": hex(i),
+                "from": sender,
+                "to": to,
+                "status": "0x1",
+                "effectiveGasPrice": hex(gas_price),
+                "logs": logs,
+            }
+        )
+    return block, receipts
+
+
+class TestSandwichReconstruction:
+    def test_v2_sandwich_profit_and_exact_victim_loss(self):
+        victim = "0x" + "01" * 20
+        pool = V2Pool(1_000 * 10**18, 2_000_000 * 10**6)
+
+        # Counterfactual: the victim alone against the untouched pool
+        expected_victim_out = v2_amount_out(10 * 10**18, pool.reserve0, pool.reserve1)
+
+        front_out, front_logs = pool.swap(True, 50 * 10**18, BOT)
+        victim_out, victim_logs = pool.swap(True, 10 * 10**18, victim)
+        back_out, back_logs = pool.swap(False, front_out, BOT)
+
+        block, receipts = make_block(
+            [
+                (SEARCHER, BOT, 200, front_logs),
+                (victim, ROUTER, 100, victim_logs),
+                (SEARCHER, BOT, 90, back_logs),
+            ]
+        )
+        analysis = analyze_block(block, receipts)
+
+        assert analysis.block_number == 16
+        assert analysis.swaps == 3
+        [event] = analysis.events
+        assert event.mev_type == "sandwich"
+        assert event.attacker == BOT
+        assert event.victim_txs == [receipts[1]["transactionHash"]]
+        assert event.profit_token_index == 0
+        assert event.attacker_profit == back_out - 50 * 10**18
+        assert event.attacker_profit > 0
+        assert event.victim_loss == expected_victim_out - victim_out
+        assert event.evidence["inventory_delta"] == 0
+
+    def test_failed_and_unrelated_transactions_are_ignored(self):
+        victim = "0x" + "01" * 20
+        pool = V2Pool(10**21, 10**21)
+        _, front_logs = pool.swap(True, 10**19, BOT)
+        _, victim_logs = pool.swap(True, 10**18, victim)
+
+        block, receipts = make_block(
+            [
+                (SEARCHER, BOT, 200, front_logs),
+                (victim, ROUTER, 100, victim_logs),
+                (SEARCHER, ROUTER, 50, [{"address": POOL, "topics": ["0x" + "12" * 32], "data": "0x"}]),
+            ]
+        )
+        receipts[0]["status"] = "0x0"
+
+        assert len(decode_block_swaps(block, receipts)) == 1
+        assert analyze_block(block, receipts).events == []
+
+    def test_v3_sandwich_uses_logged_prices(self):
+        victim = "0x" + "01" * 20
+        liquidity = 10**24
+        price = Q96  # sqrtP == 1
+
+        def v3_swap(recipient, zero_for_one, amount_in):
+            nonlocal price
+            sqrt_p = price / Q96
+            if zero_for_one:
+                new = 1 / (1 / sqrt_p + amount_in / liquidity)
+                amounts = (amount_in, -int(liquidity * (sqrt_p - new)))
+            else:
+                new = sqrt_p + amount_in / liquidity
+                amounts = (-int(liquidity * (1 / sqrt_p - 1 / new)), amount_in)
+            price = int(new * Q96)
+            data = "0x" + word(amounts[0]) + word(amounts[1]) + word(price) + word(liquidity) + word(0)
+            log = {"address": POOL, "topics": [UNISWAP_V3_SWAP_TOPIC, topic(ROUTER), topic(recipient)], "data": data}
+            return amounts, [log]
+
+        _, front_logs = v3_swap(BOT, True, 10**22)
+        (_, victim_delta), victim_logs = v3_swap(victim, True, 10**21)
+        _, back_logs = v3_swap(BOT, False, 10**22)
+
+        # Victim alone against the initial price
+        alone = liquidity * (1 - 1 / (1 + 10**21 / liquidity))
+
+        block, receipts = make_block(
+            [(SEARCHER, BOT, 2, front_logs), (victim, ROUTER, 1, victim_logs), (SEARCHER, BOT, 1, back_logs)]
+        )
+        [event] = analyze_block(block, receipts).events
+
+        assert event.mev_type == "sandwich"
+        assert event.protocol == "uniswap_v3"
+        assert event.evidence["single_tick"] is True
+        assert event.victim_loss == pytest.approx(alone + victim_delta, rel=1e-6)
+
+
+class TestFrontAndBackRuns:
+    def test_front_run_requires_higher_gas(self):
+        victim = "0x" + "01" * 20
+        pool = V2Pool(10**21, 10**21)
+        _, front_logs = pool.swap(True, 10**19, BOT)
+        _, victim_logs = pool.swap(True, 10**18, victim)
+
+        block, receipts = make_block([(SEARCHER, BOT, 200, front_logs), (victim, ROUTER, 100, victim_logs)])
+        [event] = analyze_block(block, receipts).events
+        assert event.mev_type == "front_run"
+        assert event.attacker == BOT
+        assert event.victim_loss > 0
+
+        block, receipts = make_block([(SEARCHER, BOT, 100, front_logs), (victim, ROUTER, 100, victim_logs)])
+        assert analyze_block(block, receipts).events == []
+
+    def test_back_run(self):
+        user = "0x" + "01" * 20
+        pool = V2Pool(10**21, 10**21)
+        _, user_logs = pool.swap(True, 10**19, user)
+        _, bot_logs = pool.swap(False, 10**18, BOT)
+
+        block, receipts = make_block([(user, ROUTER, 100, user_logs), (SEARCHER, BOT, 100, bot_logs)])
+        [event] = analyze_block(block, receipts).events
+        assert event.mev_type == "back_run"
+        assert event.victim_txs == [receipts[0]["transactionHash"]]
+
+
+def test_stats_aggregate_blocks():
+    victim = "0x" + "01" * 20
+    pool = V2Pool(10**21, 10**21)
+    front_out, front_logs = pool.swap(True, 10**19, BOT)
+    _, victim_logs = pool.swap(True, 10**18, victim)
+    _, back_logs = pool.swap(False, front_out, BOT)
+    block, receipts = make_block(
+        [(SEARCHER, BOT, 2, front_logs), (victim, ROUTER, 1, victim_logs), (SEARCHER, BOT, 1, back_logs)]
+    )
+
+    stats = BlockMEVStats()
+    stats.add(analyze_block(block, receipts))
+    stats.add(analyze_block({"number": 17, "transactions": []}, []))
+
+    summary = stats.to_dict()
+    assert summary["blocks_analyzed"] == 2
+    assert summary["block_range"] == [16, 17]
+    assert summary["sandwich_attacks"] == 1
+    assert summary["victim_transactions"] == 1
+    assert summary["top_attackers"] == [(BOT, 1)]
+
+
+def test_stats_count_each_block_once():
+    block, receipts = make_block([])
+    block["hash"] = "0x" + "ab" * 32
+    unhashed = {"number": 17, "transactions": []}
+
+    stats = BlockMEVStats()
+    assert stats.add(analyze_block(block, receipts))
+    assert stats.add(analyze_block(unhashed, []))
+    # A second backfill over the same range changes nothing
+    assert not stats.add(analyze_block(block, receipts))
+    assert not stats.add(analyze_block(unhashed, []))
+    # Same height with a different hash (another chain) is a different block
+    assert stats.add(analyze_block(dict(block, hash="0x" + "cd" * 32), receipts))
+
+    assert stats.to_dict()["blocks_analyzed"] == 3
+
+
+def test_windowed_stats_forget_old_blocks():
+    stats = BlockMEVStats(dedup_window=4)
+    for number in range(100):
+        assert stats.add(analyze_block({"number": number, "hash": hex(number), "transactions": []}, []))
+
+    assert len(stats._counted_blocks) == 5
+    # Recent blocks are still recognised; older ones are refused, not recounted
+    assert not stats.add(analyze_block({"number": 98, "hash": hex(98), "transactions": []}, []))
+    assert not stats.add(analyze_block({"number": 10, "hash": hex(10), "transactions": []}, []))
+    assert stats.add(analyze_block({"number": 97, "hash": "0x" + "ef" * 32, "transactions": []}, []))
+    assert stats.to_dict()["blocks_analyzed"] == 101
+
+
+@pytest.mark.asyncio
+async def test_backfill_reports_failed_blocks():
+    class FlakyBackfill(BlockMEVBackfill):
+        async def fetch_block(self, session, block_number):
+            if block_number in (12, 14):
+                raise RuntimeError("receipts unavailable")
+            return {"number": hex(block_number), "transactions": []}, []
+
+    stats = await FlakyBackfill("http://rpc.invalid", workers=1).run(10, 15)
+
+    assert stats.blocks_analyzed == 4
+    assert stats.failed_blocks == [12, 14]
+    assert stats.to_dict()["failed_blocks"] == [12, 14]
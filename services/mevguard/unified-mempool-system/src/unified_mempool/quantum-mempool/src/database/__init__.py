@@ -2,6 +2,7 @@
 Database package with enterprise connection management and models.
 """
 
+from .bulk_persistence import BulkPersistence, BulkPersistenceWriter
 from .models import Base
 from .models import QuantumSignature as QuantumSignatureRecord
 from .models import ThreatAlert as QuantumThreatAlert
@@ -14,4 +15,6 @@ __all__ = [
     "QuantumSignatureRecord",
     "QuantumThreatAlert",
     "SimpleDatabaseManager",
+    "BulkPersistence",
+    "BulkPersistenceWriter",
 ]
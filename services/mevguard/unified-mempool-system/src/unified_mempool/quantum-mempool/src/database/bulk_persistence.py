@@ -0,0 +1,438 @@
+"""
+Bulk persistence for quantum analysis results.
+
+Transaction records, quantum signatures and threat alerts are written with
+set-based statements on an async SQLAlchemy engine: one existence query and
+one multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` per chunk
+instead of a query and flush per transaction. Large windows on PostgreSQL
+are staged with ``COPY``. ``BulkPersistenceWriter`` batches signature and
+alert writes on a background task so detection never waits on the database.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+
+try:
+    from sqlalchemy import JSON, select
+    from sqlalchemy.dialects import postgresql, sqlite
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    SQLALCHEMY_AVAILABLE = False
+
+from ..utils.config import DatabaseConfig
+from .models import QuantumSignature, ThreatAlert, TransactionRecord
+
+# Rows per multi-row INSERT / IN (...) lookup; keeps bind parameters well
+# below the PostgreSQL and SQLite limits for the widest table
+CHUNK_SIZE = 500
+
+# New transaction windows at least this large are loaded with COPY on PostgreSQL
+COPY_THRESHOLD = 2000
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(connection_string: str) -> str:
+    """Map a sync connection string onto the matching async driver."""
+    scheme, separator, rest = connection_string.partition("://")
+    dialect, _, driver = scheme.partition("+")
+    if driver in ("asyncpg", "aiosqlite") or dialect not in ASYNC_DRIVERS:
+        return connection_string
+    return f"{ASYNC_DRIVERS[dialect]}{separator}{rest}"
+
+
+def _chunks(items: Sequence[Any], size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def with_defaults(table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill Python-side column defaults (ids, audit ids, JSON lists) so every row
+    of a multi-row statement carries the same columns.
+    """
+    for column in table.columns:
+        if column.key in row or column.default is None:
+            continue
+        default = column.default
+        if default.is_scalar:
+            row[column.key] = default.arg
+        elif default.is_callable:
+            row[column.key] = default.arg(None)
+    return row
+
+
+def transaction_row(
+    tx: Any, risk_score: float, created_by: str = "quantum_detector"
+) -> Dict[str, Any]:
+    """Build a ``transactions`` row from a mempool transaction object."""
+    now = datetime.utcnow()
+    return with_defaults(
+        TransactionRecord.__table__,
+        {
+            "txid": tx.txid,
+            "block_hash": getattr(tx, "block_hash", None),
+            "block_height": getattr(tx, "block_height", None),
+            "fee": max(Decimal(str(getattr(tx, "fee", 0) or 0)), Decimal(0)),
+            "size": max(int(getattr(tx, "size", 0) or 0), 1),
+            "vsize": getattr(tx, "vsize", None),
+            "weight": getattr(tx, "weight", None),
+            "locktime": int(getattr(tx, "locktime", 0) or 0),
+            "inputs": list(getattr(tx, "inputs", None) or []),
+            "outputs": list(getattr(tx, "outputs", None) or []),
+            "is_legacy": bool(getattr(tx, "is_legacy", False)),
+            "risk_score": min(max(risk_score, 0.0), 1.0),
+            "network": getattr(tx, "network", "bitcoin"),
+            "seen_at": getattr(tx, "timestamp", None) or now,
+            "created_at": now,
+            "updated_at": now,
+            "compliance_tags": ["quantum_analysis"],
+            "created_by": created_by,
+            "updated_by": created_by,
+        },
+    )
+
+
+@dataclass
+class SignatureWrite:
+    """A quantum signature and the transactions it was computed over."""
+
+    signature_row: Dict[str, Any]
+    transaction_rows: List[Dict[str, Any]]
+
+
+@dataclass
+class AlertWrite:
+    """A threat alert for a signature persisted in the same or an earlier batch."""
+
+    alert_row: Dict[str, Any]
+    analysis_id: str
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one bulk write."""
+
+    transactions_resolved: int = 0
+    signatures_written: int = 0
+    alerts_written: int = 0
+    alerts_skipped: List[str] = field(default_factory=list)
+
+
+class BulkPersistence:
+    """
+    Set-based writer for the quantum analysis tables on an async engine.
+
+    Supports PostgreSQL (asyncpg) and SQLite (aiosqlite); both provide
+    ``ON CONFLICT DO NOTHING`` and ``RETURNING``.
+    """
+
+    def __init__(
+        self,
+        config: DatabaseConfig,
+        engine=None,
+        copy_threshold: int = COPY_THRESHOLD,
+    ):
+        if not SQLALCHEMY_AVAILABLE:
+            raise RuntimeError("SQLAlchemy asyncio support is not available")
+
+        self.config = config
+        self.logger = structlog.get_logger(__name__)
+        self.copy_threshold = copy_threshold
+
+        if engine is None:
+            url = to_async_url(config.connection_string)
+            options = {"pool_pre_ping": config.pool_pre_ping}
+            if not url.startswith("sqlite"):
+                options.update(
+                    pool_size=config.pool_size,
+                    max_overflow=config.max_overflow,
+                    pool_timeout=config.pool_timeout,
+                    pool_recycle=config.pool_recycle,
+                )
+            engine = create_async_engine(url, **options)
+
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        if self.dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"Bulk persistence does not support {self.dialect}")
+
+        self.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    def _insert(self, table):
+        dialect = postgresql if self.dialect == "postgresql" else sqlite
+        return dialect.insert(table)
+
+    async def _lookup(self, session: "AsyncSession", key_column, value_column, keys) -> Dict[Any, Any]:
+        found = {}
+        for chunk in _chunks(list(keys)):
+            result = await session.execute(
+                select(key_column, value_column).where(key_column.in_(chunk))
+            )
+            found.update(result.all())
+        return found
+
+    async def _insert_returning(self, session: "AsyncSession", table, rows, key: str) -> Dict[Any, Any]:
+        """Multi-row insert that skips conflicts and returns key -> id for new rows."""
+        inserted = {}
+        for chunk in _chunks(rows):
+            statement = (
+                self._insert(table)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[key])
+                .returning(table.c[key], table.c.id)
+            )
+            result = await session.execute(statement)
+            inserted.update(result.all())
+        return inserted
+
+    async def _copy_transactions(self, session: "AsyncSession", rows: List[Dict[str, Any]]):
+        """Stage rows with COPY and merge them with a single INSERT ... SELECT."""
+        table = TransactionRecord.__table__
+        columns = list(rows[0])
+        json_columns = {c.key for c in table.columns if isinstance(c.type, JSON)}
+        records = [
+            tuple(json.dumps(row[c]) if c in json_columns else row[c] for c in columns)
+            for row in rows
+        ]
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        column_list = ", ".join(columns)
+
+        await driver.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS transactions_stage "
+            "(LIKE transactions INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        await driver.copy_records_to_table(
+            "transactions_stage", records=records, columns=columns
+        )
+        await driver.execute(
+            f"INSERT INTO transactions ({column_list}) "
+            f"SELECT {column_list} FROM transactions_stage "
+            "ON CONFLICT (txid) DO NOTHING"
+        )
+
+    async def upsert_transactions(
+        self, session: "AsyncSession", rows: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Ensure a record exists for every row and return txid -> id.
+
+        Existing records are found with one lookup per chunk; the rest are
+        inserted in bulk. Rows that lose a race to a concurrent writer are
+        resolved with a final lookup.
+        """
+        table = TransactionRecord.__table__
+        unique_rows = list({row["txid"]: row for row in rows}.values())
+        ids = await self._lookup(session, table.c.txid, table.c.id, [r["txid"] for r in unique_rows])
+
+        missing = [row for row in unique_rows if row["txid"] not in ids]
+        if missing:
+            if self.dialect == "postgresql" and len(missing) >= self.copy_threshold:
+                await self._copy_transactions(session, missing)
+            else:
+                ids.update(await self._insert_returning(session, table, missing, "txid"))
+
+            unresolved = [row["txid"] for row in missing if row["txid"] not in ids]
+            if unresolved:
+                ids.update(await self._lookup(session, table.c.txid, table.c.id, unresolved))
+
+        return ids
+
+    async def write_batch(
+        self,
+        signatures: List[SignatureWrite],
+        alerts: Optional[List[AlertWrite]] = None,
+    ) -> BatchResult:
+        """Persist a batch of signatures and alerts in one transaction."""
+        result = BatchResult()
+        alerts = alerts or []
+
+        async with self.session_factory() as session:
+            async with session.begin():
+                transaction_rows = [row for write in signatures for row in write.transaction_rows]
+                tx_ids = await self.upsert_transactions(session, transaction_rows)
+                result.transactions_resolved = len(tx_ids)
+
+                signature_table = QuantumSignature.__table__
+                signature_rows = []
+                for write in signatures:
+                    if not write.transaction_rows:
+                        continue
+                    row = dict(write.signature_row)
+                    row["transaction_id"] = tx_ids[write.transaction_rows[0]["txid"]]
+                    signature_rows.append(row)
+                if signature_rows:
+                    written = await self._insert_returning(
+                        session, signature_table, signature_rows, "analysis_id"
+                    )
+                    result.signatures_written = len(written)
+
+                if alerts:
+                    lookup = await session.execute(
+                        select(
+                            signature_table.c.analysis_id,
+                            signature_table.c.id,
+                            signature_table.c.transaction_id,
+                        ).where(
+                            signature_table.c.analysis_id.in_(list({a.analysis_id for a in alerts}))
+                        )
+                    )
+                    signature_refs = {
+                        analysis_id: (signature_id, transaction_id)
+                        for analysis_id, signature_id, transaction_id in lookup.all()
+                    }
+
+                    alert_rows = []
+                    for write in alerts:
+                        ref = signature_refs.get(write.analysis_id)
+                        if ref is None:
+                            result.alerts_skipped.append(write.alert_row["alert_id"])
+                            continue
+                        row = dict(write.alert_row)
+                        row["signature_id"], row["transaction_id"] = ref
+                        alert_rows.append(row)
+                    if alert_rows:
+                        written = await self._insert_returning(
+                            session, ThreatAlert.__table__, alert_rows, "alert_id"
+                        )
+                        result.alerts_written = len(written)
+
+        return result
+
+    async def close(self):
+        await self.engine.dispose()
+
+
+class BulkPersistenceWriter:
+    """
+    Background writer that coalesces signature and alert writes into batches.
+
+    Submissions never block: when the queue is full the write is dropped and
+    counted, so a slow database degrades persistence rather than detection.
+    """
+
+    def __init__(
+        self,
+        persistence: BulkPersistence,
+        max_batch: int = 200,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+    ):
+        self.persistence = persistence
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.logger = structlog.get_logger(__name__)
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "batches_written": 0,
+            "batches_failed": 0,
+            "signatures_written": 0,
+            "alerts_written": 0,
+            "dropped": 0,
+        }
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _submit(self, item) -> bool:
+        self.start()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            self.logger.warning("Persistence queue full, dropping write")
+            return False
+
+    def submit_signature(self, write: SignatureWrite) -> bool:
+        return self._submit(write)
+
+    def submit_alert(self, write: AlertWrite) -> bool:
+        return self._submit(write)
+
+    async def flush(self):
+        """
+        Wait until everything submitted so far has been written.
+
+        Raises ``RuntimeError`` if the background task dies with writes still
+        queued, instead of waiting on a queue nothing drains.
+        """
+        if self._task is None:
+            return
+        joined = asyncio.ensure_future(self._queue.join())
+        await asyncio.wait({joined, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not joined.done():
+            joined.cancel()
+            error = None if self._task.cancelled() else self._task.exception()
+            raise RuntimeError("Bulk persistence writer stopped with writes pending") from error
+
+    async def stop(self):
+        """Flush pending writes and stop the background task."""
+        try:
+            await self.flush()
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                await asyncio.gather(self._task, return_exceptions=True)
+                self._task = None
+
+    async def _next_batch(self) -> List[Any]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                signatures = [item for item in batch if isinstance(item, SignatureWrite)]
+                alerts = [item for item in batch if isinstance(item, AlertWrite)]
+                result = await self.persistence.write_batch(signatures, alerts)
+
+                self.stats["batches_written"] += 1
+                self.stats["signatures_written"] += result.signatures_written
+                self.stats["alerts_written"] += result.alerts_written
+                if result.alerts_skipped:
+                    self.logger.warning(
+                        "Alerts skipped without a persisted signature",
+                        alert_ids=result.alerts_skipped,
+                    )
+            except Exception as e:
+                self.stats["batches_failed"] += 1
+                self.logger.error(
+                    "Bulk persistence batch failed", error=str(e), items=len(batch)
+                )
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
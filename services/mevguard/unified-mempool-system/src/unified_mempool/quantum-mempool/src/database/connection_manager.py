@@ -8,33 +8,33 @@ Enterprise database connection management with high availability and security.
 
 import asyncio  # noqa: E402
 import ssl  # noqa: E402
+import time  # noqa: E402
 from contextlib import asynccontextmanager  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
 from enum import Enum  # noqa: E402
 from typing import AsyncGenerator  # noqa: E402
-from typing import Any, AsyncContextManager, Dict, Optional
+from typing import Any, AsyncContextManager, Dict, Optional, Tuple
 
 from common.observability.logging import get_scorpius_logger  # noqa: E402
 
 try:
-    import aioredis  # noqa: E402
     from sqlalchemy import create_engine, event, text  # noqa: E402
     from sqlalchemy.engine import Engine  # noqa: E402
-    from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession  # noqa: E402
     from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
     from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
     from sqlalchemy.pool import QueuePool  # noqa: E402
 
     SQLALCHEMY_AVAILABLE = True
-    REDIS_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
-    REDIS_AVAILABLE = False
 
 try:
     import aioredis  # noqa: E402
 
     REDIS_AVAILABLE = True
-except ImportError:
+except (ImportError, TypeError):
+    # aioredis 2.x fails at import time on Python 3.11+ (duplicate TimeoutError base)
     REDIS_AVAILABLE = False
 
 import structlog  # noqa: E402
@@ -42,6 +42,7 @@ import structlog  # noqa: E402
 from ..enterprise.audit_logger import SecurityEventLogger  # noqa: E402
 from ..utils.config import DatabaseConfig, EnterpriseConfig  # noqa: E402
 from ..utils.metrics import MetricsCollector  # noqa: E402
+from .bulk_persistence import to_async_url  # noqa: E402
 
 
 class DatabaseType(Enum):
@@ -71,6 +72,95 @@ class ConnectionPoolConfig:
         self.pool_pre_ping = pool_pre_ping
 
 
+@dataclass
+class ReplicaHealth:
+    """Measured health of one engine, refreshed by the health check loop."""
+
+    latency_ms: Optional[float] = None
+    lag_seconds: Optional[float] = None
+    healthy: bool = True
+    consecutive_failures: int = 0
+    last_checked: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def record_success(
+        self, latency_ms: float, lag_seconds: Optional[float], smoothing: float
+    ):
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += smoothing * (latency_ms - self.latency_ms)
+        self.lag_seconds = lag_seconds
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.last_checked = time.time()
+        self.last_error = None
+
+    def record_failure(self, error: str, failure_threshold: int):
+        self.consecutive_failures += 1
+        self.healthy = self.consecutive_failures < failure_threshold
+        self.last_checked = time.time()
+        self.last_error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "latency_ms": self.latency_ms,
+            "lag_seconds": self.lag_seconds,
+            "consecutive_failures": self.consecutive_failures,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout wait times observed when sessions acquire a connection."""
+
+    checkouts: int = 0
+    checkout_failures: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def record(self, wait_ms: float):
+        self.checkouts += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def to_dict(self, pool) -> Dict[str, Any]:
+        stats = {
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "avg_checkout_wait_ms": (
+                self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            ),
+            "max_checkout_wait_ms": self.max_wait_ms,
+        }
+        # Only queue-style pools expose size/overflow counters
+        if hasattr(pool, "checkedout"):
+            stats.update(
+                {
+                    "pool_size": pool.size(),
+                    "in_use": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return stats
+
+
+# Seconds a PostgreSQL standby is behind; 0 when caught up or on a primary
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+PRIMARY = "primary"
+
+
 class DatabaseConnectionManager:
     """
     Enterprise-grade database connection manager with high availability,
@@ -83,6 +173,12 @@ class DatabaseConnectionManager:
     - Connection monitoring and health checks
     - Audit logging for all database operations
     - Support for read replicas and load balancing
+
+    Every engine is available both synchronously (``get_session``) and as an
+    ``AsyncEngine`` (``get_async_session``, asyncpg/aiosqlite). Read-only
+    sessions are routed to the replica with the best measured latency and
+    load whose replication lag is within ``max_replica_lag_seconds``, falling
+    back to the primary when none qualifies.
     """
 
     def __init__(self, config: DatabaseConfig):
@@ -95,10 +191,14 @@ class DatabaseConnectionManager:
         # Database engines
         self.primary_engine: Optional[Engine] = None
         self.read_replica_engines: Dict[str, Engine] = {}
+        self.primary_async_engine: Optional[AsyncEngine] = None
+        self.read_replica_async_engines: Dict[str, AsyncEngine] = {}
 
         # Session factories
         self.primary_session_factory: Optional[sessionmaker] = None
         self.read_session_factories: Dict[str, sessionmaker] = {}
+        self.primary_async_session_factory: Optional[async_sessionmaker] = None
+        self.read_async_session_factories: Dict[str, async_sessionmaker] = {}
 
         # Connection monitoring
         self.connection_stats = {
@@ -106,11 +206,22 @@ class DatabaseConnectionManager:
             "active_connections": 0,
             "failed_connections": 0,
             "avg_connection_time": 0.0,
+            "replica_reads": 0,
+            "replica_fallbacks": 0,
         }
+        self.engine_health: Dict[str, ReplicaHealth] = {}
+        self.pool_metrics: Dict[str, PoolMetrics] = {}
 
         # Health check configuration
         self.health_check_interval = getattr(config, "health_check_interval", 60)
         self.health_check_timeout = getattr(config, "health_check_timeout", 10)
+        self._health_check_task: Optional[asyncio.Task] = None
+
+        # Replica routing configuration
+        self.async_enabled = getattr(config, "async_enabled", True)
+        self.max_replica_lag_seconds = getattr(config, "max_replica_lag_seconds", 5.0)
+        self.replica_failure_threshold = getattr(config, "replica_failure_threshold", 2)
+        self.latency_smoothing = getattr(config, "latency_smoothing", 0.3)
 
     async def initialize_connections(self):
         """Initialize database connections with enterprise security."""
@@ -125,27 +236,50 @@ class DatabaseConnectionManager:
             await self._setup_connection_monitoring()
 
             # Start health check monitoring
-            asyncio.create_task(self._health_check_loop())
+            self._health_check_task = asyncio.create_task(self._health_check_loop())
 
             self.logger.info(
                 "Database connections initialized",
-                primary_db=getattr(
-                    self.config, "primary_database_url", "not_configured"
-                ),
+                primary_db=self._primary_url(),
                 read_replicas=len(self.read_replica_engines),
+                async_engines=self.primary_async_engine is not None,
             )
 
         except Exception as e:
             self.logger.error("Failed to initialize database connections", error=str(e))
             raise
 
+    def _primary_url(self) -> str:
+        return getattr(self.config, "primary_database_url", None) or getattr(
+            self.config, "connection_string", "sqlite:///quantum_monitor.db"
+        )
+
+    def _create_async_engine(self, url: str, **pool_options) -> Optional[AsyncEngine]:
+        """Create the async twin of an engine; None when no async driver applies."""
+        if not self.async_enabled:
+            return None
+
+        async_url = to_async_url(url)
+        if async_url == url and "+asyncpg" not in url and "+aiosqlite" not in url:
+            return None
+
+        try:
+            return create_async_engine(
+                async_url,
+                echo=getattr(self.config, "sql_echo", False),
+                connect_args=self._get_async_connection_args(async_url),
+                **pool_options,
+            )
+        except Exception as e:
+            # Missing driver: keep serving the sync path
+            self.logger.warning("Async engine unavailable", url=async_url.split("@")[-1], error=str(e))
+            return None
+
     async def _create_primary_connection(self):
         """Create primary database connection with enterprise security."""
         try:
             # Get connection URL (in production, this would be secured)
-            connection_url = getattr(
-                self.config, "primary_database_url", "sqlite:///quantum_monitor.db"
-            )
+            connection_url = self._primary_url()
 
             # Create connection pool configuration
             pool_config = ConnectionPoolConfig(
@@ -154,23 +288,26 @@ class DatabaseConnectionManager:
                 pool_timeout=getattr(self.config, "pool_timeout", 30),
                 pool_recycle=getattr(self.config, "pool_recycle", 3600),
             )
+            pool_options = {
+                "pool_size": pool_config.pool_size,
+                "max_overflow": pool_config.max_overflow,
+                "pool_timeout": pool_config.pool_timeout,
+                "pool_recycle": pool_config.pool_recycle,
+                "pool_pre_ping": pool_config.pool_pre_ping,
+            }
 
             # Create engine with enterprise features
             self.primary_engine = create_engine(
                 connection_url,
                 poolclass=QueuePool,
-                pool_size=pool_config.pool_size,
-                max_overflow=pool_config.max_overflow,
-                pool_timeout=pool_config.pool_timeout,
-                pool_recycle=pool_config.pool_recycle,
-                pool_pre_ping=pool_config.pool_pre_ping,
                 echo=getattr(self.config, "sql_echo", False),
                 echo_pool=getattr(self.config, "echo_pool", False),
                 connect_args=self._get_connection_args(),
+                **pool_options,
             )
 
             # Setup event listeners for monitoring
-            self._setup_engine_events(self.primary_engine, "primary")
+            self._setup_engine_events(self.primary_engine, PRIMARY)
 
             # Create session factory
             self.primary_session_factory = sessionmaker(
@@ -180,8 +317,17 @@ class DatabaseConnectionManager:
                 autocommit=False,
             )
 
+            self.primary_async_engine = self._create_async_engine(connection_url, **pool_options)
+            if self.primary_async_engine is not None:
+                self.primary_async_session_factory = async_sessionmaker(
+                    self.primary_async_engine, expire_on_commit=False, autoflush=True
+                )
+
+            self.engine_health[PRIMARY] = ReplicaHealth()
+            self.pool_metrics[PRIMARY] = PoolMetrics()
+
             # Test connection
-            await self._test_connection(self.primary_engine, "primary")
+            await self._test_connection(self.primary_engine, PRIMARY)
 
         except Exception as e:
             self.logger.error(
@@ -200,17 +346,21 @@ class DatabaseConnectionManager:
             replica_name = f"replica_{idx}"
 
             try:
+                pool_options = {
+                    "pool_size": getattr(self.config, "replica_pool_size", 10),
+                    "max_overflow": getattr(self.config, "replica_max_overflow", 15),
+                    "pool_timeout": getattr(self.config, "pool_timeout", 30),
+                    "pool_recycle": getattr(self.config, "pool_recycle", 3600),
+                    "pool_pre_ping": True,
+                }
+
                 # Create replica engine
                 replica_engine = create_engine(
                     replica_url,
                     poolclass=QueuePool,
-                    pool_size=getattr(self.config, "replica_pool_size", 10),
-                    max_overflow=getattr(self.config, "replica_max_overflow", 15),
-                    pool_timeout=getattr(self.config, "pool_timeout", 30),
-                    pool_recycle=getattr(self.config, "pool_recycle", 3600),
-                    pool_pre_ping=True,
                     echo=getattr(self.config, "sql_echo", False),
                     connect_args=self._get_connection_args(),
+                    **pool_options,
                 )
 
                 # Setup event listeners
@@ -224,6 +374,9 @@ class DatabaseConnectionManager:
                     autocommit=False,
                 )
 
+                self.engine_health[replica_name] = ReplicaHealth()
+                self.pool_metrics[replica_name] = PoolMetrics()
+
                 # Test connection
                 await self._test_connection(replica_engine, replica_name)
 
@@ -231,11 +384,20 @@ class DatabaseConnectionManager:
                 self.read_replica_engines[replica_name] = replica_engine
                 self.read_session_factories[replica_name] = replica_session_factory
 
+                replica_async_engine = self._create_async_engine(replica_url, **pool_options)
+                if replica_async_engine is not None:
+                    self.read_replica_async_engines[replica_name] = replica_async_engine
+                    self.read_async_session_factories[replica_name] = async_sessionmaker(
+                        replica_async_engine, expire_on_commit=False, autoflush=False
+                    )
+
                 self.logger.info(
                     f"Read replica {replica_name} initialized", url=replica_url
                 )
 
             except Exception as e:
+                self.engine_health.pop(replica_name, None)
+                self.pool_metrics.pop(replica_name, None)
                 self.logger.error(
                     f"Failed to create read replica {replica_name}", error=str(e)
                 )
@@ -281,6 +443,32 @@ class DatabaseConnectionManager:
 
         return connection_args
 
+    def _get_async_connection_args(self, async_url: str) -> Dict[str, Any]:
+        """Get asyncpg connection arguments (libpq-style keys do not apply)."""
+        if not async_url.startswith("postgresql+asyncpg"):
+            return {}
+
+        connection_args: Dict[str, Any] = {
+            "server_settings": {"application_name": "quantum_mempool_monitor"}
+        }
+
+        if getattr(self.config, "ssl_enabled", False):
+            ssl_context = ssl.create_default_context(
+                cafile=getattr(self.config, "ssl_ca_path", None)
+            )
+            cert_path = getattr(self.config, "ssl_cert_path", None)
+            if cert_path:
+                ssl_context.load_cert_chain(
+                    cert_path, getattr(self.config, "ssl_key_path", None)
+                )
+            connection_args["ssl"] = ssl_context
+
+        connection_timeout = getattr(self.config, "connection_timeout", None)
+        if connection_timeout:
+            connection_args["timeout"] = connection_timeout
+
+        return connection_args
+
     def _setup_engine_events(self, engine: Engine, engine_name: str):
         """Setup SQLAlchemy engine events for monitoring."""
 
@@ -308,17 +496,65 @@ class DatabaseConnectionManager:
             self.connection_stats["active_connections"] -= 1
             self.logger.debug("Detached database connection closed", engine=engine_name)
 
+
+    @staticmethod
+    def _probe_sync(engine: Engine, measure_lag: bool) -> Tuple[float, Optional[float]]:
+        """Round-trip ``SELECT 1`` (and replica lag) on a sync engine."""
+        with engine.connect() as connection:
+            started = time.perf_counter()
+            connection.execute(text("SELECT 1")).scalar()
+            latency_ms = (time.perf_counter() - started) * 1000
+            lag = None
+            if measure_lag:
+                lag = float(connection.execute(text(REPLICA_LAG_QUERY)).scalar() or 0)
+            return latency_ms, lag
+
+    @staticmethod
+    async def _probe_async(
+        engine: AsyncEngine, measure_lag: bool
+    ) -> Tuple[float, Optional[float]]:
+        """Round-trip ``SELECT 1`` (and replica lag) on an async engine."""
+        async with engine.connect() as connection:
+            started = time.perf_counter()
+            (await connection.execute(text("SELECT 1"))).scalar()
+            latency_ms = (time.perf_counter() - started) * 1000
+            lag = None
+            if measure_lag:
+                lag = float((await connection.execute(text(REPLICA_LAG_QUERY))).scalar() or 0)
+            return latency_ms, lag
+
+    async def _probe(self, engine_name: str) -> Tuple[float, Optional[float]]:
+        """Measure an engine without blocking the event loop."""
+        if engine_name == PRIMARY:
+            engine, async_engine = self.primary_engine, self.primary_async_engine
+        else:
+            engine = self.read_replica_engines.get(engine_name)
+            async_engine = self.read_replica_async_engines.get(engine_name)
+
+        measure_lag = engine_name != PRIMARY and engine.dialect.name == "postgresql"
+        probe = (
+            self._probe_async(async_engine, measure_lag)
+            if async_engine is not None
+            else asyncio.to_thread(self._probe_sync, engine, measure_lag)
+        )
+        return await asyncio.wait_for(probe, self.health_check_timeout)
+
     async def _test_connection(self, engine: Engine, engine_name: str):
         """Test database connection and log results."""
         try:
-            with engine.connect() as connection:
-                result = connection.execute("SELECT 1")
-                if result.fetchone()[0] == 1:
-                    self.logger.info(
-                        "Database connection test successful", engine=engine_name
-                    )
-                else:
-                    raise Exception("Connection test returned unexpected result")
+            latency_ms, lag = await asyncio.to_thread(
+                self._probe_sync,
+                engine,
+                engine_name != PRIMARY and engine.dialect.name == "postgresql",
+            )
+            self.engine_health[engine_name].record_success(
+                latency_ms, lag, self.latency_smoothing
+            )
+            self.logger.info(
+                "Database connection test successful",
+                engine=engine_name,
+                latency_ms=round(latency_ms, 2),
+            )
         except Exception as e:
             self.logger.error(
                 "Database connection test failed", engine=engine_name, error=str(e)
@@ -335,6 +571,8 @@ class DatabaseConnectionManager:
             try:
                 await asyncio.sleep(self.health_check_interval)
                 await self._perform_health_checks()
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error("Health check loop error", error=str(e))
                 await asyncio.sleep(60)  # Wait before retrying
@@ -342,58 +580,119 @@ class DatabaseConnectionManager:
     async def _perform_health_checks(self):
         """Perform health checks on all database connections."""
         try:
-            # Check primary database
-            await self._health_check_engine(self.primary_engine, "primary")
-
-            # Check read replicas
-            for replica_name, replica_engine in self.read_replica_engines.items():
-                await self._health_check_engine(replica_engine, replica_name)
+            names = [PRIMARY, *self.read_replica_engines]
+            await asyncio.gather(*(self._health_check_engine(name) for name in names))
 
         except Exception as e:
             self.logger.error("Health check error", error=str(e))
 
-    async def _health_check_engine(self, engine: Engine, engine_name: str):
-        """Perform health check on a specific engine."""
+    async def _health_check_engine(self, engine_name: str):
+        """Measure latency and replication lag of one engine."""
+        health = self.engine_health.setdefault(engine_name, ReplicaHealth())
         try:
-            with engine.connect() as connection:
-                connection.execute("SELECT 1")
-                self.logger.debug("Health check passed", engine=engine_name)
+            latency_ms, lag = await self._probe(engine_name)
+            health.record_success(latency_ms, lag, self.latency_smoothing)
+            if lag is not None and lag > self.max_replica_lag_seconds:
+                self.logger.warning(
+                    "Read replica lagging, routing reads elsewhere",
+                    engine=engine_name,
+                    lag_seconds=lag,
+                )
+            self.logger.debug(
+                "Health check passed", engine=engine_name, latency_ms=health.latency_ms
+            )
         except Exception as e:
+            health.record_failure(str(e) or type(e).__name__, self.replica_failure_threshold)
             self.logger.error("Health check failed", engine=engine_name, error=str(e))
-            # Could trigger alerts or failover logic here
+
+    def _select_read_replica(self) -> Optional[str]:
+        """
+        Pick the replica with the lowest load-weighted latency among those that
+        are healthy and within the lag budget; None means use the primary.
+        """
+        best_name, best_score = None, None
+        for replica_name, engine in self.read_replica_engines.items():
+            health = self.engine_health.get(replica_name)
+            if health is None or not health.healthy:
+                continue
+            if health.lag_seconds is not None and health.lag_seconds > self.max_replica_lag_seconds:
+                continue
+
+            pools = [engine.pool]
+            async_engine = self.read_replica_async_engines.get(replica_name)
+            if async_engine is not None:
+                pools.append(async_engine.pool)
+            # NullPool/StaticPool keep no counters; they add no load signal
+            pools = [p for p in pools if hasattr(p, "checkedout")]
+            capacity = sum(p.size() + max(getattr(p, "_max_overflow", 0), 0) for p in pools)
+            in_use = sum(p.checkedout() for p in pools)
+            load = in_use / capacity if capacity > 0 else 0.0
+
+            score = (health.latency_ms or 1.0) * (1.0 + load)
+            if best_score is None or score < best_score:
+                best_name, best_score = replica_name, score
+
+        return best_name
+
+    def _route(self, read_only: bool) -> str:
+        """Name of the engine a session should use."""
+        if read_only and self.read_replica_engines:
+            replica_name = self._select_read_replica()
+            if replica_name:
+                self.connection_stats["replica_reads"] += 1
+                return replica_name
+            self.connection_stats["replica_fallbacks"] += 1
+            self.logger.debug("No replica within health and lag limits, using primary")
+        return PRIMARY
+
+    def _record_checkout(self, engine_name: str, started: float):
+        self.pool_metrics.setdefault(engine_name, PoolMetrics()).record(
+            (time.perf_counter() - started) * 1000
+        )
+
+    def _record_checkout_failure(self, engine_name: str):
+        self.pool_metrics.setdefault(engine_name, PoolMetrics()).checkout_failures += 1
+        self.connection_stats["failed_connections"] += 1
 
     @asynccontextmanager
     async def get_session(
         self, read_only: bool = False
     ) -> AsyncGenerator[Session, None]:
         """
-        Get a database session with automatic cleanup.
+        Get a synchronous database session with automatic cleanup.
+
+        Queries on this session block the event loop; coroutines should prefer
+        ``get_async_session``.
 
         Args:
-            read_only: If True, use read replica if available
+            read_only: If True, use the best read replica if one qualifies
 
         Yields:
             Database session
         """
         session = None
-        session_factory = None
+        engine_name = self._route(read_only)
 
         try:
-            if read_only and self.read_session_factories:
-                # Use read replica for read-only operations
-                replica_name = self._select_read_replica()
-                session_factory = self.read_session_factories[replica_name]
-                self.logger.debug("Using read replica", replica=replica_name)
-            else:
-                # Use primary database
+            if engine_name == PRIMARY:
                 session_factory = self.primary_session_factory
-                self.logger.debug("Using primary database")
+            else:
+                session_factory = self.read_session_factories[engine_name]
+            self.logger.debug("Using database", engine=engine_name)
 
             if not session_factory:
                 raise Exception("No database session factory available")
 
             session = session_factory()
 
+            started = time.perf_counter()
+            try:
+                session.connection()
+            except Exception:
+                self._record_checkout_failure(engine_name)
+                raise
+            self._record_checkout(engine_name, started)
+
             # Setup session-level auditing
             await self._setup_session_auditing(session)
 
@@ -412,70 +711,147 @@ class DatabaseConnectionManager:
             if session:
                 session.close()
 
-    def _select_read_replica(self) -> str:
-        """Select a read replica using load balancing strategy."""
-        if not self.read_replica_engines:
-            return None
+    def get_sync_session(self, read_only: bool = False) -> Session:
+        """Get an unmanaged synchronous session, e.g. for use in a worker thread."""
+        engine_name = self._route(read_only)
+        if engine_name == PRIMARY:
+            if not self.primary_session_factory:
+                raise Exception("No database session factory available")
+            return self.primary_session_factory()
+        return self.read_session_factories[engine_name]()
 
-        # Simple round-robin selection
-        # In production, this could use more sophisticated load balancing
-        replica_names = list(self.read_replica_engines.keys())
-        return replica_names[
-            self.connection_stats["total_connections"] % len(replica_names)
-        ]
+    @asynccontextmanager
+    async def get_async_session(
+        self, read_only: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get an ``AsyncSession`` with automatic commit/rollback.
+
+        Args:
+            read_only: If True, use the best read replica if one qualifies
+
+        Yields:
+            Async database session
+        """
+        engine_name = self._route(read_only)
+        if engine_name == PRIMARY:
+            session_factory = self.primary_async_session_factory
+        else:
+            session_factory = self.read_async_session_factories.get(
+                engine_name, self.primary_async_session_factory
+            )
+            if engine_name not in self.read_async_session_factories:
+                engine_name = PRIMARY
+
+        if not session_factory:
+            raise RuntimeError("Async database engine not initialized")
+
+        async with session_factory() as session:
+            started = time.perf_counter()
+            try:
+                await session.connection()
+            except Exception:
+                self._record_checkout_failure(engine_name)
+                raise
+            self._record_checkout(engine_name, started)
+
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                self.logger.error("Database session error", error=str(e))
+                raise
 
     async def _setup_session_auditing(self, session: Session):
         """Setup auditing for database session."""
         # Add session-level audit logging
         # This would integrate with the enterprise audit system
 
+    def _pool_status(self, engine_name: str, engine, async_engine) -> Dict[str, Any]:
+        metrics = self.pool_metrics.get(engine_name, PoolMetrics())
+        status = metrics.to_dict(engine.pool)
+        if async_engine is not None and hasattr(async_engine.pool, "checkedout"):
+            async_pool = async_engine.pool
+            status["async_pool"] = {
+                "pool_size": async_pool.size(),
+                "in_use": async_pool.checkedout(),
+                "idle": async_pool.checkedin(),
+                "overflow": max(async_pool.overflow(), 0),
+            }
+        return status
+
     async def get_connection_statistics(self) -> Dict[str, Any]:
-        """Get current connection statistics."""
+        """Get current connection, pool and replica statistics."""
         primary_pool_status = {}
         if self.primary_engine:
-            pool = self.primary_engine.pool
-            primary_pool_status = {
-                "pool_size": pool.size(),
-                "checked_out_connections": pool.checkedout(),
-                "overflow_connections": pool.overflow(),
-                "total_pool_connections": pool.size() + pool.overflow(),
-            }
+            primary_pool_status = self._pool_status(
+                PRIMARY, self.primary_engine, self.primary_async_engine
+            )
 
-        replica_pool_status = {}
-        for replica_name, replica_engine in self.read_replica_engines.items():
-            pool = replica_engine.pool
-            replica_pool_status[replica_name] = {
-                "pool_size": pool.size(),
-                "checked_out_connections": pool.checkedout(),
-                "overflow_connections": pool.overflow(),
-                "total_pool_connections": pool.size() + pool.overflow(),
-            }
+        replica_pool_status = {
+            replica_name: self._pool_status(
+                replica_name,
+                replica_engine,
+                self.read_replica_async_engines.get(replica_name),
+            )
+            for replica_name, replica_engine in self.read_replica_engines.items()
+        }
+
+        primary_health = self.engine_health.get(PRIMARY)
+        replica_health = {
+            name: self.engine_health[name].to_dict()
+            for name in self.read_replica_engines
+            if name in self.engine_health
+        }
+        if primary_health is not None and not primary_health.healthy:
+            health_status = "unhealthy"
+        elif any(not h["healthy"] for h in replica_health.values()):
+            health_status = "degraded"
+        else:
+            health_status = "healthy"
 
         return {
             "connection_stats": self.connection_stats,
             "primary_pool": primary_pool_status,
             "replica_pools": replica_pool_status,
-            "health_status": "healthy",  # This would be calculated based on health checks
+            "primary_health": primary_health.to_dict() if primary_health else None,
+            "replica_health": replica_health,
+            "preferred_replica": self._select_read_replica(),
+            "health_status": health_status,
         }
 
     async def close_all_connections(self):
         """Close all database connections and cleanup resources."""
         try:
+            if self._health_check_task is not None:
+                self._health_check_task.cancel()
+                self._health_check_task = None
+
             # Close primary engine
             if self.primary_engine:
                 self.primary_engine.dispose()
-                self.logger.info("Primary database connections closed")
+            if self.primary_async_engine:
+                await self.primary_async_engine.dispose()
+            self.logger.info("Primary database connections closed")
 
             # Close replica engines
             for replica_name, replica_engine in self.read_replica_engines.items():
                 replica_engine.dispose()
+                async_engine = self.read_replica_async_engines.get(replica_name)
+                if async_engine is not None:
+                    await async_engine.dispose()
                 self.logger.info(f"Read replica {replica_name} connections closed")
 
             # Clear references
             self.primary_engine = None
+            self.primary_async_engine = None
             self.read_replica_engines.clear()
+            self.read_replica_async_engines.clear()
             self.primary_session_factory = None
+            self.primary_async_session_factory = None
             self.read_session_factories.clear()
+            self.read_async_session_factories.clear()
 
             self.logger.info("All database connections closed successfully")
 
@@ -489,17 +865,23 @@ class DatabaseConnectionManager:
             raise Exception("Primary database engine not initialized")
         return self.primary_engine
 
+    def get_primary_async_engine(self) -> Optional[AsyncEngine]:
+        """Get the primary async engine, if an async driver is available."""
+        return self.primary_async_engine
+
     def get_replica_engine(self, replica_name: str = None) -> Engine:
         """Get a read replica engine."""
-        if not self.read_replica_engines:
-            # Fallback to primary if no replicas available
-            return self.get_primary_engine()
-
         if replica_name and replica_name in self.read_replica_engines:
             return self.read_replica_engines[replica_name]
 
-        # Return first available replica
-        return next(iter(self.read_replica_engines.values()))
+        # Best measured replica, else the primary
+        selected = self._select_read_replica()
+        if selected is None:
+            return self.get_primary_engine()
+        return self.read_replica_engines[selected]
+
+
+class MultiDatabaseConnectionManager:
 
     """
     Enterprise database connection manager with support for multiple
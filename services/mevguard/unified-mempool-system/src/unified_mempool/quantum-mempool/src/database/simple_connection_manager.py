@@ -90,8 +90,13 @@ class SimpleDatabaseManager:
         finally:
             session.close()
 
-    def get_sync_session(self) -> Session:
-        """Get synchronous database session."""
+    def get_sync_session(self, read_only: bool = False) -> Session:
+        """
+        Get synchronous database session.
+
+        ``read_only`` is accepted for parity with ``DatabaseConnectionManager``;
+        this manager has a single engine.
+        """
         if not SQLALCHEMY_AVAILABLE or not self.session_factory:
             raise RuntimeError("SQLAlchemy not available or not initialized")
 
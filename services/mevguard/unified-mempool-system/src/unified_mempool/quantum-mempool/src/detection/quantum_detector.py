@@ -7,10 +7,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "core-engine
 Enterprise quantum attack detection with advanced machine learning algorithms.
 """
 
+import asyncio  # noqa: E402
 import uuid  # noqa: E402
 from dataclasses import dataclass  # noqa: E402
 from datetime import datetime  # noqa: E402
-from typing import Any, Dict, List, Optional  # noqa: E402
+from typing import Any, Callable, Dict, List, Optional, TypeVar  # noqa: E402
 
 import numpy as np  # noqa: E402
 
@@ -26,8 +27,13 @@ try:
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
 
+from ..database.bulk_persistence import AlertWrite  # noqa: E402
+from ..database.bulk_persistence import BulkPersistence  # noqa: E402
+from ..database.bulk_persistence import BulkPersistenceWriter  # noqa: E402
+from ..database.bulk_persistence import SignatureWrite  # noqa: E402
+from ..database.bulk_persistence import transaction_row  # noqa: E402
+from ..database.bulk_persistence import with_defaults  # noqa: E402
 from ..database.models import IncidentReport  # noqa: E402
-from ..database.models import TransactionRecord  # noqa: E402
 from ..database.models import QuantumSignature as QuantumSignatureRecord  # noqa: E402
 from ..database.models import ThreatAlert as ThreatAlertModel  # noqa: E402
 from ..database.simple_connection_manager import SimpleDatabaseManager  # noqa: E402
@@ -35,6 +41,8 @@ from ..enterprise.audit_logger import SecurityEventLogger  # noqa: E402
 from ..utils.config import DetectionConfig  # noqa: E402
 from ..utils.metrics import MetricsCollector  # noqa: E402
 
+T = TypeVar("T")
+
 
 @dataclass
 class QuantumSignature:
@@ -86,9 +94,13 @@ class EnterpriseQuantumDetector:
         self,
         config: DetectionConfig,
         db_manager: Optional["SimpleDatabaseManager"] = None,
+        persistence_writer: Optional[BulkPersistenceWriter] = None,
     ):
         self.config = config
         self.db_manager = db_manager
+        self.persistence_writer = persistence_writer
+        # Set when the detector built the writer's engine and must dispose of it
+        self._owned_persistence: Optional[BulkPersistence] = None
 
         # Initialize logger
         if STRUCTLOG_AVAILABLE:
@@ -1040,83 +1052,65 @@ class EnterpriseQuantumDetector:
             self.logger.error("Quantum threat alert generation error", error=str(e))
             raise
 
+    def _get_persistence_writer(self) -> Optional[BulkPersistenceWriter]:
+        """Create the background bulk writer on first use."""
+        if self.persistence_writer is None and self.db_manager and SQLALCHEMY_AVAILABLE:
+            try:
+                # Share the manager's async pool when it has one
+                shared_engine = getattr(self.db_manager, "primary_async_engine", None)
+                persistence = BulkPersistence(self.db_manager.config, engine=shared_engine)
+                self.persistence_writer = BulkPersistenceWriter(persistence)
+                if shared_engine is None:
+                    self._owned_persistence = persistence
+            except Exception as e:
+                self.logger.error("Bulk persistence unavailable", error=str(e))
+                self.db_manager = None
+        return self.persistence_writer
+
     async def _save_quantum_signature_to_db(
         self, signature: QuantumSignature, transactions: List[Any]
     ) -> None:
-        """Save quantum signature analysis results to database."""
-        if not self.db_manager or not SQLALCHEMY_AVAILABLE:
+        """Queue quantum signature analysis results for batched persistence."""
+        writer = self._get_persistence_writer()
+        if not writer:
             self.logger.warning("Database not available for signature persistence")
             return
 
-        try:
-            async with self.db_manager.get_session() as session:
-                # First, ensure we have transaction records
-                transaction_records = []
-                for tx in transactions:
-                    # Check if transaction already exists
-                    existing_tx = (
-                        session.query(TransactionRecord).filter_by(txid=tx.txid).first()
-                    )
-                    if not existing_tx:
-                        # Create new transaction record
-                        tx_record = TransactionRecord(
-                            txid=tx.txid,
-                            block_hash=getattr(tx, "block_hash", None),
-                            block_height=getattr(tx, "block_height", None),
-                            from_address=getattr(tx, "from_address", ""),
-                            to_address=getattr(tx, "to_address", ""),
-                            amount=float(getattr(tx, "amount", 0)),
-                            fee=float(getattr(tx, "fee", 0)),
-                            gas_limit=getattr(tx, "gas_limit", None),
-                            gas_price=(
-                                float(getattr(tx, "gas_price", 0))
-                                if hasattr(tx, "gas_price")
-                                else None
-                            ),
-                            status="pending",
-                            risk_score=signature.confidence_score,
-                            compliance_tags=["quantum_analysis"],
-                            created_by="quantum_detector",
-                        )
-                        session.add(tx_record)
-                        session.flush()  # Get the ID
-                        transaction_records.append(tx_record)
-                    else:
-                        transaction_records.append(existing_tx)
-
-                # Create quantum signature record
-                signature_record = QuantumSignatureRecord(
-                    analysis_id=signature.analysis_id,
-                    transaction_id=(
-                        transaction_records[0].id if transaction_records else None
-                    ),
-                    temporal_clustering=signature.temporal_clustering,
-                    fee_uniformity=signature.fee_uniformity,
-                    address_age_correlation=signature.address_age_correlation,
-                    geometric_pattern_score=signature.geometric_pattern_score,
-                    entropy_analysis=signature.entropy_analysis,
-                    statistical_anomaly_score=signature.statistical_anomaly_score,
-                    confidence_score=signature.confidence_score,
-                    threat_level=signature.threat_level,
-                    detection_timestamp=signature.timestamp,
-                    algorithm_version=(
-                        self.config.algorithm_version
-                        if hasattr(self.config, "algorithm_version")
-                        else "1.0"
-                    ),
-                    processing_time_ms=100,  # Would be calculated in real implementation
-                    validation_status="VALIDATED",
-                    compliance_tags=["quantum_signature"],
-                    created_by="quantum_detector",
-                )
+        if not transactions:
+            return
 
-                session.add(signature_record)
-                session.commit()
+        try:
+            signature_row = with_defaults(
+                QuantumSignatureRecord.__table__,
+                {
+                    "analysis_id": signature.analysis_id,
+                    "temporal_clustering": signature.temporal_clustering,
+                    "fee_uniformity": signature.fee_uniformity,
+                    "address_age_correlation": signature.address_age_correlation,
+                    "geometric_pattern_score": signature.geometric_pattern_score,
+                    "entropy_analysis": signature.entropy_analysis,
+                    "statistical_anomaly_score": signature.statistical_anomaly_score,
+                    "confidence_score": signature.confidence_score,
+                    "threat_level": signature.threat_level,
+                    "algorithm_version": getattr(self.config, "algorithm_version", "1.0"),
+                    "processing_time_ms": 100,  # Would be calculated in real implementation
+                    "created_at": signature.timestamp,
+                    "updated_at": signature.timestamp,
+                    "compliance_tags": ["quantum_signature"],
+                    "created_by": "quantum_detector",
+                    "updated_by": "quantum_detector",
+                },
+            )
+            transaction_rows = [
+                transaction_row(tx, signature.confidence_score) for tx in transactions
+            ]
 
+            if writer.submit_signature(SignatureWrite(signature_row, transaction_rows)):
                 self.logger.info(
-                    "Quantum signature saved to database",
+                    "Quantum signature queued for persistence",
                     analysis_id=signature.analysis_id,
                     confidence_score=signature.confidence_score,
+                    transactions=len(transaction_rows),
                 )
 
         except Exception as e:
@@ -1130,41 +1124,39 @@ class EnterpriseQuantumDetector:
     async def _save_threat_alert_to_db(
         self, alert: QuantumThreatAlert, signature: QuantumSignature
     ) -> None:
-        """Save quantum threat alert to database."""
-        if not self.db_manager or not SQLALCHEMY_AVAILABLE:
+        """Queue quantum threat alert for batched persistence."""
+        writer = self._get_persistence_writer()
+        if not writer:
             self.logger.warning("Database not available for alert persistence")
             return
 
         try:
-            async with self.db_manager.get_session() as session:
-                # Create threat alert record
-                alert_record = ThreatAlertModel(
-                    alert_id=alert.alert_id,
-                    threat_type="QUANTUM_ATTACK",
-                    severity_level=alert.threat_level,
-                    confidence_score=alert.confidence_score,
-                    affected_addresses=alert.affected_addresses,
-                    attack_vector=alert.attack_vector,
-                    estimated_impact=alert.technical_details.get(
-                        "estimated_impact", "HIGH"
-                    ),
-                    mitigation_steps=alert.recommended_actions,
-                    detection_timestamp=datetime.utcnow(),
-                    status="ACTIVE",
-                    assigned_analyst=None,
-                    resolution_notes=None,
-                    false_positive_probability=signature.confidence_score,
-                    compliance_impact=alert.compliance_impact,
-                    technical_details=alert.technical_details,
-                    compliance_tags=["quantum_threat", "automated_detection"],
-                    created_by="quantum_detector",
-                )
-
-                session.add(alert_record)
-                session.commit()
+            now = datetime.utcnow()
+            alert_row = with_defaults(
+                ThreatAlertModel.__table__,
+                {
+                    "alert_id": alert.alert_id,
+                    "threat_level": alert.threat_level,
+                    "confidence_score": alert.confidence_score,
+                    "attack_vector": alert.attack_vector,
+                    "estimated_time_to_compromise": alert.estimated_time_to_compromise,
+                    "affected_addresses": alert.affected_addresses,
+                    "recommended_actions": alert.recommended_actions,
+                    "technical_details": alert.technical_details,
+                    "false_positive_probability": signature.confidence_score,
+                    "compliance_impact": alert.compliance_impact,
+                    "incident_classification": alert.incident_classification,
+                    "created_at": now,
+                    "updated_at": now,
+                    "compliance_tags": ["quantum_threat", "automated_detection"],
+                    "created_by": "quantum_detector",
+                    "updated_by": "quantum_detector",
+                },
+            )
 
+            if writer.submit_alert(AlertWrite(alert_row, signature.analysis_id)):
                 self.logger.info(
-                    "Threat alert saved to database",
+                    "Threat alert queued for persistence",
                     alert_id=alert.alert_id,
                     threat_level=alert.threat_level,
                 )
@@ -1176,6 +1168,48 @@ class EnterpriseQuantumDetector:
                 alert_id=alert.alert_id,
             )
 
+    async def flush_persistence(self) -> None:
+        """Wait until queued signatures and alerts have been written."""
+        if self.persistence_writer:
+            await self.persistence_writer.flush()
+
+    async def stop_monitoring(self) -> None:
+        """Write out queued signatures and alerts and stop the background writer."""
+        if self.persistence_writer:
+            await self.persistence_writer.stop()
+        if self._owned_persistence is not None:
+            await self._owned_persistence.close()
+            self._owned_persistence = None
+            # Rebuilt on next use if the detector is restarted
+            self.persistence_writer = None
+        self.logger.info("Quantum detector stopped")
+
+    async def _run_db(self, work: Callable[[Any], T], read_only: bool = False) -> T:
+        """
+        Run ORM work without blocking the event loop.
+
+        Uses the manager's ``AsyncSession`` when it has an async engine and
+        otherwise runs ``work`` on a sync session in a worker thread.
+        ``read_only`` work may be routed to a read replica.
+        """
+        if getattr(self.db_manager, "primary_async_session_factory", None):
+            async with self.db_manager.get_async_session(read_only=read_only) as session:
+                return await session.run_sync(work)
+
+        def run_in_thread() -> T:
+            session = self.db_manager.get_sync_session(read_only=read_only)
+            try:
+                result = work(session)
+                session.commit()
+                return result
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        return await asyncio.to_thread(run_in_thread)
+
     async def _create_incident_report(
         self, signature: QuantumSignature, alert: QuantumThreatAlert
     ) -> None:
@@ -1189,45 +1223,44 @@ class EnterpriseQuantumDetector:
             return
 
         try:
-            async with self.db_manager.get_session() as session:
-                incident = IncidentReport(
-                    incident_id=str(uuid.uuid4()),
-                    incident_type="QUANTUM_ATTACK_DETECTED",
-                    severity_level=signature.threat_level,
-                    affected_systems=["mempool_monitor", "blockchain_scanner"],
-                    initial_detection_time=signature.timestamp,
-                    incident_summary=f"Quantum attack detected with {signature.confidence_score:.2%} confidence",
-                    technical_details={
-                        "analysis_id": signature.analysis_id,
-                        "confidence_score": signature.confidence_score,
-                        "threat_level": signature.threat_level,
-                        "detection_algorithm": "enterprise_quantum_detector_v1",
-                        "signature_scores": {
-                            "temporal_clustering": signature.temporal_clustering,
-                            "fee_uniformity": signature.fee_uniformity,
-                            "address_age_correlation": signature.address_age_correlation,
-                            "geometric_pattern_score": signature.geometric_pattern_score,
-                            "entropy_analysis": signature.entropy_analysis,
-                            "statistical_anomaly_score": signature.statistical_anomaly_score,
-                        },
+            incident_id = str(uuid.uuid4())
+            incident = IncidentReport(
+                incident_id=incident_id,
+                incident_type="QUANTUM_ATTACK_DETECTED",
+                severity_level=signature.threat_level,
+                affected_systems=["mempool_monitor", "blockchain_scanner"],
+                initial_detection_time=signature.timestamp,
+                incident_summary=f"Quantum attack detected with {signature.confidence_score:.2%} confidence",
+                technical_details={
+                    "analysis_id": signature.analysis_id,
+                    "confidence_score": signature.confidence_score,
+                    "threat_level": signature.threat_level,
+                    "detection_algorithm": "enterprise_quantum_detector_v1",
+                    "signature_scores": {
+                        "temporal_clustering": signature.temporal_clustering,
+                        "fee_uniformity": signature.fee_uniformity,
+                        "address_age_correlation": signature.address_age_correlation,
+                        "geometric_pattern_score": signature.geometric_pattern_score,
+                        "entropy_analysis": signature.entropy_analysis,
+                        "statistical_anomaly_score": signature.statistical_anomaly_score,
                     },
-                    status="INVESTIGATING",
-                    assigned_analyst="auto_assigned",
-                    escalation_level="L2_SECURITY",
-                    business_impact="POTENTIAL_FINANCIAL_LOSS",
-                    compliance_requirements=["SOX", "GDPR", "PCI_DSS"],
-                    compliance_tags=["quantum_incident", "security_breach"],
-                    created_by="quantum_detector",
-                )
+                },
+                status="INVESTIGATING",
+                assigned_analyst="auto_assigned",
+                escalation_level="L2_SECURITY",
+                business_impact="POTENTIAL_FINANCIAL_LOSS",
+                compliance_requirements=["SOX", "GDPR", "PCI_DSS"],
+                compliance_tags=["quantum_incident", "security_breach"],
+                created_by="quantum_detector",
+            )
 
-                session.add(incident)
-                session.commit()
+            await self._run_db(lambda session: session.add(incident))
 
-                self.logger.info(
-                    "Incident report created",
-                    incident_id=incident.incident_id,
-                    confidence_score=signature.confidence_score,
-                )
+            self.logger.info(
+                "Incident report created",
+                incident_id=incident_id,
+                confidence_score=signature.confidence_score,
+            )
 
         except Exception as e:
             self.logger.error(
@@ -1245,30 +1278,33 @@ class EnterpriseQuantumDetector:
         if not self.db_manager or not SQLALCHEMY_AVAILABLE:
             return []
 
-        try:
-            async with self.db_manager.get_session() as session:
-                signatures = (
-                    session.query(QuantumSignatureRecord)
-                    .order_by(QuantumSignatureRecord.created_at.desc())
-                    .limit(limit)
-                    .all()
-                )
 
-                return [
-                    {
-                        "analysis_id": sig.analysis_id,
-                        "confidence_score": sig.confidence_score,
-                        "threat_level": sig.threat_level,
-                        "detection_timestamp": sig.detection_timestamp,
-                        "temporal_clustering": sig.temporal_clustering,
-                        "fee_uniformity": sig.fee_uniformity,
-                        "address_age_correlation": sig.address_age_correlation,
-                        "geometric_pattern_score": sig.geometric_pattern_score,
-                        "entropy_analysis": sig.entropy_analysis,
-                        "statistical_anomaly_score": sig.statistical_anomaly_score,
-                    }
-                    for sig in signatures
-                ]
+        def load(session) -> List[Dict[str, Any]]:
+            signatures = (
+                session.query(QuantumSignatureRecord)
+                .order_by(QuantumSignatureRecord.created_at.desc())
+                .limit(limit)
+                .all()
+            )
+
+            return [
+                {
+                    "analysis_id": sig.analysis_id,
+                    "confidence_score": sig.confidence_score,
+                    "threat_level": sig.threat_level,
+                    "detection_timestamp": sig.detection_timestamp,
+                    "temporal_clustering": sig.temporal_clustering,
+                    "fee_uniformity": sig.fee_uniformity,
+                    "address_age_correlation": sig.address_age_correlation,
+                    "geometric_pattern_score": sig.geometric_pattern_score,
+                    "entropy_analysis": sig.entropy_analysis,
+                    "statistical_anomaly_score": sig.statistical_anomaly_score,
+                }
+                for sig in signatures
+            ]
+
+        try:
+            return await self._run_db(load, read_only=True)
 
         except Exception as e:
             self.logger.error("Failed to retrieve historical signatures", error=str(e))
@@ -1279,41 +1315,44 @@ class EnterpriseQuantumDetector:
         if not self.db_manager or not SQLALCHEMY_AVAILABLE:
             return {}
 
-        try:
-            async with self.db_manager.get_session() as session:
-                # Get total analyses
-                total_analyses = session.query(QuantumSignatureRecord).count()
-
-                # Get high-confidence detections
-                high_confidence = (
-                    session.query(QuantumSignatureRecord)
-                    .filter(QuantumSignatureRecord.confidence_score > 0.7)
-                    .count()
-                )
 
-                # Get active alerts
-                active_alerts = (
-                    session.query(ThreatAlertModel)
-                    .filter(ThreatAlertModel.status == "ACTIVE")
-                    .count()
-                )
+        def load(session) -> Dict[str, Any]:
+            # Get total analyses
+            total_analyses = session.query(QuantumSignatureRecord).count()
 
-                # Get incidents
-                total_incidents = (
-                    session.query(IncidentReport)
-                    .filter(IncidentReport.incident_type == "QUANTUM_ATTACK_DETECTED")
-                    .count()
-                )
+            # Get high-confidence detections
+            high_confidence = (
+                session.query(QuantumSignatureRecord)
+                .filter(QuantumSignatureRecord.confidence_score > 0.7)
+                .count()
+            )
 
-                return {
-                    "total_analyses": total_analyses,
-                    "high_confidence_detections": high_confidence,
-                    "active_alerts": active_alerts,
-                    "total_incidents": total_incidents,
-                    "detection_rate": (
-                        high_confidence / total_analyses if total_analyses > 0 else 0
-                    ),
-                }
+            # Get active alerts
+            active_alerts = (
+                session.query(ThreatAlertModel)
+                .filter(ThreatAlertModel.status == "ACTIVE")
+                .count()
+            )
+
+            # Get incidents
+            total_incidents = (
+                session.query(IncidentReport)
+                .filter(IncidentReport.incident_type == "QUANTUM_ATTACK_DETECTED")
+                .count()
+            )
+
+            return {
+                "total_analyses": total_analyses,
+                "high_confidence_detections": high_confidence,
+                "active_alerts": active_alerts,
+                "total_incidents": total_incidents,
+                "detection_rate": (
+                    high_confidence / total_analyses if total_analyses > 0 else 0
+                ),
+            }
+
+        try:
+            return await self._run_db(load, read_only=True)
 
         except Exception as e:
             self.logger.error("Failed to retrieve threat statistics", error=str(e))
@@ -9,11 +9,12 @@ Enterprise audit logging with blockchain integration.
 
 import asyncio  # noqa: E402
 import hashlib  # noqa: E402
-import json  # noqa: E402
+import hmac  # noqa: E402
+import time  # noqa: E402
 import uuid  # noqa: E402
-from dataclasses import dataclass  # noqa: E402
+from dataclasses import asdict, dataclass  # noqa: E402
 from datetime import datetime  # noqa: E402
-from typing import Any, Dict, List, Optional  # noqa: E402
+from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
 
 from common.observability.logging import get_scorpius_logger  # noqa: E402
 
@@ -26,6 +27,11 @@ except ImportError:
 
     STRUCTLOG_AVAILABLE = False
 
+from .audit_segments import AuditSegmentLog  # noqa: E402
+from .audit_segments import batch_signing_payload  # noqa: E402
+from .audit_segments import canonical_json  # noqa: E402
+from .audit_segments import merkle_root  # noqa: E402
+
 
 @dataclass
 class SecurityEvent:
@@ -54,9 +60,14 @@ class SecurityEvent:
 class SecurityEventLogger:
     """Enterprise security event logging with compliance integration."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        audit_trail: Optional["BlockchainAuditLogger"] = None,
+    ):
         self.config = config
         self.enabled = config.get("enabled", True)
+        self.audit_trail = audit_trail
 
         # Initialize logger
         if STRUCTLOG_AVAILABLE:
@@ -200,7 +211,8 @@ class SecurityEventLogger:
 
     async def _store_immutable(self, event: SecurityEvent):
         """Store event in immutable blockchain audit trail."""
-        # Implementation would store to blockchain
+        if self.audit_trail is not None:
+            await self.audit_trail.log_critical_security_event(asdict(event))
 
     async def _send_to_siem(self, event: SecurityEvent):
         """Send event to SIEM system."""
@@ -212,9 +224,21 @@ class SecurityEventLogger:
 
 
 class BlockchainAuditLogger:
-    """Immutable audit logging using blockchain technology."""
+    """
+    Immutable audit logging using blockchain technology.
+
+    Events are appended to a hash-chained local segment log with group
+    commit: concurrent callers share one write and fsync. Committed entries
+    are sealed into a Merkle batch every ``merkle_batch_size`` events or
+    ``seal_interval`` seconds, so one signature and one blockchain anchor
+    cover the whole batch and each entry has an inclusion proof against the
+    anchored root.
+    """
 
     def __init__(self, config: Dict[str, Any]):
+        if not isinstance(config, dict):
+            # Accept the AuditConfig dataclass as well as plain dicts
+            config = dict(vars(config)) if config is not None else {}
         self.config = config
         self.enabled = config.get("blockchain_audit_trail", True)
 
@@ -228,10 +252,52 @@ class BlockchainAuditLogger:
         # Audit chain configuration
         self.chain_config = config.get("chain_config", {})
         self.encryption_enabled = config.get("encryption_enabled", True)
-
-        # Audit buffer
-        self.audit_buffer: List[Dict[str, Any]] = []
-        self.buffer_lock = asyncio.Lock()
+        signing_key = config.get("signing_key") or os.getenv("AUDIT_SIGNING_KEY")
+        self._signing_key = signing_key.encode("utf-8") if signing_key else None
+
+        # Segment log and batching configuration
+        self.segment_log = AuditSegmentLog(
+            config.get("audit_log_dir", "audit_logs"),
+            segment_max_bytes=config.get("segment_max_bytes", 64 * 1024 * 1024),
+            fsync=config.get("fsync", True),
+        )
+        self.merkle_batch_size = config.get("merkle_batch_size", 4096)
+        self.seal_interval = config.get("seal_interval", 5.0)
+        self.commit_interval = config.get("commit_interval", 0.005)
+
+        # Group commit state, owned by the writer task
+        self._pending: List[Tuple[str, str, Dict[str, Any], asyncio.Future]] = []
+        self._unsealed: List[Tuple[int, str]] = []
+        self._batch_started = time.monotonic()
+        self._wake: Optional[asyncio.Event] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Serializes writer start-up and shutdown across concurrent callers
+        self._lifecycle_lock = asyncio.Lock()
+
+        self.stats = {
+            "entries_committed": 0,
+            "group_commits": 0,
+            "batches_sealed": 0,
+            "seal_failures": 0,
+            "last_merkle_root": None,
+            "last_anchor_tx": None,
+        }
+
+    async def _ensure_writer(self):
+        """Open the segment log and start the writer task on first use."""
+        if self._writer_task is not None and not self._writer_task.done():
+            return
+        async with self._lifecycle_lock:
+            # Another caller may have started the writer while we waited
+            if self._writer_task is not None and not self._writer_task.done():
+                return
+            self._wake = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+            if self.segment_log._file is None:
+                self._unsealed = await asyncio.to_thread(self.segment_log.open)
+            self._batch_started = time.monotonic()
+            self._writer_task = asyncio.create_task(self._writer_loop())
 
     async def initialize_audit_trail(self, security_context: Any):
         """Initialize blockchain audit trail."""
@@ -263,39 +329,27 @@ class BlockchainAuditLogger:
             raise
 
     async def log_critical_security_event(self, event_data: Dict[str, Any]) -> str:
-        """Log critical security event to blockchain."""
+        """
+        Append a critical security event to the audit trail.
+
+        Returns once the entry is durably committed; Merkle sealing and
+        anchoring happen per batch in the background.
+        """
         try:
             if not self.enabled:
                 return str(uuid.uuid4())
 
-            # Create audit log entry
-            audit_entry = {
-                "audit_id": str(uuid.uuid4()),
-                "timestamp": datetime.utcnow(),
-                "event_data": event_data,
-                "hash": self._calculate_hash(event_data),
-                "signature": await self._sign_entry(event_data),
-            }
-
-            # Add to buffer
-            async with self.buffer_lock:
-                self.audit_buffer.append(audit_entry)
-
-            # Store to blockchain
-            blockchain_tx = await self._store_to_blockchain(audit_entry)
+            await self._ensure_writer()
 
-            if STRUCTLOG_AVAILABLE:
-                self.logger.info(
-                    "Critical security event logged to blockchain",
-                    audit_id=audit_entry["audit_id"],
-                    blockchain_tx=blockchain_tx,
-                )
-            else:
-                self.logger.info(
-                    f"Critical security event logged: {audit_entry['audit_id']}"
-                )
+            audit_id = str(uuid.uuid4())
+            committed = asyncio.get_running_loop().create_future()
+            self._pending.append(
+                (audit_id, datetime.utcnow().isoformat(), event_data, committed)
+            )
+            self._wake.set()
+            await committed
 
-            return audit_entry["audit_id"]
+            return audit_id
 
         except Exception as e:
             if STRUCTLOG_AVAILABLE:
@@ -304,10 +358,140 @@ class BlockchainAuditLogger:
                 self.logger.error(f"Blockchain audit logging failed: {e}")
             raise
 
+    async def log_security_event(self, event_data: Dict[str, Any]) -> str:
+        """Append a security event to the audit trail."""
+        return await self.log_critical_security_event(event_data)
+
+    async def _writer_loop(self):
+        """Group-commit pending entries and seal batches."""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.seal_interval)
+                except asyncio.TimeoutError:
+                    await self._seal_batch()
+                    continue
+                self._wake.clear()
+
+                # Let concurrent callers join this commit group
+                if self.commit_interval:
+                    await asyncio.sleep(self.commit_interval)
+                await self._commit_pending()
+
+                if len(self._unsealed) >= self.merkle_batch_size or (
+                    time.monotonic() - self._batch_started >= self.seal_interval
+                ):
+                    await self._seal_batch()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Audit writer error", error=str(e))
+
+    async def _commit_pending(self):
+        """Write every pending entry with a single write and fsync."""
+        async with self._write_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+
+            seq, last_hash = self.segment_log.next_seq, self.segment_log.last_hash
+            offset = self.segment_log.tell()
+            try:
+                lines, entry_hashes = [], []
+                for audit_id, timestamp, event_data, _ in pending:
+                    lines.append(self.segment_log.build_entry(audit_id, timestamp, event_data))
+                    entry_hashes.append(self.segment_log.last_hash)
+                await asyncio.to_thread(self.segment_log.append_entries, lines)
+            except Exception as e:
+                # Roll the chain back so the next commit links to what is on disk
+                self.segment_log.next_seq, self.segment_log.last_hash = seq, last_hash
+                await asyncio.to_thread(self.segment_log.truncate_to, offset)
+                for *_, committed in pending:
+                    if not committed.done():
+                        committed.set_exception(e)
+                return
+
+            if not self._unsealed:
+                self._batch_started = time.monotonic()
+            self._unsealed.extend(
+                (seq + i, entry_hash) for i, entry_hash in enumerate(entry_hashes)
+            )
+            self.stats["entries_committed"] += len(pending)
+            self.stats["group_commits"] += 1
+            for *_, committed in pending:
+                if not committed.done():
+                    committed.set_result(None)
+
+    async def _seal_batch(self):
+        """Seal committed entries under one Merkle root, signature and anchor."""
+        async with self._write_lock:
+            if not self._unsealed:
+                return
+            # Seal everything committed so the segment can rotate after it
+            sealing = self._unsealed
+            hashes = [entry_hash for _, entry_hash in sealing]
+
+            batch = {
+                "batch_id": str(uuid.uuid4()),
+                "first_seq": sealing[0][0],
+                "last_seq": sealing[-1][0],
+                "entry_count": len(sealing),
+                "merkle_root": merkle_root(hashes),
+                "last_entry_hash": hashes[-1],
+                "sealed_at": datetime.utcnow().isoformat(),
+            }
+            try:
+                batch["signature"] = await self._sign_entry(batch_signing_payload(batch))
+                batch["anchor_tx"] = await self._store_to_blockchain(batch)
+                await asyncio.to_thread(self.segment_log.append_batch, batch)
+            except Exception as e:
+                self.stats["seal_failures"] += 1
+                self.logger.error("Audit batch sealing failed", error=str(e))
+                return
+
+            self._unsealed = []
+            self._batch_started = time.monotonic()
+            self.stats["batches_sealed"] += 1
+            self.stats["last_merkle_root"] = batch["merkle_root"]
+            self.stats["last_anchor_tx"] = batch["anchor_tx"]
+
+            if STRUCTLOG_AVAILABLE:
+                self.logger.info(
+                    "Audit batch anchored to blockchain",
+                    batch_id=batch["batch_id"],
+                    entries=batch["entry_count"],
+                    merkle_root=batch["merkle_root"],
+                    blockchain_tx=batch["anchor_tx"],
+                )
+            else:
+                self.logger.info(f"Audit batch anchored: {batch['batch_id']}")
+
+    async def flush(self):
+        """Commit pending entries and seal everything committed so far."""
+        if self._writer_task is None:
+            return
+        await self._commit_pending()
+        await self._seal_batch()
+
+    async def close(self):
+        """Flush, stop the writer task and close the current segment."""
+        async with self._lifecycle_lock:
+            if self._writer_task is None:
+                return
+            await self.flush()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            self.segment_log.close()
+
     def _calculate_hash(self, data: Dict[str, Any]) -> str:
         """Calculate cryptographic hash of audit data."""
         # Serialize data deterministically
-        serialized = json.dumps(data, sort_keys=True, default=str)
+        serialized = canonical_json(data)
 
         # Calculate SHA-256 hash
         hash_obj = hashlib.sha256(serialized.encode("utf-8"))
@@ -316,26 +500,47 @@ class BlockchainAuditLogger:
     async def _sign_entry(self, data: Dict[str, Any]) -> str:
         """Sign audit entry with enterprise key."""
         # Implementation would use HSM or enterprise PKI
-        return "signature_placeholder"
+        if self._signing_key is None:
+            return "signature_placeholder"
+        return hmac.new(
+            self._signing_key, canonical_json(data).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+    def _verify_signature(self, data: Dict[str, Any], signature: str) -> bool:
+        """Check a batch signature produced by ``_sign_entry``."""
+        if self._signing_key is None:
+            return True
+        expected = hmac.new(
+            self._signing_key, canonical_json(data).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected, signature)
 
     async def _store_to_blockchain(self, audit_entry: Dict[str, Any]) -> str:
         """Store audit entry to blockchain."""
         # Implementation would submit to blockchain
         return f"tx_{uuid.uuid4().hex[:16]}"
 
+    async def get_inclusion_proof(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """Merkle inclusion proof of an entry against its anchored batch root."""
+        return await asyncio.to_thread(self.segment_log.find_inclusion_proof, audit_id)
+
     async def verify_audit_trail_integrity(
         self, time_range: Optional[tuple] = None
     ) -> Dict[str, Any]:
-        """Verify integrity of blockchain audit trail."""
+        """
+        Verify the audit trail by streaming its segments from disk.
+
+        Checks the hash chain, each batch's Merkle root and signature for the
+        segments overlapping ``time_range`` (a ``(start, end)`` datetime pair).
+        """
         try:
-            # Implementation would verify blockchain integrity
-            return {
-                "integrity_verified": True,
-                "verification_timestamp": datetime.utcnow(),
-                "total_entries": len(self.audit_buffer),
-                "hash_mismatches": 0,
-                "signature_failures": 0,
-            }
+            start, end = time_range if time_range else (None, None)
+            # Readers skip a partially written tail, so no lock is needed
+            report = await asyncio.to_thread(
+                self.segment_log.verify, start, end, self._verify_signature
+            )
+            report["verification_timestamp"] = datetime.utcnow()
+            return report
 
         except Exception as e:
             if STRUCTLOG_AVAILABLE:
@@ -0,0 +1,376 @@
+"""
+Append-only, hash-chained audit log segments with Merkle batch sealing.
+
+Each segment is a JSON-lines file. The first line is a segment header, followed
+by entry records and batch records:
+
+- entry: ``entry_hash = sha256(prev_hash + body)`` where ``body`` is the
+  canonical JSON of the entry, stored verbatim. Entries form one chain across
+  all segments.
+- batch: seals every entry since the previous batch with the Merkle root of
+  their entry hashes. One signature and one anchor cover the whole batch, and
+  each entry can be proven against the root with a log-sized inclusion proof.
+
+Segments only rotate after a batch record, so a batch never spans two files.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+GENESIS_HASH = "0" * 64
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".log"
+
+# Domain separation keeps leaves and interior nodes from colliding
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def canonical_json(data: Any) -> str:
+    """Deterministic JSON used for every hashed payload."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def chain_hash(prev_hash: str, body: str) -> str:
+    return hashlib.sha256((prev_hash + body).encode("utf-8")).hexdigest()
+
+
+def _leaf(entry_hash: str) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(entry_hash)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: List[bytes]) -> List[bytes]:
+    parents = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        # Odd node is promoted rather than duplicated
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(entry_hashes: Sequence[str]) -> str:
+    """Merkle root over a batch of entry hashes."""
+    if not entry_hashes:
+        return hashlib.sha256(b"").hexdigest()
+    level = [_leaf(h) for h in entry_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(entry_hashes: Sequence[str], index: int) -> List[List[str]]:
+    """Sibling path for ``entry_hashes[index]`` as ``[side, hash]`` pairs."""
+    proof = []
+    level = [_leaf(h) for h in entry_hashes]
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(["L" if sibling < index else "R", level[sibling].hex()])
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_inclusion(entry_hash: str, proof: Sequence[Sequence[str]], root: str) -> bool:
+    """Check an inclusion proof produced by ``merkle_proof``."""
+    node = _leaf(entry_hash)
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _node(sibling, node) if side == "L" else _node(node, sibling)
+    return node.hex() == root
+
+
+def batch_signing_payload(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of a batch record covered by its signature."""
+    return {
+        key: batch[key]
+        for key in (
+            "batch_id",
+            "first_seq",
+            "last_seq",
+            "entry_count",
+            "merkle_root",
+            "last_entry_hash",
+            "sealed_at",
+        )
+    }
+
+
+class AuditSegmentLog:
+    """
+    Segment files of one audit trail.
+
+    Not thread-safe: the owning logger serializes writes. ``append_*`` block on
+    disk I/O and are meant to run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync = fsync
+
+        self.next_seq = 0
+        self.last_hash = GENESIS_HASH
+        self._file = None
+        self._path: Optional[Path] = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def open(self) -> List[Tuple[int, str]]:
+        """
+        Open the newest segment for appending, recovering chain state.
+
+        Returns the ``(seq, entry_hash)`` pairs written after the last batch
+        record; they still need sealing. A torn final line is truncated.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = self.segments()
+        if not segments:
+            self._open_segment()
+            return []
+
+        path = segments[-1]
+        unsealed: List[Tuple[int, str]] = []
+        good_offset = 0
+        with open(path, "rb") as fh:
+            for raw in fh:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                if not raw.endswith(b"\n"):
+                    break
+                good_offset += len(raw)
+                if record["type"] == "segment":
+                    self.next_seq = record["first_seq"]
+                    self.last_hash = record["prev_hash"]
+                elif record["type"] == "entry":
+                    self.next_seq = record["seq"] + 1
+                    self.last_hash = record["entry_hash"]
+                    unsealed.append((record["seq"], record["entry_hash"]))
+                elif record["type"] == "batch":
+                    unsealed = []
+
+        if good_offset < path.stat().st_size:
+            with open(path, "r+b") as fh:
+                fh.truncate(good_offset)
+
+        self._path = path
+        self._file = open(path, "ab")
+        return unsealed
+
+    def build_entry(self, audit_id: str, timestamp: str, event: Dict[str, Any]) -> bytes:
+        """Chain a new entry and return its serialized line."""
+        body = canonical_json(
+            {"seq": self.next_seq, "audit_id": audit_id, "timestamp": timestamp, "event": event}
+        )
+        entry_hash = chain_hash(self.last_hash, body)
+        header = canonical_json(
+            {
+                "type": "entry",
+                "seq": self.next_seq,
+                "audit_id": audit_id,
+                "timestamp": timestamp,
+                "prev_hash": self.last_hash,
+                "entry_hash": entry_hash,
+            }
+        )
+        # Splice in the already serialized body instead of encoding it twice
+        line = f'{header[:-1]},"body":{body}}}\n'
+        self.next_seq += 1
+        self.last_hash = entry_hash
+        return line.encode("utf-8")
+
+    def append_entries(self, lines: Sequence[bytes]):
+        """Group commit: one write and one fsync for many entries."""
+        self._write(b"".join(lines))
+
+    def append_batch(self, batch: Dict[str, Any]):
+        """Write a batch record, rotating the segment once it is full."""
+        self._write((canonical_json({"type": "batch", **batch}) + "\n").encode("utf-8"))
+        if self._file.tell() >= self.segment_max_bytes:
+            self._file.close()
+            self._open_segment()
+
+    def truncate_to(self, offset: int):
+        """Drop a partially written tail after a failed append."""
+        self._file.truncate(offset)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _open_segment(self):
+        self._path = self.directory / f"{SEGMENT_PREFIX}{self.next_seq:012d}{SEGMENT_SUFFIX}"
+        self._file = open(self._path, "ab")
+        header = {
+            "type": "segment",
+            "first_seq": self.next_seq,
+            "prev_hash": self.last_hash,
+            "opened_at": datetime.utcnow().isoformat(),
+        }
+        self._write((canonical_json(header) + "\n").encode("utf-8"))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    @staticmethod
+    def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+        """Stream the complete records of one segment."""
+        with open(path, "rb") as fh:
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    return
+                yield json.loads(raw)
+
+    @staticmethod
+    def segment_opened_at(path: Path) -> Optional[datetime]:
+        with open(path, "rb") as fh:
+            first = fh.readline()
+        try:
+            return datetime.fromisoformat(json.loads(first)["opened_at"])
+        except (ValueError, KeyError):
+            return None
+
+    def verify(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        verify_signature: Optional[Callable[[Dict[str, Any], str], bool]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream the segments overlapping ``[start, end]`` and check the hash
+        chain, every batch's Merkle root and (optionally) its signature.
+        """
+        report = {
+            "segments_verified": 0,
+            "total_entries": 0,
+            "entries_in_range": 0,
+            "batches_verified": 0,
+            "unsealed_entries": 0,
+            "hash_mismatches": 0,
+            "chain_breaks": 0,
+            "merkle_mismatches": 0,
+            "signature_failures": 0,
+        }
+
+        segments = self.segments()
+        opened = [self.segment_opened_at(path) for path in segments]
+        previous_last_hash: Optional[str] = None
+        previous_index = None
+
+        for index, path in enumerate(segments):
+            # A segment covers [its opened_at, the next segment's opened_at)
+            next_opened = opened[index + 1] if index + 1 < len(segments) else None
+            if start and next_opened and next_opened < start:
+                continue
+            if end and opened[index] and opened[index] > end:
+                break
+
+            prev_hash = None
+            group: List[str] = []
+            for record in self.iter_records(path):
+                kind = record["type"]
+                if kind == "segment":
+                    prev_hash = record["prev_hash"]
+                    if previous_index == index - 1 and prev_hash != previous_last_hash:
+                        report["chain_breaks"] += 1
+                elif kind == "entry":
+                    if record["prev_hash"] != prev_hash:
+                        report["chain_breaks"] += 1
+                    if chain_hash(record["prev_hash"], canonical_json(record["body"])) != record["entry_hash"]:
+                        report["hash_mismatches"] += 1
+                    prev_hash = record["entry_hash"]
+                    group.append(record["entry_hash"])
+
+                    report["total_entries"] += 1
+                    timestamp = datetime.fromisoformat(record["timestamp"])
+                    if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                        report["entries_in_range"] += 1
+                elif kind == "batch":
+                    if (
+                        record["entry_count"] != len(group)
+                        or merkle_root(group) != record["merkle_root"]
+                    ):
+                        report["merkle_mismatches"] += 1
+                    if verify_signature and not verify_signature(
+                        batch_signing_payload(record), record.get("signature", "")
+                    ):
+                        report["signature_failures"] += 1
+                    report["batches_verified"] += 1
+                    group = []
+
+            report["unsealed_entries"] += len(group)
+            report["segments_verified"] += 1
+            previous_last_hash, previous_index = prev_hash, index
+
+        report["integrity_verified"] = not (
+            report["hash_mismatches"]
+            or report["chain_breaks"]
+            or report["merkle_mismatches"]
+            or report["signature_failures"]
+        )
+        return report
+
+    def find_inclusion_proof(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """Locate an entry and prove it against its batch's Merkle root."""
+        for path in reversed(self.segments()):
+            group: List[Dict[str, Any]] = []
+            target = None
+            for record in self.iter_records(path):
+                if record["type"] == "entry":
+                    if record["audit_id"] == audit_id:
+                        target = len(group)
+                    group.append(record)
+                elif record["type"] == "batch":
+                    if target is not None:
+                        hashes = [r["entry_hash"] for r in group]
+                        entry = group[target]
+                        return {
+                            "audit_id": audit_id,
+                            "seq": entry["seq"],
+                            "entry_hash": entry["entry_hash"],
+                            "sealed": True,
+                            "batch_id": record["batch_id"],
+                            "merkle_root": record["merkle_root"],
+                            "anchor_tx": record.get("anchor_tx"),
+                            "proof": merkle_proof(hashes, target),
+                        }
+                    group = []
+            if target is not None:
+                entry = group[target]
+                return {
+                    "audit_id": audit_id,
+                    "seq": entry["seq"],
+                    "entry_hash": entry["entry_hash"],
+                    "sealed": False,
+                }
+        return None
@@ -0,0 +1,120 @@
+"""
+Tests for the segment-backed blockchain audit logger.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.enterprise.audit_logger import BlockchainAuditLogger  # noqa: E402
+from src.enterprise.audit_segments import AuditSegmentLog  # noqa: E402
+from src.enterprise.audit_segments import canonical_json  # noqa: E402
+from src.enterprise.audit_segments import chain_hash  # noqa: E402
+
+
+def make_logger(directory) -> BlockchainAuditLogger:
+    return BlockchainAuditLogger(
+        {
+            "audit_log_dir": str(directory),
+            "fsync": False,
+            "commit_interval": 0,
+            "signing_key": "test-key",
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_writes_start_one_writer(tmp_path, monkeypatch):
+    audit = make_logger(tmp_path)
+    opens = []
+    real_open = audit.segment_log.open
+
+    def counting_open():
+        opens.append(1)
+        return real_open()
+
+    monkeypatch.setattr(audit.segment_log, "open", counting_open)
+
+    await asyncio.gather(
+        *(audit.log_critical_security_event({"n": i}) for i in range(50))
+    )
+    writer = audit._writer_task
+    await audit.close()
+
+    assert len(opens) == 1
+    assert writer.done()
+    assert audit.stats["entries_committed"] == 50
+    others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    assert others == []
+
+    report = await audit.verify_audit_trail_integrity()
+    assert report["integrity_verified"]
+    assert report["total_entries"] == 50
+    assert report["unsealed_entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_chain_verifies_across_restart(tmp_path):
+    first = make_logger(tmp_path)
+    for i in range(5):
+        await first.log_critical_security_event({"run": 1, "n": i})
+    await first.close()
+
+    second = make_logger(tmp_path)
+    audit_ids = [
+        await second.log_critical_security_event({"run": 2, "n": i}) for i in range(5)
+    ]
+    await second.close()
+
+    report = await second.verify_audit_trail_integrity()
+    assert report["integrity_verified"]
+    assert report["total_entries"] == 10
+    assert report["chain_breaks"] == 0
+    assert report["batches_verified"] == 2
+
+    proof = await second.get_inclusion_proof(audit_ids[-1])
+    assert proof is not None
+
+
+@pytest.mark.asyncio
+async def test_unsealed_entries_are_sealed_after_restart(tmp_path):
+    crashed = make_logger(tmp_path)
+    await crashed.log_critical_security_event({"n": 0})
+    # Simulate a crash: stop the writer without flushing a batch
+    crashed._writer_task.cancel()
+    await asyncio.gather(crashed._writer_task, return_exceptions=True)
+    crashed.segment_log.close()
+
+    restarted = make_logger(tmp_path)
+    await restarted.log_critical_security_event({"n": 1})
+    await restarted.close()
+
+    report = await restarted.verify_audit_trail_integrity()
+    assert report["integrity_verified"]
+    assert report["total_entries"] == 2
+    assert report["unsealed_entries"] == 0
+
+
+def test_entry_fields_are_escaped(tmp_path):
+    segment_log = AuditSegmentLog(str(tmp_path), fsync=False)
+    segment_log.open()
+    audit_id = 'id"with\\quotes\nand newline'
+    timestamp = "2024-01-01T00:00:00"
+
+    line = segment_log.build_entry(audit_id, timestamp, {"note": 'a "quoted" value'})
+    segment_log.append_entries([line])
+    segment_log.close()
+
+    record = json.loads(line)
+    assert record["audit_id"] == audit_id
+    assert record["timestamp"] == timestamp
+    assert record["body"]["event"] == {"note": 'a "quoted" value'}
+    assert chain_hash(record["prev_hash"], canonical_json(record["body"])) == record["entry_hash"]
+    report = segment_log.verify()
+    assert report["total_entries"] == 1
+    assert report["hash_mismatches"] == 0
@@ -0,0 +1,187 @@
+"""
+Tests for set-based bulk persistence against SQLite.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from src.database.bulk_persistence import AlertWrite  # noqa: E402
+from src.database.bulk_persistence import BulkPersistence  # noqa: E402
+from src.database.bulk_persistence import BulkPersistenceWriter  # noqa: E402
+from src.database.bulk_persistence import SignatureWrite  # noqa: E402
+from src.database.bulk_persistence import transaction_row  # noqa: E402
+from src.database.bulk_persistence import with_defaults  # noqa: E402
+from src.database.models import Base  # noqa: E402
+from src.database.models import QuantumSignature  # noqa: E402
+from src.database.models import ThreatAlert  # noqa: E402
+from src.database.models import TransactionRecord  # noqa: E402
+from src.utils.config import DatabaseConfig  # noqa: E402
+
+
+def tx_row(txid: str):
+    return transaction_row(SimpleNamespace(txid=txid, fee=1, size=250), risk_score=0.5)
+
+
+def signature(analysis_id: str, *txids: str) -> SignatureWrite:
+    row = with_defaults(
+        QuantumSignature.__table__, {"analysis_id": analysis_id, "threat_level": "HIGH"}
+    )
+    return SignatureWrite(row, [tx_row(txid) for txid in txids])
+
+
+def alert(alert_id: str, analysis_id: str) -> AlertWrite:
+    row = with_defaults(
+        ThreatAlert.__table__,
+        {
+            "alert_id": alert_id,
+            "threat_level": "HIGH",
+            "confidence_score": 0.9,
+            "attack_vector": "QUANTUM_SIGNATURE_FORGERY",
+            "estimated_time_to_compromise": "unknown",
+            "incident_classification": "SECURITY_INCIDENT",
+        },
+    )
+    return AlertWrite(row, analysis_id)
+
+
+@pytest_asyncio.fixture
+async def persistence():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    persistence = BulkPersistence(DatabaseConfig(), engine=engine)
+    yield persistence
+    await persistence.close()
+
+
+async def count(persistence: BulkPersistence, model) -> int:
+    async with persistence.session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+class TestInsertReturning:
+    """ON CONFLICT DO NOTHING RETURNING reports only the rows it inserted."""
+
+    @pytest.mark.asyncio
+    async def test_new_rows_are_returned(self, persistence):
+        table = TransactionRecord.__table__
+        async with persistence.session_factory() as session, session.begin():
+            inserted = await persistence._insert_returning(
+                session, table, [tx_row("t1"), tx_row("t2")], "txid"
+            )
+
+        assert set(inserted) == {"t1", "t2"}
+        assert await count(persistence, TransactionRecord) == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_not_returned(self, persistence):
+        table = TransactionRecord.__table__
+        async with persistence.session_factory() as session, session.begin():
+            await persistence._insert_returning(session, table, [tx_row("t1")], "txid")
+            inserted = await persistence._insert_returning(
+                session, table, [tx_row("t1"), tx_row("t2")], "txid"
+            )
+
+        assert set(inserted) == {"t2"}
+        assert await count(persistence, TransactionRecord) == 2
+
+
+class TestUpsertTransactions:
+    """Every txid resolves to one id, whether it was new or already stored."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_new_and_existing_rows(self, persistence):
+        async with persistence.session_factory() as session, session.begin():
+            first = await persistence.upsert_transactions(session, [tx_row("t1"), tx_row("t2")])
+        async with persistence.session_factory() as session, session.begin():
+            second = await persistence.upsert_transactions(
+                session, [tx_row("t2"), tx_row("t3"), tx_row("t3")]
+            )
+
+        assert second["t2"] == first["t2"]
+        assert set(second) == {"t2", "t3"}
+        assert await count(persistence, TransactionRecord) == 3
+
+
+class TestWriteBatch:
+    """Signatures and alerts land once; reruns write nothing new."""
+
+    @pytest.mark.asyncio
+    async def test_new_batch_is_written(self, persistence):
+        result = await persistence.write_batch(
+            [signature("a1", "t1", "t2"), signature("a2", "t2")], [alert("x1", "a1")]
+        )
+
+        assert result.transactions_resolved == 2
+        assert result.signatures_written == 2
+        assert result.alerts_written == 1
+        assert result.alerts_skipped == []
+
+    @pytest.mark.asyncio
+    async def test_duplicate_batch_writes_nothing(self, persistence):
+        batch = [signature("a1", "t1")], [alert("x1", "a1")]
+        await persistence.write_batch(*batch)
+
+        result = await persistence.write_batch(*batch)
+
+        assert result.signatures_written == 0
+        assert result.alerts_written == 0
+        assert await count(persistence, QuantumSignature) == 1
+        assert await count(persistence, ThreatAlert) == 1
+
+    @pytest.mark.asyncio
+    async def test_mixed_batch(self, persistence):
+        await persistence.write_batch([signature("a1", "t1")], [alert("x1", "a1")])
+
+        result = await persistence.write_batch(
+            [signature("a1", "t1"), signature("a2", "t1", "t2")],
+            [
+                alert("x1", "a1"),  # already stored
+                alert("x2", "a1"),  # new alert on a signature from an earlier batch
+                alert("x3", "a2"),  # new alert on a signature from this batch
+                alert("x4", "missing"),  # no signature was ever persisted
+            ],
+        )
+
+        assert result.transactions_resolved == 2
+        assert result.signatures_written == 1
+        assert result.alerts_written == 2
+        assert result.alerts_skipped == ["x4"]
+        assert await count(persistence, ThreatAlert) == 3
+
+
+class TestWriterFailure:
+    """flush() must not hang once the background task is gone."""
+
+    @pytest.mark.asyncio
+    async def test_flush_raises_when_writer_task_dies(self):
+        class Persistence:
+            async def write_batch(self, signatures, alerts=None):
+                raise AssertionError("unreachable")
+
+        writer = BulkPersistenceWriter(Persistence(), flush_interval=0.01)
+
+        async def broken_batch():
+            raise RuntimeError("queue corrupted")
+
+        writer._next_batch = broken_batch
+        writer.submit_signature(signature("a1", "t1"))
+
+        with pytest.raises(RuntimeError, match="writes pending"):
+            await asyncio.wait_for(writer.flush(), timeout=1)
+        with pytest.raises(RuntimeError):
+            await writer.stop()
+        assert writer._task is None
@@ -0,0 +1,66 @@
+"""
+Tests that queued bulk persistence writes land on shutdown.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.bulk_persistence import AlertWrite  # noqa: E402
+from src.database.bulk_persistence import BatchResult  # noqa: E402
+from src.database.bulk_persistence import BulkPersistenceWriter  # noqa: E402
+from src.database.bulk_persistence import SignatureWrite  # noqa: E402
+from src.detection.quantum_detector import EnterpriseQuantumDetector  # noqa: E402
+from src.utils.config import DetectionConfig  # noqa: E402
+
+
+class RecordingPersistence:
+    """BulkPersistence stand-in that records what each batch wrote."""
+
+    def __init__(self):
+        self.signatures = []
+        self.alerts = []
+
+    async def write_batch(self, signatures, alerts=None):
+        await asyncio.sleep(0.01)
+        self.signatures.extend(signatures)
+        self.alerts.extend(alerts or [])
+        return BatchResult(signatures_written=len(signatures), alerts_written=len(alerts or []))
+
+
+def queue_writes(writer: BulkPersistenceWriter, count: int):
+    for i in range(count):
+        writer.submit_signature(SignatureWrite({"analysis_id": f"a{i}"}, [{"txid": f"t{i}"}]))
+        writer.submit_alert(AlertWrite({"alert_id": f"alert{i}"}, f"a{i}"))
+
+
+@pytest.mark.asyncio
+async def test_writer_stop_writes_everything_queued():
+    persistence = RecordingPersistence()
+    writer = BulkPersistenceWriter(persistence, max_batch=16, flush_interval=0.05)
+    queue_writes(writer, 50)
+
+    await writer.stop()
+
+    assert len(persistence.signatures) == 50
+    assert len(persistence.alerts) == 50
+    assert writer.stats["signatures_written"] == 50
+    assert writer._task is None
+
+
+@pytest.mark.asyncio
+async def test_detector_shutdown_flushes_persistence():
+    persistence = RecordingPersistence()
+    writer = BulkPersistenceWriter(persistence, flush_interval=0.05)
+    detector = EnterpriseQuantumDetector(DetectionConfig(), persistence_writer=writer)
+    queue_writes(writer, 10)
+
+    await detector.stop_monitoring()
+
+    assert len(persistence.signatures) == 10
+    assert len(persistence.alerts) == 10
+    assert writer._task is None
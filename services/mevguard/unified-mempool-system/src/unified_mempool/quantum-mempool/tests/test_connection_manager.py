@@ -0,0 +1,113 @@
+"""
+Tests for read replica routing in the database connection manager.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool  # noqa: E402
+
+from src.database.connection_manager import PRIMARY  # noqa: E402
+from src.database.connection_manager import DatabaseConnectionManager  # noqa: E402
+from src.database.connection_manager import ReplicaHealth  # noqa: E402
+from src.utils.config import DatabaseConfig  # noqa: E402
+
+
+def make_manager(**replicas) -> DatabaseConnectionManager:
+    """Manager with in-memory SQLite replicas and the given measured health."""
+    manager = DatabaseConnectionManager(DatabaseConfig(connection_string="sqlite://"))
+    manager.primary_engine = create_engine("sqlite://", poolclass=StaticPool)
+    manager.engine_health[PRIMARY] = ReplicaHealth(latency_ms=1.0)
+    for name, health in replicas.items():
+        manager.read_replica_engines[name] = create_engine("sqlite://", poolclass=QueuePool)
+        manager.engine_health[name] = health
+    return manager
+
+
+class TestReplicaSelection:
+    """Reads go to the fastest healthy replica within the lag budget."""
+
+    def test_lowest_latency_replica_wins(self):
+        manager = make_manager(
+            slow=ReplicaHealth(latency_ms=40.0, lag_seconds=0.0),
+            fast=ReplicaHealth(latency_ms=5.0, lag_seconds=0.0),
+            medium=ReplicaHealth(latency_ms=12.0, lag_seconds=0.0),
+        )
+
+        assert manager._select_read_replica() == "fast"
+        assert manager._route(read_only=True) == "fast"
+        assert manager.connection_stats["replica_reads"] == 1
+
+    def test_latency_is_smoothed_across_samples(self):
+        manager = make_manager(a=ReplicaHealth(), b=ReplicaHealth())
+        manager.engine_health["a"].record_success(10.0, 0.0, manager.latency_smoothing)
+        manager.engine_health["b"].record_success(20.0, 0.0, manager.latency_smoothing)
+        # One slow sample moves the average, but not past the other replica
+        manager.engine_health["a"].record_success(40.0, 0.0, manager.latency_smoothing)
+
+        assert manager.engine_health["a"].latency_ms == pytest.approx(19.0)
+        assert manager._select_read_replica() == "a"
+
+    def test_lagging_replica_is_excluded(self):
+        manager = make_manager(
+            fast=ReplicaHealth(latency_ms=1.0),
+            slow=ReplicaHealth(latency_ms=30.0, lag_seconds=0.5),
+        )
+        manager.engine_health["fast"].lag_seconds = manager.max_replica_lag_seconds + 1
+
+        assert manager._select_read_replica() == "slow"
+
+    def test_replica_turns_unhealthy_after_repeated_failures(self):
+        manager = make_manager(
+            fast=ReplicaHealth(latency_ms=1.0, lag_seconds=0.0),
+            slow=ReplicaHealth(latency_ms=30.0, lag_seconds=0.0),
+        )
+
+        manager.engine_health["fast"].record_failure("timeout", manager.replica_failure_threshold)
+        assert manager._select_read_replica() == "fast"
+
+        manager.engine_health["fast"].record_failure("timeout", manager.replica_failure_threshold)
+        assert manager._select_read_replica() == "slow"
+
+    def test_falls_back_to_primary_when_no_replica_qualifies(self):
+        manager = make_manager(
+            down=ReplicaHealth(latency_ms=1.0, healthy=False),
+            lagging=ReplicaHealth(latency_ms=2.0),
+        )
+        manager.engine_health["lagging"].lag_seconds = manager.max_replica_lag_seconds * 10
+
+        assert manager._select_read_replica() is None
+        assert manager._route(read_only=True) == PRIMARY
+        assert manager.connection_stats["replica_fallbacks"] == 1
+
+    def test_writes_always_use_primary(self):
+        manager = make_manager(fast=ReplicaHealth(latency_ms=1.0, lag_seconds=0.0))
+
+        assert manager._route(read_only=False) == PRIMARY
+        assert manager.connection_stats["replica_reads"] == 0
+
+
+class TestPoolsWithoutCounters:
+    """NullPool/StaticPool engines must not break routing or statistics."""
+
+    @pytest.mark.parametrize("poolclass", [NullPool, StaticPool])
+    def test_selection_and_statistics(self, poolclass):
+        manager = make_manager()
+        manager.read_replica_engines["plain"] = create_engine("sqlite://", poolclass=poolclass)
+        manager.engine_health["plain"] = ReplicaHealth(latency_ms=3.0, lag_seconds=0.0)
+
+        assert manager._select_read_replica() == "plain"
+
+        status = manager._pool_status(
+            "plain", manager.read_replica_engines["plain"], manager.read_replica_engines["plain"]
+        )
+        assert "pool_size" not in status
+        assert "async_pool" not in status
+
@@ -4,9 +4,10 @@ Main AI processing engine for blockchain security analysis.
 """
 
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
 # Optional dependencies
 try:
@@ -25,9 +26,63 @@ except ImportError:
 
 from .blockchain_knowledge_base import BlockchainKnowledgeBase
 from .conversation_manager import ConversationManager
+from .intent_classifier import IntentClassifier, IntentDefinition
+from .pipeline import Stage, StagePipeline
 
 logger = logging.getLogger(__name__)
 
+# Per-stage deadlines (seconds) for process_message
+DEFAULT_STAGE_DEADLINES = {
+    "session": 1.0,
+    "intent": 1.0,
+    "knowledge": 2.0,
+    "response": 45.0,
+    "task": 10.0,
+    "suggestions": 1.0,
+}
+
+# Intent vocabulary compiled into the classifier at startup
+DEFAULT_INTENTS = [
+    IntentDefinition.from_keywords(
+        "contract_analysis",
+        ["contract", "smart contract", "vulnerability", "audit", "analyze", "security"],
+        has_task=True,
+        task="analyze_contract",
+    ),
+    IntentDefinition.from_keywords(
+        "token_security",
+        ["token", "honeypot", "rug pull", "scam", "safe"],
+        has_task=True,
+        task="check_token_security",
+    ),
+    IntentDefinition.from_keywords(
+        "defi_analysis",
+        ["defi", "protocol", "yield", "liquidity", "farm", "pool"],
+        has_task=True,
+        task="get_defi_risks",
+    ),
+    IntentDefinition.from_keywords(
+        "address_scan",
+        ["address", "wallet", "scan", "check"],
+        has_task=True,
+        task="scan_address",
+    ),
+    IntentDefinition.from_keywords("general", ["help", "what", "how", "explain"]),
+]
+
+
+@dataclass
+class MessageRequest:
+    """Inputs shared by every stage while processing one message."""
+
+    message: str
+    user_id: str
+    session_id: str
+    context: dict[str, Any] | None
+    blockchain_focus: str | None
+    execute_tasks: bool
+    new_session: bool = False
+
 
 class ScarletteAI:
     """
@@ -43,6 +98,8 @@ class ScarletteAI:
         openai_api_key: str | None = None,
         use_openai: bool = True,
         use_huggingface: bool = False,
+        stage_deadlines: dict[str, float] | None = None,
+        intents: list[IntentDefinition] | None = None,
     ):
         self.model_path = model_path
         self.knowledge_base = knowledge_base
@@ -77,8 +134,65 @@ When analyzing code or protocols, always consider security implications and prov
             "Hi there! I'm Scarlette, specialized in cryptocurrency and DeFi security. What security challenges can I help you with?",
         ]
 
+        self.intent_classifier = IntentClassifier(intents or DEFAULT_INTENTS)
+
+        # Message processing stages; independent ones run concurrently
+        self.stage_deadlines = {**DEFAULT_STAGE_DEADLINES, **(stage_deadlines or {})}
+        self.pipeline = self._build_pipeline()
+
         self._initialized = False
 
+    def _build_pipeline(self) -> StagePipeline:
+        """Dependency graph of the stages behind process_message."""
+        deadlines = self.stage_deadlines
+        return StagePipeline(
+            [
+                Stage(
+                    "session",
+                    self._load_session_stage,
+                    timeout=deadlines["session"],
+                    fallback=lambda request, error: "",
+                ),
+                Stage(
+                    "intent",
+                    self._intent_stage,
+                    timeout=deadlines["intent"],
+                    fallback=lambda request, error: self._default_intent(),
+                ),
+                Stage(
+                    "knowledge",
+                    self._knowledge_stage,
+                    timeout=deadlines["knowledge"],
+                    fallback=lambda request, error: "",
+                ),
+                Stage(
+                    "response",
+                    self._response_stage,
+                    depends_on=("session", "intent", "knowledge"),
+                    timeout=deadlines["response"],
+                    fallback=lambda request, error, intent, **_: self._generate_fallback_response(
+                        request.message, intent, request.blockchain_focus,
+                    ),
+                ),
+                Stage(
+                    "task",
+                    self._task_stage,
+                    depends_on=("intent",),
+                    timeout=deadlines["task"],
+                    fallback=lambda request, error, **_: {
+                        "error": str(error) or f"Task exceeded {deadlines['task']}s deadline",
+                    },
+                ),
+                Stage(
+                    "suggestions",
+                    self._suggestions_stage,
+                    depends_on=("intent",),
+                    timeout=deadlines["suggestions"],
+                    fallback=lambda request, error, intent: [],
+                ),
+            ],
+        )
+
     async def initialize(self):
         """Initialize the AI engine with available models."""
         import os
@@ -146,51 +260,37 @@ When analyzing code or protocols, always consider security implications and prov
         blockchain_focus: str | None = None,
         execute_tasks: bool = True,
     ) -> dict[str, Any]:
-        """Process a user message and generate an intelligent response."""
-
-        # Create session if not provided
-        if not session_id and self.conversation_manager:
-            session_id = await self.conversation_manager.create_session(user_id)
-        elif not session_id:
-            session_id = f"{user_id}_{uuid4().hex[:8]}"
-
-        # Get conversation context
-        conversation_context = ""
-        if self.conversation_manager:
-            conversation_context = await self.conversation_manager.get_conversation_context(
-                session_id,
-            )
-
-        # Analyze message intent
-        intent = await self._analyze_intent(message)
-
-        # Get relevant knowledge
-        knowledge_context = ""
-        if self.knowledge_base:
-            knowledge_context = await self._get_relevant_knowledge(message, blockchain_focus)
-
-        # Generate response
-        response_text = await self._generate_response(
+        """
+        Process a user message and generate an intelligent response.
+
+        Session loading, intent analysis and knowledge lookup run concurrently;
+        the reply, task execution and suggestions start as soon as their inputs
+        are ready. Every stage has its own deadline, so a slow task or lookup
+        degrades its part of the response instead of delaying the whole reply.
+        The session is read once and written back in one pipelined call.
+        """
+        started = time.perf_counter()
+
+        # New sessions are only written once, together with the first exchange
+        new_session = not session_id
+        if new_session:
+            session_id = ConversationManager.new_session_id(user_id)
+
+        request = MessageRequest(
             message=message,
-            conversation_context=conversation_context,
-            knowledge_context=knowledge_context,
-            intent=intent,
+            user_id=user_id,
+            session_id=session_id,
+            context=context,
             blockchain_focus=blockchain_focus,
+            execute_tasks=execute_tasks,
+            new_session=new_session,
         )
-
-        # Execute tasks if requested
-        task_results = None
-        task_executed = False
-        if execute_tasks and intent.get("has_task", False):
-            try:
-                task_results = await self._execute_task(intent, message, context)
-                task_executed = True
-            except Exception as e:
-                logger.exception(f"Task execution failed: {e}")
-                task_results = {"error": str(e)}
-
-        # Get suggestions
-        suggestions = await self._generate_suggestions(message, intent, blockchain_focus)
+        stages = await self.pipeline.run(request)
+        intent = stages["intent"]
+        knowledge_context = stages["knowledge"]
+        response_text = stages["response"]
+        task_results = stages["task"]
+        task_executed = task_results is not None and stages.outcomes["task"] == "ok"
 
         # Prepare response
         response = {
@@ -198,7 +298,7 @@ When analyzing code or protocols, always consider security implications and prov
             "session_id": session_id,
             "confidence": intent.get("confidence", 0.8),
             "sources": self._get_sources(knowledge_context),
-            "suggestions": suggestions,
+            "suggestions": stages["suggestions"],
             "blockchain_context": {
                 "focus": blockchain_focus or "general",
                 "intent": intent.get("category", "general"),
@@ -210,12 +310,60 @@ When analyzing code or protocols, always consider security implications and prov
 
         # Update conversation
         if self.conversation_manager:
+            write_started = time.perf_counter()
             await self.conversation_manager.update_session(
-                session_id, message, response_text, context,
+                session_id, message, response_text, context, user_id=user_id,
             )
+            self.pipeline.record("session_write", time.perf_counter() - write_started)
 
+        self.pipeline.record("total", time.perf_counter() - started)
         return response
 
+    async def _load_session_stage(self, request: MessageRequest) -> str:
+        if not self.conversation_manager or request.new_session:
+            return ""
+        return await self.conversation_manager.get_conversation_context(request.session_id)
+
+    async def _intent_stage(self, request: MessageRequest) -> dict[str, Any]:
+        return await self._analyze_intent(request.message)
+
+    async def _knowledge_stage(self, request: MessageRequest) -> str:
+        if not self.knowledge_base:
+            return ""
+        return await self._get_relevant_knowledge(request.message, request.blockchain_focus)
+
+    async def _response_stage(
+        self,
+        request: MessageRequest,
+        session: str,
+        intent: dict[str, Any],
+        knowledge: str,
+    ) -> str:
+        return await self._generate_response(
+            message=request.message,
+            conversation_context=session,
+            knowledge_context=knowledge,
+            intent=intent,
+            blockchain_focus=request.blockchain_focus,
+        )
+
+    async def _task_stage(
+        self, request: MessageRequest, intent: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        if not (request.execute_tasks and intent.get("has_task", False)):
+            return None
+        return await self._execute_task(intent, request.message, request.context)
+
+    async def _suggestions_stage(self, request: MessageRequest, intent: dict[str, Any]) -> list[str]:
+        return await self._generate_suggestions(request.message, intent, request.blockchain_focus)
+
+    def get_stage_metrics(self) -> dict[str, Any]:
+        """Per-stage latency histograms and outcome counts for process_message."""
+        return {
+            "deadlines": self.stage_deadlines,
+            "stages": self.pipeline.get_metrics(),
+        }
+
     async def generate_greeting(self, user_id: str) -> str:
         """Generate a personalized greeting."""
         # Simple random selection for now
@@ -257,76 +405,17 @@ When analyzing code or protocols, always consider security implications and prov
             logger.exception(f"Task {task_name} failed: {e}")
             return {"task": task_name, "error": str(e), "status": "failed"}
 
+    @staticmethod
+    def _default_intent() -> dict[str, Any]:
+        return {"category": "general", "confidence": 0.0, "has_task": False, "task": None}
+
     async def _analyze_intent(self, message: str) -> dict[str, Any]:
         """Analyze user intent from the message."""
-        message_lower = message.lower()
-
-        # Define intent patterns
-        intents = {
-            "contract_analysis": {
-                "keywords": [
-                    "contract",
-                    "smart contract",
-                    "vulnerability",
-                    "audit",
-                    "analyze",
-                    "security",
-                ],
-                "confidence": 0.0,
-                "has_task": True,
-                "task": "analyze_contract",
-            },
-            "token_security": {
-                "keywords": ["token", "honeypot", "rug pull", "scam", "safe"],
-                "confidence": 0.0,
-                "has_task": True,
-                "task": "check_token_security",
-            },
-            "defi_analysis": {
-                "keywords": ["defi", "protocol", "yield", "liquidity", "farm", "pool"],
-                "confidence": 0.0,
-                "has_task": True,
-                "task": "get_defi_risks",
-            },
-            "address_scan": {
-                "keywords": ["address", "wallet", "scan", "check"],
-                "confidence": 0.0,
-                "has_task": True,
-                "task": "scan_address",
-            },
-            "general": {
-                "keywords": ["help", "what", "how", "explain"],
-                "confidence": 0.0,
-                "has_task": False,
-            },
-        }
-
-        # Calculate confidence for each intent
-        best_intent = "general"
-        best_confidence = 0.0
+        return self.intent_classifier.classify(message).to_dict()
 
-        for intent_name, intent_data in intents.items():
-            confidence = 0.0
-            keyword_matches = 0
-
-            for keyword in intent_data["keywords"]:
-                if keyword in message_lower:
-                    keyword_matches += 1
-
-            if keyword_matches > 0:
-                confidence = min(keyword_matches / len(intent_data["keywords"]), 1.0)
-                intent_data["confidence"] = confidence
-
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_intent = intent_name
-
-        return {
-            "category": best_intent,
-            "confidence": best_confidence,
-            "has_task": intents[best_intent]["has_task"],
-            "task": intents[best_intent].get("task"),
-        }
+    async def analyze_intents(self, messages: list[str]) -> list[dict[str, Any]]:
+        """Analyze the intent of many messages in one call."""
+        return [match.to_dict() for match in self.intent_classifier.classify_many(messages)]
 
     async def _get_relevant_knowledge(
         self, message: str, blockchain_focus: str | None = None,
@@ -3,12 +3,15 @@ Blockchain Knowledge Base for Scarlette AI Service
 Provides domain-specific knowledge for blockchain security and estate planning.
 """
 
+import base64
 import json
 import logging
 from typing import Any
 
 import redis.asyncio as redis
 
+from .knowledge_index import BM25Index, IndexedEntry, knowledge_fingerprint, tokenize
+
 logger = logging.getLogger(__name__)
 
 WILL_PLANNING_KNOWLEDGE = {
@@ -172,6 +175,8 @@ class BlockchainKnowledgeBase:
     def __init__(self, redis_client: redis.Redis | None = None):
         self.redis_client = redis_client
         self.knowledge = WILL_PLANNING_KNOWLEDGE
+        self.index: BM25Index | None = None
+        self._entries: dict[IndexedEntry, dict[str, Any]] = {}
         self._initialized = False
 
     async def initialize(self):
@@ -181,24 +186,113 @@ class BlockchainKnowledgeBase:
         if self.redis_client:
             try:
                 await self.redis_client.ping()
-                await self._cache_knowledge()
-                logger.info("Knowledge base cached in Redis")
+                await self._load_cached_index()
             except Exception as e:
                 logger.warning(f"Redis not available for caching: {e}")
 
+        if self.index is None:
+            self.build_index()
+            await self._cache_knowledge()
+
         self._initialized = True
-        logger.info("Blockchain Knowledge Base initialized")
+        logger.info(f"Blockchain Knowledge Base initialized ({len(self.index)} indexed entries)")
+
+    def _iter_entries(self):
+        """Yield (entry, content, data, title, body) for every searchable item."""
+        for template_id, template in self.knowledge["templates"].items():
+            yield (
+                IndexedEntry("template", template_id),
+                template["description"],
+                template,
+                f"{template_id} {template['name']}",
+                " ".join([
+                    template["description"],
+                    *template["best_for"],
+                    *template["allocation_tips"],
+                    *template["conditions"],
+                    template["security_level"],
+                ]),
+            )
+
+        for strategy_id, strategy in self.knowledge["allocation_strategies"].items():
+            yield (
+                IndexedEntry("allocation_strategy", strategy_id),
+                strategy["description"],
+                strategy,
+                f"{strategy_id} allocation split distribute",
+                " ".join([
+                    strategy["description"], strategy["formula"], *strategy["pros"], *strategy["cons"],
+                ]),
+            )
+
+        for condition in self.knowledge["common_conditions"]:
+            yield (
+                IndexedEntry("condition", condition["type"]),
+                condition["description"],
+                condition,
+                f"{condition['type']} condition release trigger",
+                " ".join([
+                    condition["description"], *condition["parameters"], condition["verification"],
+                ]),
+            )
+
+        for level, tips in self.knowledge["security_recommendations"].items():
+            yield (
+                IndexedEntry("security_recommendation", level),
+                "; ".join(tips),
+                {"security_level": level, "recommendations": tips},
+                f"{level} security",
+                " ".join(tips),
+            )
+
+    def build_index(self):
+        """Tokenize every knowledge entry into a fresh BM25 index."""
+        documents = []
+        self._entries = {}
+        for entry, content, data, title, body in self._iter_entries():
+            self._entries[entry] = {"content": content, "data": data}
+            # Titles count twice so names and ids outrank incidental mentions
+            title_tokens = tokenize(title)
+            documents.append((entry, title_tokens * 2 + tokenize(body)))
+
+        self.index = BM25Index.build(documents, fingerprint=knowledge_fingerprint(self.knowledge))
+
+    def _index_cache_key(self) -> str:
+        return f"knowledge:index:{knowledge_fingerprint(self.knowledge).hex()}"
+
+    async def _load_cached_index(self):
+        """Load a serialized index built from the same knowledge, if cached."""
+        blob = await self.redis_client.get(self._index_cache_key())
+        if not blob:
+            return
+
+        try:
+            index = BM25Index.from_bytes(base64.b64decode(blob))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached knowledge index: {e}")
+            return
+
+        self._entries = {
+            entry: {"content": content, "data": data}
+            for entry, content, data, _, _ in self._iter_entries()
+        }
+        if index.fingerprint == knowledge_fingerprint(self.knowledge) and all(
+            entry in self._entries for entry in index.entries
+        ):
+            self.index = index
+            logger.info("Knowledge index loaded from Redis")
 
     async def _cache_knowledge(self):
-        """Cache knowledge base in Redis for faster access."""
-        if not self.redis_client:
+        """Cache the serialized knowledge index in Redis for fast cold starts."""
+        if not self.redis_client or self.index is None:
             return
 
         try:
+            # Base64 keeps the blob safe for clients created with decode_responses=True
             await self.redis_client.set(
-                "knowledge:will_planning",
-                json.dumps(self.knowledge),
-                ex=3600
+                self._index_cache_key(),
+                base64.b64encode(self.index.to_bytes()).decode(),
+                ex=86400
             )
         except Exception as e:
             logger.exception(f"Failed to cache knowledge: {e}")
@@ -209,40 +303,21 @@ class BlockchainKnowledgeBase:
         blockchain: str = "ethereum",
         limit: int = 5
     ) -> list[dict[str, Any]]:
-        """Query the knowledge base for relevant information."""
-        results = []
-        query_lower = query.lower()
-
-        if any(word in query_lower for word in ["will", "inheritance", "estate", "beneficiary"]):
-            for template_id, template in self.knowledge["templates"].items():
-                if any(word in query_lower for word in [template_id, template["name"].lower()]):
-                    results.append({
-                        "type": "template",
-                        "id": template_id,
-                        "content": template["description"],
-                        "data": template
-                    })
-
-        if any(word in query_lower for word in ["allocation", "split", "distribute"]):
-            for strategy_id, strategy in self.knowledge["allocation_strategies"].items():
-                results.append({
-                    "type": "allocation_strategy",
-                    "id": strategy_id,
-                    "content": strategy["description"],
-                    "data": strategy
-                })
+        """Query the knowledge base for the entries most relevant to ``query``, best first."""
+        if self.index is None:
+            self.build_index()
 
-        if any(word in query_lower for word in ["condition", "release", "trigger"]):
-            for condition in self.knowledge["common_conditions"]:
-                if condition["type"] in query_lower or any(word in query_lower for word in condition["description"].lower().split()):
-                    results.append({
-                        "type": "condition",
-                        "id": condition["type"],
-                        "content": condition["description"],
-                        "data": condition
-                    })
-
-        return results[:limit]
+        results = []
+        for entry, score in self.index.search(query, limit):
+            stored = self._entries[entry]
+            results.append({
+                "type": entry.type,
+                "id": entry.id,
+                "content": stored["content"],
+                "data": stored["data"],
+                "score": score,
+            })
+        return results
 
     async def get_template_recommendations(
         self,
@@ -423,6 +498,8 @@ class BlockchainKnowledgeBase:
     async def warm_start(self):
         """Pre-load common knowledge for faster access."""
         logger.info("Warming up knowledge base cache...")
+        if self.index is None:
+            self.build_index()
         if self.redis_client:
             await self._cache_knowledge()
         logger.info("Knowledge base warmed up")
@@ -5,7 +5,8 @@ Handles conversation state, context, and session management.
 
 import json
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
@@ -13,11 +14,24 @@ import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
+# Exchanges kept per session
+MAX_HISTORY = 10
+
 
 class ConversationManager:
     """
     Manages conversation context, sessions, and chat history.
     Provides memory and continuity across interactions.
+
+    Each session is stored natively in Redis:
+
+    - ``session:{id}``: metadata hash (ids, timestamps, message count)
+    - ``session:{id}:history``: list of JSON exchanges capped at ``MAX_HISTORY``
+    - ``session:{id}:context``: hash of JSON-encoded context values
+    - ``user_sessions:{user_id}``: sorted set of session ids by last activity
+
+    Every write is a single pipelined transaction whose cost does not depend
+    on the length of the conversation, and sessions expire through key TTLs.
     """
 
     def __init__(self, redis_client: redis.Redis | None = None):
@@ -41,30 +55,43 @@ class ConversationManager:
         self._initialized = True
         logger.info("✅ Conversation Manager initialized")
 
+    @staticmethod
+    def new_session_id(user_id: str) -> str:
+        """Generate a session id (format: user_id_hash)."""
+        return f"{user_id}_{uuid4().hex[:8]}"
+
+    @staticmethod
+    def _keys(session_id: str) -> tuple[str, str, str]:
+        key = f"session:{session_id}"
+        return key, f"{key}:history", f"{key}:context"
+
+    def _touch(self, pipe, session_id: str, user_id: str, now: float):
+        """Queue the metadata, TTL and user-index updates shared by every write."""
+        meta_key, history_key, context_key = self._keys(session_id)
+        timestamp = datetime.utcfromtimestamp(now).isoformat()
+
+        pipe.hsetnx(meta_key, "session_id", session_id)
+        pipe.hsetnx(meta_key, "user_id", user_id)
+        pipe.hsetnx(meta_key, "created_at", timestamp)
+        pipe.hset(meta_key, "last_activity", timestamp)
+        for key in (meta_key, history_key, context_key):
+            pipe.expire(key, self.session_timeout)
+
+        index_key = f"user_sessions:{user_id}"
+        pipe.zadd(index_key, {session_id: now})
+        pipe.zremrangebyscore(index_key, "-inf", now - self.session_timeout)
+        pipe.expire(index_key, self.session_timeout)
+
     async def create_session(self, user_id: str) -> str:
         """Create a new conversation session."""
-        session_id = f"{user_id}_{uuid4().hex[:8]}"
-
-        session_data = {
-            "session_id": session_id,
-            "user_id": user_id,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat(),
-            "message_count": 0,
-            "context": {},
-            "conversation_history": [],
-        }
+        session_id = self.new_session_id(user_id)
 
         if self.redis_client:
             try:
-                await self.redis_client.hset(
-                    f"session:{session_id}",
-                    mapping={
-                        k: json.dumps(v) if isinstance(v, dict | list) else v
-                        for k, v in session_data.items()
-                    },
-                )
-                await self.redis_client.expire(f"session:{session_id}", self.session_timeout)
+                async with self.redis_client.pipeline(transaction=True) as pipe:
+                    self._touch(pipe, session_id, user_id, time.time())
+                    pipe.hsetnx(f"session:{session_id}", "message_count", 0)
+                    await pipe.execute()
                 logger.debug(f"Session {session_id} created and stored in Redis")
             except Exception as e:
                 logger.exception(f"Failed to store session in Redis: {e}")
@@ -76,25 +103,24 @@ class ConversationManager:
         if not self.redis_client:
             return None
 
+        meta_key, history_key, context_key = self._keys(session_id)
         try:
-            session_data = await self.redis_client.hgetall(f"session:{session_id}")
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(meta_key)
+                pipe.lrange(history_key, 0, -1)
+                pipe.hgetall(context_key)
+                session_data, history, context = await pipe.execute()
             if not session_data:
                 return None
 
-            # Parse JSON fields
-            for key in ["context", "conversation_history"]:
-                if key in session_data:
-                    try:
-                        session_data[key] = json.loads(session_data[key])
-                    except (json.JSONDecodeError, TypeError):
-                        session_data[key] = {} if key == "context" else []
+            session_data["conversation_history"] = self._decode_history(history)
+            session_data["context"] = self._decode_context(context)
 
             # Convert message_count to int
-            if "message_count" in session_data:
-                try:
-                    session_data["message_count"] = int(session_data["message_count"])
-                except (ValueError, TypeError):
-                    session_data["message_count"] = 0
+            try:
+                session_data["message_count"] = int(session_data.get("message_count", 0))
+            except (ValueError, TypeError):
+                session_data["message_count"] = 0
 
             return session_data
         except Exception as e:
@@ -107,66 +133,55 @@ class ConversationManager:
         message: str,
         response: str,
         context: dict[str, Any] | None = None,
+        *,
+        user_id: str,
     ):
-        """Update session with new message and response."""
-        session_data = await self.get_session(session_id)
-        if not session_data:
-            logger.warning(f"Session {session_id} not found, creating new one")
-            # Extract user_id from session_id (format: user_id_hash)
-            user_id = session_id.split("_")[0] if "_" in session_id else "anonymous"
-            await self.create_session(user_id)
-            session_data = await self.get_session(session_id)
-            if not session_data:
-                return
+        """
+        Append an exchange to a session, creating the session if needed.
+
+        ``user_id`` is the caller's user, never derived from the session id
+        the client sent. History, context, metadata, TTLs and the user index
+        are updated in one transaction without reading the session first.
+        """
+        if not self.redis_client:
+            return
 
-        # Update conversation history
+        meta_key, history_key, context_key = self._keys(session_id)
+        now = time.time()
         conversation_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcfromtimestamp(now).isoformat(),
             "message": message,
             "response": response,
         }
 
-        if "conversation_history" not in session_data:
-            session_data["conversation_history"] = []
-
-        session_data["conversation_history"].append(conversation_entry)
-
-        # Keep only last 10 messages to manage memory
-        if len(session_data["conversation_history"]) > 10:
-            session_data["conversation_history"] = session_data["conversation_history"][-10:]
-
-        # Update context if provided
-        if context:
-            if "context" not in session_data:
-                session_data["context"] = {}
-            session_data["context"].update(context)
-
-        # Update metadata
-        session_data["last_activity"] = datetime.utcnow().isoformat()
-        session_data["message_count"] = session_data.get("message_count", 0) + 1
-
-        # Store updated session
-        if self.redis_client:
-            try:
-                await self.redis_client.hset(
-                    f"session:{session_id}",
-                    mapping={
-                        k: json.dumps(v) if isinstance(v, dict | list) else str(v)
-                        for k, v in session_data.items()
-                    },
-                )
-                await self.redis_client.expire(f"session:{session_id}", self.session_timeout)
-            except Exception as e:
-                logger.exception(f"Failed to update session in Redis: {e}")
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.rpush(history_key, json.dumps(conversation_entry))
+                pipe.ltrim(history_key, -MAX_HISTORY, -1)
+                if context:
+                    pipe.hset(context_key, mapping={k: json.dumps(v) for k, v in context.items()})
+                pipe.hincrby(meta_key, "message_count", 1)
+                self._touch(pipe, session_id, user_id, now)
+                await pipe.execute()
+        except Exception as e:
+            logger.exception(f"Failed to update session in Redis: {e}")
 
-    async def get_conversation_context(self, session_id: str) -> str:
+    async def get_conversation_context(self, session_id: str, exchanges: int = 3) -> str:
         """Get formatted conversation context for AI processing."""
-        session_data = await self.get_session(session_id)
-        if not session_data or not session_data.get("conversation_history"):
+        if not self.redis_client:
             return ""
 
+        try:
+            history = await self.redis_client.lrange(self._keys(session_id)[1], -exchanges, -1)
+        except Exception as e:
+            logger.exception(f"Failed to retrieve conversation history from Redis: {e}")
+            return ""
+        return self.format_context(self._decode_history(history))
+
+    @staticmethod
+    def format_context(history: list[dict[str, Any]]) -> str:
+        """Format the most recent exchanges for a prompt."""
         context_lines = []
-        history = session_data["conversation_history"]
 
         # Include last few exchanges for context
         for entry in history[-3:]:  # Last 3 exchanges
@@ -175,54 +190,62 @@ class ConversationManager:
 
         return "\n".join(context_lines)
 
-    async def cleanup_expired_sessions(self):
-        """Clean up expired sessions (if not using Redis TTL)."""
-        if not self.redis_client:
-            return
-
-        try:
-            # Get all session keys
-            session_keys = []
-            async for key in self.redis_client.scan_iter(match="session:*"):
-                session_keys.append(key)
-
-            expired_count = 0
-            for key in session_keys:
-                session_data = await self.redis_client.hgetall(key)
-                if session_data and "last_activity" in session_data:
-                    last_activity = datetime.fromisoformat(session_data["last_activity"])
-                    if datetime.utcnow() - last_activity > timedelta(seconds=self.session_timeout):
-                        await self.redis_client.delete(key)
-                        expired_count += 1
-
-            if expired_count > 0:
-                logger.info(f"Cleaned up {expired_count} expired sessions")
+    @staticmethod
+    def _decode_history(history: list[str]) -> list[dict[str, Any]]:
+        entries = []
+        for item in history:
+            try:
+                entries.append(json.loads(item))
+            except (json.JSONDecodeError, TypeError):
+                continue
+        return entries
+
+    @staticmethod
+    def _decode_context(context: dict[str, str]) -> dict[str, Any]:
+        decoded = {}
+        for key, value in context.items():
+            try:
+                decoded[key] = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                decoded[key] = value
+        return decoded
 
-        except Exception as e:
-            logger.exception(f"Failed to cleanup expired sessions: {e}")
+    async def cleanup_expired_sessions(self):
+        """
+        Kept for compatibility: sessions expire through Redis TTLs and stale
+        user-index entries are pruned on every write and lookup.
+        """
+        return
 
     async def get_user_sessions(self, user_id: str, limit: int = 10) -> list[dict[str, Any]]:
         """Get recent sessions for a user."""
         if not self.redis_client:
             return []
 
+        index_key = f"user_sessions:{user_id}"
         try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(index_key, "-inf", time.time() - self.session_timeout)
+                pipe.zrevrange(index_key, 0, limit - 1)
+                _, session_ids = await pipe.execute()
+            if not session_ids:
+                return []
+
+            fields = ("session_id", "created_at", "last_activity", "message_count")
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.hmget(f"session:{session_id}", *fields)
+                rows = await pipe.execute()
+
+            # Most recent first; sessions whose keys already expired are skipped
             sessions = []
-            async for key in self.redis_client.scan_iter(match=f"session:{user_id}_*"):
-                session_data = await self.redis_client.hgetall(key)
-                if session_data:
-                    # Parse basic fields
-                    session_info = {
-                        "session_id": session_data.get("session_id", ""),
-                        "created_at": session_data.get("created_at", ""),
-                        "last_activity": session_data.get("last_activity", ""),
-                        "message_count": int(session_data.get("message_count", 0)),
-                    }
-                    sessions.append(session_info)
-
-            # Sort by last activity and return most recent
-            sessions.sort(key=lambda x: x["last_activity"], reverse=True)
-            return sessions[:limit]
+            for row in rows:
+                session_info = dict(zip(fields, row))
+                if not session_info["session_id"]:
+                    continue
+                session_info["message_count"] = int(session_info["message_count"] or 0)
+                sessions.append(session_info)
+            return sessions
 
         except Exception as e:
             logger.exception(f"Failed to get user sessions: {e}")
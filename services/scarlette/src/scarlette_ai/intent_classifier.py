@@ -0,0 +1,175 @@
+"""
+Intent Classifier for Scarlette AI Service
+Keyword intent detection compiled into a single Aho-Corasick automaton.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class IntentDefinition:
+    """
+    Keywords and task routing for one intent.
+
+    ``keywords`` maps each keyword to its weight. Confidence is the summed
+    weight of distinct matched keywords divided by ``saturation``, capped at
+    1.0; by default ``saturation`` is the total keyword weight.
+    """
+
+    name: str
+    keywords: dict[str, float]
+    has_task: bool = False
+    task: str | None = None
+    saturation: float | None = None
+
+    @classmethod
+    def from_keywords(cls, name: str, keywords: list[str], **kwargs: Any) -> "IntentDefinition":
+        return cls(name=name, keywords=dict.fromkeys(keywords, 1.0), **kwargs)
+
+
+@dataclass
+class IntentMatch:
+    """Classification result for one message."""
+
+    category: str
+    confidence: float
+    has_task: bool
+    task: str | None
+    matched_keywords: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "category": self.category,
+            "confidence": self.confidence,
+            "has_task": self.has_task,
+            "task": self.task,
+        }
+
+
+class IntentClassifier:
+    """
+    Multi-intent keyword matcher.
+
+    All keywords of all intents are compiled once into an Aho-Corasick
+    automaton, so classifying a message is a single pass over its characters
+    and costs the same whether the vocabulary holds ten keywords or ten
+    thousand. Keywords match as case-insensitive substrings. ``steps`` counts
+    the automaton transitions (goto and failure hops) taken so far.
+    """
+
+    def __init__(self, intents: list[IntentDefinition], default_intent: str = "general"):
+        if not any(intent.name == default_intent for intent in intents):
+            raise ValueError(f"Default intent {default_intent!r} is not defined")
+
+        self.intents = intents
+        self.default_intent = default_intent
+        self._intent_index = {intent.name: i for i, intent in enumerate(intents)}
+        self._saturation = [
+            intent.saturation or sum(intent.keywords.values()) or 1.0 for intent in intents
+        ]
+        self.steps = 0
+        self._compile()
+
+    def _compile(self):
+        # Trie over all keywords; node 0 is the root
+        goto: list[dict[str, int]] = [{}]
+        # Per node: (keyword id, ...) of keywords ending here
+        outputs: list[tuple[int, ...]] = [()]
+        self.keywords: list[str] = []
+        # Per keyword id: ((intent index, weight), ...)
+        self.keyword_targets: list[tuple[tuple[int, float], ...]] = []
+
+        keyword_ids: dict[str, int] = {}
+        targets: list[list[tuple[int, float]]] = []
+        for intent_index, intent in enumerate(self.intents):
+            for keyword, weight in intent.keywords.items():
+                keyword = keyword.lower()
+                keyword_id = keyword_ids.get(keyword)
+                if keyword_id is None:
+                    keyword_id = keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    targets.append([])
+
+                    node = 0
+                    for char in keyword:
+                        next_node = goto[node].get(char)
+                        if next_node is None:
+                            next_node = len(goto)
+                            goto[node][char] = next_node
+                            goto.append({})
+                            outputs.append(())
+                        node = next_node
+                    outputs[node] += (keyword_id,)
+                targets[keyword_id].append((intent_index, weight))
+        self.keyword_targets = [tuple(t) for t in targets]
+
+        # Failure links in breadth-first order; outputs inherit along them
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(char, 0)
+                fail[child] = fallback if fallback != child else 0
+                outputs[child] += outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def match_keywords(self, message: str) -> set[int]:
+        """Ids of every distinct keyword occurring in ``message``."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: set[int] = set()
+        node = failure_hops = 0
+        text = message.lower()
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+                failure_hops += 1
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        self.steps += len(text) + failure_hops
+        return found
+
+    def classify(self, message: str) -> IntentMatch:
+        keyword_ids = self.match_keywords(message)
+
+        # Only intents with a matched keyword are scored
+        scores: dict[int, float] = {}
+        for keyword_id in keyword_ids:
+            for intent_index, weight in self.keyword_targets[keyword_id]:
+                scores[intent_index] = scores.get(intent_index, 0.0) + weight
+
+        best_index = self._intent_index[self.default_intent]
+        best_confidence = 0.0
+        # Ties go to the intent defined first
+        for intent_index in sorted(scores):
+            confidence = min(scores[intent_index] / self._saturation[intent_index], 1.0)
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_index = intent_index
+
+        intent = self.intents[best_index]
+        return IntentMatch(
+            category=intent.name,
+            confidence=best_confidence,
+            has_task=intent.has_task,
+            task=intent.task,
+            matched_keywords=sorted(self.keywords[k] for k in keyword_ids),
+        )
+
+    def classify_many(self, messages: list[str]) -> list[IntentMatch]:
+        """Classify a batch of messages with the same compiled automaton."""
+        return [self.classify(message) for message in messages]
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.keywords)
@@ -0,0 +1,185 @@
+"""
+Knowledge Index for Scarlette AI Service
+Tokenized inverted index with BM25 ranking over knowledge base entries.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it my of on or should the "
+    "to what when which with you your".split()
+)
+
+_MAGIC = b"SKI1"
+_HEADER = struct.Struct("<4s16sddII")
+_POSTING = struct.Struct("<IH")
+
+
+def _normalize(token: str) -> str:
+    """Fold simple English plurals so 'conditions' matches 'condition'."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        _normalize(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in _STOPWORDS
+    ]
+
+
+def knowledge_fingerprint(knowledge: dict[str, Any]) -> bytes:
+    """Digest identifying the knowledge an index was built from."""
+    return hashlib.blake2b(
+        json.dumps(knowledge, sort_keys=True).encode(), digest_size=16,
+    ).digest()
+
+
+@dataclass(frozen=True)
+class IndexedEntry:
+    """A knowledge entry addressed by its type and id."""
+
+    type: str
+    id: str
+
+
+class BM25Index:
+    """
+    Inverted index with precomputed BM25 term weights.
+
+    Each posting stores the full BM25 contribution of a term to a document,
+    so a query is a handful of dictionary lookups and additions followed by a
+    top-k selection.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.fingerprint = b""
+        self.entries: list[IndexedEntry] = []
+        self.doc_lengths: list[int] = []
+        # term -> [(doc index, term frequency)]
+        self.term_frequencies: dict[str, list[tuple[int, int]]] = {}
+        # term -> [(doc index, BM25 weight)]
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        documents: list[tuple[IndexedEntry, list[str]]],
+        fingerprint: bytes = b"",
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> "BM25Index":
+        """Index documents given as (entry, tokens) pairs."""
+        index = cls(k1=k1, b=b)
+        index.fingerprint = fingerprint
+        for doc_id, (entry, tokens) in enumerate(documents):
+            index.entries.append(entry)
+            index.doc_lengths.append(len(tokens))
+            counts: dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                index.term_frequencies.setdefault(term, []).append((doc_id, tf))
+        index._compute_weights()
+        return index
+
+    def _compute_weights(self):
+        n_docs = len(self.entries)
+        avg_length = (sum(self.doc_lengths) / n_docs) if n_docs else 0.0
+        k1, b = self.k1, self.b
+
+        self.postings = {}
+        for term, postings in self.term_frequencies.items():
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            weighted = []
+            for doc_id, tf in postings:
+                norm = k1 * (1 - b + b * self.doc_lengths[doc_id] / avg_length) if avg_length else k1
+                weighted.append((doc_id, idf * tf * (k1 + 1) / (tf + norm)))
+            self.postings[term] = weighted
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[IndexedEntry, float]]:
+        """Top ``limit`` entries for ``query`` by BM25 score."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.entries[doc_id], score) for doc_id, score in top]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compressed binary blob."""
+        terms = list(self.term_frequencies)
+        chunks = [
+            _HEADER.pack(_MAGIC, self.fingerprint.ljust(16, b"\0"), self.k1, self.b,
+                         len(self.entries), len(terms)),
+            _pack_strings([f"{entry.type}\t{entry.id}" for entry in self.entries]),
+            struct.pack(f"<{len(self.doc_lengths)}I", *self.doc_lengths),
+            _pack_strings(terms),
+        ]
+        for term in terms:
+            postings = self.term_frequencies[term]
+            chunks.append(struct.pack("<I", len(postings)))
+            chunks.extend(_POSTING.pack(doc_id, tf) for doc_id, tf in postings)
+        return zlib.compress(b"".join(chunks))
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "BM25Index":
+        data = zlib.decompress(blob)
+        magic, fingerprint, k1, b, n_docs, n_terms = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a knowledge index")
+        offset = _HEADER.size
+
+        index = cls(k1=k1, b=b)
+        index.fingerprint = fingerprint
+        keys, offset = _unpack_strings(data, offset, n_docs)
+        index.entries = [IndexedEntry(*key.split("\t", 1)) for key in keys]
+        index.doc_lengths = list(struct.unpack_from(f"<{n_docs}I", data, offset))
+        offset += 4 * n_docs
+
+        terms, offset = _unpack_strings(data, offset, n_terms)
+        for term in terms:
+            (count,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            index.term_frequencies[term] = [
+                _POSTING.unpack_from(data, offset + i * _POSTING.size) for i in range(count)
+            ]
+            offset += count * _POSTING.size
+
+        index._compute_weights()
+        return index
+
+
+def _pack_strings(strings: list[str]) -> bytes:
+    encoded = [s.encode() for s in strings]
+    return struct.pack(f"<{len(encoded)}H", *(len(e) for e in encoded)) + b"".join(encoded)
+
+
+def _unpack_strings(data: bytes, offset: int, count: int) -> tuple[list[str], int]:
+    lengths = struct.unpack_from(f"<{count}H", data, offset)
+    offset += 2 * count
+    strings = []
+    for length in lengths:
+        strings.append(data[offset : offset + length].decode())
+        offset += length
+    return strings, offset
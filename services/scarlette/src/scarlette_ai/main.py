@@ -236,6 +236,7 @@ async def root():
             "chat": "/chat",
             "greeting": "/greeting",
             "task": "/task",
+            "metrics": "/metrics",
             "websocket": "/ws",
         },
     }
@@ -340,6 +341,18 @@ async def execute_task(request: TaskRequest):
         )
 
 
+@app.get("/metrics", response_model=dict)
+async def get_metrics():
+    """Per-stage chat processing latencies."""
+    if not scarlette_ai:
+        raise HTTPException(status_code=503, detail="Scarlette AI not available")
+
+    return {
+        "pipeline": scarlette_ai.get_stage_metrics(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
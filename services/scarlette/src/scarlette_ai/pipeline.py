@@ -0,0 +1,194 @@
+"""
+Stage Pipeline for Scarlette AI Service
+Runs request-processing stages concurrently along a dependency graph.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the last bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = self.count
+
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class Stage:
+    """
+    One step of request processing.
+
+    ``run`` is called as ``run(request, **dependency_results)``. When it fails
+    or exceeds ``timeout`` seconds, ``fallback(request, error, **dependency_results)``
+    supplies the result instead; without a fallback the error fails the request.
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+    timeout: float | None = None
+    fallback: Callable[..., Any] | None = None
+
+
+@dataclass
+class PipelineResult:
+    """Stage results and outcomes (``ok``, ``timeout``, ``error``) for one request."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    outcomes: dict[str, str] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+
+class StagePipeline:
+    """
+    Executes stages as soon as their dependencies complete.
+
+    Independent stages run concurrently, each under its own deadline, and
+    every stage's latency is recorded in a per-stage histogram.
+    """
+
+    def __init__(self, stages: list[Stage], buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        names: set[str] = set()
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in names]
+            if missing:
+                raise ValueError(
+                    f"Stage {stage.name} depends on {missing}, which must be declared before it",
+                )
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            names.add(stage.name)
+
+        self.stages = stages
+        self.buckets = buckets
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.outcomes: dict[str, Counter] = {}
+
+    async def run(self, request: Any) -> PipelineResult:
+        """Run every stage for one request."""
+        result = PipelineResult()
+        tasks: dict[str, asyncio.Task] = {}
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.create_task(self._run_stage(stage, request, tasks, result))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        for name, task in tasks.items():
+            result.results[name] = task.result()
+        return result
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        request: Any,
+        tasks: dict[str, asyncio.Task],
+        result: PipelineResult,
+    ) -> Any:
+        deps = {name: await tasks[name] for name in stage.depends_on}
+
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            if stage.timeout is None:
+                return await stage.run(request, **deps)
+            return await asyncio.wait_for(stage.run(request, **deps), stage.timeout)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except asyncio.TimeoutError as e:
+            outcome = "timeout"
+            logger.warning(f"Stage {stage.name} exceeded its {stage.timeout}s deadline")
+            error: Exception = e
+        except Exception as e:
+            outcome = "error"
+            logger.exception(f"Stage {stage.name} failed: {e}")
+            error = e
+        finally:
+            self.record(stage.name, time.perf_counter() - started, outcome)
+            result.outcomes[stage.name] = outcome
+
+        if stage.fallback is None:
+            raise error
+        fallback = stage.fallback(request, error, **deps)
+        if inspect.isawaitable(fallback):
+            fallback = await fallback
+        return fallback
+
+    def record(self, name: str, seconds: float, outcome: str = "ok"):
+        """Record a latency sample, including for work done outside the graph."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(self.buckets)
+            self.outcomes[name] = Counter()
+        histogram.observe(seconds)
+        self.outcomes[name][outcome] += 1
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            name: {**histogram.to_dict(), "outcomes": dict(self.outcomes[name])}
+            for name, histogram in self.histograms.items()
+        }
@@ -31,3 +31,134 @@ def client():
 async def mock_scarlette_ai():
     """Mock Scarlette AI service for testing."""
     return {"status": "mocked"}
+
+
+class FakeRedisPipeline:
+    """Queues commands and runs them against FakeRedis in one round trip."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis_client.round_trips += 1
+        results = [
+            getattr(self.redis_client, f"_{name}")(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis (decode_responses=True) that counts round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    def __getattr__(self, name):
+        command = getattr(self, f"_{name}")
+
+        async def call(*args, **kwargs):
+            self.round_trips += 1
+            return command(*args, **kwargs)
+
+        return call
+
+    def _ping(self):
+        return True
+
+    def _get(self, key):
+        return self.data.get(key)
+
+    def _set(self, key, value, ex=None):
+        self.data[key] = value
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    def _expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return key in self.data
+
+    def _hset(self, key, field=None, value=None, mapping=None):
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in fields.items()})
+        return len(fields)
+
+    def _hsetnx(self, key, field, value):
+        hash_ = self.data.setdefault(key, {})
+        if field in hash_:
+            return 0
+        hash_[field] = str(value)
+        return 1
+
+    def _hincrby(self, key, field, amount=1):
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(int(hash_.get(field, 0)) + amount)
+        return int(hash_[field])
+
+    def _hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def _hmget(self, key, *fields):
+        hash_ = self.data.get(key, {})
+        return [hash_.get(field) for field in fields]
+
+    def _rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+        return len(self.data[key])
+
+    def _ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        end = len(items) if end == -1 else end + 1
+        self.data[key] = items[start:end]
+        return True
+
+    def _lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        end = len(items) if end == -1 else end + 1
+        return items[start:end]
+
+    def _zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _zremrangebyscore(self, key, low, high):
+        zset = self.data.get(key, {})
+        low = float(low)
+        stale = [member for member, score in zset.items() if low <= score <= float(high)]
+        for member in stale:
+            del zset[member]
+        return len(stale)
+
+    def _zrevrange(self, key, start, end):
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+        end = len(members) if end == -1 else end + 1
+        return [member for member, _ in members[start:end]]
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis double."""
+    return FakeRedis()
@@ -0,0 +1,113 @@
+"""Unit tests for the staged message processing pipeline."""
+
+import asyncio
+
+import pytest
+from scarlette_ai.ai_core import ScarletteAI
+from scarlette_ai.conversation_manager import ConversationManager
+from scarlette_ai.pipeline import LatencyHistogram, Stage, StagePipeline
+
+
+class TestStagePipeline:
+    """Test cases for StagePipeline."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self):
+        async def slow(request, **deps):
+            await asyncio.sleep(0.05)
+            return request
+
+        async def combine(request, a, b):
+            return a + b
+
+        pipeline = StagePipeline(
+            [Stage("a", slow), Stage("b", slow), Stage("sum", combine, depends_on=("a", "b"))],
+        )
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await pipeline.run(1)
+
+        assert result["sum"] == 2
+        assert loop.time() - started < 0.09
+
+    @pytest.mark.asyncio
+    async def test_deadline_uses_fallback(self):
+        async def hang(request):
+            await asyncio.sleep(10)
+
+        pipeline = StagePipeline(
+            [Stage("slow", hang, timeout=0.01, fallback=lambda request, error: "fallback")],
+        )
+        result = await pipeline.run(None)
+
+        assert result["slow"] == "fallback"
+        assert result.outcomes["slow"] == "timeout"
+        assert pipeline.get_metrics()["slow"]["outcomes"] == {"timeout": 1}
+
+    @pytest.mark.asyncio
+    async def test_failure_without_fallback_propagates(self):
+        async def broken(request):
+            raise RuntimeError("boom")
+
+        pipeline = StagePipeline([Stage("broken", broken)])
+        with pytest.raises(RuntimeError, match="boom"):
+            await pipeline.run(None)
+
+    def test_dependencies_must_be_declared_first(self):
+        async def noop(request, **deps):
+            return None
+
+        with pytest.raises(ValueError):
+            StagePipeline([Stage("b", noop, depends_on=("a",)), Stage("a", noop)])
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.005)
+        for _ in range(10):
+            histogram.observe(0.5)
+
+        assert histogram.quantile(0.5) <= 0.01
+        assert 0.1 < histogram.quantile(0.99) <= 1.0
+        assert histogram.to_dict()["buckets"]["le_inf"] == 100
+
+
+class TestProcessMessage:
+    """Test cases for ScarletteAI.process_message."""
+
+    @pytest.fixture
+    def scarlette(self, fake_redis):
+        return ScarletteAI(
+            conversation_manager=ConversationManager(fake_redis),
+            use_openai=False,
+            stage_deadlines={"task": 0.05},
+        )
+
+    @pytest.mark.asyncio
+    async def test_session_read_once_and_written_once(self, scarlette, fake_redis):
+        first = await scarlette.process_message("explain flash loans", user_id="alice")
+        assert fake_redis.round_trips == 1
+
+        session_id = first["session_id"]
+        await scarlette.process_message("and reentrancy?", user_id="alice", session_id=session_id)
+        assert fake_redis.round_trips == 3
+
+        session = await scarlette.conversation_manager.get_session(session_id)
+        assert session["message_count"] == 2
+        assert len(session["conversation_history"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_task_does_not_block_reply(self, scarlette):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        scarlette._execute_task = hang
+        response = await asyncio.wait_for(
+            scarlette.process_message("scan this wallet address"), timeout=1.0,
+        )
+
+        assert response["response"]
+        assert response["task_executed"] is False
+        assert "error" in response["task_results"]
+        assert scarlette.get_stage_metrics()["stages"]["task"]["outcomes"] == {"timeout": 1}
@@ -0,0 +1,75 @@
+"""Unit tests for Redis-native conversation sessions."""
+
+import pytest
+from scarlette_ai.conversation_manager import MAX_HISTORY, ConversationManager
+
+
+class TestConversationManager:
+    """Test cases for ConversationManager."""
+
+    @pytest.fixture
+    def manager(self, fake_redis):
+        return ConversationManager(fake_redis)
+
+    @pytest.mark.asyncio
+    async def test_each_update_is_one_round_trip(self, manager, fake_redis):
+        session_id = await manager.create_session("alice")
+        for i in range(25):
+            before = fake_redis.round_trips
+            await manager.update_session(
+                session_id, f"question {i}", f"answer {i}", {"turn": i}, user_id="alice"
+            )
+            assert fake_redis.round_trips == before + 1
+
+        session = await manager.get_session(session_id)
+        assert session["message_count"] == 25
+        assert len(session["conversation_history"]) == MAX_HISTORY
+        assert session["conversation_history"][-1]["message"] == "question 24"
+        assert session["context"] == {"turn": 24}
+
+    @pytest.mark.asyncio
+    async def test_all_session_keys_carry_ttl(self, manager, fake_redis):
+        session_id = await manager.create_session("alice")
+        await manager.update_session(session_id, "hi", "hello", {"chain": "ethereum"}, user_id="alice")
+
+        for key in fake_redis.data:
+            assert fake_redis.ttls[key] == manager.session_timeout
+
+    @pytest.mark.asyncio
+    async def test_update_creates_missing_session(self, manager):
+        await manager.update_session("bob_smith_1234abcd", "hi", "hello", user_id="bob_smith")
+
+        session = await manager.get_session("bob_smith_1234abcd")
+        assert session["user_id"] == "bob_smith"
+        assert session["message_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_session_id_does_not_choose_the_user(self, manager):
+        # A client-supplied id shaped like another user's session
+        await manager.update_session("alice_1234abcd", "hi", "hello", user_id="mallory")
+
+        session = await manager.get_session("alice_1234abcd")
+        assert session["user_id"] == "mallory"
+        assert await manager.get_user_sessions("alice") == []
+        assert [s["session_id"] for s in await manager.get_user_sessions("mallory")] == ["alice_1234abcd"]
+
+    @pytest.mark.asyncio
+    async def test_conversation_context_reads_recent_history(self, manager):
+        session_id = await manager.create_session("alice")
+        for i in range(5):
+            await manager.update_session(session_id, f"q{i}", f"a{i}", user_id="alice")
+
+        context = await manager.get_conversation_context(session_id)
+        assert context.splitlines() == ["User: q2", "Assistant: a2", "User: q3", "Assistant: a3",
+                                        "User: q4", "Assistant: a4"]
+
+    @pytest.mark.asyncio
+    async def test_user_sessions_index(self, manager):
+        first = await manager.create_session("alice")
+        second = await manager.create_session("alice")
+        await manager.create_session("carol")
+        await manager.update_session(first, "hi", "hello", user_id="alice")
+
+        sessions = await manager.get_user_sessions("alice")
+        assert [s["session_id"] for s in sessions] == [first, second]
+        assert sessions[0]["message_count"] == 1
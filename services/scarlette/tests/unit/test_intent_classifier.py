@@ -0,0 +1,107 @@
+"""Unit tests for the compiled intent classifier."""
+
+import random
+
+import pytest
+from scarlette_ai.ai_core import DEFAULT_INTENTS
+from scarlette_ai.intent_classifier import IntentClassifier, IntentDefinition
+
+MESSAGES = [
+    "Can you audit this smart contract for vulnerability issues?",
+    "is this token a honeypot or a rug pull scam",
+    "what are the yield farm risks in this defi protocol pool",
+    "please scan and check this wallet address",
+    "explain how flash loans work",
+    "hello there",
+    "CHECK THE SECURITY OF MY WALLET",
+]
+
+
+def reference_classify(intents, message):
+    """Straightforward per-keyword substring scan the classifier must agree with."""
+    message_lower = message.lower()
+    best, best_confidence = "general", 0.0
+    for intent in intents:
+        matches = sum(1 for keyword in intent.keywords if keyword in message_lower)
+        if matches:
+            confidence = min(matches / len(intent.keywords), 1.0)
+            if confidence > best_confidence:
+                best, best_confidence = intent.name, confidence
+    return best, best_confidence
+
+
+class TestIntentClassifier:
+    """Test cases for IntentClassifier."""
+
+    @pytest.fixture
+    def classifier(self):
+        return IntentClassifier(DEFAULT_INTENTS)
+
+    @pytest.mark.parametrize("message", MESSAGES)
+    def test_matches_reference_scan(self, classifier, message):
+        match = classifier.classify(message)
+        category, confidence = reference_classify(DEFAULT_INTENTS, message)
+
+        assert match.category == category
+        assert match.confidence == pytest.approx(confidence)
+
+    def test_overlapping_keywords_all_count(self, classifier):
+        match = classifier.classify("smart contract")
+
+        assert match.matched_keywords == ["contract", "smart contract"]
+        assert match.task == "analyze_contract"
+
+    def test_weights_and_saturation(self):
+        classifier = IntentClassifier([
+            IntentDefinition("exploit", {"drained": 3.0, "exploit": 1.0}, saturation=3.0),
+            IntentDefinition.from_keywords("general", ["help"]),
+        ])
+
+        assert classifier.classify("funds drained!").confidence == 1.0
+        assert classifier.classify("an exploit?").confidence == pytest.approx(1 / 3)
+        assert classifier.classify("nothing").category == "general"
+
+    def test_steps_count_failure_hops(self):
+        classifier = IntentClassifier([
+            IntentDefinition.from_keywords("general", ["abcd", "bcx"]),
+        ])
+
+        # "abc" walks down "abcd", then "x" falls back to "bc" before matching "bcx"
+        assert classifier.match_keywords("abcx") == {1}
+        assert classifier.steps == len("abcx") + 1
+
+    def test_classify_many(self, classifier):
+        matches = classifier.classify_many(MESSAGES)
+        assert [m.category for m in matches] == [classifier.classify(m).category for m in MESSAGES]
+
+    def test_unknown_default_intent_rejected(self):
+        with pytest.raises(ValueError):
+            IntentClassifier(DEFAULT_INTENTS, default_intent="missing")
+
+    def test_cost_stays_flat_as_vocabulary_grows(self):
+        rng = random.Random(3)
+        messages = [
+            " ".join(rng.choice(MESSAGES).split() + [f"w{rng.randrange(10**6)}"]) * 3
+            for _ in range(300)
+        ]
+
+        def build(keywords_per_intent):
+            intents = [
+                IntentDefinition.from_keywords(
+                    f"intent_{i}",
+                    [f"kw{i}x{j}y{rng.randrange(10**9)}" for j in range(keywords_per_intent)],
+                )
+                for i in range(10)
+            ]
+            return IntentClassifier([*intents, *DEFAULT_INTENTS])
+
+        small, large = build(5), build(500)
+        chars = sum(len(message) for message in messages)
+        small.classify_many(messages)
+        large.classify_many(messages)
+
+        assert large.vocabulary_size > 50 * small.vocabulary_size
+        # Each character costs one goto plus amortized failure hops,
+        # independent of how many keywords are compiled in
+        assert chars <= small.steps <= 2 * chars
+        assert chars <= large.steps <= 2 * chars
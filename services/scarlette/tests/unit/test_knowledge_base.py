@@ -0,0 +1,70 @@
+"""Unit tests for BM25 knowledge retrieval."""
+
+import pytest
+from scarlette_ai.blockchain_knowledge_base import BlockchainKnowledgeBase
+from scarlette_ai.knowledge_index import BM25Index, IndexedEntry, tokenize
+
+
+class TestKnowledgeIndex:
+    """Test cases for BM25Index."""
+
+    def test_tokenize_folds_plurals_and_separators(self):
+        assert tokenize("Multi-chain conditions for beneficiaries") == [
+            "multi", "chain", "condition", "beneficiary",
+        ]
+
+    def test_rare_terms_outrank_common_ones(self):
+        index = BM25Index.build([
+            (IndexedEntry("doc", "a"), tokenize("wallet wallet recovery")),
+            (IndexedEntry("doc", "b"), tokenize("wallet multisig guardian")),
+            (IndexedEntry("doc", "c"), tokenize("wallet")),
+        ])
+
+        ranked = [entry.id for entry, _ in index.search("wallet guardian", limit=3)]
+        assert ranked[0] == "b"
+        assert index.search("nothing matches", limit=3) == []
+
+    def test_binary_round_trip_preserves_scores(self):
+        index = BM25Index.build(
+            [(IndexedEntry("doc", str(i)), tokenize(f"term{i} shared text")) for i in range(20)],
+            fingerprint=b"f" * 16,
+        )
+        restored = BM25Index.from_bytes(index.to_bytes())
+
+        assert restored.fingerprint == index.fingerprint
+        assert restored.search("term3 shared", 5) == index.search("term3 shared", 5)
+
+
+class TestBlockchainKnowledgeBase:
+    """Test cases for BlockchainKnowledgeBase.query_knowledge."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_ranked_and_limited(self):
+        kb = BlockchainKnowledgeBase()
+        await kb.initialize()
+
+        results = await kb.query_knowledge("trust fund for minor beneficiaries", limit=3)
+
+        assert len(results) == 3
+        assert results[0]["id"] == "trust-fund"
+        assert results[0]["data"]["name"] == "Trust Fund"
+        assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_condition_query(self):
+        kb = BlockchainKnowledgeBase()
+        results = await kb.query_knowledge("release after a vesting cliff period")
+
+        assert results[0] == {**results[0], "type": "condition", "id": "vesting"}
+
+    @pytest.mark.asyncio
+    async def test_index_is_reused_from_redis(self, fake_redis):
+        await BlockchainKnowledgeBase(fake_redis).initialize()
+        assert len(fake_redis.data) == 1
+
+        kb = BlockchainKnowledgeBase(fake_redis)
+        kb.build_index = None  # a rebuild would fail
+        await kb.initialize()
+
+        results = await kb.query_knowledge("charitable giving")
+        assert results[0]["id"] == "charitable"
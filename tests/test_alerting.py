@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Tests for alert notifiers, per-channel dispatch and rule matching
+"""
+
+import time
+
+import pytest
+from app.core.alerting import (
+    Alert,
+    AlertChannel,
+    AlertManager,
+    AlertNotifier,
+    AlertPriority,
+    AlertRule,
+    ChannelDispatcher,
+)
+
+
+def make_alert(alert_id: str, priority: AlertPriority = AlertPriority.MEDIUM) -> Alert:
+    return Alert(
+        alert_id=alert_id,
+        rule_id="rule",
+        title=f"Alert {alert_id}",
+        message="test",
+        priority=priority,
+        channels=[AlertChannel.WEBHOOK],
+        timestamp=time.time(),
+    )
+
+
+class RecordingNotifier(AlertNotifier):
+    """Notifier that records each message and fails the first ``failures`` attempts"""
+
+    channel = AlertChannel.WEBHOOK
+
+    def __init__(self, failures: int = 0, enabled: bool = True):
+        self.failures = failures
+        self.enabled = enabled
+        self.attempts = 0
+        self.messages: list[list[str]] = []
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    async def deliver(self, alerts: list[Alert]) -> dict:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise RuntimeError("HTTP 503")
+        self.messages.append([alert.alert_id for alert in alerts])
+        return {"status_code": 200}
+
+
+class TestAlertNotifier:
+    """Test the notifier base class"""
+
+    def test_notifier_must_implement_deliver(self):
+        class Incomplete(AlertNotifier):
+            channel = AlertChannel.WEBHOOK
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    @pytest.mark.asyncio
+    async def test_disabled_notifier_does_not_deliver(self):
+        notifier = RecordingNotifier(enabled=False)
+
+        [delivery] = await notifier.send_batch([make_alert("a")])
+
+        assert delivery.status == "failed"
+        assert delivery.error_message == notifier.disabled_message
+        assert notifier.attempts == 0
+
+
+class TestChannelDispatcher:
+    """Test batching, retries and disabled channels"""
+
+    @pytest.mark.asyncio
+    async def test_alerts_in_window_are_sent_as_one_digest(self):
+        notifier = RecordingNotifier()
+        deliveries = []
+        dispatcher = ChannelDispatcher(
+            notifier, on_delivery=deliveries.append, workers=1, digest_window=0.05
+        )
+
+        for i in range(5):
+            assert dispatcher.submit(make_alert(str(i)))
+        await dispatcher.close()
+
+        assert notifier.messages == [["0", "1", "2", "3", "4"]]
+        assert [d.status for d in deliveries] == ["sent"] * 5
+        assert all(d.delivery_data["digest_size"] == 5 for d in deliveries)
+        assert dispatcher.stats["digests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_digest_is_capped(self):
+        notifier = RecordingNotifier()
+        dispatcher = ChannelDispatcher(notifier, workers=1, digest_window=0.05, max_digest_size=2)
+
+        for i in range(5):
+            dispatcher.submit(make_alert(str(i)))
+        await dispatcher.close()
+
+        assert notifier.messages == [["0", "1"], ["2", "3"], ["4"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_retried(self):
+        notifier = RecordingNotifier(failures=2)
+        deliveries = []
+        dispatcher = ChannelDispatcher(
+            notifier, on_delivery=deliveries.append, digest_window=0, base_backoff=0.001
+        )
+
+        dispatcher.submit(make_alert("a"))
+        await dispatcher.close()
+
+        assert notifier.attempts == 3
+        assert [d.status for d in deliveries] == ["sent"]
+        assert dispatcher.stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_delivery_fails_after_max_retries(self):
+        notifier = RecordingNotifier(failures=10)
+        deliveries = []
+        dispatcher = ChannelDispatcher(
+            notifier,
+            on_delivery=deliveries.append,
+            digest_window=0,
+            max_retries=2,
+            base_backoff=0.001,
+        )
+
+        dispatcher.submit(make_alert("a"))
+        await dispatcher.close()
+
+        assert notifier.attempts == 3
+        assert [(d.status, d.error_message) for d in deliveries] == [("failed", "HTTP 503")]
+        assert dispatcher.stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_channel_reports_failure_without_queueing(self):
+        notifier = RecordingNotifier(enabled=False)
+        deliveries = []
+        dispatcher = ChannelDispatcher(notifier, on_delivery=deliveries.append)
+
+        assert not dispatcher.submit(make_alert("a"))
+        await dispatcher.close()
+
+        assert notifier.attempts == 0
+        assert [d.error_message for d in deliveries] == [notifier.disabled_message]
+        assert dispatcher.get_metrics()["workers"] == 0
+
+
+def linear_scan_matches(rule: AlertRule, source: str, event_type: str, severity: str | None) -> bool:
+    """Per-rule condition check the manager used before rules were indexed"""
+    conditions = rule.conditions
+    if source == "threat":
+        if "threat_severity" in conditions and severity != conditions["threat_severity"]:
+            return False
+        if "threat_types" in conditions and event_type not in conditions["threat_types"]:
+            return False
+    elif source == "vulnerability":
+        if "vulnerability_severity" in conditions and severity not in conditions["vulnerability_severity"]:
+            return False
+        if "vulnerability_types" in conditions and event_type not in conditions["vulnerability_types"]:
+            return False
+    elif "event_types" in conditions and event_type not in conditions["event_types"]:
+        return False
+    return True
+
+
+SOURCE_KEYS = {
+    "threat": ("threat_types", "threat_severity"),
+    "vulnerability": ("vulnerability_types", "vulnerability_severity"),
+    "mempool": ("event_types",),
+}
+EVENTS = [
+    ("threat", event_type, severity)
+    for event_type in ("sandwich_attack", "dust_attack", "rug_pull")
+    for severity in ("high", "critical")
+] + [
+    ("vulnerability", event_type, severity)
+    for event_type in ("reentrancy", "honeypot", "overflow")
+    for severity in ("medium", "high", "critical")
+] + [
+    ("mempool", event_type, None)
+    for event_type in ("high_value_transaction", "suspicious_pattern", "gas_spike")
+]
+
+
+def make_rule(rule_id: str, conditions: dict, enabled: bool = True) -> AlertRule:
+    return AlertRule(
+        rule_id=rule_id,
+        name=rule_id,
+        description=rule_id,
+        conditions=conditions,
+        channels=[AlertChannel.WEBHOOK],
+        priority=AlertPriority.MEDIUM,
+        enabled=enabled,
+        cooldown_seconds=0,
+    )
+
+
+class TestRuleIndex:
+    """Indexed rule lookup agrees with checking every rule"""
+
+    @pytest.fixture
+    def manager(self):
+        manager = AlertManager()
+        for rule in [
+            make_rule("any_event", {}),
+            make_rule("unrelated_condition", {"network": "ethereum"}),
+            make_rule("sandwiches", {"threat_types": ["sandwich_attack"]}),
+            make_rule("critical_threats", {"threat_severity": "critical"}),
+            make_rule("bad_code", {"vulnerability_types": ["reentrancy", "honeypot"]}),
+            make_rule("gas", {"event_types": "gas_spike"}),
+            make_rule("mixed", {"threat_types": ["dust_attack"], "event_types": ["gas_spike"]}),
+            make_rule("disabled", {}, enabled=False),
+        ]:
+            manager.add_alert_rule(rule)
+        return manager
+
+    def expected(self, manager, source, event_type, severity) -> list[str]:
+        """Old linear scan, limited to rules that name the event's source or no source"""
+        matches = []
+        for rule in manager.alert_rules.values():
+            named = {s for s, keys in SOURCE_KEYS.items() if any(k in rule.conditions for k in keys)}
+            if rule.enabled and (not named or source in named):
+                if linear_scan_matches(rule, source, event_type, severity):
+                    matches.append(rule.rule_id)
+        return matches
+
+    def assert_agrees(self, manager):
+        for source, event_type, severity in EVENTS:
+            indexed = [r.rule_id for r in manager._candidate_rules(source, event_type, severity)]
+            assert indexed == self.expected(manager, source, event_type, severity), (
+                source,
+                event_type,
+                severity,
+            )
+
+    def test_index_matches_linear_scan(self, manager):
+        self.assert_agrees(manager)
+
+    def test_rules_without_source_match_every_source(self, manager):
+        for source, event_type, severity in EVENTS:
+            ids = [r.rule_id for r in manager._candidate_rules(source, event_type, severity)]
+            assert {"any_event", "unrelated_condition"} <= set(ids)
+            assert "disabled" not in ids
+
+    def test_rules_only_match_the_sources_they_name(self, manager):
+        mempool = [r.rule_id for r in manager._candidate_rules("mempool", "high_value_transaction", None)]
+
+        assert "critical_threats" not in mempool
+        assert "bad_code" not in mempool
+
+    def test_index_follows_rule_changes(self, manager):
+        manager._candidate_rules("threat", "sandwich_attack", "critical")
+
+        manager.remove_alert_rule("any_event")
+        manager.disable_alert_rule("sandwiches")
+        manager.add_alert_rule(make_rule("late_wildcard", {}))
+        manager.add_alert_rule(make_rule("dust", {"threat_types": ["dust_attack"]}))
+        self.assert_agrees(manager)
+
+        manager.enable_alert_rule("sandwiches")
+        self.assert_agrees(manager)
+        assert "sandwiches" in [r.rule_id for r in manager._candidate_rules("threat", "sandwich_attack", "high")]
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process EVM fork simulator
+"""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+pytest.importorskip("eth")
+
+from eth_account import Account
+from web3 import Web3
+from app.core.local_evm_simulation import LocalEVMBackend, StateSource, StaticStateSource
+
+SENDER = Account.from_key("0x" + "11" * 32)
+RECIPIENT = "0x" + "22" * 20
+GAS_PRICE = 10**9
+CONTRACT = "0x" + "cc" * 20
+# return sload(0)
+RETURN_SLOT0 = "0x60005460005260206000f3"
+# sstore(0, 1)
+STORE_ONE = "0x600160005500"
+# revert(0, 0)
+REVERT_EMPTY = "0x60006000fd"
+SPENDER = "0x" + "dd" * 20
+APPROVAL_TOPIC = "8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+# mstore(0, 2**256 - 1); log3(0, 32, Approval, caller, SPENDER)
+APPROVE_UNLIMITED = (
+    "0x7f" + "ff" * 32 + "600052" + "73" + SPENDER[2:] + "33" + "7f" + APPROVAL_TOPIC + "60206000a300"
+)
+
+
+def signed_transfer(nonce=0, value=10**18, chain_id=1, key=SENDER.key):
+    signed = Account.sign_transaction(
+        {
+            "nonce": nonce,
+            "to": RECIPIENT,
+            "value": value,
+            "gas": 21_000,
+            "gasPrice": GAS_PRICE,
+            "chainId": chain_id,
+        },
+        key,
+    )
+    return {"raw": signed.raw_transaction.hex()}
+
+
+def transfer(sender: str, value: int) -> dict:
+    return {"from": sender, "to": RECIPIENT, "value": value, "gas": 21_000}
+
+
+class TestLocalEVMBackend:
+    """Fork execution against a StaticStateSource"""
+
+    @pytest.fixture
+    def source(self):
+        return StaticStateSource(
+            {
+                SENDER.address: {"balance": 5 * 10**18},
+                CONTRACT: {"code": RETURN_SLOT0, "storage": {0: 7}},
+            },
+            block={"number": 100},
+        )
+
+    @pytest.fixture
+    def backend(self, source):
+        backend = LocalEVMBackend(state_source=source)
+        yield backend
+        backend.close()
+
+    def test_state_source_is_abstract(self):
+        class Incomplete(StateSource):
+            def get_chain_id(self) -> int:
+                return 1
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_transfer_reports_balance_changes(self, backend):
+        result = backend.execute(transfer(SENDER.address, 10**18))
+
+        assert result["success"], result["error"]
+        assert result["gas_used"] == 21_000
+        assert result["block_number"] == 100
+        assert result["balance_changes"] == {
+            SENDER.address: str(-(10**18)),
+            Web3.to_checksum_address(RECIPIENT): str(10**18),
+        }
+
+    def test_storage_is_read_from_the_source(self, backend):
+        result = backend.execute({"from": SENDER.address, "to": CONTRACT})
+
+        assert result["success"], result["error"]
+        assert int(result["return_data"], 16) == 7
+        assert backend.get_snapshot(100).stats["storage_fetches"] == 1
+
+    def test_storage_writes_show_in_state_diff(self, source, backend):
+        source.accounts[CONTRACT.lower()]["code"] = STORE_ONE
+        result = backend.execute({"from": SENDER.address, "to": CONTRACT})
+
+        storage = result["state_diff"][Web3.to_checksum_address(CONTRACT)]["storage"]
+        assert storage == {
+            "0x" + "00" * 32: {"from": "0x" + "00" * 31 + "07", "to": "0x" + "00" * 31 + "01"}
+        }
+
+    def test_revert_is_reported(self, source, backend):
+        source.accounts[CONTRACT.lower()]["code"] = REVERT_EMPTY
+        result = backend.execute({"from": SENDER.address, "to": CONTRACT})
+
+        assert not result["success"]
+        assert result["error"] == "execution reverted"
+        assert backend.stats["reverted"] == 1
+
+    def test_snapshot_is_shared_between_simulations(self, backend):
+        backend.execute(transfer(SENDER.address, 1))
+        snapshot = backend.get_snapshot(100)
+        fetched = dict(snapshot.stats)
+        backend.execute(transfer(SENDER.address, 1))
+
+        assert backend.stats["snapshots_created"] == 1
+        assert snapshot.stats["account_fetches"] == fetched["account_fetches"]
+        assert snapshot.stats["hits"] > fetched["hits"]
+
+    def test_bundle_sees_earlier_transactions(self, backend):
+        funded, spent = backend.execute_bundle(
+            [transfer(SENDER.address, 10**18), {"from": RECIPIENT, "to": SENDER.address, "value": 10**18}]
+        )
+
+        assert funded["success"] and spent["success"], spent["error"]
+
+    @pytest.mark.asyncio
+    async def test_simulate_many_runs_independently(self, backend):
+        results = await backend.simulate_many(
+            [transfer(SENDER.address, 4 * 10**18), transfer(SENDER.address, 4 * 10**18)]
+        )
+        bundle = await backend.simulate_bundle(
+            [transfer(SENDER.address, 4 * 10**18), transfer(SENDER.address, 4 * 10**18)]
+        )
+
+        assert [r["success"] for r in results] == [True, True]
+        assert [r["success"] for r in bundle] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_stats_are_exact_across_workers(self, backend):
+        await backend.simulate_many([transfer(SENDER.address, 1) for _ in range(40)])
+        stats = backend.get_stats()
+
+        assert stats["simulations"] == 40
+        assert stats["snapshots_created"] == 1
+        assert stats["snapshots"][100]["hits"] > 0
+
+
+class TestRawTransactions:
+    """Signed transactions are checked and charged like a node would"""
+
+    @pytest.fixture
+    def backend(self):
+        source = StaticStateSource(
+            {SENDER.address: {"balance": 5 * 10**18, "nonce": 3}}, chain_id=1
+        )
+        backend = LocalEVMBackend(state_source=source)
+        yield backend
+        backend.close()
+
+    def test_signed_fee_is_charged_to_sender(self, backend):
+        result = backend.execute(signed_transfer(nonce=3))
+
+        assert result["success"], result["error"]
+        assert result["gas_used"] == 21_000
+        fee = 21_000 * GAS_PRICE
+        assert result["balance_changes"][SENDER.address] == str(-(10**18 + fee))
+        assert result["balance_changes"][Web3.to_checksum_address(RECIPIENT)] == str(10**18)
+        assert result["state_diff"][SENDER.address]["nonce"] == {"from": 3, "to": 4}
+
+    def test_stale_nonce_is_rejected(self, backend):
+        result = backend.execute(signed_transfer(nonce=2))
+
+        assert not result["success"]
+        assert result["error"].startswith("nonce too low")
+
+    def test_future_nonce_is_rejected(self, backend):
+        result = backend.execute(signed_transfer(nonce=4))
+
+        assert not result["success"]
+        assert result["error"].startswith("nonce too high")
+
+    def test_duplicate_nonce_in_bundle_fails_second_slot(self, backend):
+        first, second = backend.execute_bundle(
+            [signed_transfer(nonce=3), signed_transfer(nonce=3, value=1)]
+        )
+
+        assert first["success"]
+        assert not second["success"]
+        assert second["error"].startswith("nonce too low")
+
+    def test_wrong_chain_id_is_rejected(self, backend):
+        result = backend.execute(signed_transfer(nonce=3, chain_id=137))
+
+        assert not result["success"]
+        assert result["error"] == "invalid chain id: signed for 137, fork is 1"
+
+    def test_unfunded_sender_is_rejected(self, backend):
+        pauper = Account.from_key("0x" + "33" * 32)
+        result = backend.execute(signed_transfer(nonce=0, value=1, key=pauper.key))
+
+        assert not result["success"]
+        assert result["error"].startswith("insufficient funds")
+
+    def test_typed_transaction_must_afford_max_fee(self, backend):
+        signed = SENDER.sign_transaction(
+            {
+                "type": 2,
+                "nonce": 3,
+                "to": RECIPIENT,
+                "value": 5 * 10**18 - 21_000 * GAS_PRICE,
+                "gas": 21_000,
+                "maxFeePerGas": 2 * GAS_PRICE,
+                "maxPriorityFeePerGas": 1,
+                "chainId": 1,
+            }
+        )
+        result = backend.execute({"raw": signed.raw_transaction.hex()})
+
+        assert not result["success"]
+        assert result["error"].startswith("insufficient funds")
+
+
+class TestWalletGuardLocalSimulation:
+    """WalletGuardService prefers the local fork and falls back to the remote simulator"""
+
+    @pytest.fixture
+    def remote_calls(self, monkeypatch):
+        pytest.importorskip("cryptography")
+        from app import wallet_guard
+
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"simulation_success": True, "simulation_backend": "remote"})
+
+        client_class = httpx.AsyncClient
+        monkeypatch.setattr(
+            wallet_guard.httpx,
+            "AsyncClient",
+            lambda **kwargs: client_class(transport=httpx.MockTransport(handler)),
+        )
+        return calls
+
+    @pytest.fixture
+    def service(self, remote_calls):
+        from app.wallet_guard import WalletGuardService
+
+        return WalletGuardService()
+
+    def with_local_evm(self, service, source):
+        backend = LocalEVMBackend(state_source=source)
+        service.wallet_simulation_engine = SimpleNamespace(
+            simulation_engines={"ethereum_local_evm": SimpleNamespace(local_evm=backend)}
+        )
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_local_fork_answers_first(self, service, remote_calls):
+        source = StaticStateSource({SENDER.address: {"balance": 5 * 10**18}}, block={"number": 100})
+        backend = self.with_local_evm(service, source)
+
+        try:
+            result = await service._simulate_transaction(
+                {"to": RECIPIENT, "value": 10**18, "gas": 21_000}, SENDER.address
+            )
+        finally:
+            backend.close()
+
+        assert result["simulation_backend"] == "local_evm"
+        assert result["simulation_success"] and not result["risk_detected"]
+        assert result["block_number"] == 100
+        assert result["balance_changes"][SENDER.address] == str(-(10**18))
+        assert remote_calls == []
+
+    @pytest.mark.asyncio
+    async def test_unlimited_approval_is_flagged(self, service):
+        source = StaticStateSource(
+            {SENDER.address: {"balance": 10**18}, CONTRACT: {"code": APPROVE_UNLIMITED}}
+        )
+        backend = self.with_local_evm(service, source)
+
+        try:
+            result = await service._simulate_transaction_locally({"to": CONTRACT}, SENDER.address)
+        finally:
+            backend.close()
+
+        assert result["simulation_success"]
+        assert result["risk_detected"]
+        assert result["approval_drain_risk"] == 1.0
+        assert result["warnings"] == [
+            f"Unlimited approval of {Web3.to_checksum_address(CONTRACT)} to {Web3.to_checksum_address(SPENDER)}"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_fork_falls_back_to_remote(self, service, remote_calls):
+        class Unreachable(StaticStateSource):
+            def get_block(self):
+                raise ConnectionError("node unreachable")
+
+        backend = self.with_local_evm(service, Unreachable())
+
+        try:
+            assert await service._simulate_transaction_locally({"to": RECIPIENT}, SENDER.address) is None
+            result = await service._simulate_transaction({"to": RECIPIENT}, SENDER.address)
+        finally:
+            backend.close()
+
+        assert result["simulation_backend"] == "remote"
+        assert remote_calls == ["/simulate"]
+
+    @pytest.mark.asyncio
+    async def test_network_without_local_engine_uses_remote(self, service, remote_calls):
+        backend = self.with_local_evm(service, StaticStateSource())
+
+        try:
+            result = await service._simulate_transaction(
+                {"to": RECIPIENT, "network": "polygon"}, SENDER.address
+            )
+        finally:
+            backend.close()
+
+        assert result["simulation_backend"] == "remote"
+        assert remote_calls == ["/simulate"]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for Moralis wallet portfolio valuation
+"""
+
+import time
+
+import pytest
+from app.core import moralis_integration
+from app.core.moralis_integration import MoralisAPI, TokenBalance
+from app.core.price_oracle import PriceOracle
+from app.core.provider_clients import TOKEN_METADATA
+
+
+def token_balance(symbol: str, token_address: str, amount: str) -> TokenBalance:
+    return TokenBalance(
+        token_address=token_address,
+        name=symbol,
+        symbol=symbol,
+        decimals=18,
+        balance=amount,
+        balance_formatted=amount,
+    )
+
+
+def snapshot_entry(symbol: str, price_usd: float, status: str = "moralis"):
+    return {"symbol": symbol, "price_usd": price_usd, "status": status, "fetched_at": time.time()}
+
+
+class TestWalletPortfolio:
+    """Test USD valuation of wallet balances"""
+
+    @pytest.fixture
+    def oracle(self, monkeypatch):
+        oracle = PriceOracle(symbols=[])
+        oracle._snapshot = {
+            "ETH": snapshot_entry("ETH", 2000.0),
+            "USDC": snapshot_entry("USDC", 1.0),
+            "LINK": snapshot_entry("LINK", 999.0, status="fallback_mock"),
+        }
+        monkeypatch.setattr(moralis_integration, "get_price_oracle", lambda: oracle)
+        return oracle
+
+    @pytest.mark.asyncio
+    async def test_tokens_are_valued_by_address_not_symbol(self, oracle, monkeypatch):
+        api = MoralisAPI(api_key="test")
+        balances = [
+            token_balance("USDC", TOKEN_METADATA["USDC"]["address"].lower(), "100"),
+            # Spam token claiming a well-known symbol
+            token_balance("ETH", "0x" + "66" * 20, "1000"),
+            token_balance("LINK", TOKEN_METADATA["LINK"]["address"], "5"),
+        ]
+
+        async def native_balance(address, network):
+            return {"balance": str(10**18)}
+
+        async def token_balances(address, network):
+            return balances
+
+        async def transactions(address, network, limit):
+            return {"result": []}
+
+        monkeypatch.setattr(api, "get_native_balance", native_balance)
+        monkeypatch.setattr(api, "get_wallet_token_balances", token_balances)
+        monkeypatch.setattr(api, "get_wallet_transactions", transactions)
+
+        profile = await api.get_wallet_portfolio("0x" + "ab" * 20, "ethereum")
+
+        assert profile.usd_balance == pytest.approx(2000.0 + 100.0)
+        assert [b.usd_value for b in balances] == [100.0, None, None]
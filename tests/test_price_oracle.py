@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process price oracle
+"""
+
+import time
+
+import pytest
+from app.core import price_oracle
+from app.core.price_oracle import PriceOracle
+from app.core.provider_clients import TOKEN_METADATA, TokenPrice
+
+
+def token_price(symbol: str, price_usd: float) -> TokenPrice:
+    meta = TOKEN_METADATA.get(symbol, {"address": "unknown", "chain": "eth"})
+    return TokenPrice(
+        symbol=symbol,
+        address=meta["address"],
+        chain=meta["chain"],
+        price_usd=price_usd,
+        price_native=price_usd,
+        percent_change_24h=0.0,
+        liquidity_usd=None,
+        last_updated=int(time.time()),
+        status="moralis",
+    )
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Batch fetcher stand-in pricing whatever is in ``prices``"""
+    prices = {}
+    requested = []
+
+    async def fetch(symbols):
+        requested.append(list(symbols))
+        return {s: token_price(s, prices[s]) for s in symbols if s in prices}, {}
+
+    monkeypatch.setattr(price_oracle, "fetch_token_prices_batch_async", fetch)
+    return prices, requested
+
+
+class TestPriceOracle:
+    """Test on-demand tracking and price lookups"""
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbols_are_not_tracked(self, upstream):
+        prices, requested = upstream
+        prices["USDC"] = 1.0
+        oracle = PriceOracle(symbols=["ETH"])
+
+        response = await oracle.get_prices(["usdc", "NOT-A-TOKEN", "RUGPULL"])
+
+        assert [t["symbol"] for t in response["tokens"]] == ["USDC"]
+        assert requested == [["USDC"]]
+        assert oracle.get_status()["tracked_symbols"] == 2
+
+    @pytest.mark.asyncio
+    async def test_on_demand_tracking_is_capped(self, upstream):
+        prices, _ = upstream
+        prices.update({"USDC": 1.0, "DAI": 1.0})
+        oracle = PriceOracle(symbols=["ETH"], max_symbols=2)
+
+        response = await oracle.get_prices(["USDC", "DAI"])
+
+        assert [t["symbol"] for t in response["tokens"]] == ["USDC"]
+        assert oracle.get_status()["tracked_symbols"] == 2
+
+    @pytest.mark.asyncio
+    async def test_price_usd_ignores_mock_entries(self, upstream):
+        oracle = PriceOracle(symbols=["LINK"])
+
+        await oracle.refresh()
+
+        assert oracle.get_price("LINK")["status"] == "fallback_mock"
+        assert oracle.get_price_usd("LINK") is None
+
+    @pytest.mark.asyncio
+    async def test_price_usd_ignores_stale_entries(self, upstream):
+        prices, _ = upstream
+        prices["ETH"] = 3000.0
+        oracle = PriceOracle(symbols=["ETH"], stale_after=60)
+        await oracle.refresh()
+        assert oracle.get_price_usd("ETH") == 3000.0
+
+        oracle._snapshot["ETH"] = {**oracle._snapshot["ETH"], "fetched_at": time.time() - 61}
+
+        assert oracle.get_price_usd("ETH") is None
+
+    @pytest.mark.asyncio
+    async def test_token_price_is_keyed_by_chain_and_address(self, upstream):
+        prices, _ = upstream
+        prices.update({"USDC": 1.0, "ARB": 0.8})
+        oracle = PriceOracle(symbols=["USDC", "ARB"])
+        await oracle.refresh()
+
+        usdc = TOKEN_METADATA["USDC"]["address"]
+        arb = TOKEN_METADATA["ARB"]["address"]
+        assert oracle.get_token_price_usd("eth", usdc.lower()) == 1.0
+        assert oracle.get_token_price_usd("arbitrum", arb) == 0.8
+        # Same address on another chain, or another address claiming the symbol
+        assert oracle.get_token_price_usd("polygon", usdc) is None
+        assert oracle.get_token_price_usd("eth", "0x" + "12" * 20) is None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the async provider quote layer
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from app.core import provider_clients
+from app.core.provider_clients import QuoteCache, _hedged_json, get_dex_routes_async
+
+URL = "https://quotes.example/price"
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the shared async client to a scripted handler"""
+    requests = []
+    responses = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        delay, response = responses.pop(0)
+        await asyncio.sleep(delay)
+        return response
+
+    monkeypatch.setitem(provider_clients.PROVIDER_DEADLINES, "test", (1.0, 0.05))
+    monkeypatch.setattr(
+        provider_clients, "_async_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    yield requests, responses
+
+
+class TestHedgedJson:
+    """Duplicates are only sent for slow or transient failures"""
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_hedged(self, upstream):
+        requests, responses = upstream
+        responses.append((0, httpx.Response(401, json={"error": "bad key"})))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await _hedged_json("test", "GET", URL)
+        assert len(requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_hedged(self, upstream):
+        requests, responses = upstream
+        responses.append((0, httpx.Response(503)))
+        responses.append((0, httpx.Response(200, json={"price": 1})))
+
+        data, _ = await _hedged_json("test", "GET", URL)
+        assert data == {"price": 1}
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_attempt_is_hedged(self, upstream):
+        requests, responses = upstream
+        responses.append((0.5, httpx.Response(200, json={"attempt": 1})))
+        responses.append((0, httpx.Response(200, json={"attempt": 2})))
+
+        data, _ = await _hedged_json("test", "GET", URL)
+        assert data == {"attempt": 2}
+        assert len(requests) == 2
+
+
+class TestQuoteCache:
+    """Single-flight loading and what gets cached"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        cache = QuoteCache(ttl_seconds=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"quote": calls}
+
+        results = await asyncio.gather(*(cache.get_or_fetch(("k",), fetch) for _ in range(10)))
+        assert await cache.get_or_fetch(("k",), fetch) == {"quote": 1}
+
+        assert calls == 1
+        assert all(result == {"quote": 1} for result in results)
+        assert cache.stats == {"hits": 1, "misses": 1, "coalesced": 9}
+
+    @pytest.mark.asyncio
+    async def test_missing_live_quote_is_not_cached(self):
+        cache = QuoteCache(ttl_seconds=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await cache.get_or_fetch(("k",), fetch) is None
+        assert await cache.get_or_fetch(("k",), fetch) is None
+        assert calls == 2
+
+
+class TestDexRoutes:
+    """Live routes are cached per amount bucket; mock routes never are"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch):
+        monkeypatch.setattr(provider_clients, "_dex_quote_cache", QuoteCache(ttl_seconds=60))
+
+    @pytest.mark.asyncio
+    async def test_live_quote_is_rescaled_to_exact_amount(self, monkeypatch):
+        calls = []
+
+        async def live_route(aggregator, api_key, from_token, to_token, amount_in, slippage_percent):
+            calls.append(amount_in)
+            return {
+                "aggregator": aggregator,
+                "amount_in": amount_in,
+                "amount_out": 2 * amount_in,
+                "min_received": 1.9 * amount_in,
+                "status": "live",
+            }
+
+        monkeypatch.setattr(provider_clients, "DEX_AGGREGATORS", {"1inch": "key"})
+        monkeypatch.setattr(provider_clients, "_fetch_live_dex_route_async", live_route)
+
+        [first] = await get_dex_routes_async("eth", "usdc", 100.0, 0.5)
+        [second] = await get_dex_routes_async("ETH", "USDC", 100.2, 0.5)
+
+        assert calls == [100.0]
+        assert first["amount_out"] == pytest.approx(200.0)
+        assert second["amount_in"] == 100.2
+        assert second["amount_out"] == pytest.approx(200.4)
+        assert second["min_received"] == pytest.approx(190.38)
+
+    @pytest.mark.asyncio
+    async def test_mock_routes_are_not_cached(self, monkeypatch):
+        async def no_route(*args):
+            return None
+
+        monkeypatch.setattr(provider_clients, "DEX_AGGREGATORS", {"1inch": "key", "MetaMask Swaps": None})
+        monkeypatch.setattr(provider_clients, "_fetch_live_dex_route_async", no_route)
+
+        routes = await get_dex_routes_async("ETH", "USDC", 100.0, 0.5)
+        await get_dex_routes_async("ETH", "USDC", 100.0, 0.5)
+
+        assert [route["aggregator"] for route in routes] == ["1inch", "MetaMask Swaps"]
+        assert not provider_clients._dex_quote_cache._entries
+        assert provider_clients._dex_quote_cache.stats["misses"] == 2
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for the simulation result cache and its wallet simulation integration
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from app.core import simulation_cache
+from app.core.simulation_cache import SimulationCacheKey, SimulationResultCache
+from app.core.wallet_simulation import RealWalletSimulationEngine
+
+WALLET = "0x" + "a1" * 20
+TRANSACTION = {"from": WALLET, "to": "0x" + "b2" * 20, "value": 1}
+
+
+def key(transaction_id="sim_1", block_number=100, nonces=((WALLET, 1),)) -> SimulationCacheKey:
+    return SimulationCacheKey(transaction_id, "ethereum", block_number, nonces)
+
+
+def verdict(executed_successfully=True):
+    return SimpleNamespace(
+        executed_successfully=executed_successfully,
+        simulation_timestamp=datetime.now(timezone.utc),
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeWeb3:
+    """Chain head and pending nonces, counting every read"""
+
+    def __init__(self):
+        self.head = 100
+        self.nonces: dict[str, int] = {}
+        self.block_reads = 0
+        self.nonce_reads = 0
+        self.eth = self
+
+    @property
+    def block_number(self) -> int:
+        self.block_reads += 1
+        return self.head
+
+    def get_transaction_count(self, address, block_identifier):
+        self.nonce_reads += 1
+        return self.nonces.get(address.lower(), 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(simulation_cache, "time", clock)
+    return clock
+
+
+class TestSimulationResultCache:
+    """TTL, LRU bound, per-block invalidation and single-flight"""
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = SimulationResultCache(ttl_seconds=30)
+        cache.put(key(), "verdict")
+
+        clock.now += 29
+        assert cache.get(key()) == "verdict"
+        clock.now += 2
+        assert cache.get(key()) is None
+        assert cache.stats["expired"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SimulationResultCache(max_entries=2)
+        cache.put(key("a"), "a")
+        cache.put(key("b"), "b")
+        cache.get(key("a"))
+        cache.put(key("c"), "c")
+
+        assert len(cache) == 2
+        assert cache.get(key("b")) is None
+        assert cache.get(key("a")) == "a"
+        assert cache.stats["evictions"] == 1
+
+    def test_new_block_drops_older_entries(self):
+        cache = SimulationResultCache()
+        cache.put(key("a", block_number=100), "a")
+        cache.put(key("b", block_number=101), "b")
+        cache.put(SimulationCacheKey("c", "polygon", 50), "c")
+
+        assert cache.on_new_block("ethereum", 101) == 1
+        # Reports of an older head are ignored
+        assert cache.on_new_block("ethereum", 100) == 0
+
+        assert cache.get(key("a", block_number=100)) is None
+        assert cache.get(key("b", block_number=101)) == "b"
+        assert cache.get(SimulationCacheKey("c", "polygon", 50)) == "c"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_computation(self):
+        cache = SimulationResultCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return verdict()
+
+        results = await asyncio.gather(*(cache.get_or_compute(key(), compute) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert cache.stats["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_result_computed_across_a_new_block_is_not_stored(self):
+        cache = SimulationResultCache()
+
+        async def compute():
+            cache.on_new_block("ethereum", 101)
+            return verdict()
+
+        await cache.get_or_compute(key(block_number=100), compute)
+
+        assert len(cache) == 0
+
+
+class TestWalletSimulationCaching:
+    """simulate_transaction keys on block and nonces and caches good verdicts"""
+
+    @pytest.fixture
+    def w3(self):
+        return FakeWeb3()
+
+    @pytest.fixture
+    def engine(self, w3, monkeypatch):
+        engine = RealWalletSimulationEngine({"simulation_cache": {"block_number_max_age": 0}})
+        engine.web3_clients["ethereum"] = w3
+        engine.runs = []
+
+        async def run_simulation(transaction_id, transaction, wallet_address, network, depth):
+            engine.runs.append(transaction_id)
+            await asyncio.sleep(0.01)
+            result = verdict(engine.next_success)
+            result.transaction_id = transaction_id
+            return result
+
+        engine.next_success = True
+        monkeypatch.setattr(engine, "_run_simulation", run_simulation)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_simulate_once(self, engine):
+        results = await asyncio.gather(
+            *(engine.simulate_transaction(TRANSACTION, WALLET) for _ in range(4))
+        )
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert len(engine.runs) == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_new_block_invalidates(self, engine, w3):
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+        w3.head = 101
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert len(engine.runs) == 2
+        assert engine.simulation_cache.stats["invalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nonce_change_invalidates(self, engine, w3):
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+        w3.nonces[WALLET] = 1
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert len(engine.runs) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_simulation_is_not_cached(self, engine):
+        engine.next_success = False
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+        engine.next_success = True
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert len(engine.runs) == 2
+
+    @pytest.mark.asyncio
+    async def test_recent_block_number_is_reused(self, engine, w3):
+        engine.block_number_max_age = 60
+        engine.on_new_block("ethereum", 100)
+
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+        await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert w3.block_reads == 0
+        assert w3.nonce_reads == 2
+        assert len(engine.runs) == 1
+
+    @pytest.mark.asyncio
+    async def test_lookup_and_cleanup(self, engine, clock):
+        result = await engine.simulate_transaction(TRANSACTION, WALLET)
+
+        assert engine.get_simulation_result(result.transaction_id) is result
+        assert engine.get_simulation_result("sim_unknown") is None
+
+        clock.now += 3600
+        engine.cleanup_cache(max_age_hours=24)
+        assert engine.get_simulation_result(result.transaction_id) is None
+        assert len(engine.simulation_cache) == 0
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for Multicall3 wallet state snapshots
+"""
+
+import pytest
+from eth_abi import decode, encode
+from app.core.state_snapshot import (
+    BALANCE_OF_SELECTOR,
+    DECIMALS_SELECTOR,
+    SYMBOL_SELECTOR,
+    StateSnapshotter,
+)
+
+WALLET = "0x" + "11" * 20
+TOKEN = "0x" + "22" * 20
+
+
+class FakeEth:
+    """Answers aggregate3 with fixed per-selector token responses"""
+
+    def __init__(self, decimals: int):
+        self.responses = {
+            BALANCE_OF_SELECTOR: encode(["uint256"], [500]),
+            DECIMALS_SELECTOR: encode(["uint8"], [decimals]),
+            SYMBOL_SELECTOR: encode(["string"], ["TKN"]),
+        }
+        self.calls = 0
+
+    def call(self, tx):
+        self.calls += 1
+        payload = bytes.fromhex(tx["data"][2:])[4:]
+        [sub_calls] = decode(["(address,bool,bytes)[]"], payload)
+        results = []
+        for _, _, data in sub_calls:
+            response = self.responses.get(bytes(data[:4]))
+            results.append((response is not None, response or encode(["uint256"], [1])))
+        return encode(["(bool,bytes)[]"], [results])
+
+
+class FakeWeb3:
+    def __init__(self, decimals: int):
+        self.eth = FakeEth(decimals)
+
+
+class TestStateSnapshotter:
+    """Token metadata decoding and caching"""
+
+    @pytest.mark.asyncio
+    async def test_zero_decimals_are_kept_and_cached(self):
+        snapshotter = StateSnapshotter()
+        w3 = FakeWeb3(decimals=0)
+
+        first = await snapshotter.snapshot(w3, "ethereum", WALLET, {"TKN": TOKEN})
+        second = await snapshotter.snapshot(w3, "ethereum", WALLET, {"TKN": TOKEN})
+
+        [token] = first.tokens.values()
+        assert token.decimals == 0
+        assert token.to_approval_dict()["balance"] == 500
+        assert second.tokens[token.address].decimals == 0
+        assert len(snapshotter.metadata_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_decimals_default_to_18_uncached(self):
+        snapshotter = StateSnapshotter()
+        w3 = FakeWeb3(decimals=6)
+        del w3.eth.responses[DECIMALS_SELECTOR]
+
+        snapshot = await snapshotter.snapshot(w3, "ethereum", WALLET, {"TKN": TOKEN})
+
+        [token] = snapshot.tokens.values()
+        assert token.decimals == 18
+        assert not snapshotter.metadata_cache
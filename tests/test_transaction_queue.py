@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the transaction queue scheduler
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from app.core.transaction_queue import (
+    HEAP_COMPACT_SLACK,
+    REPLACEMENT_PRIORITY_BOOST,
+    TransactionQueue,
+    TransactionStatus,
+)
+
+
+def ready_entries(queue: TransactionQueue, network: str = "ethereum") -> int:
+    return len(queue._ready.get(network, []))
+
+
+class TestTransactionQueue:
+    """Test add / broadcast / confirm / replace flows"""
+
+    @pytest.fixture
+    def queue(self):
+        """Create a queue with room for the bulk tests"""
+        return TransactionQueue(max_queue_size=10000)
+
+    @pytest.mark.asyncio
+    async def test_add_then_broadcast_does_not_grow_ready_heap(self, queue):
+        """Sends broadcast by the caller leave no scheduling state behind"""
+        for i in range(5000):
+            queued_tx = await queue.add_transaction({"nonce": i}, network="ethereum")
+            await queue.mark_broadcasting(f"0x{i:064x}", queued_tx)
+            await queue.mark_confirmed(f"0x{i:064x}", 1)
+
+        assert ready_entries(queue) <= HEAP_COMPACT_SLACK
+        assert not queue._queued
+        assert not queue._lanes
+        assert len(queue.completed) == 5000
+        assert await queue.get_next_transaction() is None
+
+    @pytest.mark.asyncio
+    async def test_broadcast_of_queued_head_releases_next_nonce(self, queue):
+        """Broadcasting a queued tx directly lets the next nonce go, not the same tx"""
+        first = await queue.add_transaction({"nonce": 0})
+        second = await queue.add_transaction({"nonce": 1})
+
+        await queue.mark_broadcasting("0xaa", first)
+
+        assert first.status is TransactionStatus.BROADCASTING
+        assert await queue.get_next_transaction() is second
+        assert await queue.get_next_transaction() is None
+
+    @pytest.mark.asyncio
+    async def test_unbounded_churn_keeps_heaps_bounded(self, queue):
+        """Lanes that keep being republished compact their stale entries"""
+        parked = await queue.add_transaction({"nonce": 10_000}, network="ethereum")
+        for i in range(2000):
+            queued_tx = await queue.add_transaction({"nonce": i}, priority=i % 7)
+            await queue.mark_broadcasting(f"0x{i:064x}", queued_tx)
+
+        lane = queue._lanes[parked.lane]
+        assert len(lane.heap) <= 2 * len(lane.live) + HEAP_COMPACT_SLACK + 1
+        assert ready_entries(queue) <= 2 + HEAP_COMPACT_SLACK + 1
+        assert await queue.get_next_transaction() is parked
+
+    @pytest.mark.asyncio
+    async def test_nonce_order_within_account(self, queue):
+        """An account's transactions go out one at a time in nonce order"""
+        high = await queue.add_transaction({"nonce": 2}, priority=5)
+        low = await queue.add_transaction({"nonce": 1})
+
+        assert await queue.get_next_transaction() is low
+        # Next nonce waits for the in-flight one to be handed off
+        assert await queue.get_next_transaction() is None
+
+        await queue.mark_broadcasting("0x01", low)
+        assert await queue.get_next_transaction() is high
+
+    @pytest.mark.asyncio
+    async def test_lane_priority_follows_most_urgent_tx(self, queue):
+        """A lane competes at its highest queued priority"""
+        await queue.add_transaction({"nonce": 0}, account_index=0, priority=1)
+        urgent_lane_head = await queue.add_transaction({"nonce": 0}, account_index=1, priority=0)
+        await queue.add_transaction({"nonce": 1}, account_index=1, priority=9)
+
+        assert await queue.get_next_transaction() is urgent_lane_head
+
+    @pytest.mark.asyncio
+    async def test_cancelled_urgent_tx_drops_lane_priority(self, queue):
+        """Discarded transactions stop counting toward their lane's priority"""
+        other = await queue.add_transaction({"nonce": 0}, account_index=0, priority=1)
+        await queue.add_transaction({"nonce": 0}, account_index=1, priority=0)
+        urgent = await queue.add_transaction({"nonce": 1}, account_index=1, priority=9)
+
+        assert await queue.cancel_transaction(urgent.tx_id)
+        assert await queue.get_next_transaction() is other
+
+    @pytest.mark.asyncio
+    async def test_retry_requeues_without_duplicates(self, queue):
+        """A retried tx is dispatched once more, not once per stale entry"""
+        queued_tx = await queue.add_transaction({"nonce": 0})
+        await queue.mark_broadcasting("0x01", queued_tx)
+        assert await queue.retry_transaction(queued_tx, "underpriced")
+
+        assert await queue.get_next_transaction() is queued_tx
+        assert await queue.get_next_transaction() is None
+
+    @pytest.mark.asyncio
+    async def test_gas_bump_replacement_marks_original_replaced(self, queue):
+        """Broadcasting a replacement retires the stuck original"""
+        original = await queue.add_transaction({"nonce": 3, "gasPrice": 100})
+        await queue.mark_broadcasting("0xold", original)
+        original.broadcast_at = datetime.utcnow() - timedelta(minutes=10)
+
+        [replacement] = await queue.bump_stuck_transactions()
+        assert replacement.priority == REPLACEMENT_PRIORITY_BOOST
+        assert replacement.tx_data["gasPrice"] > 100
+
+        assert await queue.get_next_transaction() is replacement
+        await queue.mark_broadcasting("0xnew", replacement)
+
+        assert original.status is TransactionStatus.REPLACED
+        assert "0xold" not in queue.pending
+        assert queue.metrics["replaced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_confirmed_original_cancels_queued_replacement(self, queue):
+        """The original landing first drops its not-yet-sent replacement"""
+        original = await queue.add_transaction({"nonce": 3, "gasPrice": 100})
+        await queue.mark_broadcasting("0xold", original)
+        original.broadcast_at = datetime.utcnow() - timedelta(minutes=10)
+        [replacement] = await queue.bump_stuck_transactions()
+
+        await queue.mark_confirmed("0xold", 1)
+
+        assert original.status is TransactionStatus.CONFIRMED
+        assert replacement.status is TransactionStatus.CANCELLED
+        assert await queue.get_next_transaction() is None
+        assert not queue._lanes
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for wallet guard monitoring flows
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from app import wallet_guard
+from app.core import threat_detection
+from app.core.blockchain import AccountState
+from app.core.watchlist_scanner import WalletActivity, WatchlistScanner
+from app.wallet_guard import ThreatLevel, WalletGuardService, WalletInfo, WalletType
+
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b2" * 20
+CAROL = "0x" + "c3" * 20
+
+
+def wallet_info(address: str, last_activity: datetime | None = None) -> WalletInfo:
+    now = datetime.utcnow()
+    return WalletInfo(
+        address=address,
+        wallet_type=WalletType.EOA,
+        balance=1.0,
+        network="ethereum",
+        first_seen=now,
+        last_activity=last_activity or now,
+        transaction_count=5,
+        risk_score=0.0,
+        threat_level=ThreatLevel.LOW,
+        tags=[],
+    )
+
+
+class FakeProvider:
+    """Batched account reads with optional per-address delays"""
+
+    def __init__(self, delays: dict[str, float] | None = None):
+        self.delays = delays or {}
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_healthy_rpc_urls(self) -> list[str]:
+        return ["https://rpc-a.example", "https://rpc-b.example"]
+
+    async def get_account_states(self, addresses, rpc_url=None):
+        self.batches.append(list(addresses))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(max(self.delays.get(a, 0) for a in addresses))
+        finally:
+            self.in_flight -= 1
+        return {a: AccountState(a, 10**18, 3) for a in addresses}
+
+    async def get_codes(self, addresses, rpc_url=None):
+        return {a: b"" for a in addresses}
+
+
+@pytest.fixture
+def service():
+    return WalletGuardService()
+
+
+@pytest.fixture
+def account_lookups(monkeypatch):
+    """Record every per-wallet balance/nonce lookup the threat engine makes"""
+    lookups = []
+
+    async def get_balance(address, network):
+        lookups.append(("balance", address))
+        return 0
+
+    async def get_transaction_count(address, network):
+        lookups.append(("nonce", address))
+        return 0
+
+    manager = threat_detection.blockchain_manager
+    monkeypatch.setattr(manager, "get_provider", lambda network: object())
+    monkeypatch.setattr(manager, "get_balance", get_balance)
+    monkeypatch.setattr(manager, "get_transaction_count", get_transaction_count)
+    return lookups
+
+
+class TestWatchlistMonitoring:
+    """Wallets touched by scanned blocks, and leaving the watchlist"""
+
+    @pytest.mark.asyncio
+    async def test_activity_reuses_scanned_state(self, service, account_lookups):
+        service.monitored_wallets[ALICE] = wallet_info(ALICE)
+        activity = {ALICE: WalletActivity(ALICE, "ethereum", 100, outgoing_txs=["0x01"])}
+        states = {ALICE: AccountState(ALICE, 2 * 10**18, 7)}
+
+        await service._handle_watchlist_activity("ethereum", activity, states)
+
+        assert account_lookups == []
+        assert service.monitored_wallets[ALICE].transaction_count == 7
+        assert service.monitored_wallets[ALICE].balance == 2.0
+
+    @pytest.mark.asyncio
+    async def test_stop_monitoring_unwatches_wallet(self, service):
+        async def on_activity(network, activity, states):
+            pass
+
+        scanner = WatchlistScanner("ethereum", provider=None, on_activity=on_activity, poll_interval=1)
+        service.watchlist_scanners["ethereum"] = scanner
+        for address in (ALICE, BOB):
+            scanner.watch(address)
+            service.monitored_wallets[address] = wallet_info(address)
+
+        assert await service.stop_monitoring_wallet(ALICE)
+        assert not await service.stop_monitoring_wallet(ALICE)
+
+        assert ALICE not in scanner and BOB in scanner
+        assert set(service.monitored_wallets) == {BOB}
+
+    @pytest.mark.asyncio
+    async def test_idle_wallets_are_evicted(self, service):
+        now = datetime.utcnow()
+        idle_since = now - timedelta(days=wallet_guard.MONITORED_WALLET_IDLE_DAYS + 1)
+        service.monitored_wallets[ALICE] = wallet_info(ALICE, last_activity=idle_since)
+        service.monitored_wallets[BOB] = wallet_info(BOB, last_activity=now)
+
+        assert await service.evict_idle_wallets(now) == 1
+        assert set(service.monitored_wallets) == {BOB}
+
+
+class TestBulkAnalysis:
+    """NDJSON bulk analysis endpoint and its generator"""
+
+    @pytest.fixture
+    def provider(self, monkeypatch, account_lookups):
+        provider = FakeProvider()
+        monkeypatch.setattr(wallet_guard.blockchain_manager, "get_provider", lambda network: provider)
+        return provider
+
+    @pytest.fixture
+    def client(self, service):
+        from fastapi.testclient import TestClient
+
+        # Production middleware only trusts the service's own domain
+        return TestClient(service.app, base_url="https://api.yourdomain.com")
+
+    def test_endpoint_streams_one_line_per_address(self, client, provider):
+        response = client.post(
+            "/api/v1/wallet-guard/analyze/bulk",
+            json={"addresses": [ALICE, "not-an-address", 42, BOB.upper().replace("0X", "0x"), ALICE]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        errors = {r["address"]: r["error"] for r in records if "error" in r}
+        analyzed = {r["address"]: r["wallet_info"] for r in records if "wallet_info" in r}
+        assert errors == {"not-an-address": "Invalid Ethereum address", 42: "Invalid Ethereum address"}
+        assert set(analyzed) == {ALICE, BOB}
+        assert analyzed[ALICE]["transaction_count"] == 3
+        assert provider.batches == [[ALICE, BOB]]
+
+    def test_endpoint_rejects_non_list(self, client, provider):
+        response = client.post("/api/v1/wallet-guard/analyze/bulk", json={"addresses": ALICE})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_yielded_as_they_complete(self, service, provider, account_lookups):
+        provider.delays = {ALICE: 0.05}
+
+        records = [
+            record
+            async for record in service.analyze_wallets_bulk([ALICE, BOB, CAROL], "ethereum", chunk_size=1)
+        ]
+
+        assert [r["address"] for r in records][-1] == ALICE
+        assert {r["address"] for r in records} == {ALICE, BOB, CAROL}
+        assert account_lookups == []
+
+    @pytest.mark.asyncio
+    async def test_concurrency_budget_and_early_close(self, service, provider):
+        provider.delays = {address: 0.01 for address in (ALICE, BOB, CAROL)}
+        addresses = ["0x" + f"{i:040x}" for i in range(1, 21)]
+        stream = service.analyze_wallets_bulk(addresses, "ethereum", chunk_size=2, max_concurrency=2)
+
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+        assert "wallet_info" in first
+        assert provider.max_in_flight <= 2
+        # Closing the stream cancels chunks that have not been loaded yet
+        assert len(provider.batches) < 10
+
+    @pytest.mark.asyncio
+    async def test_single_wallet_analysis_uses_batched_reads(self, service, provider):
+        # FakeProvider has no blocking per-value getters to fall back on
+        info = await service.analyze_wallet_enhanced(ALICE, "ethereum")
+
+        assert info.transaction_count == 3
+        assert info.wallet_type == WalletType.EOA
+        assert provider.batches == [[ALICE]]
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for the block-driven watchlist scanner
+"""
+
+import pytest
+from app.core.blockchain import AccountState
+from app.core.watchlist_scanner import WatchlistScanner
+
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b2" * 20
+CAROL = "0x" + "c3" * 20
+DAVE = "0x" + "d4" * 20
+TOKEN = "0x" + "70" * 20
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+def topic(address: str) -> str:
+    return "0x" + "00" * 12 + address[2:]
+
+
+def block(number: int, transactions=()) -> dict:
+    return {"number": hex(number), "transactions": list(transactions)}
+
+
+class FakeProvider:
+    """Serves scripted batch results and records every call"""
+
+    def __init__(self, head: int):
+        self.head = head
+        self.blocks: dict[int, dict | Exception] = {}
+        self.logs: list[dict] | Exception = []
+        self.batches: list[list] = []
+        self.state_requests: list[list[str]] = []
+
+    async def get_block_number(self) -> int:
+        return self.head
+
+    async def rpc_batch(self, calls):
+        self.batches.append(calls)
+        results = []
+        for method, params in calls:
+            if method == "eth_getBlockByNumber":
+                number = int(params[0], 16)
+                results.append(self.blocks.get(number, block(number)))
+            else:
+                results.append(self.logs)
+        return results
+
+    async def get_account_states(self, addresses):
+        self.state_requests.append(list(addresses))
+        return {address: AccountState(address, 10**18, 1) for address in addresses}
+
+
+@pytest.fixture
+def reports():
+    return []
+
+
+@pytest.fixture
+def scanner(reports):
+    async def on_activity(network, activity, states):
+        reports.append((activity, states))
+
+    scanner = WatchlistScanner("ethereum", FakeProvider(head=100), on_activity, poll_interval=1)
+    scanner.last_block_number = 99
+    return scanner
+
+
+class TestMatching:
+    """Transactions and logs are matched against watched addresses"""
+
+    def test_transactions_and_log_topics_touch_watched_wallets(self, scanner):
+        for address in (ALICE, BOB, CAROL):
+            scanner.watch(address)
+        blocks = [
+            block(
+                100,
+                [
+                    {"hash": "0x01", "from": ALICE, "to": DAVE},
+                    {"hash": "0x02", "from": DAVE, "to": BOB.upper().replace("0X", "0x")},
+                ],
+            )
+        ]
+        logs = [
+            {
+                "blockNumber": hex(100),
+                "address": TOKEN,
+                "topics": [TRANSFER_TOPIC, topic(DAVE), topic(CAROL)],
+            }
+        ]
+
+        activity = scanner.match(blocks, logs)
+
+        assert set(activity) == {ALICE, BOB, CAROL}
+        assert activity[ALICE].outgoing_txs == ["0x01"]
+        assert activity[BOB].incoming_txs == ["0x02"]
+        assert activity[CAROL].log_count == 1
+        assert activity[CAROL].emitting_contracts == {TOKEN}
+
+    def test_unwatched_wallets_are_not_reported(self, scanner):
+        scanner.watch(ALICE)
+        scanner.unwatch(ALICE)
+
+        activity = scanner.match([block(100, [{"hash": "0x01", "from": ALICE, "to": DAVE}])], [])
+
+        assert activity == {}
+        assert len(scanner) == 0
+
+
+class TestScanning:
+    """Cursor handling and batched state refresh"""
+
+    @pytest.mark.asyncio
+    async def test_touched_wallets_get_one_batched_state_refresh(self, scanner, reports):
+        scanner.watch(ALICE)
+        scanner.watch(BOB)
+        scanner.provider.blocks[100] = block(
+            100, [{"hash": "0x01", "from": ALICE, "to": BOB}, {"hash": "0x02", "from": DAVE, "to": CAROL}]
+        )
+
+        await scanner.scan_once()
+
+        assert scanner.provider.state_requests == [[ALICE, BOB]]
+        [(activity, states)] = reports
+        assert set(activity) == set(states) == {ALICE, BOB}
+
+    @pytest.mark.asyncio
+    async def test_failed_block_is_retried_not_skipped(self, scanner, reports):
+        scanner.watch(ALICE)
+        provider = scanner.provider
+        provider.head = 103
+        provider.blocks[102] = RuntimeError("node lagging")
+        provider.blocks[103] = block(103, [{"hash": "0x03", "from": ALICE, "to": DAVE}])
+        provider.logs = [
+            {"blockNumber": hex(103), "address": TOKEN, "topics": [TRANSFER_TOPIC, topic(ALICE)]}
+        ]
+
+        await scanner.scan_once()
+        # Blocks 100 and 101 made it; nothing past the failed block is reported
+        assert scanner.last_block_number == 101
+        assert reports == []
+
+        del provider.blocks[102]
+        await scanner.scan_once()
+
+        assert scanner.last_block_number == 103
+        [(activity, _)] = reports
+        assert activity[ALICE].outgoing_txs == ["0x03"]
+        assert activity[ALICE].log_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_logs_keep_the_cursor(self, scanner):
+        scanner.watch(ALICE)
+        scanner.provider.head = 102
+        scanner.provider.logs = RuntimeError("logs unavailable")
+
+        await scanner.scan_once()
+
+        assert scanner.last_block_number == 99
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_scanned_in_bounded_cycles(self, scanner):
+        scanner.watch(ALICE)
+        scanner.max_blocks_per_cycle = 5
+        scanner.provider.head = 120
+
+        await scanner.scan_once()
+
+        assert scanner.last_block_number == 104
+        [calls] = scanner.provider.batches
+        assert len(calls) == 6